@@ -38,6 +38,11 @@ class BasePlugin(ABC):
     method by redirecting to __call__.
     """
 
+    #: Number of workers used by :meth:`parallel_map` and
+    #: :meth:`process_slices`. This is set by the ``--workers`` option of the
+    #: improver command. A single worker processes the slices serially.
+    _workers = 1
+
     def __call__(self, *args, **kwargs):
         """Makes subclasses callable to use process
         Args:
@@ -55,6 +60,79 @@ class BasePlugin(ABC):
         """Abstract class for rest to implement."""
         pass
 
+    def parallel_map(self, function, iterable, executor="thread"):
+        """Apply a function to each item of an iterable, fanning the items
+        out to a pool of workers if more than one worker is configured.
+
+        Args:
+            function (callable):
+                Function to apply to each item. For a process pool, this
+                function and the items must be picklable.
+            iterable (iterable):
+                Items, such as cube slices, to be processed.
+            executor (str):
+                The type of pool to use, either "thread" or "process".
+                Threads suit functions that spend most of their time in
+                numpy, which releases the GIL. Processes suit functions that
+                loop in pure Python. The processes are spawned rather than
+                forked, as forking a process after the netCDF library or
+                dask have started threads can deadlock.
+
+        Returns:
+            list:
+                The results of applying the function to each item, in the
+                same order as the items.
+
+        Raises:
+            ValueError: If the executor is not recognised.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        from functools import partial
+
+        executors = {
+            "thread": ThreadPoolExecutor,
+            "process": partial(
+                ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")
+            ),
+        }
+        if executor not in executors:
+            msg = "Executor {} is not recognised. Valid options are {}".format(
+                executor, list(executors.keys())
+            )
+            raise ValueError(msg)
+        items = list(iterable)
+        if self._workers <= 1 or len(items) <= 1:
+            return [function(item) for item in items]
+        max_workers = min(self._workers, len(items))
+        with executors[executor](max_workers=max_workers) as pool:
+            return list(pool.map(function, items))
+
+    def process_slices(self, function, cube, coord, executor="thread"):
+        """Apply a function to each slice of a cube over a coordinate, such as
+        "realization" or "time", and merge the resulting slices back into a
+        single cube. The slices are processed in parallel if more than one
+        worker is configured.
+
+        Args:
+            function (callable):
+                Function that takes a cube slice and returns a cube.
+            cube (iris.cube.Cube):
+                Cube to be sliced.
+            coord (str or iris.coords.Coord):
+                Coordinate over which to slice the cube.
+            executor (str):
+                The type of pool to use, either "thread" or "process".
+
+        Returns:
+            iris.cube.Cube:
+                Cube merged from the processed slices.
+        """
+        from iris.cube import CubeList
+
+        results = self.parallel_map(function, cube.slices_over(coord), executor)
+        return CubeList(results).merge_cube()
+
 
 class PostProcessingPlugin(BasePlugin):
     """An abstract class for IMPROVER post-processing plugins.
@@ -69,12 +147,13 @@ class PostProcessingPlugin(BasePlugin):
             **kwargs:
                 Keyword arguments.
         Returns:
-            iris.cube.Cube:
+            iris.cube.Cube or iris.cube.CubeList:
                 Output of self.process() with updated title attribute
         """
-        cube = super().__call__(*args, **kwargs)
-        self.post_processed_title(cube)
-        return cube
+        result = super().__call__(*args, **kwargs)
+        for cube in result if isinstance(result, list) else [result]:
+            self.post_processed_title(cube)
+        return result
 
     @staticmethod
     def post_processed_title(cube):
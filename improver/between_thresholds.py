@@ -45,7 +45,7 @@ from improver.metadata.probabilistic import (
 class OccurrenceBetweenThresholds(PostProcessingPlugin):
     """Calculate the probability of occurrence between thresholds"""
 
-    def __init__(self, threshold_ranges, threshold_units):
+    def __init__(self, threshold_ranges, threshold_units, lazy=False):
         """
         Initialise the class.  Threshold ranges must be specified in a unit
         that is NOT sensitive to differences at the 1e-5 (float32) precision
@@ -57,6 +57,10 @@ class OccurrenceBetweenThresholds(PostProcessingPlugin):
                 probabilities should be calculated
             threshold_units (str):
                 Units in which the thresholds are specified
+            lazy (bool):
+                If True and the input cube has lazy data, the probabilities
+                are calculated lazily and only computed when the data of the
+                output cube is realised (eg. on saving).
 
         Raises:
             ValueError:
@@ -71,6 +75,7 @@ class OccurrenceBetweenThresholds(PostProcessingPlugin):
             )
         self.threshold_ranges = threshold_ranges
         self.threshold_units = threshold_units
+        self.lazy = lazy
 
     def _slice_cube(self):
         """
@@ -161,7 +166,13 @@ class OccurrenceBetweenThresholds(PostProcessingPlugin):
         cubelist = iris.cube.CubeList([])
         for (lower_cube, upper_cube) in self.cube_slices:
             # construct difference cube
-            between_thresholds_data = (lower_cube.data - upper_cube.data) * multiplier
+            if self.lazy:
+                lower_data = lower_cube.core_data()
+                upper_data = upper_cube.core_data()
+            else:
+                lower_data = lower_cube.data
+                upper_data = upper_cube.data
+            between_thresholds_data = (lower_data - upper_data) * multiplier
             between_thresholds_cube = upper_cube.copy(between_thresholds_data)
 
             # add threshold coordinate bounds
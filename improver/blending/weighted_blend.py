@@ -33,6 +33,7 @@
 
 import warnings
 
+import dask.array as da
 import iris
 import numpy as np
 from iris.analysis import Aggregator
@@ -207,6 +208,74 @@ class MergeCubesForWeightedBlending(BasePlugin):
         return result
 
 
+PERCENTILE_BLEND_BLOCK_SIZE = 4096
+
+
+def _batched_interp(x, xp, fp):
+    """
+    Linearly interpolate as np.interp does, but for many sets of points at
+    once. The interpolation is along the last axis of each array, and the
+    leading dimensions of the arrays are broadcast against each other. The
+    results are identical to those of np.interp called for each set of
+    points in turn.
+
+    The index of the data point below each x is found by counting the data
+    points not greater than x, which requires the data points to be sorted.
+    Any set of data points that is not sorted is passed to np.interp
+    instead.
+
+    Args:
+        x (numpy.ndarray):
+            The x-coordinates at which to evaluate the interpolated values.
+        xp (numpy.ndarray):
+            The x-coordinates of the data points, which should be
+            non-decreasing along the last axis.
+        fp (numpy.ndarray):
+            The y-coordinates of the data points, broadcastable to the shape
+            of xp.
+
+    Returns:
+        numpy.ndarray:
+            The interpolated values, as float64.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    xp = np.asarray(xp, dtype=np.float64)
+    fp = np.broadcast_to(np.asarray(fp, dtype=np.float64), xp.shape)
+    batch_shape = np.broadcast(x[..., :1], xp[..., :1]).shape[:-1]
+    num_x, length = x.shape[-1], xp.shape[-1]
+    x = np.broadcast_to(x, batch_shape + (num_x,)).reshape(-1, num_x)
+    xp = np.broadcast_to(xp, batch_shape + (length,)).reshape(-1, length)
+    fp = np.broadcast_to(fp, batch_shape + (length,)).reshape(-1, length)
+    if length == 1:
+        return np.broadcast_to(fp, x.shape).reshape(batch_shape + (num_x,))
+
+    # the index found by np.interp is that of the last data point not
+    # greater than x
+    index = np.full(x.shape, -1, dtype=np.intp)
+    for i in range(length):
+        index += xp[:, i : i + 1] <= x
+
+    # flat indices of the data points below and above each x
+    lower = np.clip(index, 0, length - 2)
+    lower += length * np.arange(len(xp))[:, np.newaxis]
+    upper = lower + 1
+    xp, fp = xp.reshape(-1), fp.reshape(-1)
+    x0, x1, y0, y1 = xp[lower], xp[upper], fp[lower], fp[upper]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = (y1 - y0) / (x1 - x0) * (x - x0) + y0
+    # use data point values directly at and beyond the data points
+    result = np.where(x == x0, y0, result)
+    result = np.where(index < 0, y0, result)
+    result = np.where(index >= length - 1, y1, result)
+    result = np.where(np.isnan(x), x, result)
+    # np.interp searches unsorted data points differently, so use it for
+    # any of those
+    xp, fp = xp.reshape(-1, length), fp.reshape(-1, length)
+    for row in np.flatnonzero(np.any(np.diff(xp, axis=-1) < 0, axis=-1)):
+        result[row] = np.interp(x[row], xp[row], fp[row])
+    return result.reshape(batch_shape + (num_x,))
+
+
 class PercentileBlendingAggregator:
     """Class for the percentile blending aggregator
 
@@ -284,12 +353,13 @@ class PercentileBlendingAggregator:
         # Create the resulting data array, which is the shape of the original
         # data without dimension we are collapsing over
         result = np.zeros(input_shape[1:], dtype=np.float32)
-        # Loop over the flattened data, i.e. across all the data points in
-        # each slice of the coordinate we are collapsing over, finding the
-        # blended percentile values at each point.
-        for i in range(data.shape[-1]):
-            result[:, i] = PercentileBlendingAggregator.blend_percentiles(
-                data[:, :, i], arr_percent, arr_weights[:, :, i]
+        # Find the blended percentile values for blocks of the flattened
+        # data points at a time, which bounds the size of the intermediate
+        # arrays used to blend all the points in a block at once.
+        for start in range(0, data.shape[-1], PERCENTILE_BLEND_BLOCK_SIZE):
+            block = slice(start, start + PERCENTILE_BLEND_BLOCK_SIZE)
+            result[:, block] = PercentileBlendingAggregator.blend_percentiles(
+                data[:, :, block], arr_percent, arr_weights[:, :, block]
             )
         # Reshape the data and put the percentile dimension
         # back in the right place
@@ -314,60 +384,94 @@ class PercentileBlendingAggregator:
     @staticmethod
     def blend_percentiles(perc_values, percentiles, weights):
         """ Blend percentiles function, to calculate the weighted blend across
-            a given axis of percentile data for a single grid point.
+            a given axis of percentile data for a single grid point, or for
+            many grid points at once.
 
         Args:
             perc_values (numpy.ndarray):
                 Array containing the percentile values to blend, with
-                shape: (length of coord to blend, num of percentiles)
+                shape: (length of coord to blend, num of percentiles), with
+                optional further dimensions for many grid points.
             percentiles (numpy.ndarray):
                 Array of percentile values e.g [0, 20.0, 50.0, 70.0, 100.0],
                 same size as the percentile dimension of data.
             weights (numpy.ndarray):
                 Array of weights, same size as the axis dimension of data,
-                that we will blend over.
+                that we will blend over, or of the same shape as
+                perc_values.
 
         Returns:
             numpy.ndarray:
                 Array containing the weighted percentile blend data
-                across the chosen coord
+                across the chosen coord, with shape: (num of percentiles)
+                followed by any grid point dimensions of perc_values.
         """
-        # Find the size of the dimension we want to blend over.
-        num = perc_values.shape[0]
+        perc_values = np.ma.getdata(perc_values)
+        num, num_percentiles = perc_values.shape[:2]
+        points_shape = perc_values.shape[2:]
+        weights = np.asarray(weights)
+        weights = weights.reshape(
+            weights.shape + (1,) * (perc_values.ndim - weights.ndim)
+        )
+        weights = np.broadcast_to(weights, perc_values.shape)
+        # Put the grid points first, with shape:
+        # (num of points, length of coord to blend, num of percentiles)
+        perc_values = np.moveaxis(perc_values.reshape(num, num_percentiles, -1), -1, 0)
+        weights = np.moveaxis(weights.reshape(num, num_percentiles, -1), -1, 0)
+
         # Create an array to store the weighted blending pdf
-        combined_pdf = np.zeros((num, len(percentiles)), dtype=np.float32)
+        combined_pdf = np.zeros(perc_values.shape, dtype=np.float32)
         # Loop over the axis we are blending over finding the values for the
-        # probability at each threshold in the pdf, for each of the other
-        # points in the axis we are blending over. Use the values from the
-        # percentiles if we are at the same point, otherwise use linear
+        # probability at each threshold in the pdf of that point, for all
+        # the points in the axis we are blending over. Use the values from
+        # the percentiles if we are at the same point, otherwise use linear
         # interpolation.
         # Then add the probabilities multiplied by the correct weight to the
         # running total.
-        for i in range(0, num):
-            for j in range(0, num):
-                if i == j:
-                    recalc_values_in_pdf = percentiles
-                else:
-                    recalc_values_in_pdf = np.interp(
-                        perc_values[i], perc_values[j], percentiles
-                    )
-                # Add the resulting probabilities multiplied by the right
-                # weight to the running total for the combined pdf.
-                combined_pdf[i] += recalc_values_in_pdf * weights[j]
+        for j in range(0, num):
+            recalc_values_in_pdf = _batched_interp(
+                perc_values, perc_values[:, j : j + 1], percentiles
+            )
+            weighted_values = recalc_values_in_pdf * weights[:, j : j + 1]
+            others = np.arange(num) != j
+            combined_pdf[:, others] += weighted_values[:, others]
+            combined_pdf[:, j] += percentiles * weights[:, j]
 
         # Combine and sort the threshold values for all the points
         # we are blending.
-        combined_perc_thres_data = np.sort(perc_values.flatten())
+        combined_perc_thres_data = np.sort(perc_values.reshape(len(perc_values), -1))
 
         # Combine and sort blended probability values.
-        combined_perc_values = np.sort(combined_pdf.flatten())
+        combined_perc_values = np.sort(combined_pdf.reshape(len(combined_pdf), -1))
 
         # Find the percentile values from this combined data by interpolating
         # back from probability values to the original percentiles.
-        new_combined_perc = np.interp(
+        new_combined_perc = _batched_interp(
             percentiles, combined_perc_values, combined_perc_thres_data
         ).astype(np.float32)
-        return new_combined_perc
+        return new_combined_perc.T.reshape((num_percentiles,) + points_shape)
+
+
+def _broadcast_along(array, dim, shape):
+    """Broadcast an array along one dimension only, without copying it.
+
+    Args:
+        array (numpy.ndarray):
+            Array with as many dimensions as the shape, each of which has
+            the length in the shape or length one.
+        dim (int):
+            The dimension along which the array is broadcast.
+        shape (tuple of int):
+            The full shape against which the array broadcasts.
+
+    Returns:
+        numpy.ndarray:
+            A read-only view of the array with the full length along the
+            dimension, so that it can be iterated over.
+    """
+    broadcast_shape = list(array.shape)
+    broadcast_shape[dim] = shape[dim]
+    return np.broadcast_to(array, broadcast_shape)
 
 
 class WeightedBlendAcrossWholeDimension(PostProcessingPlugin):
@@ -472,15 +576,14 @@ class WeightedBlendAcrossWholeDimension(PostProcessingPlugin):
             raise ValueError(msg)
 
     @staticmethod
-    def shape_weights(cube, weights):
+    def _broadcastable_weights(cube, weights):
         """
-        The function shapes weights to match the diagnostic cube. A 1D cube of
-        weights that vary across the blending coordinate will be broadcast to
-        match the complete multidimensional cube shape. A multidimensional cube
-        of weights will be checked to ensure that the coordinate names match
-        between the two cubes. If they match the order will be enforced and
-        then the shape will be checked. If the shapes match the weights will be
-        returned as an array.
+        Shape weights so that they broadcast against the diagnostic cube,
+        without expanding them to its full shape. A multidimensional cube of
+        weights will be checked to ensure that the coordinate names match
+        between the two cubes, and the order will be enforced. Otherwise the
+        dimensions of the weights are ordered as in the cube, with length
+        one dimensions inserted for those that the weights do not vary over.
 
         Args:
             cube (iris.cube.Cube):
@@ -489,7 +592,8 @@ class WeightedBlendAcrossWholeDimension(PostProcessingPlugin):
                 Cube of blending weights.
         Returns:
             numpy.ndarray:
-                An array of weights that matches the cube data shape.
+                An array of weights with the dimensions of the cube, each of
+                which has the length of the cube dimension or length one.
         Raises:
             ValueError: If weights cube coordinates do not match the diagnostic
                         cube in the case of a multidimensional weights cube.
@@ -502,7 +606,7 @@ class WeightedBlendAcrossWholeDimension(PostProcessingPlugin):
         cube_dims = get_dim_coord_names(cube)
         if set(weight_dims) == set(cube_dims):
             enforce_coordinate_ordering(weights, cube_dims)
-            weights_array = weights.data.astype(np.float32)
+            weights_array = weights.data.astype(np.float32, copy=False)
         else:
             # Map array of weights to shape of cube to collapse.
             dim_map = []
@@ -518,21 +622,56 @@ class WeightedBlendAcrossWholeDimension(PostProcessingPlugin):
                         "found on the cube we are trying to collapse."
                     )
                     raise ValueError(message.format(dim_coord))
-            try:
-                weights_array = iris.util.broadcast_to_shape(
-                    np.array(weights.data, dtype=np.float32), cube.shape, tuple(dim_map)
-                )
-            except ValueError:
-                msg = (
-                    "Weights cube is not a compatible shape with the"
-                    " data cube. Weights: {}, Diagnostic: {}".format(
-                        weights.shape, cube.shape
-                    )
+            weights_array = np.array(weights.data, dtype=np.float32)
+            weights_array = weights_array.transpose(np.argsort(dim_map))
+            shape = [1] * cube.ndim
+            for dim, length in zip(sorted(dim_map), weights_array.shape):
+                shape[dim] = length
+            weights_array = weights_array.reshape(shape)
+
+        try:
+            np.broadcast_to(weights_array, cube.shape)
+        except ValueError:
+            msg = (
+                "Weights cube is not a compatible shape with the"
+                " data cube. Weights: {}, Diagnostic: {}".format(
+                    weights.shape, cube.shape
                 )
-                raise ValueError(msg)
+            )
+            raise ValueError(msg)
 
         return weights_array
 
+    @staticmethod
+    def shape_weights(cube, weights):
+        """
+        The function shapes weights to match the diagnostic cube. A 1D cube of
+        weights that vary across the blending coordinate will be broadcast to
+        match the complete multidimensional cube shape. A multidimensional cube
+        of weights will be checked to ensure that the coordinate names match
+        between the two cubes. If they match the order will be enforced and
+        then the shape will be checked. If the shapes match the weights will be
+        returned as an array.
+
+        Args:
+            cube (iris.cube.Cube):
+                The data cube on which a coordinate is being blended.
+            weights (iris.cube.Cube):
+                Cube of blending weights.
+        Returns:
+            numpy.ndarray:
+                An array of weights that matches the cube data shape.
+        Raises:
+            ValueError: If weights cube coordinates do not match the diagnostic
+                        cube in the case of a multidimensional weights cube.
+            ValueError: If weights cube shape is not broadcastable to the data
+                        cube shape.
+        """
+        weights_array = WeightedBlendAcrossWholeDimension._broadcastable_weights(
+            cube, weights
+        )
+        return np.broadcast_to(weights_array, cube.shape)
+
     @staticmethod
     def check_weights(weights, blend_dim):
         """
@@ -702,6 +841,64 @@ class WeightedBlendAcrossWholeDimension(PostProcessingPlugin):
                 coord.points = coord.points.astype(np.float32)
         return cube_new
 
+    def _accumulate_weighted_mean(self, cube, weights_array):
+        """
+        Calculate the weighted mean over self.blend_coord, accumulating the
+        weighted sum of the data and the sum of the weights one slice over
+        the blend coordinate at a time. The memory needed beyond that of the
+        inputs is therefore about two slices, regardless of the number of
+        slices being blended. Lazy data is realised one slice at a time.
+        Masked data is given no weight, and points with no weight are
+        masked.
+
+        Args:
+            cube (iris.cube.Cube):
+                The cube which is being blended over self.blend_coord.
+            weights_array (numpy.ndarray):
+                Array of weights that broadcasts against the cube data
+                shape. It is broadcast to the shape of each slice as that
+                slice is blended.
+
+        Returns:
+            iris.cube.Cube:
+                The cube with values blended over self.blend_coord.
+        """
+        (blend_dim,) = cube.coord_dims(self.blend_coord)
+
+        # accumulate in the precision that a weighted mean would use
+        if np.issubdtype(cube.dtype, np.integer):
+            result_dtype = np.result_type(cube.dtype, weights_array.dtype, "f8")
+        else:
+            result_dtype = np.result_type(cube.dtype, weights_array.dtype)
+
+        # collapse a cube with lazy placeholder data to get the coordinates
+        # of the blended cube, without realising any data
+        placeholder = da.zeros(cube.shape, dtype=result_dtype, chunks=cube.shape)
+        result = collapsed(
+            cube.copy(data=placeholder), self.blend_coord, iris.analysis.MEAN
+        )
+
+        weighted_sum = np.zeros(result.shape, dtype=result_dtype)
+        sum_of_weights = np.zeros(result.shape, dtype=result_dtype)
+        weighted_slice = np.empty(result.shape, dtype=result_dtype)
+        data_slices = np.moveaxis(cube.core_data(), blend_dim, 0)
+        weights_slices = np.moveaxis(
+            _broadcast_along(weights_array, blend_dim, cube.shape), blend_dim, 0
+        )
+        for data_slice, weights_slice in zip(data_slices, weights_slices):
+            if isinstance(data_slice, da.Array):
+                data_slice = data_slice.compute()
+            weights_slice = np.broadcast_to(weights_slice, result.shape)
+            if np.ma.is_masked(data_slice):
+                weights_slice = np.where(data_slice.mask, 0, weights_slice)
+                data_slice = data_slice.filled(0)
+            np.multiply(data_slice, weights_slice, out=weighted_slice)
+            weighted_sum += weighted_slice
+            sum_of_weights += weights_slice
+
+        result.data = np.ma.divide(weighted_sum, sum_of_weights)
+        return result
+
     def weighted_mean(self, cube, weights):
         """
         Blend data using a weighted mean using the weights provided.
@@ -717,9 +914,17 @@ class WeightedBlendAcrossWholeDimension(PostProcessingPlugin):
                 The cube with values blended over self.blend_coord, with
                 suitable weightings applied.
         """
-        weights_array = self.non_percentile_weights(cube, weights)
-
         (collapse_dim,) = cube.coord_dims(self.blend_coord)
+        # The weights are not broadcast to the shape of the cube, so that
+        # only one slice of them at a time is expanded as it is blended.
+        if weights:
+            weights_array = self._broadcastable_weights(cube, weights)
+        else:
+            (number_of_fields,) = cube.coord(self.blend_coord).shape
+            weights_array = np.full(
+                (1,) * cube.ndim, 1.0 / number_of_fields, dtype=np.float32
+            )
+
         if collapse_dim == 0:
             slice_dim = 1
         else:
@@ -733,13 +938,15 @@ class WeightedBlendAcrossWholeDimension(PostProcessingPlugin):
             cube_slices = [cube]
 
         weights_slices = (
-            np.moveaxis(weights_array, slice_dim, 0)
+            np.moveaxis(
+                _broadcast_along(weights_array, slice_dim, cube.shape), slice_dim, 0
+            )
             if allow_slicing
             else [weights_array]
         )
 
         result_slices = iris.cube.CubeList(
-            collapsed(c_slice, self.blend_coord, iris.analysis.MEAN, weights=w_slice)
+            self._accumulate_weighted_mean(c_slice, w_slice)
             for c_slice, w_slice in zip(cube_slices, weights_slices)
         )
 
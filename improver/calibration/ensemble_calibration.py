@@ -38,12 +38,14 @@ Statistics (EMOS).
 
 """
 import warnings
+from functools import partial
 
 import iris
 import numpy as np
 from iris.exceptions import CoordinateNotFoundError
 from scipy import stats
 from scipy.optimize import minimize
+from scipy.special import ndtr
 from scipy.stats import norm
 
 from improver import BasePlugin, PostProcessingPlugin
@@ -55,6 +57,7 @@ from improver.calibration.utilities import (
     filter_non_matching_cubes,
     flatten_ignoring_masked_data,
     forecast_coords_match,
+    get_spatial_dims,
     merge_land_and_sea,
 )
 from improver.ensemble_copula_coupling.ensemble_copula_coupling import (
@@ -84,10 +87,13 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
     The number of coefficients that will be optimised depend upon the initial
     guess.
 
-    Minimisation is performed using the Nelder-Mead algorithm for 200
-    iterations to limit the computational expense.
+    Minimisation is performed using the Nelder-Mead algorithm by default.
     Note that the BFGS algorithm was initially trialled but had a bug
     in comparison to comparative results generated in R.
+    Alternatively, the L-BFGS-B algorithm can be requested, in which case
+    the closed-form gradient of the CRPS with respect to the coefficients
+    is supplied to the minimisation. This typically requires far fewer
+    evaluations of the CRPS over the training data.
 
     """
 
@@ -99,7 +105,17 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
     # as part of the minimisation.
     BAD_VALUE = np.float64(999999)
 
-    def __init__(self, tolerance=0.01, max_iterations=1000):
+    # Methods supported for the minimisation. Methods other than Nelder-Mead
+    # use the analytic gradient of the CRPS.
+    MINIMISATION_METHODS = ["Nelder-Mead", "L-BFGS-B"]
+
+    def __init__(
+        self,
+        tolerance=0.01,
+        max_iterations=1000,
+        minimisation_method="Nelder-Mead",
+        point_by_point=False,
+    ):
         """
         Initialise class for performing minimisation of the Continuous
         Ranked Probability Score (CRPS).
@@ -122,8 +138,29 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
                 predictor_of_mean is "realizations", then the number of
                 iterations may require increasing, as there will be
                 more coefficients to solve for.
+            minimisation_method (str):
+                The scipy.optimize.minimize method used for the minimisation,
+                either "Nelder-Mead" or "L-BFGS-B". If "L-BFGS-B" is
+                requested, the analytic gradient of the CRPS is used and the
+                minimisation terminates once the gradient is within the
+                tolerance.
+            point_by_point (bool):
+                If True, the coefficients are estimated independently for
+                each spatial point (each grid point or site), rather than one
+                set of coefficients being estimated using all points. The
+                minimisations for separate points are distributed over the
+                number of workers configured for the plugin.
+
+        Raises:
+            ValueError: If the minimisation method is not supported.
 
         """
+        if minimisation_method not in self.MINIMISATION_METHODS:
+            msg = (
+                "Minimisation method {} is not supported. Supported methods "
+                "are {}".format(minimisation_method, self.MINIMISATION_METHODS)
+            )
+            raise ValueError(msg)
         # Dictionary containing the functions that will be minimised,
         # depending upon the distribution requested. The names of these
         # distributions match the names of distributions in scipy.stats.
@@ -131,20 +168,35 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
             "norm": self.calculate_normal_crps,
             "truncnorm": self.calculate_truncated_normal_crps,
         }
+        # Dictionary containing the functions returning both the CRPS and
+        # its gradient, for use with gradient-based minimisation methods.
+        self.gradient_dict = {
+            "norm": self.calculate_normal_crps_and_gradient,
+            "truncnorm": self.calculate_truncated_normal_crps_and_gradient,
+        }
         self.tolerance = tolerance
-        # Maximum iterations for minimisation using Nelder-Mead.
+        # Maximum iterations for minimisation.
         self.max_iterations = max_iterations
+        self.minimisation_method = minimisation_method
+        self.point_by_point = point_by_point
 
     def __repr__(self):
         """Represent the configured plugin instance as a string."""
         result = (
             "<ContinuousRankedProbabilityScoreMinimisers: "
-            "minimisation_dict: {}; tolerance: {}; max_iterations: {}>"
+            "minimisation_dict: {}; tolerance: {}; max_iterations: {}; "
+            "minimisation_method: {}; point_by_point: {}>"
         )
         print_dict = {}
         for key in self.minimisation_dict:
             print_dict.update({key: self.minimisation_dict[key].__name__})
-        return result.format(print_dict, self.tolerance, self.max_iterations)
+        return result.format(
+            print_dict,
+            self.tolerance,
+            self.max_iterations,
+            self.minimisation_method,
+            self.point_by_point,
+        )
 
     def process(
         self,
@@ -163,9 +215,12 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
 <improver.calibration.ensemble_calibration>`.
 
         Args:
-            initial_guess (list):
+            initial_guess (list or numpy.ndarray):
                 List of optimised coefficients.
                 Order of coefficients is [alpha, beta, gamma, delta].
+                If point_by_point is True, the coefficients may be followed
+                by the spatial dimensions of the truth cube, to provide a
+                separate initial guess at each point.
             forecast_predictor (iris.cube.Cube):
                 Cube containing the fields to be used as the predictor,
                 either the ensemble mean or the ensemble realizations.
@@ -183,9 +238,11 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
                 minimisation within self.minimisation_dict.
 
         Returns:
-            list of float:
-                List of optimised coefficients.
+            numpy.ndarray:
+                Array of optimised coefficients.
                 Order of coefficients is [alpha, beta, gamma, delta].
+                If point_by_point is True, the trailing dimensions of the
+                array are the spatial dimensions of the truth cube.
 
         Raises:
             KeyError: If the distribution is not supported.
@@ -194,6 +251,95 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
             Warning: If the minimisation did not converge.
 
         """
+        try:
+            self.minimisation_dict[distribution]
+        except KeyError as err:
+            msg = (
+                "Distribution requested {} is not supported in {}"
+                "Error message is {}".format(distribution, self.minimisation_dict, err)
+            )
+            raise KeyError(msg)
+
+        # Ensure predictor is valid.
+        check_predictor(predictor)
+
+        if predictor.lower() == "realizations":
+            enforce_coordinate_ordering(forecast_predictor, "realization")
+
+        if self.point_by_point:
+            return self._minimise_each_point(
+                initial_guess,
+                forecast_predictor,
+                truth,
+                forecast_var,
+                predictor,
+                distribution,
+            )
+
+        # Flatten the data arrays and remove any missing data.
+        truth_data = flatten_ignoring_masked_data(truth.data)
+        forecast_var_data = flatten_ignoring_masked_data(forecast_var.data)
+        if predictor.lower() == "mean":
+            forecast_predictor_data = flatten_ignoring_masked_data(
+                forecast_predictor.data
+            )
+        elif predictor.lower() == "realizations":
+            # Need to transpose this array so there are columns for each
+            # ensemble member rather than rows.
+            forecast_predictor_data = flatten_ignoring_masked_data(
+                forecast_predictor.data, preserve_leading_dimension=True
+            ).T
+
+        return self._minimise(
+            initial_guess,
+            forecast_predictor_data,
+            truth_data,
+            forecast_var_data,
+            predictor,
+            distribution,
+        )
+
+    def _minimise(
+        self,
+        initial_guess,
+        forecast_predictor_data,
+        truth_data,
+        forecast_var_data,
+        predictor,
+        distribution,
+    ):
+        """
+        Minimise the CRPS for the flattened training data, which contain no
+        missing data.
+
+        Args:
+            initial_guess (list):
+                List of optimised coefficients.
+                Order of coefficients is [alpha, beta, gamma, delta].
+            forecast_predictor_data (numpy.ndarray):
+                Data to be used as the predictor, either the ensemble mean or
+                the ensemble realizations, with a column for each realization.
+            truth_data (numpy.ndarray):
+                Data to be used as truth.
+            forecast_var_data (numpy.ndarray):
+                Ensemble variance data.
+            predictor (str):
+                String to specify the form of the predictor, either "mean" or
+                "realizations".
+            distribution (str):
+                String used to access the appropriate function for use in the
+                minimisation within self.minimisation_dict.
+
+        Returns:
+            numpy.ndarray:
+                Array of optimised coefficients.
+                Order of coefficients is [alpha, beta, gamma, delta].
+
+        Warns:
+            Warning: If the minimisation did not converge.
+            Warning: If the L-BFGS-B minimisation could not start, because
+                the CRPS could not be calculated for the initial guess.
+        """
 
         def calculate_percentage_change_in_last_iteration(allvecs):
             """
@@ -233,32 +379,7 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
                 )
                 warnings.warn(msg)
 
-        try:
-            minimisation_function = self.minimisation_dict[distribution]
-        except KeyError as err:
-            msg = (
-                "Distribution requested {} is not supported in {}"
-                "Error message is {}".format(distribution, self.minimisation_dict, err)
-            )
-            raise KeyError(msg)
-
-        # Ensure predictor is valid.
-        check_predictor(predictor)
-
-        # Flatten the data arrays and remove any missing data.
-        truth_data = flatten_ignoring_masked_data(truth.data)
-        forecast_var_data = flatten_ignoring_masked_data(forecast_var.data)
-        if predictor.lower() == "mean":
-            forecast_predictor_data = flatten_ignoring_masked_data(
-                forecast_predictor.data
-            )
-        elif predictor.lower() == "realizations":
-            enforce_coordinate_ordering(forecast_predictor, "realization")
-            # Need to transpose this array so there are columns for each
-            # ensemble member rather than rows.
-            forecast_predictor_data = flatten_ignoring_masked_data(
-                forecast_predictor.data, preserve_leading_dimension=True
-            ).T
+        minimisation_function = self.minimisation_dict[distribution]
 
         # Increased precision is needed for stable coefficient calculation.
         # The resulting coefficients are cast to float32 prior to output.
@@ -267,20 +388,55 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
         forecast_var_data = forecast_var_data.astype(np.float64)
         truth_data = truth_data.astype(np.float64)
         sqrt_pi = np.sqrt(np.pi).astype(np.float64)
-        optimised_coeffs = minimize(
-            minimisation_function,
-            initial_guess,
-            args=(
-                forecast_predictor_data,
-                truth_data,
-                forecast_var_data,
-                sqrt_pi,
-                predictor,
-            ),
-            method="Nelder-Mead",
-            tol=self.tolerance,
-            options={"maxiter": self.max_iterations, "return_all": True},
+        args = (
+            forecast_predictor_data,
+            truth_data,
+            forecast_var_data,
+            sqrt_pi,
+            predictor,
         )
+        if self.minimisation_method == "Nelder-Mead":
+            optimised_coeffs = minimize(
+                minimisation_function,
+                initial_guess,
+                args=args,
+                method="Nelder-Mead",
+                tol=self.tolerance,
+                options={"maxiter": self.max_iterations, "return_all": True},
+            )
+            allvecs = optimised_coeffs.allvecs
+        else:
+            # The gamma and delta coefficients are squared within the CRPS,
+            # so a value of zero is a stationary point that a gradient-based
+            # method cannot move away from. Zero values are replaced by the
+            # tolerance to avoid this.
+            initial_guess = np.array(initial_guess, dtype=np.float64)
+            initial_guess[-2:] = np.where(
+                initial_guess[-2:] == 0, self.tolerance, initial_guess[-2:]
+            )
+            # Gradient-based methods do not support return_all, so the
+            # coefficients after each iteration are recorded by a callback.
+            allvecs = [initial_guess]
+            optimised_coeffs = minimize(
+                self.gradient_dict[distribution],
+                initial_guess,
+                args=args,
+                method=self.minimisation_method,
+                jac=True,
+                options={"maxiter": self.max_iterations, "gtol": self.tolerance},
+                callback=lambda coeffs: allvecs.append(coeffs.copy()),
+            )
+            # The gradient is zero where the CRPS is set to BAD_VALUE, so a
+            # minimisation starting from such coefficients stops at once and
+            # reports success.
+            if optimised_coeffs.fun == self.BAD_VALUE:
+                msg = (
+                    "The CRPS could not be calculated for the initial guess "
+                    "{}, so the L-BFGS-B minimisation could not start. The "
+                    "initial guess is returned.".format(initial_guess)
+                )
+                warnings.warn(msg)
+                return optimised_coeffs.x.astype(np.float32)
 
         if not optimised_coeffs.success:
             msg = (
@@ -290,9 +446,200 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
                 )
             )
             warnings.warn(msg)
-        calculate_percentage_change_in_last_iteration(optimised_coeffs.allvecs)
+        if len(allvecs) > 1:
+            calculate_percentage_change_in_last_iteration(allvecs)
         return optimised_coeffs.x.astype(np.float32)
 
+    @staticmethod
+    def _move_spatial_dimensions_last(cube):
+        """Return the data of a cube with the spatial dimensions flattened
+        into a single trailing dimension of points.
+
+        Args:
+            cube (iris.cube.Cube):
+                Cube with spatial (x and y) coordinates. For spot data, these
+                share a single site dimension.
+
+        Returns:
+            (tuple): tuple containing:
+                **data** (numpy.ndarray):
+                    Data with a trailing dimension of points.
+                **spatial_shape** (tuple):
+                    Shape of the spatial dimensions of the cube.
+        """
+        spatial_dims = get_spatial_dims(cube)
+        n_spatial = len(spatial_dims)
+        data = np.moveaxis(cube.data, spatial_dims, range(-n_spatial, 0))
+        spatial_shape = data.shape[-n_spatial:]
+        return data.reshape(data.shape[:-n_spatial] + (-1,)), spatial_shape
+
+    def _minimise_at_point(self, predictor, distribution, point_data):
+        """
+        Minimise the CRPS using the training data at a single point.
+
+        Args:
+            predictor (str):
+                String to specify the form of the predictor, either "mean" or
+                "realizations".
+            distribution (str):
+                String used to access the appropriate function for use in the
+                minimisation within self.minimisation_dict.
+            point_data (tuple):
+                The initial guess, forecast predictor, truth and forecast
+                variance at the point. The order of the coefficients in the
+                initial guess is [alpha, beta, gamma, delta]. If the
+                realizations are the predictor, the forecast predictor has a
+                leading realization dimension.
+
+        Returns:
+            (tuple): tuple containing:
+                **coefficients** (numpy.ndarray):
+                    Optimised coefficients at the point. These are NaN if
+                    there is no valid training data at the point.
+                **warned** (bool):
+                    True if the minimisation at the point did not converge
+                    satisfactorily.
+        """
+        initial_guess, forecast_predictor, truth, forecast_var = point_data
+        truth_data = flatten_ignoring_masked_data(truth)
+        if truth_data.size == 0:
+            return np.full(len(initial_guess), np.nan, dtype=np.float32), False
+        forecast_var_data = flatten_ignoring_masked_data(forecast_var)
+        if predictor.lower() == "mean":
+            forecast_predictor_data = flatten_ignoring_masked_data(forecast_predictor)
+        else:
+            forecast_predictor_data = flatten_ignoring_masked_data(
+                forecast_predictor, preserve_leading_dimension=True
+            ).T
+        with warnings.catch_warnings(record=True) as warning_list:
+            warnings.simplefilter("always")
+            coefficients = self._minimise(
+                initial_guess,
+                forecast_predictor_data,
+                truth_data,
+                forecast_var_data,
+                predictor,
+                distribution,
+            )
+        warned = any(issubclass(item.category, UserWarning) for item in warning_list)
+        return coefficients, warned
+
+    def _minimise_block(self, predictor, distribution, block_data):
+        """
+        Minimise the CRPS independently at each point of a block of points.
+
+        Args:
+            predictor (str):
+                String to specify the form of the predictor, either "mean" or
+                "realizations".
+            distribution (str):
+                String used to access the appropriate function for use in the
+                minimisation within self.minimisation_dict.
+            block_data (tuple):
+                The initial guess, forecast predictor, truth and forecast
+                variance for the block, each with a trailing dimension of
+                points.
+
+        Returns:
+            list of tuple:
+                The coefficients at each point, and whether the minimisation
+                at the point did not converge satisfactorily, as returned by
+                _minimise_at_point.
+        """
+        return [
+            self._minimise_at_point(
+                predictor, distribution, tuple(data[..., index] for data in block_data)
+            )
+            for index in range(block_data[0].shape[-1])
+        ]
+
+    def _minimise_each_point(
+        self,
+        initial_guess,
+        forecast_predictor,
+        truth,
+        forecast_var,
+        predictor,
+        distribution,
+    ):
+        """
+        Minimise the CRPS independently at each spatial point. The points
+        are split into blocks, which are distributed over the workers
+        configured for the plugin. Rather than warning for each point, a single warning is
+        raised reporting the number of points at which the minimisation did
+        not converge satisfactorily.
+
+        Args:
+            initial_guess (numpy.ndarray):
+                Array of coefficients used as the initial guess. Order of
+                coefficients is [alpha, beta, gamma, delta]. If the array is
+                one dimensional, the same initial guess is used at every
+                point. Otherwise, the coefficients are followed by the spatial
+                dimensions of the truth cube, to provide a separate initial
+                guess at each point.
+            forecast_predictor (iris.cube.Cube):
+                Cube containing the fields to be used as the predictor,
+                either the ensemble mean or the ensemble realizations. If the
+                realizations are the predictor, realization must be the
+                leading dimension.
+            truth (iris.cube.Cube):
+                Cube containing the field, which will be used as truth.
+            forecast_var (iris.cube.Cube):
+                Cube containing the field containing the ensemble variance.
+            predictor (str):
+                String to specify the form of the predictor, either "mean" or
+                "realizations".
+            distribution (str):
+                String used to access the appropriate function for use in the
+                minimisation within self.minimisation_dict.
+
+        Returns:
+            numpy.ndarray:
+                Array of optimised coefficients, with a leading dimension
+                for the coefficients, in the order [alpha, beta, gamma,
+                delta], followed by the spatial dimensions of the truth cube.
+
+        Warns:
+            Warning: If the minimisation did not converge at any point.
+        """
+        forecast_predictor_data, _ = self._move_spatial_dimensions_last(
+            forecast_predictor
+        )
+        truth_data, spatial_shape = self._move_spatial_dimensions_last(truth)
+        forecast_var_data, _ = self._move_spatial_dimensions_last(forecast_var)
+        initial_guess = np.asarray(initial_guess)
+        n_coeffs = len(initial_guess)
+        initial_guess_data = np.broadcast_to(
+            initial_guess.reshape(n_coeffs, -1), (n_coeffs, truth_data.shape[-1])
+        )
+        # Send the points to the workers in a few blocks per worker, as the
+        # cost of sending each point to a process as a separate task would
+        # be comparable to the cost of the minimisation.
+        n_points = truth_data.shape[-1]
+        block_size = max(1, -(-n_points // (4 * max(self._workers, 1))))
+        block_data = (
+            (
+                initial_guess_data[:, start : start + block_size],
+                forecast_predictor_data[..., start : start + block_size],
+                truth_data[..., start : start + block_size],
+                forecast_var_data[..., start : start + block_size],
+            )
+            for start in range(0, n_points, block_size)
+        )
+        results = self.parallel_map(
+            partial(self._minimise_block, predictor, distribution),
+            block_data,
+            executor="process",
+        )
+        coefficients, warned = zip(*(result for block in results for result in block))
+        if any(warned):
+            msg = (
+                "The minimisation did not result in a satisfactory "
+                "convergence at {} of {} points.".format(sum(warned), len(warned))
+            )
+            warnings.warn(msg)
+        return np.stack(coefficients, axis=-1).reshape((n_coeffs,) + spatial_shape)
+
     def calculate_normal_crps(
         self, initial_guess, forecast_predictor, truth, forecast_var, sqrt_pi, predictor
     ):
@@ -431,6 +778,242 @@ class ContinuousRankedProbabilityScoreMinimisers(BasePlugin):
             result = self.BAD_VALUE
         return result
 
+    @staticmethod
+    def _mean_crps_and_gradient(
+        initial_guess,
+        all_data,
+        forecast_var,
+        sigma,
+        crps,
+        crps_mu_derivative,
+        crps_sigma_derivative,
+        predictor,
+    ):
+        """
+        Calculate the mean CRPS across all points, and its gradient with
+        respect to the coefficients, from the CRPS at each point and the
+        derivatives of the CRPS at each point with respect to the location
+        (mu) and scale (sigma) parameters. Points with a non-finite CRPS are
+        ignored, consistent with the use of np.nanmean for the CRPS.
+
+        Args:
+            initial_guess (numpy.ndarray):
+                Coefficients in the order [alpha, beta, gamma, delta].
+            all_data (numpy.ndarray):
+                Predictor data with a leading column of ones, so that the
+                location parameter is the dot product of this array with
+                [alpha, beta].
+            forecast_var (numpy.ndarray):
+                Ensemble variance data.
+            sigma (numpy.ndarray):
+                Scale parameter at each point.
+            crps (numpy.ndarray):
+                CRPS at each point.
+            crps_mu_derivative (numpy.ndarray):
+                Derivative of the CRPS at each point with respect to mu.
+            crps_sigma_derivative (numpy.ndarray):
+                Derivative of the CRPS at each point with respect to sigma.
+            predictor (str):
+                String to specify the form of the predictor, either "mean"
+                or "realizations".
+
+        Returns:
+            (tuple): tuple containing:
+                **mean_crps** (float):
+                    CRPS for the current set of coefficients. This CRPS is a
+                    mean value across all points.
+                **gradient** (numpy.ndarray):
+                    Gradient of the mean CRPS with respect to the
+                    coefficients.
+        """
+        valid = np.isfinite(crps)
+        n_valid = np.count_nonzero(valid)
+        crps_mu_derivative = np.where(valid, crps_mu_derivative, 0) / n_valid
+        crps_sigma_derivative = np.where(valid, crps_sigma_derivative, 0) / n_valid
+
+        # sigma = sqrt(gamma**2 + delta**2 * forecast_var)
+        gamma, delta = initial_guess[-2:]
+        sigma_gradient = crps_sigma_derivative / sigma
+        gradient = np.empty_like(initial_guess, dtype=np.float64)
+        gradient[:-2] = np.dot(crps_mu_derivative, all_data)
+        gradient[-2] = gamma * np.sum(sigma_gradient)
+        gradient[-1] = delta * np.dot(sigma_gradient, forecast_var)
+        if predictor.lower() == "realizations":
+            # The beta coefficients are squared to ensure they are positive.
+            gradient[1:-2] *= 2 * initial_guess[1:-2]
+        return np.mean(crps[valid]), gradient
+
+    def calculate_normal_crps_and_gradient(
+        self, initial_guess, forecast_predictor, truth, forecast_var, sqrt_pi, predictor
+    ):
+        """
+        Calculate the CRPS for a normal distribution and its analytic
+        gradient with respect to the coefficients. The CRPS matches that
+        from calculate_normal_crps. The derivatives of the CRPS at each point
+        with respect to the location and scale parameters are 1 - 2 * Phi(z)
+        and 2 * phi(z) - 1 / sqrt(pi) respectively, where z is the
+        standardised truth.
+
+        Args:
+            initial_guess (list):
+                List of optimised coefficients.
+                Order of coefficients is [alpha, beta, gamma, delta].
+            forecast_predictor (numpy.ndarray):
+                Data to be used as the predictor,
+                either the ensemble mean or the ensemble realizations.
+            truth (numpy.ndarray):
+                Data to be used as truth.
+            forecast_var (numpy.ndarray):
+                Ensemble variance data.
+            sqrt_pi (numpy.ndarray):
+                Square root of Pi
+            predictor (str):
+                String to specify the form of the predictor used to calculate
+                the location parameter when estimating the EMOS coefficients.
+                Currently the ensemble mean ("mean") and the ensemble
+                realizations ("realizations") are supported as the predictors.
+
+        Returns:
+            (tuple): tuple containing:
+                **crps** (float):
+                    CRPS for the current set of coefficients. This CRPS is a
+                    mean value across all points.
+                **gradient** (numpy.ndarray):
+                    Gradient of the CRPS with respect to the coefficients.
+                    If the CRPS is set to BAD_VALUE, the gradient is zero.
+
+        """
+        if predictor.lower() == "mean":
+            a, b, gamma, delta = initial_guess
+            a_b = np.array([a, b], dtype=np.float64)
+        elif predictor.lower() == "realizations":
+            a, b, gamma, delta = (
+                initial_guess[0],
+                initial_guess[1:-2] ** 2,
+                initial_guess[-2],
+                initial_guess[-1],
+            )
+            a_b = np.array([a] + b.tolist(), dtype=np.float64)
+
+        new_col = np.ones(truth.shape, dtype=np.float32)
+        all_data = np.column_stack((new_col, forecast_predictor))
+        mu = np.dot(all_data, a_b)
+        sigma = np.sqrt(gamma ** 2 + delta ** 2 * forecast_var)
+        if not np.isfinite(np.min(mu / sigma)):
+            return self.BAD_VALUE, np.zeros(len(initial_guess), dtype=np.float64)
+        # The normal cdf and pdf are evaluated directly, as this is
+        # considerably faster than using scipy.stats.norm.
+        xz = (truth - mu) / sigma
+        normal_cdf = ndtr(xz)
+        normal_pdf = np.exp(-0.5 * xz ** 2) / np.sqrt(2 * np.pi)
+        crps = sigma * (xz * (2 * normal_cdf - 1) + 2 * normal_pdf - 1 / sqrt_pi)
+        return self._mean_crps_and_gradient(
+            initial_guess,
+            all_data,
+            forecast_var,
+            sigma,
+            crps,
+            1 - 2 * normal_cdf,
+            2 * normal_pdf - 1 / sqrt_pi,
+            predictor,
+        )
+
+    def calculate_truncated_normal_crps_and_gradient(
+        self, initial_guess, forecast_predictor, truth, forecast_var, sqrt_pi, predictor
+    ):
+        """
+        Calculate the CRPS for a truncated normal distribution with zero
+        as the lower bound, and its analytic gradient with respect to the
+        coefficients. The CRPS matches that from
+        calculate_truncated_normal_crps.
+
+        Args:
+            initial_guess (list):
+                List of optimised coefficients.
+                Order of coefficients is [alpha, beta, gamma, delta].
+            forecast_predictor (numpy.ndarray):
+                Data to be used as the predictor,
+                either the ensemble mean or the ensemble realizations.
+            truth (numpy.ndarray):
+                Data to be used as truth.
+            forecast_var (numpy.ndarray):
+                Ensemble variance data.
+            sqrt_pi (numpy.ndarray):
+                Square root of Pi
+            predictor (str):
+                String to specify the form of the predictor used to calculate
+                the location parameter when estimating the EMOS coefficients.
+                Currently the ensemble mean ("mean") and the ensemble
+                realizations ("realizations") are supported as the predictors.
+
+        Returns:
+            (tuple): tuple containing:
+                **crps** (float):
+                    CRPS for the current set of coefficients. This CRPS is a
+                    mean value across all points.
+                **gradient** (numpy.ndarray):
+                    Gradient of the CRPS with respect to the coefficients.
+                    If the CRPS is set to BAD_VALUE, the gradient is zero.
+
+        """
+        if predictor.lower() == "mean":
+            a, b, gamma, delta = initial_guess
+            a_b = np.array([a, b], dtype=np.float64)
+        elif predictor.lower() == "realizations":
+            a, b, gamma, delta = (
+                initial_guess[0],
+                initial_guess[1:-2] ** 2,
+                initial_guess[-2],
+                initial_guess[-1],
+            )
+            a_b = np.array([a] + b.tolist(), dtype=np.float64)
+
+        new_col = np.ones(truth.shape, dtype=np.float32)
+        all_data = np.column_stack((new_col, forecast_predictor))
+        mu = np.dot(all_data, a_b)
+        sigma = np.sqrt(gamma ** 2 + delta ** 2 * forecast_var)
+        x0 = mu / sigma
+        if not (np.isfinite(np.min(x0)) or (np.min(x0) >= -3)):
+            return self.BAD_VALUE, np.zeros(len(initial_guess), dtype=np.float64)
+        # The normal cdf and pdf are evaluated directly, as this is
+        # considerably faster than using scipy.stats.norm.
+        xz = (truth - mu) / sigma
+        normal_cdf = ndtr(xz)
+        normal_pdf = np.exp(-0.5 * xz ** 2) / np.sqrt(2 * np.pi)
+        normal_cdf_0 = ndtr(x0)
+        normal_pdf_0 = np.exp(-0.5 * x0 ** 2) / np.sqrt(2 * np.pi)
+        normal_cdf_root_two = ndtr(np.sqrt(2) * x0)
+
+        # The CRPS is sigma * bracket / normal_cdf_0 ** 2. The derivatives
+        # with respect to mu and sigma follow from the derivatives with
+        # respect to xz = (truth - mu) / sigma and x0 = mu / sigma.
+        cdf_term = 2 * normal_cdf + normal_cdf_0 - 2
+        bracket = (
+            xz * normal_cdf_0 * cdf_term
+            + 2 * normal_pdf * normal_cdf_0
+            - normal_cdf_root_two / sqrt_pi
+        )
+        crps = (sigma / normal_cdf_0 ** 2) * bracket
+        bracket_x0_derivative = normal_pdf_0 * (
+            xz * (cdf_term + normal_cdf_0) + 2 * normal_pdf - 2 * normal_pdf_0
+        )
+        # Derivative of the CRPS with respect to x0, divided by sigma.
+        x0_term = (
+            bracket_x0_derivative / normal_cdf_0 ** 2
+            - 2 * bracket * normal_pdf_0 / normal_cdf_0 ** 3
+        )
+        xz_term = cdf_term / normal_cdf_0
+        return self._mean_crps_and_gradient(
+            initial_guess,
+            all_data,
+            forecast_var,
+            sigma,
+            crps,
+            x0_term - xz_term,
+            bracket / normal_cdf_0 ** 2 - xz * xz_term - x0 * x0_term,
+            predictor,
+        )
+
 
 class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
     """
@@ -452,6 +1035,8 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
         predictor="mean",
         tolerance=0.01,
         max_iterations=1000,
+        minimisation_method="Nelder-Mead",
+        point_by_point=False,
     ):
         """
         Create an ensemble calibration plugin that, for Nonhomogeneous Gaussian
@@ -491,6 +1076,16 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
                 predictor_of_mean is "realizations", then the number of
                 iterations may require increasing, as there will be
                 more coefficients to solve for.
+            minimisation_method (str):
+                The scipy.optimize.minimize method used for the minimisation,
+                either "Nelder-Mead" or "L-BFGS-B". If "L-BFGS-B" is
+                requested, the analytic gradient of the CRPS is used.
+            point_by_point (bool):
+                If True, the coefficients are estimated independently for
+                each spatial point (each grid point or site), and the
+                coefficient cubes have the spatial dimensions of the historic
+                forecasts. Otherwise, one set of coefficients is estimated
+                using all points.
 
         """
         self.distribution = distribution
@@ -501,8 +1096,13 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
         self.predictor = predictor
         self.tolerance = tolerance
         self.max_iterations = max_iterations
+        self.minimisation_method = minimisation_method
+        self.point_by_point = point_by_point
         self.minimiser = ContinuousRankedProbabilityScoreMinimisers(
-            tolerance=self.tolerance, max_iterations=self.max_iterations
+            tolerance=self.tolerance,
+            max_iterations=self.max_iterations,
+            minimisation_method=self.minimisation_method,
+            point_by_point=self.point_by_point,
         )
 
         # Setting default values for coeff_names.
@@ -520,7 +1120,9 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
             "minimiser: {}; "
             "coeff_names: {}; "
             "tolerance: {}; "
-            "max_iterations: {}>"
+            "max_iterations: {}; "
+            "minimisation_method: {}; "
+            "point_by_point: {}>"
         )
         return result.format(
             self.distribution,
@@ -530,6 +1132,8 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
             self.coeff_names,
             self.tolerance,
             self.max_iterations,
+            self.minimisation_method,
+            self.point_by_point,
         )
 
     def _validate_distribution(self):
@@ -655,8 +1259,43 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
             )
         return spatial_coords_and_dims
 
+    @staticmethod
+    def _create_point_coordinates(historic_forecasts):
+        """Create spatial coordinates for EMOS coefficients cubes that vary
+        by point, which have the spatial dimensions of the historic forecasts.
+
+        Args:
+            historic_forecasts (iris.cube.Cube):
+                Historic forecasts from the training dataset.
+
+        Returns:
+            (tuple): tuple containing:
+                **dim_coords_and_dims** (list of tuples):
+                    List of tuples of the spatial dimension coordinates and
+                    the associated dimension.
+                **aux_coords_and_dims** (list of tuples):
+                    List of tuples of the spatial auxiliary coordinates, such
+                    as the altitude and wmo_id of spot data, and the
+                    associated dimensions.
+        """
+        template = next(historic_forecasts.slices(get_spatial_dims(historic_forecasts)))
+        dim_coords_and_dims = [
+            (coord, template.coord_dims(coord)[0]) for coord in template.dim_coords
+        ]
+        aux_coords_and_dims = [
+            (coord, template.coord_dims(coord))
+            for coord in template.aux_coords
+            if template.coord_dims(coord)
+        ]
+        return dim_coords_and_dims, aux_coords_and_dims
+
     def _create_cubelist(
-        self, optimised_coeffs, historic_forecasts, aux_coords_and_dims, attributes
+        self,
+        optimised_coeffs,
+        historic_forecasts,
+        aux_coords_and_dims,
+        attributes,
+        spatial_dim_coords_and_dims=None,
     ):
         """Create a cubelist by combining the optimised coefficients and the
         appropriate metadata. The units of the alpha and gamma coefficients
@@ -673,6 +1312,12 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
             attributes (dict):
                 Attributes for an EMOS coefficients cube including
                 "diagnostic standard name" and an updated title.
+            spatial_dim_coords_and_dims (list of tuples or None):
+                List of tuples of spatial dimension coordinates and the
+                associated dimension, if the coefficients vary by point.
+                The dimensions of these, and of any auxiliary coordinates,
+                are offset by one for a beta coefficient cube with a leading
+                realization dimension.
 
         Returns:
             cubelist (iris.cube.CubeList):
@@ -691,12 +1336,19 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
                 dim_coords_and_dims = [
                     (historic_forecasts.coord("realization").copy(), 0)
                 ]
+            offset = len(dim_coords_and_dims)
+            for coord, dim in spatial_dim_coords_and_dims or []:
+                dim_coords_and_dims.append((coord.copy(), dim + offset))
+            coeff_aux_coords_and_dims = [
+                (coord.copy(), dims if dims is None else [dim + offset for dim in dims])
+                for coord, dims in aux_coords_and_dims
+            ]
             cube = iris.cube.Cube(
                 optimised_coeff,
                 long_name=f"emos_coefficient_{coeff_name}",
                 units=coeff_units,
                 dim_coords_and_dims=dim_coords_and_dims,
-                aux_coords_and_dims=aux_coords_and_dims,
+                aux_coords_and_dims=coeff_aux_coords_and_dims,
                 attributes=attributes,
             )
             cubelist.append(cube)
@@ -713,6 +1365,8 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
             optimised_coeffs (list or numpy.ndarray):
                 Array or list of optimised coefficients.
                 Order of coefficients is [alpha, beta, gamma, delta].
+                If point_by_point is True, the coefficients are followed by
+                the spatial dimensions of the historic forecasts.
             historic_forecasts (iris.cube.Cube):
                 Historic forecasts from the training dataset.
 
@@ -745,11 +1399,25 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
             raise ValueError(msg)
 
         aux_coords_and_dims = self._create_temporal_coordinates(historic_forecasts)
-        aux_coords_and_dims.extend(self._create_spatial_coordinates(historic_forecasts))
+        spatial_dim_coords_and_dims = None
+        if self.point_by_point:
+            (
+                spatial_dim_coords_and_dims,
+                spatial_aux_coords_and_dims,
+            ) = self._create_point_coordinates(historic_forecasts)
+            aux_coords_and_dims.extend(spatial_aux_coords_and_dims)
+        else:
+            aux_coords_and_dims.extend(
+                self._create_spatial_coordinates(historic_forecasts)
+            )
         attributes = self._set_attributes(historic_forecasts)
 
         return self._create_cubelist(
-            optimised_coeffs, historic_forecasts, aux_coords_and_dims, attributes
+            optimised_coeffs,
+            historic_forecasts,
+            aux_coords_and_dims,
+            attributes,
+            spatial_dim_coords_and_dims=spatial_dim_coords_and_dims,
         )
 
     def compute_initial_guess(
@@ -854,6 +1522,104 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
 
         return np.array(initial_guess, dtype=np.float32)
 
+    def initial_guess_from_coefficients(
+        self, coefficients_cubelist, historic_forecasts, no_of_realizations=None
+    ):
+        """
+        Function to use previously estimated EMOS coefficients, for example
+        from the previous day's training, as the initial guess for the
+        minimisation. As the coefficients typically change slowly from day
+        to day, the minimisation then converges within far fewer iterations
+        than when starting from the default or linear regression estimates.
+
+        Args:
+            coefficients_cubelist (iris.cube.CubeList):
+                CubeList of EMOS coefficients where each cube within the
+                cubelist is for a separate EMOS coefficient e.g. alpha, beta,
+                gamma, delta.
+            historic_forecasts (iris.cube.Cube):
+                Historic forecasts from the training dataset.
+            no_of_realizations (int):
+                Number of realizations, if ensemble realizations are to be
+                used as predictors. Default is None.
+
+        Returns:
+            numpy.ndarray:
+                Array of coefficients to be used as initial guess.
+                Order of coefficients is [alpha, beta, gamma, delta].
+                If the coefficients vary by point, the coefficients are
+                followed by the spatial dimensions of the historic forecasts.
+
+        Raises:
+            ValueError: If the coefficients were estimated for a different
+                diagnostic or distribution.
+            ValueError: If the shape of the beta coefficients does not match
+                the predictor.
+            ValueError: If the coefficients vary by point, but either
+                point_by_point is False or the spatial dimensions do not
+                match the historic forecasts.
+        """
+        coefficients = [
+            coefficients_cubelist.extract_strict(f"emos_coefficient_{coeff_name}")
+            for coeff_name in self.coeff_names
+        ]
+        for cube in coefficients:
+            if (
+                cube.attributes.get("diagnostic_standard_name")
+                != historic_forecasts.name()
+                or cube.attributes.get("distribution") != self.distribution
+            ):
+                msg = (
+                    "The previous coefficients were estimated for the {} "
+                    "diagnostic and the {} distribution. These must match the "
+                    "historic forecasts ({}) and the distribution requested "
+                    "({}).".format(
+                        cube.attributes.get("diagnostic_standard_name"),
+                        cube.attributes.get("distribution"),
+                        historic_forecasts.name(),
+                        self.distribution,
+                    )
+                )
+                raise ValueError(msg)
+
+        alpha, beta, gamma, delta = coefficients
+        if self.predictor.lower() == "realizations":
+            expected_beta_shape = (no_of_realizations,) + alpha.shape
+        else:
+            expected_beta_shape = alpha.shape
+        if beta.shape != expected_beta_shape:
+            msg = (
+                "The shape of the previous beta coefficients {} does not match "
+                "the shape expected for the {} predictor {}.".format(
+                    beta.shape, self.predictor, expected_beta_shape
+                )
+            )
+            raise ValueError(msg)
+
+        spatial_shape = alpha.shape
+        if spatial_shape:
+            expected_shape = tuple(
+                historic_forecasts.shape[dim]
+                for dim in get_spatial_dims(historic_forecasts)
+            )
+            if not self.point_by_point or spatial_shape != expected_shape:
+                msg = (
+                    "Previous coefficients of shape {} that vary by point can "
+                    "only be used as the initial guess if point_by_point is "
+                    "True and the historic forecasts have the same spatial "
+                    "shape. Historic forecast spatial shape: {}".format(
+                        spatial_shape, expected_shape
+                    )
+                )
+                raise ValueError(msg)
+
+        return np.concatenate(
+            [
+                cube.data.reshape((-1,) + spatial_shape).astype(np.float32)
+                for cube in coefficients
+            ]
+        )
+
     @staticmethod
     def mask_cube(cube, landsea_mask):
         """
@@ -881,7 +1647,9 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
         else:
             cube.data = np.ma.masked_invalid(cube.data)
 
-    def process(self, historic_forecasts, truths, landsea_mask=None):
+    def process(
+        self, historic_forecasts, truths, landsea_mask=None, previous_coefficients=None,
+    ):
         """
         Using Nonhomogeneous Gaussian Regression/Ensemble Model Output
         Statistics, estimate the required coefficients from historical
@@ -899,10 +1667,13 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
            forecasts.
         5. If a land-sea mask is provided then mask out sea points in the truths
            and predictor from the historic forecasts.
-        6. Calculate initial guess at coefficient values by performing a
-           linear regression, if requested, otherwise default values are
-           used.
-        7. Perform minimisation.
+        6. If previous coefficients are provided, use these as the initial
+           guess. Otherwise, calculate initial guess at coefficient values by
+           performing a linear regression, if requested, otherwise default
+           values are used.
+        7. Perform minimisation. If point_by_point is True, a separate
+           minimisation is performed at each spatial point, starting from the
+           initial guess computed using all points.
 
         Args:
             historic_forecasts (iris.cube.Cube):
@@ -914,13 +1685,22 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
                 land points are used to calculate the coefficients. Within the
                 land-sea mask cube land points should be specified as ones,
                 and sea points as zeros.
+            previous_coefficients (iris.cube.CubeList or None):
+                The optional CubeList of EMOS coefficients previously
+                estimated for the same diagnostic, distribution and predictor,
+                for example by yesterday's training. If provided, these are
+                used as the initial guess for the minimisation, so that the
+                coefficients are updated incrementally as the training period
+                moves on. Any points where the previous coefficients are NaN
+                use the initial guess calculated from the training dataset.
 
         Returns:
             iris.cube.CubeList:
                 CubeList constructed using the coefficients provided and using
                 metadata from the historic_forecasts cube. Each cube within the
                 cubelist is for a separate EMOS coefficient e.g. alpha, beta,
-                gamma, delta.
+                gamma, delta. If point_by_point is True, the cubes have the
+                spatial dimensions of the historic forecasts.
 
         Raises:
             ValueError: If either the historic_forecasts or truths cubes were not
@@ -972,17 +1752,43 @@ class EstimateCoefficientsForEnsembleCalibration(BasePlugin):
             self.mask_cube(truths, landsea_mask)
 
         # Computing initial guess for EMOS coefficients
-        initial_guess = self.compute_initial_guess(
-            truths,
-            forecast_predictor,
-            self.predictor,
-            self.ESTIMATE_COEFFICIENTS_FROM_LINEAR_MODEL_FLAG,
-            no_of_realizations=no_of_realizations,
-        )
+        initial_guess = None
+        if previous_coefficients:
+            initial_guess = self.initial_guess_from_coefficients(
+                previous_coefficients,
+                historic_forecasts,
+                no_of_realizations=no_of_realizations,
+            )
+        if initial_guess is None or np.any(np.isnan(initial_guess)):
+            computed_guess = self.compute_initial_guess(
+                truths,
+                forecast_predictor,
+                self.predictor,
+                self.ESTIMATE_COEFFICIENTS_FROM_LINEAR_MODEL_FLAG,
+                no_of_realizations=no_of_realizations,
+            )
+            if initial_guess is None:
+                initial_guess = computed_guess
+            else:
+                # Fill any points without previous coefficients.
+                computed_guess = computed_guess.reshape(
+                    (-1,) + (1,) * (initial_guess.ndim - 1)
+                )
+                initial_guess = np.where(
+                    np.isnan(initial_guess), computed_guess, initial_guess
+                )
 
         # Calculate coefficients if there are no nans in the initial guess.
         if np.any(np.isnan(initial_guess)):
             optimised_coeffs = initial_guess
+            if self.point_by_point and initial_guess.ndim == 1:
+                spatial_shape = tuple(
+                    truths.shape[dim] for dim in get_spatial_dims(truths)
+                )
+                optimised_coeffs = np.broadcast_to(
+                    initial_guess.reshape((-1,) + (1,) * len(spatial_shape)),
+                    initial_guess.shape + spatial_shape,
+                )
         else:
             optimised_coeffs = self.minimiser(
                 initial_guess,
@@ -1121,7 +1927,8 @@ class CalibratedForecastDistributionParameters(BasePlugin):
         Returns:
             numpy.ndarray:
                 Location parameter calculated using the ensemble realizations
-                as the predictor.
+                as the predictor. If the coefficients vary by point, the
+                coefficients at each point are applied.
         """
         forecast_predictor = self.current_forecast
 
@@ -1132,12 +1939,21 @@ class CalibratedForecastDistributionParameters(BasePlugin):
         beta_values = self.coefficients_cubelist.extract_strict(
             "emos_coefficient_beta"
         ).data.copy()
-        a_and_b = np.append(
-            self.coefficients_cubelist.extract_strict("emos_coefficient_alpha").data,
-            beta_values ** 2,
-        )
+        alpha_values = self.coefficients_cubelist.extract_strict(
+            "emos_coefficient_alpha"
+        ).data
         forecast_predictor_flat = convert_cube_data_to_2d(forecast_predictor)
         xy_shape = next(forecast_predictor.slices_over("realization")).shape
+        if beta_values.ndim > 1:
+            # The coefficients vary by point, so are flattened in the same way
+            # as the forecast, with a column of beta values for each
+            # realization, and applied at all points at once.
+            b_values = beta_values.reshape(len(beta_values), -1).T ** 2
+            location_parameter = alpha_values.flatten() + np.sum(
+                forecast_predictor_flat * b_values, axis=1
+            )
+            return location_parameter.reshape(xy_shape).astype(np.float32)
+        a_and_b = np.append(alpha_values, beta_values ** 2)
         col_of_ones = np.ones(np.prod(xy_shape), dtype=np.float32)
         ones_and_predictor = np.column_stack((col_of_ones, forecast_predictor_flat))
         location_parameter = (
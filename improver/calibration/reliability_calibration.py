@@ -295,6 +295,14 @@ class ConstructReliabilityCalibrationTables(BasePlugin):
         For an x-y slice at a single validity time and threshold, populate
         a reliability table using the provided truth.
 
+        The probability bins are contiguous and non-overlapping, so each
+        forecast value falls within at most one bin. The bin containing each
+        forecast value is found in a single pass, and the observation count,
+        forecast probability and forecast count of each point are then
+        scattered into the table at that bin, rather than constructing masks
+        of the forecast values within each bin. Points at which either the
+        forecast or the truth is masked do not contribute to the table.
+
         Args:
             forecast (numpy.ndarray):
                 An array containing data over an xy slice for a single validity
@@ -311,30 +319,26 @@ class ConstructReliabilityCalibrationTables(BasePlugin):
                 dimensions of the forecast and truth cubes (which are
                 equivalent).
         """
-        observation_counts = []
-        forecast_probabilities = []
-        forecast_counts = []
-
-        for bin_min, bin_max in self.probability_bins:
-
-            observation_mask = (
-                ((forecast >= bin_min) & (forecast <= bin_max)) & (np.isclose(truth, 1))
-            ).astype(int)
-            forecast_mask = ((forecast >= bin_min) & (forecast <= bin_max)).astype(int)
-            forecasts_probability_values = forecast * forecast_mask
-
-            observation_counts.append(observation_mask)
-            forecast_probabilities.append(forecasts_probability_values)
-            forecast_counts.append(forecast_mask)
-
-        reliability_table = np.stack(
-            [
-                np.stack(observation_counts),
-                np.stack(forecast_probabilities),
-                np.stack(forecast_counts),
-            ]
+        valid = ~(np.ma.getmaskarray(forecast) | np.ma.getmaskarray(truth)).ravel()
+        forecast_values = np.ma.getdata(forecast).ravel()
+        observed = np.isclose(np.ma.getdata(truth).ravel(), 1)
+
+        bin_lower, bin_upper = self.probability_bins.T
+        bin_index = np.searchsorted(bin_lower, forecast_values, side="right") - 1
+        valid &= bin_index >= 0
+        valid[valid] &= forecast_values[valid] <= bin_upper[bin_index[valid]]
+        (point_index,) = np.nonzero(valid)
+        bin_index = bin_index[point_index]
+
+        reliability_table = np.zeros(
+            (3, len(self.probability_bins), forecast_values.size), dtype=np.float32
+        )
+        reliability_table[0, bin_index, point_index] = observed[point_index]
+        reliability_table[1, bin_index, point_index] = forecast_values[point_index]
+        reliability_table[2, bin_index, point_index] = 1
+        return reliability_table.reshape(
+            reliability_table.shape[:2] + np.shape(forecast)
         )
-        return reliability_table.astype(np.float32)
 
     def process(self, historic_forecasts, truths):
         """
@@ -394,23 +398,17 @@ class ConstructReliabilityCalibrationTables(BasePlugin):
         )
         for forecast_slice, truth_slice in threshold_slices:
 
-            threshold_reliability = []
+            # Sum the reliability tables for all times
+            table_values = np.zeros(reliability_cube.shape, dtype=np.float32)
             time_slices = zip(
                 forecast_slice.slices_over(time_coord),
                 truth_slice.slices_over(time_coord),
             )
             for forecast, truth in time_slices:
-
-                reliability_table = self._populate_reliability_bins(
+                table_values += self._populate_reliability_bins(
                     forecast.data, truth.data
                 )
 
-                threshold_reliability.append(reliability_table)
-
-            # Stack and sum reliability tables for all times
-            table_values = np.stack(threshold_reliability)
-            table_values = np.sum(table_values, axis=0, dtype=np.float32)
-
             reliability_entry = reliability_cube.copy(data=table_values)
             reliability_entry.replace_coord(forecast_slice.coord(threshold_coord))
             reliability_tables.append(reliability_entry)
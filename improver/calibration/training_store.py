@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Module for a compact store of the historic forecasts and truths used to
+train calibration.
+
+A training store is a directory containing a table of historic forecasts
+and a table of truths. Each table is a set of records, where a record is a
+cube with a single validity time, forecast reference time and forecast
+period. A table consists of:
+
+* a metadata file, in JSON format, describing a template record and
+  giving the shape and data type of the records;
+* a data file, to which the uncompressed data of each record is appended;
+* an index file, in JSON format, containing the time coordinates of each
+  record in the order that the records were appended.
+
+New records are appended without rewriting the existing data, and the
+records required for training are read by memory-mapping the data file, so
+that only the records that are needed are read from disk. Records are
+looked up using their forecast reference time and forecast period, or using
+their validity time for the truths.
+"""
+
+import copy
+import json
+import os
+
+import dask.array as da
+import iris
+import numpy as np
+
+from improver.utilities.memmap import (
+    _atomic_write,
+    _cube_from_metadata,
+    _cube_metadata,
+)
+from improver.utilities.temporal import cycletime_to_number
+
+# Time coordinates that vary between the records of a table, and the units
+# used to store them within the index.
+TIME_COORD_UNITS = {
+    "time": "seconds since 1970-01-01 00:00:00",
+    "forecast_reference_time": "seconds since 1970-01-01 00:00:00",
+    "forecast_period": "seconds",
+}
+
+
+class _RecordTable:
+    """A table of records that share all metadata other than their time
+    coordinates. Masked data is stored as NaN, so the data of the records
+    must be floating point."""
+
+    def __init__(self, path):
+        """
+        Initialise the table, loading the template record and index if the
+        table already exists.
+
+        Args:
+            path (str):
+                Path of the table, used as the prefix of the file names.
+        """
+        self.meta_path = path + ".meta"
+        self.data_path = path + ".data"
+        self.index_path = path + ".json"
+        self.template = None
+        self.index = {}
+        if os.path.exists(self.meta_path):
+            self.template = self._load_template()
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as index_file:
+                self.index = json.load(index_file)
+
+    def __len__(self):
+        """Return the number of records in the table."""
+        if not self.index:
+            return 0
+        return len(next(iter(self.index.values()))["points"])
+
+    def points(self, coord_name):
+        """Return the points of a time coordinate for every record.
+
+        Args:
+            coord_name (str):
+                Name of the time coordinate.
+
+        Returns:
+            numpy.ndarray:
+                Points of the coordinate, in the units given by
+                TIME_COORD_UNITS.
+        """
+        return np.array(self.index[coord_name]["points"])
+
+    def bounds(self, coord_name):
+        """Return the bounds of a time coordinate for every record.
+
+        Args:
+            coord_name (str):
+                Name of the time coordinate.
+
+        Returns:
+            numpy.ndarray or None:
+                Bounds of the coordinate, in the units given by
+                TIME_COORD_UNITS, or None if the coordinate has no bounds.
+        """
+        bounds = self.index[coord_name]["bounds"]
+        return None if bounds is None else np.array(bounds)
+
+    @staticmethod
+    def _split_record(record):
+        """Separate the time coordinates of a record from the rest of its
+        metadata.
+
+        Args:
+            record (iris.cube.Cube):
+                Cube with scalar time coordinates.
+
+        Returns:
+            (tuple): tuple containing:
+                **time_coords** (dict):
+                    Time coordinates of the record, converted to the units
+                    given by TIME_COORD_UNITS, keyed by name.
+                **other_coords** (dict):
+                    Coordinates of the record other than the time
+                    coordinates, and their dimensions, keyed by name.
+        """
+        time_coords = {}
+        other_coords = {}
+        for coord in record.coords():
+            if coord.name() in TIME_COORD_UNITS:
+                coord = coord.copy()
+                coord.convert_units(TIME_COORD_UNITS[coord.name()])
+                time_coords[coord.name()] = coord
+            else:
+                other_coords[coord.name()] = (coord, record.coord_dims(coord))
+        return time_coords, other_coords
+
+    @staticmethod
+    def _create_template(record):
+        """Create a template record without data, with its time coordinates
+        in the units given by TIME_COORD_UNITS.
+
+        Args:
+            record (iris.cube.Cube):
+                Cube with scalar time coordinates.
+
+        Returns:
+            iris.cube.Cube:
+                Template record with lazy placeholder data.
+        """
+        placeholder = da.zeros(record.shape, dtype=record.dtype, chunks=record.shape)
+        template = record.copy(data=placeholder)
+        for coord in template.coords():
+            if coord.name() in TIME_COORD_UNITS:
+                coord.convert_units(TIME_COORD_UNITS[coord.name()])
+        return template
+
+    def _save_template(self, template):
+        """Save the metadata, shape and data type of the template record.
+
+        Args:
+            template (iris.cube.Cube):
+                Template record with lazy placeholder data.
+        """
+        meta = json.dumps(
+            {
+                "dtype": template.dtype.str,
+                "shape": template.shape,
+                "metadata": _cube_metadata(template),
+            }
+        )
+        _atomic_write(
+            self.meta_path, lambda meta_file: meta_file.write(meta.encode("utf-8"))
+        )
+
+    def _load_template(self):
+        """Load the template record saved by _save_template.
+
+        Returns:
+            iris.cube.Cube:
+                Template record with lazy placeholder data of the data type
+                of the records.
+        """
+        with open(self.meta_path) as meta_file:
+            meta = json.load(meta_file)
+        shape = tuple(meta["shape"])
+        data = da.zeros(shape, dtype=np.dtype(meta["dtype"]), chunks=shape)
+        return _cube_from_metadata(meta["metadata"], data)
+
+    def _check_record(self, template, record, time_coords, other_coords):
+        """Check that a record matches the template record of the table.
+
+        Args:
+            template (iris.cube.Cube):
+                Template record of the table.
+            record (iris.cube.Cube):
+                Cube with scalar time coordinates.
+            time_coords (dict):
+                Time coordinates of the record, keyed by name.
+            other_coords (dict):
+                Other coordinates of the record and their dimensions, keyed
+                by name.
+
+        Raises:
+            ValueError: If the record does not match the template record.
+        """
+        template_time_coords, template_other_coords = self._split_record(template)
+        if (
+            record.name() != template.name()
+            or record.units != template.units
+            or record.cell_methods != template.cell_methods
+            or record.shape != template.shape
+            or other_coords != template_other_coords
+            or time_coords.keys() != template_time_coords.keys()
+            or any(
+                coord.shape != (1,)
+                or coord.has_bounds() != template_time_coords[name].has_bounds()
+                for name, coord in time_coords.items()
+            )
+        ):
+            msg = (
+                "The {} cube with shape {} does not match the {} cube with "
+                "shape {} in the training store table {}. Only the values of "
+                "the time coordinates may differ.".format(
+                    record.name(),
+                    record.shape,
+                    template.name(),
+                    template.shape,
+                    self.data_path,
+                )
+            )
+            raise ValueError(msg)
+
+    def append(self, cube):
+        """Append each time of a cube to the table as a separate record. All
+        of the records are checked before any are written. The data of the
+        records is appended to the data file before the index file is
+        replaced, so the table is unchanged if writing fails part way.
+
+        Args:
+            cube (iris.cube.Cube):
+                Cube to be appended, which may have leading time dimensions.
+                The first record appended to an empty table is used as the
+                template for all subsequent records, including the
+                attributes of the cubes loaded from the table.
+
+        Raises:
+            ValueError: If the data of the cube is not floating point.
+            ValueError: If the cube does not match the records in the table.
+        """
+        if not np.issubdtype(cube.dtype, np.floating):
+            msg = (
+                "Only floating point data can be stored in a training store, "
+                "not {} data.".format(cube.dtype)
+            )
+            raise ValueError(msg)
+        time_coord_names = [name for name in TIME_COORD_UNITS if cube.coords(name)]
+        records = list(cube.slices_over(time_coord_names))
+
+        template = self.template
+        if template is None:
+            template = self._create_template(records[0])
+        split_records = [self._split_record(record) for record in records]
+        for record, (time_coords, other_coords) in zip(records, split_records):
+            self._check_record(template, record, time_coords, other_coords)
+
+        if self.template is None:
+            self._save_template(template)
+            # Use the saved template, so that it matches the template of the
+            # table when it is reopened.
+            self.template = self._load_template()
+            template = self.template
+        index = copy.deepcopy(self.index) or {
+            name: {"points": [], "bounds": [] if coord.has_bounds() else None}
+            for name, coord in self._split_record(template)[0].items()
+        }
+        record_nbytes = template.dtype.itemsize * int(np.prod(template.shape))
+        with open(self.data_path, "ab") as data_file:
+            # Discard any data left by an earlier append that failed before
+            # the index was replaced.
+            data_file.truncate(len(self) * record_nbytes)
+            for record, (time_coords, _) in zip(records, split_records):
+                data = np.ma.filled(record.data.astype(template.dtype), np.nan)
+                data_file.write(np.ascontiguousarray(data).tobytes())
+                for name, coord in time_coords.items():
+                    index[name]["points"].append(coord.points[0].item())
+                    if coord.has_bounds():
+                        index[name]["bounds"].append(coord.bounds[0].tolist())
+        _atomic_write(
+            self.index_path,
+            lambda index_file: index_file.write(json.dumps(index).encode("utf-8")),
+        )
+        self.index = index
+
+    def _read(self, rows):
+        """Read the data of the requested records by memory-mapping the data
+        file, so that only the requested records are read from disk.
+
+        Args:
+            rows (list of int):
+                Indices of the records to be read.
+
+        Returns:
+            numpy.ndarray:
+                Data of the records, stacked along a leading dimension. The
+                data is masked where NaN.
+        """
+        records = np.memmap(
+            self.data_path,
+            dtype=self.template.dtype,
+            mode="r",
+            shape=(len(self),) + self.template.shape,
+        )
+        data = records[rows]
+        if np.isnan(data).any():
+            data = np.ma.masked_invalid(data)
+        return data
+
+    def _time_coord(self, coord_name, rows):
+        """Create a time coordinate with the values of the requested records.
+
+        Args:
+            coord_name (str):
+                Name of the time coordinate.
+            rows (list of int):
+                Indices of the records.
+
+        Returns:
+            iris.coords.Coord:
+                Coordinate with a point for each record.
+        """
+        coord = self.template.coord(coord_name)
+        points = self.points(coord_name)[rows]
+        bounds = self.bounds(coord_name)
+        if bounds is not None:
+            bounds = bounds[rows]
+        if coord_name == "time":
+            coord = iris.coords.DimCoord.from_coord(coord)
+        elif len(np.unique(points)) > 1:
+            coord = iris.coords.AuxCoord.from_coord(coord)
+        else:
+            points = points[:1]
+            bounds = None if bounds is None else bounds[:1]
+        return coord.copy(
+            points=points.astype(coord.dtype),
+            bounds=None if bounds is None else bounds.astype(coord.dtype),
+        )
+
+    def cube(self, rows):
+        """Create a cube from the requested records, with a leading time
+        dimension. The records must have distinct validity times, and are
+        returned in the order requested. Time coordinates that are the same
+        for every record are scalar coordinates. If a single record is
+        requested, the cube has no time dimension, matching the result of
+        merging the records.
+
+        Args:
+            rows (list of int):
+                Indices of the records.
+
+        Returns:
+            iris.cube.Cube:
+                Cube of the requested records.
+        """
+        template = self.template
+        dim_coords_and_dims = [(self._time_coord("time", rows), 0)]
+        aux_coords_and_dims = []
+        for coord in template.coords():
+            if coord.name() == "time":
+                continue
+            if coord.name() in TIME_COORD_UNITS:
+                coord = self._time_coord(coord.name(), rows)
+                dims = None if len(coord.points) == 1 else 0
+                aux_coords_and_dims.append((coord, dims))
+                continue
+            dims = template.coord_dims(coord)
+            if coord in template.dim_coords:
+                dim_coords_and_dims.append((coord.copy(), dims[0] + 1))
+            else:
+                aux_coords_and_dims.append(
+                    (coord.copy(), tuple(dim + 1 for dim in dims))
+                )
+        cube = iris.cube.Cube(
+            self._read(rows),
+            dim_coords_and_dims=dim_coords_and_dims,
+            aux_coords_and_dims=aux_coords_and_dims,
+        )
+        cube.metadata = template.metadata
+        if len(rows) == 1:
+            cube = cube[0]
+        return cube
+
+
+class TrainingDataStore:
+    """
+    A compact store of historic forecasts and truths for training
+    calibration, from which the forecasts and truths with matching validity
+    times for a given forecast period and training period can be loaded
+    without reading the rest of the store.
+    """
+
+    def __init__(self, path):
+        """
+        Open a training store. The directory is created when data is first
+        appended to the store.
+
+        Args:
+            path (str or pathlib.Path):
+                Directory containing the training store.
+        """
+        self.path = str(path)
+        self.forecasts = _RecordTable(os.path.join(self.path, "forecast"))
+        self.truths = _RecordTable(os.path.join(self.path, "truth"))
+
+    def __repr__(self):
+        """Represent the training store as a string."""
+        return "<TrainingDataStore: {}, forecasts: {}, truths: {}>".format(
+            self.path, len(self.forecasts), len(self.truths)
+        )
+
+    def append(self, historic_forecasts=None, truths=None):
+        """
+        Append historic forecasts and truths to the store. If a forecast
+        with the same forecast reference time and forecast period, or a
+        truth with the same validity time, is already in the store, the
+        record appended most recently is used when loading.
+
+        Args:
+            historic_forecasts (iris.cube.Cube or None):
+                Historic forecasts, which may have leading time dimensions.
+            truths (iris.cube.Cube or None):
+                Truths, which may have a leading time dimension.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        if historic_forecasts is not None:
+            self.forecasts.append(historic_forecasts)
+        if truths is not None:
+            self.truths.append(truths)
+
+    @staticmethod
+    def _latest_rows(table, keys):
+        """Map the key of each record in a table to the index of the most
+        recently appended record with that key.
+
+        Args:
+            table (_RecordTable):
+                Table of records.
+            keys (list of str):
+                Names of the time coordinates identifying a record.
+
+        Returns:
+            dict:
+                Index of the most recent record for each key.
+        """
+        if not len(table):
+            return {}
+        columns = [table.points(key).tolist() for key in keys]
+        bounds = table.bounds("time")
+        if bounds is not None:
+            columns.append([tuple(bound) for bound in bounds.tolist()])
+        return {key: row for row, key in enumerate(zip(*columns))}
+
+    def load(self, forecast_period, cycletime=None, training_length=None):
+        """
+        Load the historic forecasts for a forecast period, and the truths
+        at the validity times of these forecasts. Only forecasts with a
+        matching truth, and truths with a matching forecast, are loaded.
+
+        Args:
+            forecast_period (int):
+                Forecast period of the historic forecasts in seconds.
+            cycletime (str or None):
+                Cycletime of the forecast to be calibrated, in the format
+                YYYYMMDDTHHMMZ. If provided, only historic forecasts with a
+                forecast reference time before the cycletime, at the same
+                time of day, are loaded.
+            training_length (int or None):
+                Number of days of historic forecasts before the cycletime to
+                load. If None, all historic forecasts before the cycletime
+                are loaded. Only used if the cycletime is provided.
+
+        Returns:
+            (tuple): tuple containing:
+                **historic_forecasts** (iris.cube.Cube):
+                    Historic forecasts, with a leading time dimension in
+                    order of validity time.
+                **truths** (iris.cube.Cube):
+                    Truths, with a leading time dimension matching that of
+                    the historic forecasts.
+
+        Raises:
+            ValueError: If no historic forecasts have a matching truth
+                within the training period.
+        """
+        forecast_rows = self._latest_rows(
+            self.forecasts, ["forecast_reference_time", "forecast_period", "time"]
+        )
+        truth_rows = self._latest_rows(self.truths, ["time"])
+        if cycletime is not None:
+            cycletime = cycletime_to_number(
+                cycletime, time_unit=TIME_COORD_UNITS["forecast_reference_time"]
+            )
+        matches = []
+        for (frt, period, *time_key), forecast_row in forecast_rows.items():
+            if period != forecast_period or tuple(time_key) not in truth_rows:
+                continue
+            if cycletime is not None:
+                days, remainder = divmod(cycletime - frt, 24 * 60 * 60)
+                if remainder or days < 1:
+                    continue
+                if training_length is not None and days > training_length:
+                    continue
+            matches.append((time_key, forecast_row, truth_rows[tuple(time_key)]))
+
+        if not matches:
+            msg = (
+                "No historic forecasts with a forecast period of {} seconds "
+                "and a matching truth were found in the training store "
+                "{}.".format(forecast_period, self.path)
+            )
+            raise ValueError(msg)
+        _, forecast_rows, truth_rows = zip(*sorted(matches))
+        return (
+            self.forecasts.cube(list(forecast_rows)),
+            self.truths.cube(list(truth_rows)),
+        )
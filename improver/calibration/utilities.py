@@ -151,6 +151,26 @@ def check_predictor(predictor):
         raise ValueError(msg)
 
 
+def get_spatial_dims(cube):
+    """
+    Get the dimensions of a cube that are spanned by the spatial (x and y)
+    coordinates. For gridded data, these are the two grid dimensions. For
+    spot data, the x and y coordinates share a single site dimension.
+
+    Args:
+        cube (iris.cube.Cube):
+            Cube with x and y coordinates.
+
+    Returns:
+        list of int:
+            Sorted indices of the spatial dimensions.
+    """
+    return sorted(
+        set(cube.coord_dims(cube.coord(axis="y")))
+        | set(cube.coord_dims(cube.coord(axis="x")))
+    )
+
+
 def filter_non_matching_cubes(historic_forecast, truth):
     """
     Provide filtering for the historic forecast and truth to make sure
@@ -293,11 +293,15 @@ def with_output(
     output=None,
     compression_level=1,
     least_significant_digit: int = None,
+    chunks=None,
+    compression_workers: int = 1,
     **kwargs,
 ):
     """Add `output` keyword only argument.
     Add `compression_level` option.
     Add `least_significant_digit` option.
+    Add `chunks` option.
+    Add `compression_workers` option.
 
     This is used to add extra `output`, `compression_level` and `least_significant_digit` CLI options. If `output`
     provided, it saves the result of calling `wrapped` to file and returns None, otherwise
@@ -319,14 +323,32 @@ def with_output(
             http://www.esrl.noaa.gov/psd/data/gridded/conventions/cdc_netcdf_standard.shtml
             for details. When used with `compression level`, this will result in lossy
             compression.
+        chunks (str):
+            Chunk layout of the output, either the name of a layout
+            ("slice", "spot" or "timeseries") or comma separated chunk sizes
+            along each dimension, where -1 selects the full extent. Defaults
+            to one chunk per slice over the last two dimensions.
+        compression_workers (int):
+            Number of threads used to compress the output. If greater than
+            one, chunks are compressed in parallel.
     Returns:
         Result of calling `wrapped` or None if `output` is given.
     """
-    from improver.utilities.save import save_netcdf
+    from improver.utilities.save import CHUNK_LAYOUTS, save_netcdf
+
+    if chunks is not None and chunks not in CHUNK_LAYOUTS:
+        chunks = tuple(int(size) for size in comma_separated_list(chunks))
 
     result = wrapped(*args, **kwargs)
     if output:
-        save_netcdf(result, output, compression_level, least_significant_digit)
+        save_netcdf(
+            result,
+            output,
+            compression_level,
+            least_significant_digit,
+            chunks=chunks,
+            compression_workers=compression_workers,
+        )
         return
     return result
 
@@ -364,18 +386,132 @@ def improver_help(prog_name: parameters.pass_name, command=None, *, usage=False)
     return result
 
 
+# Index of the description and usages of each command, which is used to list
+# the commands without importing every command module. Regenerate this with
+# write_help_index() when adding a command or changing its docstring.
+HELP_INDEX_PATH = pathlib.Path(__file__).parent / "help_index.json"
+
+
+class IndexedHelp:
+    """Help summary for a command, read from the help index."""
+
+    def __init__(self, description, usages):
+        self.description = description
+        self._usages = usages
+
+    def usages(self):
+        """Returns an iterable of the usage patterns of the command."""
+        return iter(self._usages)
+
+
+class LazyCommand:
+    """Command line interface for a command module, which is only imported
+    when the command is run or its full help is shown."""
+
+    def __init__(self, name, index_entry=None):
+        """
+        Args:
+            name (str):
+                Name of the module within improver.cli.
+            index_entry (dict or None):
+                Description and usages of the command from the help index.
+                If None, the module is imported to provide the help summary.
+        """
+        self.name = name
+        self.index_entry = index_entry
+
+    @property
+    def cli(self):
+        """Use this object as the command line interface."""
+        return self
+
+    def load(self):
+        """Import the command module.
+
+        Returns:
+            clize.Clize:
+                Command line interface for the process function of the module.
+        """
+        import importlib
+
+        module = importlib.import_module("improver.cli." + self.name)
+        return clizefy(module.process).cli
+
+    @property
+    def helper(self):
+        """Help summary for listing the command."""
+        if self.index_entry is None:
+            return self.load().helper
+        return IndexedHelp(**self.index_entry)
+
+    def __call__(self, *args):
+        return self.load()(*args)
+
+
+def load_help_index(path=HELP_INDEX_PATH):
+    """Load the help index.
+
+    Args:
+        path (pathlib.Path):
+            Path to the help index.
+
+    Returns:
+        dict:
+            Description and usages for each command module, or an empty
+            dictionary if there is no index.
+    """
+    import json
+
+    try:
+        with open(path) as index_file:
+            return json.load(index_file)
+    except FileNotFoundError:
+        return {}
+
+
+def generate_help_index():
+    """Generate the help index by importing every command module.
+
+    Returns:
+        dict:
+            Description and usages for each command module.
+    """
+    index = {}
+    for command in SUBCOMMANDS_TABLE.values():
+        if isinstance(command, LazyCommand):
+            helper = command.load().helper
+            index[command.name] = {
+                "description": helper.description,
+                "usages": list(helper.usages()),
+            }
+    return index
+
+
+def write_help_index(path=HELP_INDEX_PATH):
+    """Write the help index.
+
+    Args:
+        path (pathlib.Path):
+            Path to the help index.
+    """
+    import json
+
+    with open(path, "w") as index_file:
+        json.dump(generate_help_index(), index_file, indent=2, sort_keys=True)
+        index_file.write("\n")
+
+
 def _cli_items():
-    """Dynamically discover CLIs."""
-    import importlib
+    """Dynamically discover CLIs, without importing the command modules."""
     import pkgutil
     from improver.cli import __path__ as improver_cli_pkg_path
 
+    index = load_help_index()
     yield ("help", improver_help)
     for minfo in pkgutil.iter_modules(improver_cli_pkg_path):
         mod_name = minfo.name
         if mod_name != "__main__":
-            mcli = importlib.import_module("improver.cli." + mod_name)
-            yield (mod_name, clizefy(mcli.process))
+            yield (mod_name, LazyCommand(mod_name, index.get(mod_name)))
 
 
 SUBCOMMANDS_TABLE = OrderedDict(sorted(_cli_items()))
@@ -391,6 +527,24 @@ SUBCOMMANDS_DISPATCHER = clizefy(
 )
 
 
+def dispatch_subcommand(prog_name, *args):
+    """Dispatch a command using SUBCOMMANDS_DISPATCHER.
+
+    Unlike the dispatcher itself, this function can be pickled, so it can
+    be used to run commands in other processes.
+
+    Args:
+        prog_name (str):
+            The program name.
+        *args:
+            The command and its arguments.
+
+    Returns:
+        Result of the command.
+    """
+    return SUBCOMMANDS_DISPATCHER(prog_name, *args)
+
+
 # IMPROVER top level main
 
 
@@ -447,6 +601,165 @@ def execute_command(dispatcher, prog_name, *args, verbose=False, dry_run=False):
     return result
 
 
+# Prefix marking a reference to the result of another pipeline step.
+STEP_REFERENCE = "@"
+
+
+def _step_references(args):
+    """Find the names of the pipeline steps referenced by command arguments.
+
+    Args:
+        args (list):
+            Command arguments, which may include nested commands.
+
+    Returns:
+        set of str:
+            Names of the referenced steps.
+    """
+    references = set()
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            references |= _step_references(arg)
+        elif isinstance(arg, str) and arg.startswith(STEP_REFERENCE):
+            references.add(arg[len(STEP_REFERENCE) :])
+    return references
+
+
+def _substitute_references(args, results, shared):
+    """Replace references to pipeline steps with their results.
+
+    Args:
+        args (list):
+            Command arguments, which may include nested commands.
+        results (dict):
+            Results of the completed steps.
+        shared (set of str):
+            Names of steps whose results are used by more than one step.
+            These results are copied, so that a command which modifies its
+            inputs in place cannot affect any other command.
+
+    Returns:
+        list:
+            Command arguments with the references replaced.
+    """
+    import copy
+
+    substituted = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            arg = _substitute_references(arg, results, shared)
+        elif isinstance(arg, str) and arg.startswith(STEP_REFERENCE):
+            name = arg[len(STEP_REFERENCE) :]
+            result = copy.deepcopy(results[name]) if name in shared else results[name]
+            # Wrap the result, so that it is not mistaken for a nested command.
+            arg = ObjectAsStr(result)
+        substituted.append(arg)
+    return substituted
+
+
+def execute_pipeline(
+    dispatcher,
+    prog_name,
+    steps,
+    inputs=None,
+    concurrency=1,
+    verbose=False,
+    dry_run=False,
+):
+    """Execute a pipeline of commands without starting a new improver
+    process for each command.
+
+    The pipeline is a directed acyclic graph of named steps. Each step is a
+    list of command arguments, as would be given to the improver command,
+    which may include nested commands as for the bracket syntax. An argument
+    of the form "@name" is replaced by the result of the step or input of
+    that name, so that intermediate results are held in memory rather than
+    written to file and loaded again. Each step is started as soon as all of
+    the steps it refers to have completed.
+
+    With a concurrency of one, the steps are run one at a time in this
+    process. Otherwise, independent steps are run at the same time in a
+    pool of worker processes, which are spawned rather than forked, as
+    neither iris nor the netCDF library is thread safe. The results are
+    passed between the processes in memory.
+
+    Args:
+        dispatcher (callable):
+            Dispatcher for the commands. This must be picklable if the
+            concurrency is greater than one.
+        prog_name (str):
+            The program name.
+        steps (dict):
+            Mapping of step names to lists of command arguments.
+        inputs (dict or None):
+            Mapping of names to objects, such as loaded cubes, which may be
+            referenced by the steps.
+        concurrency (int):
+            Maximum number of steps to run at the same time.
+        verbose (bool):
+            Print executed commands.
+        dry_run (bool):
+            Print commands to be executed.
+
+    Returns:
+        dict:
+            Mapping of step names to the results of the steps.
+
+    Raises:
+        ValueError: If a step refers to an unknown step or input.
+        ValueError: If the steps have circular references.
+    """
+    import multiprocessing
+    from collections import Counter
+    from concurrent.futures import (
+        FIRST_COMPLETED,
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+        wait,
+    )
+
+    results = dict(inputs or {})
+    pending = {name: _step_references(args) for name, args in steps.items()}
+    for name, references in pending.items():
+        unknown = references - set(steps) - set(results)
+        if unknown:
+            msg = "Step {} refers to unknown steps: {}".format(name, sorted(unknown))
+            raise ValueError(msg)
+    counts = Counter(ref for references in pending.values() for ref in references)
+    shared = {name for name, count in counts.items() if count > 1}
+
+    if concurrency > 1:
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=concurrency, mp_context=context)
+    else:
+        # Run the steps one at a time, without pickling the results.
+        pool = ThreadPoolExecutor(max_workers=1)
+
+    running = {}
+    with pool:
+        while pending or running:
+            ready = [name for name, refs in pending.items() if refs <= set(results)]
+            for name in ready:
+                del pending[name]
+                args = _substitute_references(steps[name], results, shared)
+                future = pool.submit(
+                    execute_command,
+                    dispatcher,
+                    prog_name,
+                    *args,
+                    verbose=verbose,
+                    dry_run=dry_run,
+                )
+                running[future] = name
+            if not running:
+                msg = "Circular references between steps: {}".format(sorted(pending))
+                raise ValueError(msg)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    return {name: results[name] for name in steps}
+
+
 @clizefy()
 def main(
     prog_name: parameters.pass_name,
@@ -456,6 +769,7 @@ def main(
     memprofile: value_converter(lambda _: _, name="FILENAME") = None,
     verbose=False,
     dry_run=False,
+    workers: int = 1,
 ):
     """IMPROVER NWP post-processing toolbox
 
@@ -483,15 +797,27 @@ def main(
             and a track of the maximum memory used by your program
             over time (suffixed with _MAX_TRACKER).
         verbose (bool):
-            Print executed commands
+            Print executed commands, and log information such as the time
+            taken to load each input file
         dry_run (bool):
             Print commands to be executed
+        workers (int):
+            Number of worker threads or processes used by plugins that
+            process realization or time slices in parallel.
 
     See improver help [--usage] [command] for more information
     on available command(s).
     """
+    from improver import BasePlugin
+
+    if workers < 1:
+        raise ValueError("The number of workers must be at least 1.")
     args = unbracket(args)
     exec_cmd = execute_command
+    if verbose:
+        import logging
+
+        logging.basicConfig(level=logging.INFO)
     if profile is not None:
         from improver.profile import profile_hook_enable
 
@@ -500,14 +826,19 @@ def main(
         from improver.memprofile import memory_profile_decorator
 
         exec_cmd = memory_profile_decorator(exec_cmd, memprofile)
-    result = exec_cmd(
-        SUBCOMMANDS_DISPATCHER,
-        prog_name,
-        command,
-        *args,
-        verbose=verbose,
-        dry_run=dry_run,
-    )
+    default_workers = BasePlugin._workers
+    BasePlugin._workers = workers
+    try:
+        result = exec_cmd(
+            SUBCOMMANDS_DISPATCHER,
+            prog_name,
+            command,
+            *args,
+            verbose=verbose,
+            dry_run=dry_run,
+        )
+    finally:
+        BasePlugin._workers = default_workers
     return result
 
 
@@ -37,7 +37,11 @@ from improver import cli
 @cli.clizefy
 @cli.with_output
 def process(
-    cube: cli.inputcube, *, threshold_ranges: cli.inputjson, threshold_units=None
+    cube: cli.inputcube,
+    *,
+    threshold_ranges: cli.inputjson,
+    threshold_units=None,
+    lazy=False,
 ):
     """
     Calculate the probabilities of occurrence between thresholds
@@ -51,6 +55,9 @@ def process(
         threshold_units (str):
             Units in which the thresholds are specified.  If None, defaults
             to the units of the threshold coordinate on the input cube.
+        lazy (bool):
+            If True, the probabilities are calculated lazily as the output
+            is saved, which bounds the memory used by large inputs.
 
     Returns:
         iris.cube.Cube:
@@ -63,5 +70,5 @@ def process(
     if threshold_units is None:
         threshold_units = str(find_threshold_coordinate(cube).units)
 
-    plugin = OccurrenceBetweenThresholds(threshold_ranges, threshold_units)
+    plugin = OccurrenceBetweenThresholds(threshold_ranges, threshold_units, lazy=lazy)
     return plugin(cube)
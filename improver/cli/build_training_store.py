@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""CLI to build or append to a training store of historic forecasts and truths
+for use in calibration."""
+
+from improver import cli
+
+
+@cli.clizefy
+def process(
+    *cubes: cli.inputcube, truth_attribute, store: cli.inputpath,
+):
+    """Build or append to a training store for calibration.
+
+    Appends historical forecasts and truths to a compact training store,
+    from which the calibration CLIs can load the forecasts and truths for a
+    forecast period and training period without loading every file. The
+    store is created if it does not exist, so this can be used both to
+    build a store from an archive of forecasts and truths, and to append
+    the latest forecasts and truths each day.
+
+    Args:
+        cubes (list of iris.cube.Cube):
+            A list of cubes containing historical forecasts and truths. The
+            forecasts and truths are distinguished using the truth attribute.
+            Each cube may contain several forecast reference times or
+            forecast periods.
+        truth_attribute (str):
+            An attribute and its value in the format of "attribute=value",
+            which must be present on historical truth cubes.
+        store (pathlib.Path):
+            Directory containing the training store.
+    """
+    from improver.calibration.training_store import TrainingDataStore
+
+    truth_key, truth_value = truth_attribute.split("=")
+    training_store = TrainingDataStore(store)
+    for cube in cubes:
+        if cube.attributes.get(truth_key) == truth_value:
+            training_store.append(truths=cube)
+        else:
+            training_store.append(historic_forecasts=cube)
@@ -38,10 +38,14 @@ from improver import cli
 @cli.with_output
 def process(
     *cubes: cli.inputcube,
-    truth_attribute,
+    truth_attribute=None,
     n_probability_bins: int = 5,
     single_value_lower_limit: bool = False,
     single_value_upper_limit: bool = False,
+    training_store: cli.inputpath = None,
+    forecast_period: int = None,
+    cycletime: str = None,
+    training_length: int = None,
 ):
     """Populate reliability tables for use in reliability calibration.
 
@@ -56,10 +60,12 @@ def process(
             corresponding truths used for calibration. These cubes must include
             the same diagnostic name in their names, and must both have
             equivalent threshold coordinates. The cubes will be distinguished
-            using the user provided truth attribute.
+            using the user provided truth attribute. These must not be
+            provided if a training store is provided.
         truth_attribute (str):
             An attribute and its value in the format of "attribute=value",
-            which must be present on truth cubes.
+            which must be present on truth cubes. This is required unless a
+            training store is provided.
         n_probability_bins (int):
             The total number of probability bins required in the reliability
             tables. If single value limits are turned on, these are included in
@@ -71,6 +77,23 @@ def process(
         single_value_upper_limit (bool):
             Mandates that the highest bin should be single valued, with a small
             precision tolerance, defined as 1.0E-6. The bin is thus (1 - 1.0E-6) to 1.
+        training_store (pathlib.Path):
+            Optionally, a training store, built using build-training-store,
+            from which to load the historical forecasts and truths, rather
+            than providing them as input cubes. If provided, the forecast
+            period must also be provided.
+        forecast_period (int):
+            The forecast period in hours of the historical forecasts to be
+            loaded from the training store.
+        cycletime (str):
+            The cycletime of the forecasts to be calibrated in the format
+            YYYYMMDDTHHMMZ. If provided, only historical forecasts from the
+            training store with a forecast reference time before the
+            cycletime, at the same time of day, are used.
+        training_length (int):
+            The number of days of historical forecasts before the cycletime
+            to use from the training store. If not provided, all historical
+            forecasts before the cycletime are used.
 
     Returns:
         iris.cube.Cube:
@@ -82,7 +105,25 @@ def process(
         ConstructReliabilityCalibrationTables,
     )
 
-    forecast, truth, _ = split_forecasts_and_truth(cubes, truth_attribute)
+    if training_store:
+        from improver.calibration.training_store import TrainingDataStore
+
+        if forecast_period is None:
+            msg = "The forecast period must be provided with a training store."
+            raise ValueError(msg)
+        if cubes:
+            msg = "No cubes may be provided with a training store."
+            raise ValueError(msg)
+        forecast, truth = TrainingDataStore(training_store).load(
+            forecast_period * 3600,
+            cycletime=cycletime,
+            training_length=training_length,
+        )
+    else:
+        if truth_attribute is None:
+            msg = "A truth attribute must be provided without a training store."
+            raise ValueError(msg)
+        forecast, truth, _ = split_forecasts_and_truth(cubes, truth_attribute)
 
     return ConstructReliabilityCalibrationTables(
         n_probability_bins=n_probability_bins,
@@ -35,17 +35,32 @@ Regression (NGR)."""
 
 from improver import cli
 
+# Creates the value_converter that clize needs.
+inputcoeffs = cli.create_constrained_inputcubelist_converter(
+    "emos_coefficient_alpha",
+    "emos_coefficient_beta",
+    "emos_coefficient_gamma",
+    "emos_coefficient_delta",
+)
+
 
 @cli.clizefy
 @cli.with_output
 def process(
     *cubes: cli.inputcube,
     distribution,
-    truth_attribute,
+    truth_attribute=None,
     units=None,
     predictor="mean",
     tolerance: float = 0.01,
     max_iterations: int = 1000,
+    minimisation_method="Nelder-Mead",
+    point_by_point=False,
+    previous_coefficients: inputcoeffs = None,
+    training_store: cli.inputpath = None,
+    forecast_period: int = None,
+    cycletime: str = None,
+    training_length: int = None,
 ):
     """Estimate coefficients for Ensemble Model Output Statistics.
 
@@ -62,14 +77,16 @@ def process(
             cube name and will be separated based on the truth attribute.
             Optionally this may also contain a single land-sea mask cube on the
             same domain as the historic forecasts and truth (where land points
-            are set to one and sea points are set to zero).
+            are set to one and sea points are set to zero). If a training
+            store is provided, this contains only the optional land-sea mask.
         distribution (str):
             The distribution that will be used for minimising the
             Continuous Ranked Probability Score when estimating the EMOS
             coefficients. This will be dependent upon the input phenomenon.
         truth_attribute (str):
             An attribute and its value in the format of "attribute=value",
-            which must be present on historical truth cubes.
+            which must be present on historical truth cubes. This is required
+            unless a training store is provided.
         units (str):
             The units that calibration should be undertaken in. The historical
             forecast and truth will be converted as required.
@@ -91,6 +108,41 @@ def process(
             is raised. If the predictor is "realizations", then the number of
             iterations may require increasing, as there will be more
             coefficients to solve.
+        minimisation_method (str):
+            The method used for the minimisation, either "Nelder-Mead" or
+            "L-BFGS-B". If "L-BFGS-B" is requested, the analytic gradient of
+            the CRPS is used, which typically requires far fewer evaluations
+            of the CRPS over the training data.
+        point_by_point (bool):
+            If True, coefficients are estimated independently for each grid
+            point or site, rather than one set of coefficients for the whole
+            domain. The separate minimisations are distributed over the
+            workers given by the --workers option of the improver command.
+        previous_coefficients (iris.cube.CubeList):
+            Optionally, the coefficients estimated previously for the same
+            diagnostic, distribution and predictor, for example by the
+            previous day's training. If provided, these are used as the
+            initial guess for the minimisation. As the training period only
+            moves on by one day, the coefficients change little, and the
+            minimisation converges much more quickly than from the default
+            initial guess.
+        training_store (pathlib.Path):
+            Optionally, a training store, built using build-training-store,
+            from which to load the historical forecasts and truths, rather
+            than providing them as input cubes. If provided, the forecast
+            period must also be provided.
+        forecast_period (int):
+            The forecast period in hours of the historical forecasts to be
+            loaded from the training store.
+        cycletime (str):
+            The cycletime of the forecasts to be calibrated in the format
+            YYYYMMDDTHHMMZ. If provided, only historical forecasts from the
+            training store with a forecast reference time before the
+            cycletime, at the same time of day, are used.
+        training_length (int):
+            The number of days of historical forecasts before the cycletime
+            to use from the training store. If not provided, all historical
+            forecasts before the cycletime are used.
 
     Returns:
         iris.cube.CubeList:
@@ -103,7 +155,34 @@ def process(
         EstimateCoefficientsForEnsembleCalibration,
     )
 
-    forecast, truth, land_sea_mask = split_forecasts_and_truth(cubes, truth_attribute)
+    if training_store:
+        from improver.calibration.training_store import TrainingDataStore
+
+        if forecast_period is None:
+            msg = "The forecast period must be provided with a training store."
+            raise ValueError(msg)
+        if len(cubes) > 1:
+            msg = (
+                "Only a land-sea mask may be provided with a training store, "
+                "but {} cubes were provided.".format(len(cubes))
+            )
+            raise ValueError(msg)
+        land_sea_mask = cubes[0] if cubes else None
+        if land_sea_mask and land_sea_mask.name() != "land_binary_mask":
+            msg = "The land_sea_mask cube does not have the name 'land_binary_mask'"
+            raise ValueError(msg)
+        forecast, truth = TrainingDataStore(training_store).load(
+            forecast_period * 3600,
+            cycletime=cycletime,
+            training_length=training_length,
+        )
+    else:
+        if truth_attribute is None:
+            msg = "A truth attribute must be provided without a training store."
+            raise ValueError(msg)
+        forecast, truth, land_sea_mask = split_forecasts_and_truth(
+            cubes, truth_attribute
+        )
 
     plugin = EstimateCoefficientsForEnsembleCalibration(
         distribution,
@@ -111,6 +190,13 @@ def process(
         predictor=predictor,
         tolerance=tolerance,
         max_iterations=max_iterations,
+        minimisation_method=minimisation_method,
+        point_by_point=point_by_point,
     )
 
-    return plugin(forecast, truth, landsea_mask=land_sea_mask)
+    return plugin(
+        forecast,
+        truth,
+        landsea_mask=land_sea_mask,
+        previous_coefficients=previous_coefficients,
+    )
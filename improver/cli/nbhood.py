@@ -51,6 +51,7 @@ def process(
     remask=False,
     percentiles: cli.comma_separated_list = DEFAULT_PERCENTILES,
     halo_radius: float = None,
+    backend="correlate",
 ):
     """Runs neighbourhood processing.
 
@@ -80,9 +81,13 @@ def process(
         radii (list of float):
             The radius or a list of radii in metres of the neighbourhood to
             apply.
-            If it is a list, it must be the same length as lead_times, which
-            defines at which lead time to use which nbhood radius. The radius
-            will be interpolated for intermediate lead times.
+            If lead_times are set, it must be the same length as lead_times,
+            which defines at which lead time to use which nbhood radius. The
+            radius will be interpolated for intermediate lead times.
+            Otherwise, the neighbourhood is applied at each of the radii and
+            the results are returned along a neighbourhood_radius
+            dimension. Square neighbourhoods of every radius are calculated
+            from a single summed-area table.
         lead_times (list of int):
             The lead times in hours that correspond to the radii to be used.
             If lead_times are set, radii must be a list the same length as
@@ -112,6 +117,16 @@ def process(
             where a larger grid was defined than the standard grid and we want
             to clip the grid back to the standard grid. Otherwise no clipping
             is applied.
+        backend (str):
+            Method used to apply the circular kernel. "correlate" applies
+            the kernel directly, "fft" uses FFT convolution and
+            "summed_area" sums runs of accumulated rows, which requires
+            constant weighting. "auto" selects direct correlation for small
+            kernels and the faster of the other two methods for large
+            kernels. These agree to within round-off. backend is only
+            applicable for calculating "probabilities" neighbourhood output
+            using the circular kernel.
+            Options: "correlate", "fft", "summed_area", "auto".
 
     Returns:
         iris.cube.Cube:
@@ -126,6 +141,10 @@ def process(
         RuntimeError:
             If degree_as_complex is used with neighbourhood_shape='circular'.
     """
+    import numpy as np
+    from iris.coords import AuxCoord
+    from iris.cube import CubeList
+
     from improver.nbhood import radius_by_lead_time
     from improver.nbhood.nbhood import (
         GeneratePercentilesFromANeighbourhood,
@@ -154,7 +173,10 @@ def process(
         # convert cube data into complex numbers
         cube.data = WindDirection.deg_to_complex(cube.data)
 
-    radius_or_radii, lead_times = radius_by_lead_time(radii, lead_times)
+    if lead_times is None and len(radii) > 1:
+        radius_or_radii = [float(radius) for radius in radii]
+    else:
+        radius_or_radii, lead_times = radius_by_lead_time(radii, lead_times)
 
     if neighbourhood_output == "probabilities":
         result = NeighbourhoodProcessing(
@@ -164,6 +186,7 @@ def process(
             weighted_mode=weighted_mode,
             sum_or_fraction=sum_or_fraction,
             re_mask=remask,
+            backend=backend,
         )(cube, mask_cube=mask)
     elif neighbourhood_output == "percentiles":
         result = GeneratePercentilesFromANeighbourhood(
@@ -173,6 +196,16 @@ def process(
             percentiles=percentiles,
         )(cube)
 
+    if isinstance(result, CubeList):
+        # Combine the results for each radius along a new dimension
+        for radius, radius_cube in zip(radius_or_radii, result):
+            radius_cube.add_aux_coord(
+                AuxCoord(
+                    np.float32(radius), long_name="neighbourhood_radius", units="m"
+                )
+            )
+        result = result.merge_cube()
+
     if degrees_as_complex:
         # convert neighbourhooded cube back to degrees
         result.data = WindDirection.complex_to_deg(result.data)
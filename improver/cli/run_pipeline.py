@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Script to run a pipeline of IMPROVER commands within a single process."""
+
+from clize import parameters
+
+from improver import cli
+
+
+@cli.clizefy
+def process(
+    prog_name: parameters.pass_name,
+    pipeline: cli.inputjson,
+    *,
+    concurrency: int = 1,
+    verbose=False,
+    dry_run=False,
+):
+    """Run a pipeline of IMPROVER commands within a single process.
+
+    Running each command separately re-imports the libraries and reloads
+    its inputs from file. This runs all of the commands in one process and
+    keeps the intermediate results in memory. The pipeline is a JSON file
+    describing a directed acyclic graph of named steps, e.g.::
+
+        {
+            "inputs": {"temperature": "temperature.nc",
+                       "orography": "orography.nc"},
+            "steps": {
+                "lapse_rate": ["temp-lapse-rate", "@temperature",
+                               "@orography", "land_mask.nc"],
+                "adjusted": ["apply-lapse-rate", "@temperature",
+                             "@lapse_rate", "@orography",
+                             "target_orography.nc", "--output", "adjusted.nc"]
+            }
+        }
+
+    Each step is a list of command arguments, as would be given to the
+    improver command, and may include nested lists in place of the bracket
+    syntax. Arguments of the form "@name" are replaced by the result of the
+    step or input of that name. Steps are started as soon as the steps they
+    refer to are complete, so that independent steps can run concurrently
+    in separate worker processes.
+
+    Args:
+        pipeline (dict):
+            Pipeline definition, with a "steps" dictionary of lists of
+            command arguments. An optional "inputs" dictionary gives the
+            paths of files that are used by several steps, which are loaded
+            once as cubes and referred to using "@name".
+        concurrency (int):
+            Maximum number of steps to run at the same time. If greater
+            than one, the steps are run in a pool of worker processes, and
+            the results they refer to are passed to them in memory.
+        verbose (bool):
+            Print executed commands.
+        dry_run (bool):
+            Print commands to be executed.
+
+    Returns:
+        None:
+            The steps are expected to write their results using their
+            --output options.
+    """
+    from improver.cli import dispatch_subcommand, execute_pipeline
+    from improver.utilities.load import load_cube
+
+    inputs = {
+        name: load_cube(path) for name, path in pipeline.get("inputs", {}).items()
+    }
+    execute_pipeline(
+        dispatch_subcommand,
+        prog_name.split()[0],
+        pipeline["steps"],
+        inputs=inputs,
+        concurrency=concurrency,
+        verbose=verbose,
+        dry_run=dry_run,
+    )
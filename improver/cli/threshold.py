@@ -46,6 +46,7 @@ def process(
     fuzzy_factor: float = None,
     collapse_coord: str = None,
     vicinity: float = None,
+    lazy=False,
 ):
     """Module to apply thresholding to a parameter dataset.
 
@@ -96,6 +97,10 @@ def process(
         vicinity (float):
             Distance in metres used to define the vicinity within which to
             search for an occurrence
+        lazy (bool):
+            If True, the thresholds are applied lazily as the output is
+            saved, which bounds the memory used by large inputs. Vicinity
+            and collapse_coord processing realise the thresholded data.
 
     Returns:
         iris.cube.Cube:
@@ -154,6 +159,7 @@ def process(
         threshold_units=threshold_units,
         comparison_operator=comparison_operator,
         each_threshold_func=each_threshold_func_list,
+        lazy=lazy,
     )(cube)
 
     if vicinity is not None:
@@ -30,6 +30,8 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Module containing lapse rate calculation plugins."""
 
+from functools import partial
+
 import iris
 import numpy as np
 from iris.exceptions import CoordinateNotFoundError
@@ -398,13 +400,18 @@ class LapseRate(BasePlugin):
         else:
             temp_data_slices = [temperature_cube.data]
 
-        # Calculate lapse rate for each realization
-        lapse_rate_data = []
-        for temperature_data in temp_data_slices:
-            lapse_rate_array = self._generate_lapse_rate_array(
-                temperature_data, orography_data, land_sea_mask_data
-            )
-            lapse_rate_data.append(lapse_rate_array)
+        # Calculate lapse rate for each realization. The calculation loops
+        # over grid points in Python, so realizations are shared between
+        # processes if more than one worker is configured.
+        lapse_rate_data = self.parallel_map(
+            partial(
+                self._generate_lapse_rate_array,
+                orography_data=orography_data,
+                land_sea_mask_data=land_sea_mask_data,
+            ),
+            temp_data_slices,
+            executor="process",
+        )
         lapse_rate_data = np.array(lapse_rate_data)
         if not has_realization_dimension:
             lapse_rate_data = np.squeeze(lapse_rate_data)
@@ -70,3 +70,24 @@ def radius_by_lead_time(radii, lead_times):
         lead_times = [int(x) for x in lead_times]
 
     return radius_or_radii, lead_times
+
+
+def kernel_cache_info():
+    """
+    Report the use of the caches of neighbourhood kernels and normalisation
+    arrays. These caches are shared by all neighbourhood processing within a
+    process, so kernels are reused across calls, slices and lead times.
+
+    Returns:
+        dict:
+            Statistics for each cache, as returned by the `cache_info` method
+            of functions wrapped with `functools.lru_cache`, giving the
+            number of hits and misses and the current and maximum sizes.
+    """
+    from improver.nbhood.circular_kernel import cached_circular_kernel
+    from improver.nbhood.square_kernel import unmasked_area_sum
+
+    return {
+        "circular_kernel": cached_circular_kernel.cache_info(),
+        "unmasked_area_sum": unmasked_area_sum.cache_info(),
+    }
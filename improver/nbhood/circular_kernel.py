@@ -30,21 +30,48 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """This module contains methods for circular neighbourhood processing."""
 
+import functools
+
 import iris
 import numpy as np
 from scipy.ndimage.filters import correlate
+from scipy.signal import fftconvolve
 
 from improver.constants import DEFAULT_PERCENTILES
 from improver.utilities.cube_checker import (
     check_cube_coordinates,
     find_dimension_coordinate_mismatch,
 )
-from improver.utilities.neighbourhood_tools import pad_and_roll
+from improver.utilities.neighbourhood_tools import (
+    circlesum,
+    pad_and_roll,
+    sliding_percentiles,
+)
 from improver.utilities.spatial import (
     check_if_grid_is_equal_area,
     distance_to_number_of_grid_cells,
 )
 
+# Kernel ranges (in grid cells) up to which direct correlation is used when
+# the kernel backend is selected automatically. For larger kernels the
+# cost of direct correlation, which grows with the area of the kernel,
+# exceeds that of the FFT or summed-area backends.
+MAX_DIRECT_KERNEL_RANGE = 4
+
+# Neighbourhood totals from the FFT and summed-area backends smaller than
+# this fraction of the largest possible total are round-off and set to zero.
+ROUNDING_TOLERANCE = 1.0e-12
+
+KERNEL_BACKENDS = ["auto", "correlate", "fft", "summed_area"]
+
+# Neighbourhoods of up to this many grid cells are gathered and sorted
+# directly when calculating percentiles. For larger neighbourhoods it is
+# faster to update each window as it slides along the rows.
+MAX_SORTED_WINDOW_SIZE = 150
+
+# Number of distinct kernels held by cached_circular_kernel.
+KERNEL_CACHE_SIZE = 32
+
 
 def check_radius_against_distance(cube, radius):
     """Check required distance isn't greater than the size of the domain.
@@ -106,7 +133,9 @@ def circular_kernel(full_ranges, ranges, weighted_mode):
         # highest weighting, with the weighting decreasing with distance
         # away from the central grid point.
         open_grid_summed_squared = np.sum(open_grid ** 2.0).astype(float)
-        kernel[:] = (area - open_grid_summed_squared) / area
+        kernel[:] = np.reshape(
+            (area - open_grid_summed_squared) / area, np.shape(kernel)
+        )
         mask = kernel < 0.0
     else:
         mask = np.reshape(np.sum(open_grid ** 2) > area, np.shape(kernel))
@@ -114,6 +143,40 @@ def circular_kernel(full_ranges, ranges, weighted_mode):
     return kernel
 
 
+@functools.lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def cached_circular_kernel(ranges, weighted_mode):
+    """
+    Create a two dimensional circular kernel and its total weight.
+
+    The lru_cache decorator caches the kernels, so that a kernel is only
+    created once per process for each combination of radius (in grid cells,
+    i.e. the radius in metres combined with the grid spacing) and weighting,
+    however many cubes, slices or lead times it is applied to. The kernel
+    size also defines the width of any padding required. The cache hits and
+    misses are reported by :func:`~improver.nbhood.kernel_cache_info`.
+
+    Args:
+        ranges (int):
+            Number of grid cells in the x and y direction used to create
+            the kernel.
+        weighted_mode (bool):
+            If True, use a circle for neighbourhood kernel with
+            weighting decreasing with radius.
+            If False, use a circle with constant weighting.
+
+    Returns:
+        (tuple): tuple containing:
+            **kernel** (numpy.ndarray):
+                Read-only 2D array containing the circular kernel.
+            **kernel_area** (float):
+                Sum of the kernel weights, used to normalise neighbourhood
+                totals into fractions.
+    """
+    kernel = circular_kernel(np.array([ranges, ranges]), ranges, weighted_mode)
+    kernel.setflags(write=False)
+    return kernel, float(np.sum(kernel))
+
+
 class CircularNeighbourhood:
 
     """
@@ -123,7 +186,13 @@ class CircularNeighbourhood:
     avoid computational ineffiency and possible memory errors.
     """
 
-    def __init__(self, weighted_mode=True, sum_or_fraction="fraction", re_mask=False):
+    def __init__(
+        self,
+        weighted_mode=True,
+        sum_or_fraction="fraction",
+        re_mask=False,
+        backend="correlate",
+    ):
         """
         Initialise class.
 
@@ -145,6 +214,21 @@ class CircularNeighbourhood:
                 mask is not applied. Therefore, the neighbourhood processing
                 may result in values being present in areas that were
                 originally masked.
+            backend (str):
+                Method used to apply the kernel. The default, "correlate",
+                applies the dense kernel directly. "fft" uses FFT
+                convolution and "summed_area" sums runs of accumulated rows,
+                which is only available when weighted_mode is False. Both
+                agree with direct correlation to within round-off. "auto"
+                uses direct correlation for small kernels and otherwise the
+                summed-area method for unweighted kernels or FFT convolution
+                for weighted kernels.
+
+        Raises:
+            ValueError: If sum_or_fraction is not valid.
+            ValueError: If backend is not valid.
+            ValueError: If the summed_area backend is requested with
+                weighted_mode.
         """
         self.weighted_mode = weighted_mode
         if sum_or_fraction not in ["sum", "fraction"]:
@@ -158,12 +242,26 @@ class CircularNeighbourhood:
             raise ValueError(msg)
         self.sum_or_fraction = sum_or_fraction
         self.re_mask = re_mask
+        if backend not in KERNEL_BACKENDS:
+            raise ValueError(
+                f"The kernel backend {backend} is invalid. "
+                f"Valid options are {KERNEL_BACKENDS}."
+            )
+        if backend == "summed_area" and weighted_mode:
+            raise ValueError(
+                "The summed_area kernel backend can only be used with "
+                "weighted_mode set to False."
+            )
+        self.backend = backend
         self.kernel = None
 
     def __repr__(self):
         """Represent the configured plugin instance as a string."""
-        result = "<CircularNeighbourhood: weighted_mode: {}, " "sum_or_fraction: {}>"
-        return result.format(self.weighted_mode, self.sum_or_fraction)
+        result = (
+            "<CircularNeighbourhood: weighted_mode: {}, "
+            "sum_or_fraction: {}, backend: {}>"
+        )
+        return result.format(self.weighted_mode, self.sum_or_fraction, self.backend)
 
     def apply_circular_kernel(self, cube, ranges):
         """
@@ -185,25 +283,100 @@ class CircularNeighbourhood:
 
         """
         data = cube.data
-        full_ranges = np.zeros([np.ndim(data)])
+        kernel_shape = np.ones([np.ndim(data)], dtype=int)
         axes = []
         for axis in ["x", "y"]:
             coord_name = cube.coord(axis=axis).name()
             axes.append(cube.coord_dims(coord_name)[0])
 
         for axis in axes:
-            full_ranges[axis] = ranges
-        self.kernel = circular_kernel(full_ranges, ranges, self.weighted_mode)
+            kernel_shape[axis] = 2 * ranges + 1
+        # The kernel is symmetric, so it can be expanded to span the x and y
+        # dimensions of the data whatever their order.
+        kernel, kernel_area = cached_circular_kernel(int(ranges), self.weighted_mode)
+        self.kernel = kernel.reshape(kernel_shape)
         # Smooth the data by applying the kernel.
         if self.sum_or_fraction == "sum":
             total_area = 1.0
         else:
             # sum_or_fraction is in fraction mode
-            total_area = np.sum(self.kernel)
+            total_area = kernel_area
+
+        backend = self._select_backend(data, ranges)
+        if backend == "correlate":
+            smoothed = correlate(data, self.kernel, mode="nearest")
+        else:
+            # Move the spatial dimensions to the end, so that all other
+            # dimensions are processed together, and pad with the nearest
+            # values to match the edge behaviour of direct correlation.
+            spatial_data = np.moveaxis(np.asarray(data), axes[::-1], [-2, -1])
+            if backend == "summed_area":
+                smoothed = circlesum(spatial_data, ranges, mode="edge")
+            else:
+                kernel = np.moveaxis(self.kernel, axes[::-1], [-2, -1])
+                padding = [(0, 0)] * (data.ndim - 2) + [(ranges, ranges)] * 2
+                padded = np.pad(spatial_data, padding, mode="edge")
+                smoothed = fftconvolve(
+                    padded.astype(np.float64), kernel, mode="valid", axes=(-2, -1)
+                )
+            smoothed = self._remove_rounding_errors(smoothed, spatial_data, kernel_area)
+            smoothed = np.moveaxis(smoothed, [-2, -1], axes[::-1]).astype(data.dtype)
 
-        cube.data = correlate(data, self.kernel, mode="nearest") / total_area
+        cube.data = smoothed / total_area
         return cube
 
+    @staticmethod
+    def _remove_rounding_errors(smoothed, data, kernel_area):
+        """
+        Remove the round-off left in neighbourhood totals by the FFT and
+        summed-area backends. Totals that are zero within round-off are set
+        to zero, and all totals are clipped to the range that a kernel of
+        non-negative weights can produce from the input data, so that, for
+        example, probabilities remain within [0, 1].
+
+        Args:
+            smoothed (numpy.ndarray):
+                Neighbourhood totals calculated from data.
+            data (numpy.ndarray):
+                Array to which the kernel was applied.
+            kernel_area (float):
+                Sum of the kernel weights.
+
+        Returns:
+            numpy.ndarray:
+                Neighbourhood totals with the round-off removed.
+        """
+        lower = np.nanmin(data) * kernel_area
+        upper = np.nanmax(data) * kernel_area
+        tolerance = ROUNDING_TOLERANCE * max(abs(lower), abs(upper))
+        smoothed[np.abs(smoothed) <= tolerance] = 0.0
+        return np.clip(smoothed, lower, upper)
+
+    def _select_backend(self, data, ranges):
+        """
+        Select the method used to apply the kernel.
+
+        Args:
+            data (numpy.ndarray):
+                Array to which the kernel will be applied.
+            ranges (int):
+                Number of grid cells in the x and y direction used to create
+                the kernel.
+
+        Returns:
+            str:
+                Name of the kernel backend to use.
+        """
+        if self.backend != "auto":
+            return self.backend
+        if ranges <= MAX_DIRECT_KERNEL_RANGE or not np.issubdtype(
+            data.dtype, np.floating
+        ):
+            return "correlate"
+        if self.weighted_mode:
+            return "fft"
+        return "summed_area"
+
     def run(self, cube, radius, mask_cube=None):
         """
 
@@ -380,24 +553,30 @@ class GeneratePercentilesFromACircularNeighbourhood:
                      [ 0.5,  0.5,  0.5]]]
         """
         kernel_mask = kernel > 0
-        nb_slices = pad_and_roll(
-            slice_2d.data, kernel.shape, mode="mean", stat_length=max(kernel.shape) // 2
-        )
         percentiles = np.array(self.percentiles, dtype=np.float32)
+        pad_options = {"mode": "mean", "stat_length": max(kernel.shape) // 2}
 
         # Create cube for output percentile data.
         pctcube = self.make_percentile_cube(slice_2d)
 
-        # Collapse neighbourhood windows into percentiles.
-        # (Loop over outer dimension to reduce memory footprint.)
-        for nb_chunk, perc_chunk in zip(nb_slices, pctcube.data.swapaxes(0, 1)):
-            np.percentile(
-                nb_chunk[..., kernel_mask],
-                percentiles,
-                axis=-1,
-                out=perc_chunk,
-                overwrite_input=True,
-            )
+        if np.count_nonzero(kernel_mask) <= MAX_SORTED_WINDOW_SIZE:
+            nb_slices = pad_and_roll(slice_2d.data, kernel.shape, **pad_options)
+            # Collapse neighbourhood windows into percentiles.
+            # (Loop over outer dimension to reduce memory footprint.)
+            for nb_chunk, perc_chunk in zip(nb_slices, pctcube.data.swapaxes(0, 1)):
+                np.percentile(
+                    nb_chunk[..., kernel_mask],
+                    percentiles,
+                    axis=-1,
+                    out=perc_chunk,
+                    overwrite_input=True,
+                )
+        else:
+            # Calculate the percentiles using windows that are updated as
+            # they slide along the rows, rather than sorting each window.
+            pctcube.data = sliding_percentiles(
+                slice_2d.data, kernel_mask, percentiles, **pad_options
+            ).astype(pctcube.dtype)
 
         return pctcube
 
@@ -433,8 +612,7 @@ class GeneratePercentilesFromACircularNeighbourhood:
         # Take data array and identify X and Y axes indices
         grid_cell = distance_to_number_of_grid_cells(cube, radius)
         check_radius_against_distance(cube, radius)
-        ranges_xy = np.array((grid_cell, grid_cell))
-        kernel = circular_kernel(ranges_xy, grid_cell, weighted_mode=False)
+        kernel, _ = cached_circular_kernel(grid_cell, False)
         # Loop over each 2D slice to reduce memory demand and derive
         # percentiles on the kernel. Will return an extra dimension.
         pctcubelist = iris.cube.CubeList()
@@ -72,11 +72,13 @@ class BaseNeighbourhoodProcessing(PostProcessingPlugin):
             neighbourhood_method (Class object):
                 Instance of the class containing the method that will be used
                 for the neighbourhood processing.
-            radii (float or list if defining lead times):
+            radii (float or list):
                 The radii in metres of the neighbourhood to apply.
                 Rounded up to convert into integer number of grid
                 points east and north, based on the characteristic spacing
                 at the zero indices of the cube projection-x and y coords.
+                If a list is given without lead times, the neighbourhood is
+                applied at each of the radii.
             lead_times (list):
                 List of lead times or forecast periods, at which the radii
                 within 'radii' are defined. The lead times are expected
@@ -130,11 +132,74 @@ class BaseNeighbourhoodProcessing(PostProcessingPlugin):
         )
         return result.format(neighbourhood_method, self.radii, self.lead_times)
 
+    def _run_multiple_radii(self, cube, mask_cube=None):
+        """Apply the neighbourhood processing method at each of the radii.
+
+        If the method can calculate several radii together, as the square
+        neighbourhood can from a single summed-area table, this is used.
+        Otherwise the method is run separately for each radius.
+
+        Args:
+            cube (iris.cube.Cube):
+                Cube to apply a neighbourhood processing method to.
+            mask_cube (iris.cube.Cube):
+                Cube containing the array to be used as a mask.
+
+        Returns:
+            iris.cube.CubeList:
+                Cubes after applying the neighbourhood processing method,
+                one for each of the radii, in the same order as the radii.
+        """
+        run_multiple_radii = getattr(
+            self.neighbourhood_method, "run_multiple_radii", None
+        )
+        if run_multiple_radii is not None:
+            return run_multiple_radii(cube, self.radii, mask_cube=mask_cube)
+        # The method may modify the cube it is given, so each radius is
+        # applied to a copy.
+        return iris.cube.CubeList(
+            self.neighbourhood_method.run(cube.copy(), radius, mask_cube=mask_cube)
+            for radius in self.radii
+        )
+
+    @staticmethod
+    def _combine_realizations(cube, cubes_real):
+        """Combine the neighbourhood processed realizations into a single
+        cube with the dimensions of the input cube.
+
+        Args:
+            cube (iris.cube.Cube):
+                Cube to which the neighbourhood processing was applied.
+            cubes_real (list of iris.cube.Cube):
+                Neighbourhood processed cubes for each realization.
+
+        Returns:
+            iris.cube.Cube:
+                Neighbourhood processed cube.
+        """
+        if len(cubes_real) > 1:
+            combined_cube = MergeCubes()(cubes_real, slice_over_realization=True)
+        else:
+            combined_cube = cubes_real[0]
+
+        # Promote dimensional coordinates that used to be present.
+        exception_coordinates = find_dimension_coordinate_mismatch(
+            cube, combined_cube, two_way_mismatch=False
+        )
+        return check_cube_coordinates(
+            cube, combined_cube, exception_coordinates=exception_coordinates
+        )
+
     def process(self, cube, mask_cube=None):
         """
         Supply neighbourhood processing method, in order to smooth the
         input cube.
 
+        If a list of radii was given without lead times, the neighbourhood
+        processing is applied at each of the radii. Square neighbourhoods of
+        every radius are then calculated from a single summed-area table for
+        each slice of the cube.
+
         Args:
             cube (iris.cube.Cube):
                 Cube to apply a neighbourhood processing method to, in order to
@@ -143,9 +208,11 @@ class BaseNeighbourhoodProcessing(PostProcessingPlugin):
                 Cube containing the array to be used as a mask.
 
         Returns:
-            iris.cube.Cube:
+            iris.cube.Cube or iris.cube.CubeList:
                 Cube after applying a neighbourhood processing method, so that
-                the resulting field is smoothed.
+                the resulting field is smoothed. If a list of radii was given
+                without lead times, a list of cubes is returned, one for each
+                of the radii, in the same order as the radii.
 
         """
         if not getattr(self.neighbourhood_method, "run", None) or not callable(
@@ -170,9 +237,13 @@ class BaseNeighbourhoodProcessing(PostProcessingPlugin):
         if np.isnan(cube.data).any():
             raise ValueError("Error: NaN detected in input cube data")
 
+        multiple_radii = self.lead_times is None and isinstance(self.radii, list)
+
         cubes_real = []
         for cube_realization in slices_over_realization:
-            if self.lead_times is None:
+            if multiple_radii:
+                cube_new = self._run_multiple_radii(cube_realization, mask_cube)
+            elif self.lead_times is None:
                 cube_new = self.neighbourhood_method.run(
                     cube_realization, self.radii, mask_cube=mask_cube
                 )
@@ -197,20 +268,12 @@ class BaseNeighbourhoodProcessing(PostProcessingPlugin):
 
             cubes_real.append(cube_new)
 
-        if len(cubes_real) > 1:
-            combined_cube = MergeCubes()(cubes_real, slice_over_realization=True)
-        else:
-            combined_cube = cubes_real[0]
-
-        # Promote dimensional coordinates that used to be present.
-        exception_coordinates = find_dimension_coordinate_mismatch(
-            cube, combined_cube, two_way_mismatch=False
-        )
-        combined_cube = check_cube_coordinates(
-            cube, combined_cube, exception_coordinates=exception_coordinates
-        )
-
-        return combined_cube
+        if multiple_radii:
+            return iris.cube.CubeList(
+                self._combine_realizations(cube, list(radius_cubes))
+                for radius_cubes in zip(*cubes_real)
+            )
+        return self._combine_realizations(cube, cubes_real)
 
 
 class GeneratePercentilesFromANeighbourhood(BaseNeighbourhoodProcessing):
@@ -275,6 +338,7 @@ class NeighbourhoodProcessing(BaseNeighbourhoodProcessing):
         weighted_mode=True,
         sum_or_fraction="fraction",
         re_mask=False,
+        backend="correlate",
     ):
         """
         Create a neighbourhood processing subclass that applies a smoothing
@@ -289,6 +353,8 @@ class NeighbourhoodProcessing(BaseNeighbourhoodProcessing):
                 Rounded up to convert into integer number of grid
                 points east and north, based on the characteristic spacing
                 at the zero indices of the cube projection-x and y coords.
+                If a list is given without lead times, a cube is returned
+                for each of the radii.
             lead_times (list):
                 List of lead times or forecast periods, at which the radii
                 within 'radii' are defined. The lead times are expected
@@ -311,15 +377,25 @@ class NeighbourhoodProcessing(BaseNeighbourhoodProcessing):
                 mask is not applied. Therefore, the neighbourhood processing
                 may result in values being present in areas that were
                 originally masked.
+            backend (str):
+                Method used to apply a circular kernel, as described for
+                :class:`~improver.nbhood.circular_kernel.CircularNeighbourhood`.
+                Options: "correlate" (the default), "fft", "summed_area" or
+                "auto", which selects the fastest backend for the size of
+                the kernel. Square neighbourhoods are always calculated from
+                summed-area tables, so this has no effect on them.
         """
         super(NeighbourhoodProcessing, self).__init__(
             neighbourhood_method, radii, lead_times=lead_times
         )
 
         methods = {"circular": CircularNeighbourhood, "square": SquareNeighbourhood}
+        options = {"backend": backend} if neighbourhood_method == "circular" else {}
         try:
             method = methods[neighbourhood_method]
-            self.neighbourhood_method = method(weighted_mode, sum_or_fraction, re_mask)
+            self.neighbourhood_method = method(
+                weighted_mode, sum_or_fraction, re_mask, **options
+            )
         except KeyError:
             msg = (
                 "The neighbourhood_method requested: {} is not a "
@@ -36,6 +36,7 @@ import numpy as np
 
 from improver import PostProcessingPlugin
 from improver.utilities.cube_checker import check_cube_coordinates
+from improver.utilities.cube_manipulation import enforce_coordinate_ordering
 from improver.utilities.pad_spatial import pad_cube_with_halo, remove_halo_from_cube
 
 
@@ -102,10 +103,12 @@ class RecursiveFilter(PostProcessingPlugin):
         Args:
             cube (iris.cube.Cube):
                 Cube that will be checked for whether the data is masked
-                or nan. The cube should contain only x and y dimensions,
-                so will generally be a slice of a cube.
+                or nan. The x and y dimensions of the cube should be the
+                trailing dimensions; any leading dimensions are set up
+                together.
             mask_cube (iris.cube.Cube):
-                Input Cube containing the array to be used as a mask.
+                Input Cube containing the array to be used as a mask. The
+                mask is broadcast against the trailing dimensions of the cube.
 
         Returns:
             (tuple): tuple containing:
@@ -122,7 +125,7 @@ class RecursiveFilter(PostProcessingPlugin):
         if not mask_cube:
             mask = cube.copy(np.ones_like(cube.data, dtype=np.bool))
         else:
-            mask = mask_cube
+            mask = cube.copy(np.broadcast_to(mask_cube.data, cube.shape).copy())
         # If there is a mask, fill the data array of the mask_cube with a
         # logical array, logically inverted compared to the integer version of
         # the mask within the original data array.
@@ -141,6 +144,47 @@ class RecursiveFilter(PostProcessingPlugin):
         cube.data[mask.data == 0] = 0.0
         return cube, mask, nan_array
 
+    @staticmethod
+    def _recursion_views(grid, smoothing_coefficients, axis):
+        """
+        Provide views of the grid and smoothing coefficients in which the
+        axis being recursed over is the leading axis. Any dimensions of the
+        grid preceding those of the smoothing coefficients (e.g. realization
+        or threshold) are carried along so that they are filtered together.
+
+        Args:
+            grid (numpy.ndarray):
+                Array containing the input data to which the recursive
+                filter will be applied.
+            smoothing_coefficients (numpy.ndarray):
+                2D array of smoothing_coefficient values, matching the final
+                two dimensions of the grid along the non-recursed axis.
+            axis (int):
+                Index of the axis of the grid over which to recurse.
+
+        Returns:
+            (tuple): tuple containing:
+                **grid_view** (numpy.ndarray):
+                    View of the grid with the recursed axis moved to the front.
+                **coefficients_view** (numpy.ndarray):
+                    View of the smoothing coefficients with the recursed axis
+                    moved to the front.
+
+        Raises:
+            ValueError: If the axis to recurse over is not one of the
+                dimensions spanned by the smoothing coefficients.
+        """
+        axis = axis % grid.ndim
+        coefficient_axis = axis - (grid.ndim - smoothing_coefficients.ndim)
+        if coefficient_axis < 0:
+            raise ValueError(
+                f"Unable to recurse over axis {axis} of a {grid.ndim}D grid "
+                f"using {smoothing_coefficients.ndim}D smoothing coefficients."
+            )
+        grid_view = np.moveaxis(grid, axis, 0)
+        coefficients_view = np.moveaxis(smoothing_coefficients, coefficient_axis, 0)
+        return grid_view, coefficients_view
+
     @staticmethod
     def _recurse_forward(grid, smoothing_coefficients, axis):
         """
@@ -160,33 +204,38 @@ class RecursiveFilter(PostProcessingPlugin):
 
             :math:`B_{i-1}` = New value at gridpoint i - 1
 
+        Each step along the recursed axis updates a whole hyperplane of the
+        grid at once, so any leading dimensions (e.g. realizations or
+        thresholds) are filtered in the same pass. The grid is modified in
+        place.
+
         Args:
             grid (numpy.ndarray):
-                2D array containing the input data to which the recursive
-                filter will be applied.
+                Array containing the input data to which the recursive
+                filter will be applied. The final two dimensions must match
+                the smoothing coefficients; any preceding dimensions are
+                filtered together.
             smoothing_coefficients (numpy.ndarray):
                 Matching 2D array of smoothing_coefficient values that will be
                 used when applying the recursive filter along the specified
                 axis.
             axis (int):
-                Index of the spatial axis (0 or 1) over which to recurse.
+                Index of the spatial axis of the grid over which to recurse.
 
         Returns:
             numpy.ndarray:
-                2D array containing the smoothed field after the recursive
+                Array containing the smoothed field after the recursive
                 filter method has been applied to the input array in the
                 forward direction along the specified axis.
         """
-        lim = grid.shape[axis]
-        for i in range(1, lim):
-            if axis == 0:
-                grid[i, :] = (1.0 - smoothing_coefficients[i - 1, :]) * grid[
-                    i, :
-                ] + smoothing_coefficients[i - 1, :] * grid[i - 1, :]
-            if axis == 1:
-                grid[:, i] = (1.0 - smoothing_coefficients[:, i - 1]) * grid[
-                    :, i
-                ] + smoothing_coefficients[:, i - 1] * grid[:, i - 1]
+        grid_view, coefficients = RecursiveFilter._recursion_views(
+            grid, smoothing_coefficients, axis
+        )
+        increment = np.empty_like(grid_view[0])
+        for i in range(1, grid_view.shape[0]):
+            np.subtract(grid_view[i - 1], grid_view[i], out=increment)
+            increment *= coefficients[i - 1]
+            grid_view[i] += increment
         return grid
 
     @staticmethod
@@ -208,33 +257,36 @@ class RecursiveFilter(PostProcessingPlugin):
 
             :math:`B_{i+1}` = New value at gridpoint i+1
 
+        As for the forward direction, any leading dimensions of the grid are
+        filtered in the same pass and the grid is modified in place.
+
         Args:
             grid (numpy.ndarray):
-                2D array containing the input data to which the recursive
-                filter will be applied.
+                Array containing the input data to which the recursive
+                filter will be applied. The final two dimensions must match
+                the smoothing coefficients; any preceding dimensions are
+                filtered together.
             smoothing_coefficients (numpy.ndarray):
                 Matching 2D array of smoothing_coefficient values that will be
                 used when applying the recursive filter along the specified
                 axis.
             axis (int):
-                Index of the spatial axis (0 or 1) over which to recurse.
+                Index of the spatial axis of the grid over which to recurse.
 
         Returns:
             numpy.ndarray:
-                2D array containing the smoothed field after the recursive
+                Array containing the smoothed field after the recursive
                 filter method has been applied to the input array in the
                 backwards direction along the specified axis.
         """
-        lim = grid.shape[axis]
-        for i in range(lim - 2, -1, -1):
-            if axis == 0:
-                grid[i, :] = (1.0 - smoothing_coefficients[i, :]) * grid[
-                    i, :
-                ] + smoothing_coefficients[i, :] * grid[i + 1, :]
-            if axis == 1:
-                grid[:, i] = (1.0 - smoothing_coefficients[:, i]) * grid[
-                    :, i
-                ] + smoothing_coefficients[:, i] * grid[:, i + 1]
+        grid_view, coefficients = RecursiveFilter._recursion_views(
+            grid, smoothing_coefficients, axis
+        )
+        increment = np.empty_like(grid_view[0])
+        for i in range(grid_view.shape[0] - 2, -1, -1):
+            np.subtract(grid_view[i + 1], grid_view[i], out=increment)
+            increment *= coefficients[i]
+            grid_view[i] += increment
         return grid
 
     @staticmethod
@@ -246,8 +298,10 @@ class RecursiveFilter(PostProcessingPlugin):
 
         Args:
             cube (iris.cube.Cube):
-                2D cube containing the input data to which the recursive
-                filter will be applied.
+                Cube containing the input data to which the recursive
+                filter will be applied. The cube must contain x and y
+                dimensions; any other dimensions are filtered together
+                as a single batched array.
             smoothing_coefficients_x (iris.cube.Cube):
                 2D cube containing array of smoothing_coefficient values that
                 will be used when applying the recursive filter along the
@@ -267,21 +321,17 @@ class RecursiveFilter(PostProcessingPlugin):
         (x_index,) = cube.coord_dims(cube.coord(axis="x").name())
         (y_index,) = cube.coord_dims(cube.coord(axis="y").name())
         output = cube.data
+        # Present the data with (y, x) as the trailing dimensions, matching
+        # the smoothing coefficients. This is a view, so filtering in place
+        # updates the cube data directly.
+        grid = np.moveaxis(output, [y_index, x_index], [-2, -1])
 
         for _ in range(iterations):
-            output = RecursiveFilter._recurse_forward(
-                output, smoothing_coefficients_x.data, x_index
-            )
-            output = RecursiveFilter._recurse_backward(
-                output, smoothing_coefficients_x.data, x_index
-            )
-            output = RecursiveFilter._recurse_forward(
-                output, smoothing_coefficients_y.data, y_index
-            )
-            output = RecursiveFilter._recurse_backward(
-                output, smoothing_coefficients_y.data, y_index
-            )
-            cube.data = output
+            RecursiveFilter._recurse_forward(grid, smoothing_coefficients_x.data, -1)
+            RecursiveFilter._recurse_backward(grid, smoothing_coefficients_x.data, -1)
+            RecursiveFilter._recurse_forward(grid, smoothing_coefficients_y.data, -2)
+            RecursiveFilter._recurse_backward(grid, smoothing_coefficients_y.data, -2)
+        cube.data = output
         return cube
 
     @staticmethod
@@ -383,20 +433,17 @@ class RecursiveFilter(PostProcessingPlugin):
         and :func:`~improver.cli.generate_orographic_smoothing_coefficients`.
         The steps undertaken are:
 
-        1. Split the input cube into slices determined by the co-ordinates in
-           the x and y directions.
-        2. Construct an array of filter parameters (smoothing_coefficients_x
-           and smoothing_coefficients_y) for each cube slice that are used to
-           weight the recursive filter in the x- and y-directions.
-        3. Pad each cube slice with a square-neighbourhood halo and apply
-           the recursive filter for the required number of iterations.
-        4. Remove the halo from the cube slice and append the recursed cube
-           slice to a 'recursed cube'.
-        5. Merge all the cube slices in the 'recursed cube' into a 'new cube'.
-        6. Modify the 'new cube' so that its scalar dimension co-ordinates are
-           consistent with those in the original input cube.
-        7. Return the 'new cube' which now contains the recursively filtered
-           values for the original input cube.
+        1. Validate the smoothing coefficients against the x and y
+           co-ordinates of the input cube and pad them with a halo.
+        2. Reorder a copy of the input cube so that the x and y dimensions
+           are trailing, then mask and pad the whole multi-dimensional
+           array with a square-neighbourhood halo.
+        3. Apply the recursive filter for the required number of iterations
+           to all slices at once, broadcasting the smoothing coefficients
+           (smoothing_coefficients_x and smoothing_coefficients_y) across
+           any leading dimensions such as realization or threshold.
+        4. Remove the halo, re-apply the mask if requested, and restore the
+           dimension order of the original input cube.
 
         The smoothing_coefficient determines how much "value" of a cell
         undergoing filtering is comprised of the current value at that cell and
@@ -447,37 +494,40 @@ class RecursiveFilter(PostProcessingPlugin):
             smoothing_coefficients_y
         )
 
-        recursed_cube = iris.cube.CubeList()
-        for output in cube.slices([cube.coord(axis="y"), cube.coord(axis="x")]):
+        # Filter every x-y slice of the cube as a single batched array, with
+        # the spatial dimensions trailing to match the smoothing coefficients.
+        output = cube.copy()
+        enforce_coordinate_ordering(
+            output,
+            [output.coord(axis="y").name(), output.coord(axis="x").name()],
+            anchor_start=False,
+        )
 
-            # Setup cube and mask for processing.
-            # This should set up a mask full of 1.0 if None is provided
-            # and set the data 0.0 where mask is 0.0 or the data is NaN
-            output, mask, nan_array = self.set_up_cubes(output, mask_cube)
-            mask = mask.data.squeeze()
+        # Setup cube and mask for processing.
+        # This should set up a mask full of 1.0 if None is provided
+        # and set the data 0.0 where mask is 0.0 or the data is NaN
+        output, mask, nan_array = self.set_up_cubes(output, mask_cube)
+        mask = mask.data
 
-            padded_cube = pad_cube_with_halo(
-                output, 2 * self.edge_width, 2 * self.edge_width, pad_method="symmetric"
-            )
+        padded_cube = pad_cube_with_halo(
+            output, 2 * self.edge_width, 2 * self.edge_width, pad_method="symmetric"
+        )
 
-            new_cube = self._run_recursion(
-                padded_cube,
-                smoothing_coefficients_x,
-                smoothing_coefficients_y,
-                self.iterations,
-            )
-            new_cube = remove_halo_from_cube(
-                new_cube, 2 * self.edge_width, 2 * self.edge_width
+        new_cube = self._run_recursion(
+            padded_cube,
+            smoothing_coefficients_x,
+            smoothing_coefficients_y,
+            self.iterations,
+        )
+        new_cube = remove_halo_from_cube(
+            new_cube, 2 * self.edge_width, 2 * self.edge_width
+        )
+        if self.re_mask:
+            new_cube.data[nan_array] = np.nan
+            new_cube.data = np.ma.masked_array(
+                new_cube.data, mask=np.logical_not(mask), copy=False
             )
-            if self.re_mask:
-                new_cube.data[nan_array] = np.nan
-                new_cube.data = np.ma.masked_array(
-                    new_cube.data, mask=np.logical_not(mask), copy=False
-                )
-
-            recursed_cube.append(new_cube)
 
-        new_cube = recursed_cube.merge_cube()
         new_cube = check_cube_coordinates(cube, new_cube)
 
         return new_cube
@@ -30,6 +30,8 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """This module contains methods for square neighbourhood processing."""
 
+import functools
+
 import iris
 import numpy as np
 
@@ -39,10 +41,46 @@ from improver.utilities.cube_checker import (
     check_for_x_and_y_axes,
 )
 from improver.utilities.cube_manipulation import clip_cube_data
-from improver.utilities.neighbourhood_tools import boxsum
+from improver.utilities.neighbourhood_tools import (
+    boxsum,
+    masked_boxsum,
+    multi_boxsum,
+)
 from improver.utilities.pad_spatial import pad_cube_with_halo, remove_halo_from_cube
 from improver.utilities.spatial import distance_to_number_of_grid_cells
 
+# Number of distinct normalisation arrays held by unmasked_area_sum.
+AREA_SUM_CACHE_SIZE = 8
+
+
+@functools.lru_cache(maxsize=AREA_SUM_CACHE_SIZE)
+def unmasked_area_sum(shape, nb_size):
+    """
+    Calculate the number of grid cells within the square neighbourhood of
+    each point of an unmasked grid, which is used to normalise neighbourhood
+    totals into means. Points near the edge of the grid have fewer cells
+    within their neighbourhood.
+
+    The lru_cache decorator caches the arrays, so that they are only
+    calculated once per process for each grid shape and neighbourhood size,
+    rather than for every slice. The cache hits and misses are reported by
+    :func:`~improver.nbhood.kernel_cache_info`.
+
+    Args:
+        shape (tuple of int):
+            Shape of the grid.
+        nb_size (int):
+            Size of the square neighbourhood as the number of grid cells.
+
+    Returns:
+        numpy.ndarray:
+            Read-only array of the number of grid cells within the
+            neighbourhood of each point.
+    """
+    area_sum = boxsum(np.ones(shape, dtype=np.int64), nb_size, mode="constant")
+    area_sum.setflags(write=False)
+    return area_sum
+
 
 class SquareNeighbourhood:
 
@@ -98,12 +136,22 @@ class SquareNeighbourhood:
         """
         Apply neighbourhood processing.
 
+        The mask may have additional leading dimensions, in which case the
+        data is processed with each of the masks in turn and the result has
+        the shape of the mask. The totals for all of the masks are calculated
+        in a single cumulative pass using
+        :func:`~improver.utilities.neighbourhood_tools.masked_boxsum`.
+
+        If a list of neighbourhood sizes is given, the totals for every size
+        are read from a single summed-area table and a list of results is
+        returned.
+
         Args:
             data (numpy.ndarray):
                 Input data array.
             mask (numpy.ndarray):
                 Mask of valid input data elements.
-            nb_size (int):
+            nb_size (int or list of int):
                 Size of the square neighbourhood as the number of grid cells.
             sum_only (bool):
                 If true, return neighbourhood sum instead of mean.
@@ -112,9 +160,10 @@ class SquareNeighbourhood:
                 `numpy.ma.MaskedArray`.
 
         Returns:
-            numpy.ndarray:
+            numpy.ndarray or list of numpy.ndarray:
                 Array containing the smoothed field after the square
-                neighbourhood method has been applied.
+                neighbourhood method has been applied, or a list of these
+                arrays for each of the neighbourhood sizes.
         """
         if not sum_only:
             min_val = np.nanmin(data)
@@ -125,7 +174,7 @@ class SquareNeighbourhood:
         if mask is None:
             area_mask = np.ones(data.shape, dtype=area_mask_dtype)
         else:
-            area_mask = np.array(mask, dtype=area_mask_dtype, copy=False)
+            area_mask = np.array(mask, dtype=area_mask_dtype)
 
         # Data mask to be eventually used for re-masking.
         # (This is OK even if mask is None, it gives a scalar False mask then.)
@@ -145,32 +194,79 @@ class SquareNeighbourhood:
         # Replace invalid elements with zeros.
         nan_mask = np.isnan(data)
         zero_mask = nan_mask | data_mask
-        np.copyto(area_mask, 0, where=zero_mask)
-        np.copyto(data, 0, where=zero_mask)
+        np.copyto(data, 0, where=nan_mask)
+        area_mask = np.where(zero_mask, 0, area_mask)
 
-        # Calculate neighbourhood totals for input data.
-        data = boxsum(data, nb_size, mode="constant")
-        if not sum_only:
-            # Calculate neighbourhood totals for mask.
-            area_sum = boxsum(area_mask, nb_size, mode="constant")
-            with np.errstate(divide="ignore", invalid="ignore"):
-                # Calculate neighbourhood mean.
-                data = data / area_sum
-            mask_invalid = (area_sum == 0) | nan_mask
-            np.copyto(data, np.nan, where=mask_invalid)
-            data = data.clip(min_val, max_val)
+        nb_sizes = nb_size if isinstance(nb_size, list) else [nb_size]
+        if sum_only:
+            # Calculate neighbourhood totals for input data.
+            data_sums = multi_boxsum(
+                np.where(zero_mask, 0, data), nb_sizes, mode="constant"
+            )
+            area_sums = [None] * len(nb_sizes)
+        elif zero_mask.any():
+            # Calculate neighbourhood totals for input data and mask together.
+            data_sums, area_sums = masked_boxsum(
+                data, area_mask, nb_sizes, mode="constant"
+            )
+        else:
+            # Neighbourhood totals for the mask are the same for every slice
+            # if there are no masked or invalid points.
+            data_sums = [
+                np.broadcast_to(data_sum, area_mask.shape)
+                for data_sum in multi_boxsum(data, nb_sizes, mode="constant")
+            ]
+            area_sums = [
+                unmasked_area_sum(data.shape[-2:], int(size)) for size in nb_sizes
+            ]
 
         # Output type.
         if issubclass(data.dtype.type, np.complexfloating):
-            data_dtype = np.complex64
+            output_dtype = np.complex64
         else:
-            data_dtype = np.float32
-        data = data.astype(data_dtype)
+            output_dtype = np.float32
 
-        if re_mask:
-            data = np.ma.masked_array(data, data_mask, copy=False)
+        results = []
+        for data_sum, area_sum in zip(data_sums, area_sums):
+            if not sum_only:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    # Calculate neighbourhood mean.
+                    data_sum = data_sum / area_sum
+                mask_invalid = (area_sum == 0) | nan_mask
+                np.copyto(data_sum, np.nan, where=mask_invalid)
+                data_sum = data_sum.clip(min_val, max_val)
+            result = data_sum.astype(output_dtype)
+            if re_mask:
+                result = np.ma.masked_array(result, data_mask, copy=False)
+            results.append(result)
 
-        return data
+        return results if isinstance(nb_size, list) else results[0]
+
+    @staticmethod
+    def _stack_mask_results(cube_slice, data, mask_coord):
+        """
+        Create a cube from the neighbourhood results for a stack of masks,
+        with the coordinate of the masks as the leading dimension.
+
+        Args:
+            cube_slice (iris.cube.Cube):
+                2D slice of the cube to which the masks were applied.
+            data (numpy.ndarray):
+                Neighbourhood results with a leading dimension for the masks.
+            mask_coord (iris.coords.DimCoord):
+                Coordinate of the stack of masks.
+
+        Returns:
+            iris.cube.Cube:
+                Cube of the results with the mask coordinate as an additional
+                leading dimension.
+        """
+        band_cubes = iris.cube.CubeList()
+        for index, band_data in enumerate(data):
+            band_cube = cube_slice.copy(data=band_data)
+            band_cube.add_aux_coord(mask_coord[index].copy())
+            band_cubes.append(iris.util.new_axis(band_cube, mask_coord.name()))
+        return band_cubes.concatenate_cube()
 
     def run(self, cube, radius, mask_cube=None):
         """
@@ -193,41 +289,87 @@ class SquareNeighbourhood:
                 Radius in metres for use in specifying the number of
                 grid cells used to create a square neighbourhood.
             mask_cube (iris.cube.Cube):
-                Cube containing the array to be used as a mask.
+                Cube containing the array to be used as a mask. This may
+                have a leading dimension holding a stack of masks, in which
+                case the neighbourhood totals for every mask are calculated
+                together and the result has this as an additional leading
+                dimension.
 
         Returns:
             iris.cube.Cube:
                 Cube containing the smoothed field after the square
                 neighbourhood method has been applied.
         """
+        return self.run_multiple_radii(cube, [radius], mask_cube=mask_cube)[0]
+
+    def run_multiple_radii(self, cube, radii, mask_cube=None):
+        """
+        Apply square neighbourhoods of several radii to a cube.
+
+        The neighbourhood totals for every radius are read from a single
+        summed-area table for each slice of the cube, so the input is only
+        padded and accumulated once however many radii are requested.
+
+        Args:
+            cube (iris.cube.Cube):
+                Cube containing the array to which the square neighbourhoods
+                will be applied.
+            radii (list of float):
+                Radii in metres for use in specifying the number of
+                grid cells used to create each square neighbourhood.
+            mask_cube (iris.cube.Cube):
+                Cube containing the array to be used as a mask. This may
+                have a leading dimension holding a stack of masks, in which
+                case each mask is applied to the cube and the results are
+                returned with this as an additional leading dimension.
+
+        Returns:
+            iris.cube.CubeList:
+                Cubes containing the smoothed field after the square
+                neighbourhood method has been applied, one for each of the
+                radii, in the same order as the radii.
+        """
         # If the data is masked, the mask will be processed as well as the
         # original_data * mask array.
-        check_radius_against_distance(cube, radius)
-        original_attributes = cube.attributes
-        original_methods = cube.cell_methods
-        grid_cells = distance_to_number_of_grid_cells(cube, radius)
-        nb_size = 2 * grid_cells + 1
+        nb_sizes = []
+        for radius in radii:
+            check_radius_against_distance(cube, radius)
+            grid_cells = distance_to_number_of_grid_cells(cube, radius)
+            nb_sizes.append(2 * grid_cells + 1)
         try:
             mask_cube_data = mask_cube.data
         except AttributeError:
             mask_cube_data = None
+        mask_coords = []
+        if mask_cube is not None and mask_cube.ndim > 2:
+            mask_coords = [mask_cube.coord(dimensions=0, dim_coords=True)]
 
-        result_slices = iris.cube.CubeList()
+        result_slices = [iris.cube.CubeList() for _ in nb_sizes]
         for cube_slice in cube.slices([cube.coord(axis="y"), cube.coord(axis="x")]):
-            cube_slice.data = self._calculate_neighbourhood(
+            results = self._calculate_neighbourhood(
                 cube_slice.data,
                 mask_cube_data,
-                nb_size,
+                nb_sizes,
                 self.sum_or_fraction == "sum",
                 self.re_mask,
             )
-            result_slices.append(cube_slice)
-        neighbourhood_averaged_cube = result_slices.merge_cube()
-
-        neighbourhood_averaged_cube.cell_methods = original_methods
-        neighbourhood_averaged_cube.attributes = original_attributes
+            for slices, data in zip(result_slices, results):
+                if mask_coords:
+                    slices.append(
+                        self._stack_mask_results(cube_slice, data, *mask_coords)
+                    )
+                else:
+                    slices.append(cube_slice.copy(data=data))
 
-        neighbourhood_averaged_cube = check_cube_coordinates(
-            cube, neighbourhood_averaged_cube
-        )
-        return neighbourhood_averaged_cube
+        neighbourhood_cubes = iris.cube.CubeList()
+        for slices in result_slices:
+            neighbourhood_averaged_cube = slices.merge_cube()
+            neighbourhood_averaged_cube.cell_methods = cube.cell_methods
+            neighbourhood_averaged_cube.attributes = cube.attributes
+            neighbourhood_averaged_cube = check_cube_coordinates(
+                cube,
+                neighbourhood_averaged_cube,
+                exception_coordinates=[coord.name() for coord in mask_coords],
+            )
+            neighbourhood_cubes.append(neighbourhood_averaged_cube)
+        return neighbourhood_cubes
@@ -286,6 +286,13 @@ class ApplyNeighbourhoodProcessingWithAMask(PostProcessingPlugin):
         )
         yname = cube.coord(axis="y").name()
         xname = cube.coord(axis="x").name()
+        # Put the coord_for_masking first, so that the neighbourhood totals
+        # for every mask are calculated together for each 2D input slice.
+        mask_cube = mask_cube.copy()
+        mask_cube.transpose(
+            [mask_cube.coord_dims(self.coord_for_masking)[0]]
+            + [mask_cube.coord_dims(name)[0] for name in [yname, xname]]
+        )
         result_slices = iris.cube.CubeList([])
         # Take 2D slices of the input cube for memory issues.
         prev_x_y_slice = None
@@ -301,15 +308,7 @@ class ApplyNeighbourhoodProcessingWithAMask(PostProcessingPlugin):
                 continue
             prev_x_y_slice = x_y_slice
 
-            cube_slices = iris.cube.CubeList([])
-            # Apply each mask in in mask_cube to the 2D input slice.
-            for mask_slice in mask_cube.slices_over(self.coord_for_masking):
-                output_cube = plugin(x_y_slice, mask_cube=mask_slice)
-                coord_object = mask_slice.coord(self.coord_for_masking).copy()
-                output_cube.add_aux_coord(coord_object)
-                output_cube = iris.util.new_axis(output_cube, self.coord_for_masking)
-                cube_slices.append(output_cube)
-            concatenated_cube = cube_slices.concatenate_cube()
+            concatenated_cube = plugin(x_y_slice, mask_cube=mask_cube)
             if self.collapse_weights is not None:
                 concatenated_cube = self.collapse_mask_coord(concatenated_cube)
             result_slices.append(concatenated_cube)
@@ -29,6 +29,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 """Module for NowcastLightning class and associated functions."""
+from functools import partial
 from math import isclose
 
 import iris
@@ -222,6 +223,67 @@ class NowcastLightning(PostProcessingPlugin):
         new_cube.cell_methods = None
         return new_cube
 
+    def _modify_first_guess_slice(
+        self, first_guess_lightning_cube, lightning_rate_cube, cube_slice
+    ):
+        """
+        Modify first-guess lightning probability with the nowcast lightning
+        rate for a single forecast validity time.
+
+        Args:
+            first_guess_lightning_cube (iris.cube.Cube):
+                First-guess lightning probability.
+            lightning_rate_cube (iris.cube.Cube):
+                Nowcast lightning rate.
+            cube_slice (iris.cube.Cube):
+                Provides the meta-data for the Nowcast lightning probability
+                at this validity time.
+
+        Returns:
+            iris.cube.Cube:
+                Modified first-guess lightning probability for this time.
+
+        Raises:
+            iris.exceptions.ConstraintMismatchError:
+                If lightning_rate_cube does not contain the expected time.
+        """
+        this_time = iris_time_to_datetime(cube_slice.coord("time").copy())[0]
+        lightning_rate_slice = lightning_rate_cube.extract(
+            iris.Constraint(time=this_time)
+        )
+        err_string = "No matching {} cube for {}"
+        if not isinstance(lightning_rate_slice, iris.cube.Cube):
+            raise ConstraintMismatchError(err_string.format("lightning", this_time))
+        first_guess_slice = extract_nearest_time_point(
+            first_guess_lightning_cube, this_time, allowed_dt_difference=7201
+        )
+        first_guess_slice = cube_slice.copy(data=first_guess_slice.data)
+        first_guess_slice.coord("forecast_period").convert_units("minutes")
+        fcmins = first_guess_slice.coord("forecast_period").points[0]
+
+        # Increase prob(lightning) to Risk 2 (pl_dict[2]) when
+        #   lightning nearby (lrt_lev2)
+        # (and leave unchanged when condition is not met):
+        first_guess_slice.data = np.where(
+            (lightning_rate_slice.data >= self.lrt_lev2)
+            & (first_guess_slice.data < self.pl_dict[2]),
+            self.pl_dict[2],
+            first_guess_slice.data,
+        )
+
+        # Increase prob(lightning) to Risk 1 (pl_dict[1]) when within
+        #   lightning storm (lrt_lev1):
+        # (and leave unchanged when condition is not met):
+        lratethresh = self.lrt_lev1(fcmins)
+        first_guess_slice.data = np.where(
+            (lightning_rate_slice.data >= lratethresh)
+            & (first_guess_slice.data < self.pl_dict[1]),
+            self.pl_dict[1],
+            first_guess_slice.data,
+        )
+
+        return first_guess_slice
+
     def _modify_first_guess(
         self,
         cube,
@@ -267,47 +329,16 @@ class NowcastLightning(PostProcessingPlugin):
                 If lightning_rate_cube or first_guess_lightning_cube do not
                 contain the expected times.
         """
-        new_cube_list = iris.cube.CubeList([])
-        # Loop over required forecast validity times
-        for cube_slice in cube.slices_over("time"):
-            this_time = iris_time_to_datetime(cube_slice.coord("time").copy())[0]
-            lightning_rate_slice = lightning_rate_cube.extract(
-                iris.Constraint(time=this_time)
-            )
-            err_string = "No matching {} cube for {}"
-            if not isinstance(lightning_rate_slice, iris.cube.Cube):
-                raise ConstraintMismatchError(err_string.format("lightning", this_time))
-            first_guess_slice = extract_nearest_time_point(
-                first_guess_lightning_cube, this_time, allowed_dt_difference=7201
-            )
-            first_guess_slice = cube_slice.copy(data=first_guess_slice.data)
-            first_guess_slice.coord("forecast_period").convert_units("minutes")
-            fcmins = first_guess_slice.coord("forecast_period").points[0]
-
-            # Increase prob(lightning) to Risk 2 (pl_dict[2]) when
-            #   lightning nearby (lrt_lev2)
-            # (and leave unchanged when condition is not met):
-            first_guess_slice.data = np.where(
-                (lightning_rate_slice.data >= self.lrt_lev2)
-                & (first_guess_slice.data < self.pl_dict[2]),
-                self.pl_dict[2],
-                first_guess_slice.data,
-            )
-
-            # Increase prob(lightning) to Risk 1 (pl_dict[1]) when within
-            #   lightning storm (lrt_lev1):
-            # (and leave unchanged when condition is not met):
-            lratethresh = self.lrt_lev1(fcmins)
-            first_guess_slice.data = np.where(
-                (lightning_rate_slice.data >= lratethresh)
-                & (first_guess_slice.data < self.pl_dict[1]),
-                self.pl_dict[1],
-                first_guess_slice.data,
-            )
-
-            new_cube_list.append(first_guess_slice)
-
-        new_prob_lightning_cube = new_cube_list.merge_cube()
+        # Process each of the required forecast validity times
+        new_prob_lightning_cube = self.process_slices(
+            partial(
+                self._modify_first_guess_slice,
+                first_guess_lightning_cube,
+                lightning_rate_cube,
+            ),
+            cube,
+            "time",
+        )
         new_prob_lightning_cube = check_cube_coordinates(cube, new_prob_lightning_cube)
 
         # Apply precipitation adjustments.
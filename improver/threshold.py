@@ -33,6 +33,7 @@
 
 import operator
 
+import dask.array as da
 import iris
 import numpy as np
 from cf_units import Unit
@@ -42,6 +43,261 @@ from improver.utilities.cube_manipulation import enforce_coordinate_ordering
 from improver.utilities.rescale import rescale
 
 
+def _check_for_nan(data):
+    """Check that data contains no NaN values. This is suitable for use
+    with dask map_blocks, so that lazy data is checked as it is computed.
+
+    Args:
+        data (numpy.ndarray):
+            Data to be checked.
+
+    Returns:
+        numpy.ndarray:
+            The unmodified data.
+
+    Raises:
+        ValueError: if a np.nan value is detected within the data.
+    """
+    if np.isnan(data).any():
+        raise ValueError("Error: NaN detected in input cube data")
+    return data
+
+
+def _mask_like(truth_values, data):
+    """Mask thresholded data where the input data is masked. The masked
+    points retain the values of the input data, as data that has not been
+    thresholded.
+
+    Args:
+        truth_values (numpy.ndarray or dask.array.Array):
+            Thresholded data, with a leading threshold dimension followed by
+            the dimensions of the input data.
+        data (numpy.ndarray or dask.array.Array):
+            Input data, which may be masked.
+
+    Returns:
+        numpy.ma.MaskedArray or dask.array.Array:
+            Masked thresholded data.
+    """
+    if isinstance(data, da.Array):
+        mask = da.ma.getmaskarray(data)
+        values = da.where(mask, da.ma.getdata(data), truth_values)
+        return da.ma.masked_array(
+            values.astype(truth_values.dtype),
+            mask=da.broadcast_to(mask, truth_values.shape),
+        )
+    mask = np.ma.getmask(data)
+    if mask is np.ma.nomask:
+        return np.ma.masked_where(mask, truth_values, copy=False)
+    # Overwrite masked values that have been thresholded
+    # with the un-thresholded values from the input data.
+    np.copyto(truth_values, np.ma.getdata(data), casting="unsafe", where=mask)
+    return np.ma.masked_array(
+        truth_values, mask=np.broadcast_to(mask, truth_values.shape).copy()
+    )
+
+
+THRESHOLD_BLOCK_SIZE = 16384
+
+_COMPARISON_UFUNCS = {
+    operator.ge: np.greater_equal,
+    operator.gt: np.greater,
+    operator.le: np.less_equal,
+    operator.lt: np.less,
+}
+
+
+def _threshold_kernel(data, thresholds, fuzzy_bounds, comparison, below, out):
+    """Evaluate the truth values of data relative to all thresholds at
+    once, broadcasting the thresholds and their fuzzy bounds against the
+    data and writing into a preallocated output. The arithmetic matches
+    that of thresholding with each threshold in turn.
+
+    Args:
+        data (numpy.ndarray):
+            Data to be thresholded, which must not be masked.
+        thresholds (list of float):
+            Threshold values.
+        fuzzy_bounds (list of tuple of float):
+            Lower and upper fuzzy bounds of each threshold. Thresholds with
+            equal bounds are sharp.
+        comparison (callable):
+            Comparison operator for sharp thresholds, eg. operator.gt.
+        below (bool):
+            If True, fuzzy truth values are probabilities of being below
+            the threshold.
+        out (numpy.ndarray):
+            Array of floats of shape (len(thresholds),) + data.shape into
+            which the truth values are written.
+
+    Returns:
+        numpy.ndarray:
+            The output array.
+
+    Raises:
+        ValueError: if a fuzzy threshold is equal to one of its bounds.
+    """
+    thresholds = np.array(thresholds, dtype=np.float64)
+    lower, upper = np.array(fuzzy_bounds, dtype=np.float64).reshape(-1, 2).T
+    sharp = lower == upper
+    if sharp.any() and not sharp.all():
+        # Evaluate sharp and fuzzy thresholds separately
+        for selection in (sharp, ~sharp):
+            (index,) = np.nonzero(selection)
+            part = np.empty((len(index),) + data.shape, dtype=out.dtype)
+            _threshold_kernel(
+                data,
+                thresholds[index],
+                [fuzzy_bounds[i] for i in index],
+                comparison,
+                below,
+                part,
+            )
+            out[index] = part
+        return out
+
+    # work in the precision of arithmetic between the data and scalar values
+    work_dtype = np.result_type(data, 0.0)
+    work = out if work_dtype == out.dtype else np.empty(out.shape, work_dtype)
+
+    def broadcastable(values):
+        """Cast values as scalars are cast in arithmetic with the data, with
+        a shape that broadcasts the values along the leading dimension."""
+        return values.astype(work_dtype).reshape((-1,) + (1,) * data.ndim)
+
+    if sharp.all():
+        _COMPARISON_UFUNCS[comparison](data, broadcastable(thresholds), out=out)
+        return out
+
+    if np.any(thresholds == lower) or np.any(thresholds == upper):
+        raise ValueError(
+            "Cannot rescale a zero input range between a threshold and its "
+            "fuzzy bounds {}".format(fuzzy_bounds)
+        )
+    # scale exceedance probabilities linearly between 0 at the lower bound
+    # and 0.5 at the threshold value...
+    np.subtract(data, broadcastable(lower), out=work)
+    np.multiply(work, 0.5, out=work)
+    np.divide(work, broadcastable(thresholds - lower), out=work)
+    np.maximum(work, 0.0, out=work)
+    np.minimum(work, 0.5, out=work)
+    # ...and between 0.5 at the threshold value and 1 at the upper bound
+    upper_half = np.empty_like(work)
+    np.subtract(data, broadcastable(thresholds), out=upper_half)
+    np.multiply(upper_half, 0.5, out=upper_half)
+    np.divide(upper_half, broadcastable(upper - thresholds), out=upper_half)
+    np.add(upper_half, 0.5, out=upper_half)
+    np.maximum(upper_half, 0.5, out=upper_half)
+    np.minimum(upper_half, 1.0, out=upper_half)
+    # Select the upper half at and above the threshold value arithmetically,
+    # which is much faster than a masked copy. The upper half is exactly 0.5
+    # below the threshold value, and the lower half is raised to exactly 0.5
+    # at and above it, so the sum of the lower half and the upper half less
+    # 0.5 is exact.
+    at_or_above = np.empty_like(work)
+    np.greater_equal(data, broadcastable(thresholds), out=at_or_above)
+    np.multiply(at_or_above, 0.5, out=at_or_above)
+    np.maximum(work, at_or_above, out=work)
+    np.subtract(upper_half, 0.5, out=upper_half)
+    np.add(work, upper_half, out=work)
+    # if requirement is for probabilities below threshold (rather
+    # than above), invert the exceedance probability
+    if below:
+        np.subtract(1.0, work, out=work)
+    if work is not out:
+        out[...] = work
+    return out
+
+
+def _threshold_in_blocks(data, thresholds, fuzzy_bounds, comparison, below, out):
+    """Evaluate the truth values of data relative to all thresholds using
+    _threshold_kernel on one block of points at a time, so that
+    intermediate arrays stay small enough to remain in cache.
+
+    Args:
+        data (numpy.ndarray):
+            Data to be thresholded, which must not be masked.
+        thresholds (list of float):
+            Threshold values.
+        fuzzy_bounds (list of tuple of float):
+            Lower and upper fuzzy bounds of each threshold.
+        comparison (callable):
+            Comparison operator for sharp thresholds, eg. operator.gt.
+        below (bool):
+            If True, fuzzy truth values are probabilities of being below
+            the threshold.
+        out (numpy.ndarray):
+            Contiguous array of floats of shape
+            (len(thresholds),) + data.shape into which the truth values are
+            written.
+
+    Returns:
+        numpy.ndarray:
+            The output array.
+    """
+    flat_data = data.reshape(-1)
+    flat_out = out.reshape(len(thresholds), -1)
+    for start in range(0, flat_data.size, THRESHOLD_BLOCK_SIZE):
+        block = slice(start, start + THRESHOLD_BLOCK_SIZE)
+        _threshold_kernel(
+            flat_data[block],
+            thresholds,
+            fuzzy_bounds,
+            comparison,
+            below,
+            flat_out[:, block],
+        )
+    return out
+
+
+def _count_truths(data, valid, thresholds, comparison):
+    """Count the members along the leading dimension of the data that
+    satisfy a sharp comparison with each threshold, without evaluating the
+    comparison for each member and threshold.
+
+    The position of each data value within the sorted thresholds is found
+    by a binary search. A member satisfies the comparison with all the
+    thresholds on one side of its position, so the counts for all
+    thresholds are cumulative sums of a histogram of the positions at each
+    point.
+
+    Args:
+        data (numpy.ndarray):
+            Data with members along the leading dimension.
+        valid (numpy.ndarray):
+            Boolean array of the shape of the data, False for members that
+            are not to be counted.
+        thresholds (list of float):
+            Threshold values in ascending order.
+        comparison (callable):
+            Comparison operator, eg. operator.gt.
+
+    Returns:
+        numpy.ndarray:
+            Counts of shape (len(thresholds),) + data.shape[1:].
+    """
+    n_thresholds = len(thresholds)
+    thresholds = np.array(thresholds).astype(np.result_type(data, 0.0))
+    # data greater than (or equal to) a threshold is positioned after it
+    side = "right" if comparison in (operator.ge, operator.lt) else "left"
+    positions = np.searchsorted(thresholds, data, side=side)
+    # members at position 0 exceed no thresholds
+    positions[~valid] = 0
+
+    n_points = positions[0].size
+    keys = positions.reshape(len(positions), n_points)
+    keys += (n_thresholds + 1) * np.arange(n_points)
+    histogram = np.bincount(
+        keys.reshape(-1), minlength=(n_thresholds + 1) * n_points
+    ).reshape(n_points, n_thresholds + 1)
+    # the members exceeding each threshold are positioned after it
+    counts = np.cumsum(histogram[:, :0:-1], axis=1)[:, ::-1]
+    counts = counts.T.reshape((n_thresholds,) + data.shape[1:])
+    if comparison in (operator.le, operator.lt):
+        counts = valid.sum(axis=0) - counts
+    return counts
+
+
 class BasicThreshold(PostProcessingPlugin):
 
     """Apply a threshold truth criterion to a cube.
@@ -61,6 +317,8 @@ class BasicThreshold(PostProcessingPlugin):
         threshold_units=None,
         comparison_operator=">",
         each_threshold_func=(),
+        lazy=False,
+        collapse_coord=None,
     ):
         """
         Set up for processing an in-or-out of threshold field, including the
@@ -116,6 +374,26 @@ class BasicThreshold(PostProcessingPlugin):
             each_threshold_func (callable or sequence of callables):
                 Callable or sequence of callables to apply to each threshold
                 cube before concatenating.
+            lazy (bool):
+                If True and the input cube has lazy data, the thresholded
+                data is built as a dask graph over the chunks of the input
+                and is only computed when the data of the output cube is
+                realised (eg. on saving), so memory use is bounded by the
+                chunk size rather than the size of the output. The check
+                for NaN values is deferred until then too. Functions in
+                each_threshold_func may realise the data.
+            collapse_coord (str):
+                Name of a dimension coordinate to collapse. If set, the
+                output is the fraction of the members along this coordinate,
+                eg. realizations, that satisfy the threshold criterion,
+                weighting members equally. The fractions are calculated
+                directly from the input data without creating truth values
+                for each member: sharp thresholds are counted from the
+                position of each value within the sorted thresholds, and
+                fuzzy truth values are summed one member at a time. Masked
+                members are excluded. The data is realised in this mode.
+                Functions in each_threshold_func are applied to the
+                collapsed output.
 
         Raises:
             ValueError: If a threshold of 0.0 is requested when using a fuzzy
@@ -222,6 +500,8 @@ class BasicThreshold(PostProcessingPlugin):
         if callable(each_threshold_func):
             each_threshold_func = (each_threshold_func,)
         self.each_threshold_func = each_threshold_func
+        self.lazy = lazy
+        self.collapse_coord = collapse_coord
 
     def __repr__(self):
         """Represent the configured plugin instance as a string."""
@@ -229,24 +509,22 @@ class BasicThreshold(PostProcessingPlugin):
             "<BasicThreshold: thresholds {}, fuzzy_bounds {}, method: data {} threshold>"
         ).format(self.thresholds, self.fuzzy_bounds, self.comparison_operator_string)
 
-    def _add_threshold_coord(self, cube, threshold):
+    def _threshold_coord(self, thresholds, units):
         """
-        Add a scalar threshold-type coordinate to a cube containing
-        thresholded data and promote the new coordinate to be the
-        leading dimension of the cube.
+        Create a threshold-type coordinate.
 
         Args:
-            cube (iris.cube.Cube):
-                Cube containing thresholded data (1s and 0s)
-            threshold (float):
-                Value at which the data has been thresholded
+            thresholds (list of float):
+                Values at which the data has been thresholded
+            units (cf_units.Unit):
+                Units of the threshold values
 
         Returns:
-            iris.cube.Cube:
-                With new "threshold" axis
+            iris.coords.DimCoord:
+                Threshold coordinate
         """
         coord = iris.coords.DimCoord(
-            np.array([threshold], dtype=np.float32), units=cube.units
+            np.array(thresholds, dtype=np.float32), units=units
         )
         coord.rename(self.threshold_coord_name)
         coord.var_name = "threshold"
@@ -256,10 +534,66 @@ class BasicThreshold(PostProcessingPlugin):
         coord.attributes.update(
             {"spp__relative_to_threshold": self.comparison_operator["spp_string"]}
         )
+        return coord
+
+    def _add_threshold_coord(self, cube, threshold):
+        """
+        Add a scalar threshold-type coordinate to a cube containing
+        thresholded data and promote the new coordinate to be the
+        leading dimension of the cube.
+
+        Args:
+            cube (iris.cube.Cube):
+                Cube containing thresholded data (1s and 0s)
+            threshold (float):
+                Value at which the data has been thresholded
 
+        Returns:
+            iris.cube.Cube:
+                With new "threshold" axis
+        """
+        coord = self._threshold_coord([threshold], cube.units)
         cube.add_aux_coord(coord)
         return iris.util.new_axis(cube, coord)
 
+    def _create_threshold_cube(self, input_cube, thresholds, data):
+        """
+        Create a cube of thresholded data with the metadata of the input
+        cube, and a leading threshold dimension added to its coordinates.
+
+        Args:
+            input_cube (iris.cube.Cube):
+                Cube that has been thresholded
+            thresholds (list of float):
+                Values at which the data has been thresholded, in ascending
+                order
+            data (numpy.ndarray or dask.array.Array):
+                Thresholded data, with a leading threshold dimension
+
+        Returns:
+            iris.cube.Cube:
+                Cube of thresholded data
+        """
+        cube = iris.cube.Cube(data)
+        cube.metadata = input_cube.metadata
+        cube.add_dim_coord(self._threshold_coord(thresholds, input_cube.units), 0)
+        for coord in input_cube.dim_coords:
+            (dim,) = input_cube.coord_dims(coord)
+            cube.add_dim_coord(coord.copy(), dim + 1)
+        for coord in input_cube.aux_coords:
+            dims = [dim + 1 for dim in input_cube.coord_dims(coord)]
+            cube.add_aux_coord(coord.copy(), dims)
+        for measure in input_cube.cell_measures():
+            dims = [dim + 1 for dim in input_cube.cell_measure_dims(measure)]
+            cube.add_cell_measure(measure.copy(), dims)
+        coord_mapping = {
+            id(coord): cube.coord(coord)
+            for coord in input_cube.dim_coords + input_cube.aux_coords
+        }
+        for factory in input_cube.aux_factories:
+            cube.add_aux_factory(factory.updated(coord_mapping))
+        return cube
+
     def _decode_comparison_operator_string(self):
         """Sets self.comparison_operator based on
         self.comparison_operator_string. This is a dict containing the keys
@@ -281,6 +615,98 @@ class BasicThreshold(PostProcessingPlugin):
             )
             raise ValueError(msg)
 
+    def _truth_value(self, data, threshold, bounds):
+        """Calculate the truth values of data relative to a threshold. The
+        truth value is fuzzy if the fuzzy bounds differ.
+
+        Args:
+            data (numpy.ndarray or dask.array.Array):
+                Data to be thresholded.
+            threshold (float):
+                Threshold value.
+            bounds (tuple of float):
+                Lower and upper fuzzy bounds of the threshold.
+
+        Returns:
+            numpy.ndarray or dask.array.Array:
+                Truth values between 0 and 1, of the same type as the data.
+        """
+        where = da.where if isinstance(data, da.Array) else np.where
+        # if upper and lower bounds are equal, set a deterministic 0/1
+        # probability based on exceedance of the threshold
+        if bounds[0] == bounds[1]:
+            return self.comparison_operator["function"](data, threshold)
+        # otherwise, scale exceedance probabilities linearly between 0/1
+        # at the min/max fuzzy bounds and 0.5 at the threshold value
+        truth_value = where(
+            data < threshold,
+            rescale(
+                data,
+                data_range=(bounds[0], threshold),
+                scale_range=(0.0, 0.5),
+                clip=True,
+            ),
+            rescale(
+                data,
+                data_range=(threshold, bounds[1]),
+                scale_range=(0.5, 1.0),
+                clip=True,
+            ),
+        )
+        # if requirement is for probabilities below threshold (rather
+        # than above), invert the exceedance probability
+        if "below" in self.comparison_operator["spp_string"]:
+            truth_value = 1.0 - truth_value
+        return truth_value
+
+    def _collapse_truth_values(self, data, thresholds, fuzzy_bounds, axis, dtype):
+        """
+        Calculate the fraction of the valid members along one axis of the
+        data that satisfy the threshold criterion, for each threshold.
+
+        Args:
+            data (numpy.ndarray):
+                Data to be thresholded, which may be masked.
+            thresholds (list of float):
+                Threshold values in ascending order.
+            fuzzy_bounds (list of tuple of float):
+                Lower and upper fuzzy bounds of each threshold.
+            axis (int):
+                Axis of the members to collapse.
+            dtype (numpy.dtype):
+                Data type of the output.
+
+        Returns:
+            numpy.ma.MaskedArray:
+                Fractions of shape (len(thresholds),) + the shape of the data
+                without the collapsed axis, masked where all members are
+                masked.
+        """
+        comparison = self.comparison_operator["function"]
+        values = np.moveaxis(np.ma.getdata(data), axis, 0)
+        valid = ~np.moveaxis(np.ma.getmaskarray(data), axis, 0)
+        n_valid = valid.sum(axis=0)
+
+        if all(lower == upper for lower, upper in fuzzy_bounds):
+            counts = _count_truths(values, valid, thresholds, comparison)
+        else:
+            counts = np.zeros((len(thresholds),) + values.shape[1:])
+            member_truth_values = np.empty(counts.shape, dtype=dtype)
+            for member, member_valid in zip(values, valid):
+                _threshold_in_blocks(
+                    np.ascontiguousarray(member),
+                    thresholds,
+                    fuzzy_bounds,
+                    comparison,
+                    "below" in self.comparison_operator["spp_string"],
+                    member_truth_values,
+                )
+                counts += np.where(member_valid, member_truth_values, 0)
+
+        fractions = (counts / np.maximum(n_valid, 1)).astype(dtype)
+        mask = np.broadcast_to(n_valid == 0, fractions.shape)
+        return np.ma.masked_array(fractions, mask=mask.copy())
+
     def process(self, input_cube):
         """Convert each point to a truth value based on provided threshold
         values. The truth value may or may not be fuzzy depending upon if
@@ -308,6 +734,9 @@ class BasicThreshold(PostProcessingPlugin):
 
         Raises:
             ValueError: if a np.nan value is detected within the input cube.
+                In lazy mode this is raised when the output data is realised.
+            ValueError: if collapse_coord is not a dimension coordinate of
+                the input cube.
 
         """
         # Record input cube data type to ensure consistent output, though
@@ -316,9 +745,13 @@ class BasicThreshold(PostProcessingPlugin):
         if input_cube.dtype.kind == "i":
             input_cube_dtype = np.float32
 
-        thresholded_cubes = iris.cube.CubeList()
-        if np.isnan(input_cube.data).any():
-            raise ValueError("Error: NaN detected in input cube data")
+        if self.lazy and input_cube.has_lazy_data():
+            data = input_cube.lazy_data().map_blocks(
+                _check_for_nan, dtype=input_cube.dtype
+            )
+        else:
+            data = input_cube.data
+            _check_for_nan(data)
 
         # if necessary, convert thresholds and fuzzy bounds into cube units
         if self.threshold_units is not None:
@@ -339,51 +772,61 @@ class BasicThreshold(PostProcessingPlugin):
         # set name of threshold coordinate to match input diagnostic
         self.threshold_coord_name = input_cube.name()
 
-        # apply fuzzy thresholding
-        for threshold, bounds in zip(self.thresholds, self.fuzzy_bounds):
-            cube = input_cube.copy()
-            # if upper and lower bounds are equal, set a deterministic 0/1
-            # probability based on exceedance of the threshold
-            if bounds[0] == bounds[1]:
-                truth_value = self.comparison_operator["function"](cube.data, threshold)
-            # otherwise, scale exceedance probabilities linearly between 0/1
-            # at the min/max fuzzy bounds and 0.5 at the threshold value
+        # evaluate the thresholds in ascending order, which is the order of
+        # the output threshold coordinate
+        order = np.argsort(self.thresholds, kind="stable")
+        thresholds = [self.thresholds[index] for index in order]
+        fuzzy_bounds = [self.fuzzy_bounds[index] for index in order]
+
+        if self.collapse_coord is not None:
+            collapse_dims = input_cube.coord_dims(self.collapse_coord)
+            if len(collapse_dims) != 1:
+                raise ValueError(
+                    "Cannot collapse {}: it is not a dimension coordinate of the "
+                    "input cube".format(self.collapse_coord)
+                )
+            template = next(input_cube.slices_over(self.collapse_coord))
+            template.remove_coord(self.collapse_coord)
+            if isinstance(data, da.Array):
+                data = data.compute()
+            fractions = self._collapse_truth_values(
+                data, thresholds, fuzzy_bounds, collapse_dims[0], input_cube_dtype
+            )
+            cube = self._create_threshold_cube(template, thresholds, fractions)
+        else:
+            if isinstance(data, da.Array):
+                truth_values = da.stack(
+                    [
+                        self._truth_value(data, threshold, bounds).astype(
+                            input_cube_dtype
+                        )
+                        for threshold, bounds in zip(thresholds, fuzzy_bounds)
+                    ]
+                )
             else:
-                truth_value = np.where(
-                    cube.data < threshold,
-                    rescale(
-                        cube.data,
-                        data_range=(bounds[0], threshold),
-                        scale_range=(0.0, 0.5),
-                        clip=True,
-                    ),
-                    rescale(
-                        cube.data,
-                        data_range=(threshold, bounds[1]),
-                        scale_range=(0.5, 1.0),
-                        clip=True,
-                    ),
+                truth_values = np.empty(
+                    (len(thresholds),) + data.shape, dtype=input_cube_dtype
+                )
+                _threshold_in_blocks(
+                    np.ma.getdata(data),
+                    thresholds,
+                    fuzzy_bounds,
+                    self.comparison_operator["function"],
+                    "below" in self.comparison_operator["spp_string"],
+                    truth_values,
                 )
-                # if requirement is for probabilities below threshold (rather
-                # than above), invert the exceedance probability
-                if "below" in self.comparison_operator["spp_string"]:
-                    truth_value = 1.0 - truth_value
-            truth_value = np.ma.masked_where(np.ma.getmask(cube.data), truth_value)
-            truth_value = truth_value.astype(input_cube_dtype)
-
-            cube.data = truth_value
-            # Overwrite masked values that have been thresholded
-            # with the un-thresholded values from the input cube.
-            if np.ma.is_masked(cube.data):
-                cube.data[input_cube.data.mask] = input_cube.data[input_cube.data.mask]
-            cube = self._add_threshold_coord(cube, threshold)
-
-            for func in self.each_threshold_func:
-                cube = func(cube)
-
-            thresholded_cubes.append(cube)
-
-        (cube,) = thresholded_cubes.concatenate()
+            cube = self._create_threshold_cube(
+                input_cube, thresholds, _mask_like(truth_values, data)
+            )
+
+        if self.each_threshold_func:
+            thresholded_cubes = iris.cube.CubeList()
+            for index in range(len(thresholds)):
+                threshold_cube = cube[index : index + 1]
+                for func in self.each_threshold_func:
+                    threshold_cube = func(threshold_cube)
+                thresholded_cubes.append(threshold_cube)
+            (cube,) = thresholded_cubes.concatenate()
 
         cube.rename(
             "probability_of_{}_{}_threshold".format(
@@ -31,14 +31,29 @@
 """Module for loading cubes."""
 
 import contextlib
+import hashlib
+import logging
+import multiprocessing
+import os
+import pickle
+import time
+from functools import partial
 
 import iris
+import iris.fileformats
 
+from improver import BasePlugin
 from improver.utilities.cube_manipulation import (
     MergeCubes,
     enforce_coordinate_ordering,
     strip_var_names,
 )
+from improver.utilities.memmap import (
+    MEMMAP_SUFFIX,
+    is_memmap_file,
+    load_memmap,
+    save_memmap,
+)
 
 
 @contextlib.contextmanager
@@ -71,7 +86,199 @@ def iris_nimrod_patcher():
                 yield
 
 
-def load_cubelist(filepath, constraints=None, no_lazy_load=False):
+LOGGER = logging.getLogger(__name__)
+
+# Environment variable naming a directory in which to cache loaded cubes
+LOAD_CACHE_DIR_ENV = "IMPROVER_LOAD_CACHE_DIR"
+
+
+def _standardise(cubes, no_lazy_load=False):
+    """Standardise the metadata and dimension order of loaded cubes.
+
+    Args:
+        cubes (iris.cube.CubeList):
+            Cubes to be standardised.
+        no_lazy_load (bool):
+            If True, load the data of each cube into memory.
+
+    Returns:
+        iris.cube.CubeList:
+            Standardised cubes.
+    """
+    # Remove var_name from cubes and coordinates (except where needed to
+    # describe probabilistic data)
+    cubes = strip_var_names(cubes)
+
+    for cube in cubes:
+
+        # Remove metadata attributes pointing to legacy prefix cube
+        cube.attributes.pop("bald__isPrefixedBy", None)
+
+        # Ensure the probabilistic coordinates are the first coordinates within
+        # a cube and are in the specified order.
+        enforce_coordinate_ordering(cube, ["realization", "percentile", "threshold"])
+        # Ensure the y and x dimensions are the last within the cube.
+        y_name = cube.coord(axis="y").name()
+        x_name = cube.coord(axis="x").name()
+        enforce_coordinate_ordering(cube, [y_name, x_name], anchor_start=False)
+        if no_lazy_load:
+            # Force cube's data into memory by touching the .data attribute.
+            # pylint: disable=pointless-statement
+            cube.data
+    return cubes
+
+
+def _load_and_standardise(filepath, constraints=None, no_lazy_load=False):
+    """Load cubes from a filepath using iris and standardise their metadata
+    and dimension order.
+
+    Args:
+        filepath (str):
+            Filepath, which may include wildcards, that will be loaded.
+        constraints (iris.Constraint, str or None):
+            Constraint to be applied when loading from the input filepath.
+        no_lazy_load (bool):
+            If True, load the data of each cube into memory.
+
+    Returns:
+        iris.cube.CubeList:
+            CubeList loaded from the filepath.
+    """
+    # Remove legacy metadata prefix cube if present
+    constraints = (
+        iris.Constraint(cube_func=lambda cube: cube.long_name != "prefixes")
+        & constraints
+    )
+    with iris_nimrod_patcher():
+        cubes = iris.load(filepath, constraints=constraints)
+    return _standardise(cubes, no_lazy_load)
+
+
+def _load_memmap_and_standardise(filepath, constraints=None):
+    """Load cubes saved in the memory-mappable format and standardise their
+    metadata and dimension order. The data remains memory-mapped.
+
+    Args:
+        filepath (str):
+            Path of the memory-mappable index file.
+        constraints (iris.Constraint, str or None):
+            Constraint to be applied to the loaded cubes.
+
+    Returns:
+        iris.cube.CubeList:
+            CubeList loaded from the filepath.
+    """
+    cubes = load_memmap(filepath)
+    if constraints is not None:
+        cubes = cubes.extract(constraints)
+    return _standardise(cubes)
+
+
+def _cache_key(filepath, constraints):
+    """Create a key identifying the contents of a file loaded with the given
+    constraints. The key changes whenever the file is modified, as the
+    modification time and size of the file are included.
+
+    Args:
+        filepath (str):
+            Path to an existing file.
+        constraints (str or None):
+            Name constraint applied when loading the file.
+
+    Returns:
+        str:
+            Hexadecimal digest to be used as a cache file name.
+    """
+    stat = os.stat(filepath)
+    identity = (
+        os.path.abspath(filepath),
+        stat.st_mtime_ns,
+        stat.st_size,
+        constraints,
+        iris.__version__,
+    )
+    return hashlib.sha256(repr(identity).encode("utf-8")).hexdigest()
+
+
+def _load_file(filepath, constraints=None, no_lazy_load=False, cache_dir=None):
+    """Load cubes from a single filepath and standardise their metadata and
+    dimension order. The time taken is logged at INFO level.
+
+    Files saved in the memory-mappable format (see
+    improver.utilities.memmap) are recognised by their suffix, and their
+    data is memory-mapped rather than read.
+
+    If a cache directory is given, the standardised cubes are cached there
+    in the memory-mappable format, keyed by the path, modification time and
+    size of the file. Subsequent loads of the unmodified file read the
+    cached metadata and memory-map the cached data, skipping the
+    decompression and coordinate reordering. Only loads of a single
+    existing file without constraints, or constrained by cube name, are
+    cached.
+
+    Args:
+        filepath (str):
+            Filepath, which may include wildcards, that will be loaded.
+        constraints (iris.Constraint, str or None):
+            Constraint to be applied when loading from the input filepath.
+        no_lazy_load (bool):
+            If True, load the data of each cube into memory.
+        cache_dir (str or None):
+            Directory used to cache loaded cubes. If None, the cache is
+            not used.
+
+    Returns:
+        iris.cube.CubeList:
+            CubeList loaded from the filepath.
+    """
+    start = time.perf_counter()
+    cacheable = (
+        cache_dir
+        and (constraints is None or isinstance(constraints, str))
+        and os.path.isfile(filepath)
+    )
+    if is_memmap_file(filepath):
+        cubes = _load_memmap_and_standardise(filepath, constraints)
+    elif cacheable:
+        cache_path = os.path.join(
+            cache_dir, _cache_key(filepath, constraints) + MEMMAP_SUFFIX
+        )
+        try:
+            cubes = load_memmap(cache_path)
+        except FileNotFoundError:
+            cubes = _load_and_standardise(filepath, constraints)
+            os.makedirs(cache_dir, exist_ok=True)
+            save_memmap(cubes, cache_path)
+            cubes = load_memmap(cache_path)
+            LOGGER.info("Cached %s as %s", filepath, cache_path)
+    else:
+        cubes = _load_and_standardise(filepath, constraints, no_lazy_load)
+
+    LOGGER.info("Loaded %s in %.3f s", filepath, time.perf_counter() - start)
+    return cubes
+
+
+def _picklable(obj):
+    """Check whether an object can be sent to a worker process.
+
+    Args:
+        obj (object):
+            Object to be checked.
+
+    Returns:
+        bool:
+            True if the object can be pickled.
+    """
+    try:
+        pickle.dumps(obj)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def load_cubelist(
+    filepath, constraints=None, no_lazy_load=False, workers=None, cache_dir=None
+):
     """Load cubes from filepath(s) into a cubelist. Strips off all
     var names except for "threshold"-type coordinates, where this is different
     from the standard or long name.
@@ -88,57 +295,60 @@ def load_cubelist(filepath, constraints=None, no_lazy_load=False):
             If True, bypass cube deferred (lazy) loading and load the whole
             cube into memory. This can increase performance at the cost of
             memory. If False (default) then lazy load.
+        workers (int or None):
+            Maximum number of files to load concurrently from a list of
+            filepaths, using a pool of processes. If None, the number of
+            workers configured for plugins is used, which is set by the
+            improver --workers option. The order of the loaded cubes
+            matches the order of the filepaths in either case. Files are
+            loaded serially if the constraints cannot be pickled.
+        cache_dir (str or None):
+            Directory in which to cache the standardised cubes loaded from
+            each file, so that later loads of the unmodified file are faster.
+            If None, the directory named by the IMPROVER_LOAD_CACHE_DIR
+            environment variable is used, and no cache is used if that
+            is not set.
 
     Returns:
         iris.cube.CubeList:
             CubeList that has been created from the input filepath given the
             constraints provided.
     """
-    # Remove legacy metadata prefix cube if present
-    constraints = (
-        iris.Constraint(cube_func=lambda cube: cube.long_name != "prefixes")
-        & constraints
-    )
+    if cache_dir is None:
+        cache_dir = os.environ.get(LOAD_CACHE_DIR_ENV)
 
     # Load each file individually to avoid partial merging (not used
     # iris.load_raw() due to issues with time representation)
-    with iris_nimrod_patcher():
-        if isinstance(filepath, str):
-            cubes = iris.load(filepath, constraints=constraints)
+    load_file = partial(
+        _load_file,
+        constraints=constraints,
+        no_lazy_load=no_lazy_load,
+        cache_dir=cache_dir,
+    )
+    if isinstance(filepath, str):
+        cubes = load_file(filepath)
+    else:
+        filepaths = list(filepath)
+        if workers is None:
+            workers = BasePlugin._workers
+        if workers > 1 and len(filepaths) > 1 and _picklable(constraints):
+            # The netCDF library is neither thread-safe nor safe to use
+            # in forked processes, so use freshly spawned processes
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(processes=min(workers, len(filepaths))) as pool:
+                loaded = pool.map(load_file, filepaths)
         else:
-            cubes = iris.cube.CubeList([])
-            for item in filepath:
-                cubes.extend(iris.load(item, constraints=constraints))
+            loaded = [load_file(item) for item in filepaths]
+        cubes = iris.cube.CubeList(cube for item in loaded for cube in item)
 
     if not cubes:
         message = "No cubes found using constraints {}".format(constraints)
         raise ValueError(message)
 
-    # Remove var_name from cubes and coordinates (except where needed to
-    # describe probabilistic data)
-    cubes = strip_var_names(cubes)
-
-    for cube in cubes:
-
-        # Remove metadata attributes pointing to legacy prefix cube
-        cube.attributes.pop("bald__isPrefixedBy", None)
-
-        # Ensure the probabilistic coordinates are the first coordinates within
-        # a cube and are in the specified order.
-        enforce_coordinate_ordering(cube, ["realization", "percentile", "threshold"])
-        # Ensure the y and x dimensions are the last within the cube.
-        y_name = cube.coord(axis="y").name()
-        x_name = cube.coord(axis="x").name()
-        enforce_coordinate_ordering(cube, [y_name, x_name], anchor_start=False)
-        if no_lazy_load:
-            # Force cube's data into memory by touching the .data attribute.
-            # pylint: disable=pointless-statement
-            cube.data
-
     return cubes
 
 
-def load_cube(filepath, constraints=None, no_lazy_load=False):
+def load_cube(filepath, constraints=None, no_lazy_load=False, cache_dir=None):
     """Load the filepath provided using Iris into a cube. Strips off all
     var names except for "threshold"-type coordinates, where this is different
     from the standard or long name.
@@ -156,13 +366,18 @@ def load_cube(filepath, constraints=None, no_lazy_load=False):
             If True, bypass cube deferred (lazy) loading and load the whole
             cube into memory. This can increase performance at the cost of
             memory. If False (default) then lazy load.
+        cache_dir (str or None):
+            Directory in which to cache the standardised cubes loaded from
+            each file. If None, the directory named by the
+            IMPROVER_LOAD_CACHE_DIR environment variable is used, and no
+            cache is used if that is not set.
 
     Returns:
         iris.cube.Cube:
             Cube that has been loaded from the input filepath given the
             constraints provided.
     """
-    cubes = load_cubelist(filepath, constraints, no_lazy_load)
+    cubes = load_cubelist(filepath, constraints, no_lazy_load, cache_dir=cache_dir)
     # Merge loaded cubes
     if len(cubes) == 1:
         cube = cubes[0]
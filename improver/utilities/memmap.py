@@ -0,0 +1,501 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Module for saving and loading cubes in an uncompressed, memory-mappable
+format.
+
+A cubelist saved in this format is written as a small JSON index file,
+which describes the metadata of each cube, and alongside it for each cube
+an uncompressed numpy array holding its data (plus one for the mask of any
+masked data). On loading, the cubes are built directly from the index
+file without parsing any netCDF metadata, and the arrays are memory-mapped
+copy-on-write, so processes on the same node that load the same file
+share the pages of the file rather than each holding a decompressed copy
+of the data.
+"""
+
+import contextlib
+import inspect
+import json
+import os
+import tempfile
+from functools import partial
+
+import cf_units
+import iris
+import numpy as np
+
+# File suffix identifying the memory-mappable format
+MEMMAP_SUFFIX = ".mmap"
+
+
+def is_memmap_file(filepath):
+    """Check whether a filepath refers to the memory-mappable format.
+
+    Args:
+        filepath (str or pathlib.Path):
+            Path to check.
+
+    Returns:
+        bool:
+            True if the path has the memory-mappable format suffix.
+    """
+    return str(filepath).endswith(MEMMAP_SUFFIX)
+
+
+def _payload_path(filepath, index):
+    """Path of the data array of a cube within a memory-mappable file.
+
+    Args:
+        filepath (str):
+            Path of the index file.
+        index (int):
+            Index of the cube within the saved cubelist.
+
+    Returns:
+        str:
+            Path of the data array, without the ".npy" extension.
+    """
+    return "{}.{}".format(filepath, index)
+
+
+@contextlib.contextmanager
+def _atomic_path(path):
+    """Provide a temporary path in the same directory as a destination path,
+    which replaces the destination once the context exits without error, so
+    that other processes never see a partially written file.
+
+    Args:
+        path (str):
+            Destination path.
+
+    Yields:
+        str:
+            Temporary path to be written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _atomic_write(path, write):
+    """Write a file via a temporary file in the same directory, so that
+    other processes never see a partially written file.
+
+    Args:
+        path (str):
+            Destination path.
+        write (callable):
+            Function that writes the content to an open binary file object.
+    """
+    with _atomic_path(path) as tmp_path, open(tmp_path, "wb") as tmp_file:
+        write(tmp_file)
+
+
+def _array_to_json(array):
+    """Describe a numpy array or scalar in a form that can be serialised as
+    JSON.
+
+    Args:
+        array (numpy.ndarray or numpy.generic):
+            Array to be described.
+
+    Returns:
+        dict:
+            The values and data type of the array.
+    """
+    array = np.asarray(array)
+    return {"values": array.tolist(), "dtype": array.dtype.str}
+
+
+def _array_from_json(description):
+    """Create the array described by _array_to_json.
+
+    Args:
+        description (dict):
+            The values and data type of the array.
+
+    Returns:
+        numpy.ndarray or numpy.generic:
+            The array, or a numpy scalar if the array had no dimensions.
+    """
+    return np.array(description["values"], dtype=description["dtype"])[()]
+
+
+def _attributes_to_json(attributes):
+    """Describe the attributes of a cube or coordinate in a form that can be
+    serialised as JSON. Numpy values are described with their data type, so
+    that they are restored exactly.
+
+    Args:
+        attributes (dict):
+            Attributes to be described.
+
+    Returns:
+        dict:
+            Description of the attributes.
+    """
+    return {
+        key: {"array": _array_to_json(value)}
+        if isinstance(value, (np.ndarray, np.generic))
+        else {"value": value}
+        for key, value in attributes.items()
+    }
+
+
+def _attributes_from_json(description):
+    """Create the attributes described by _attributes_to_json.
+
+    Args:
+        description (dict):
+            Description of the attributes.
+
+    Returns:
+        dict:
+            The attributes.
+    """
+    return {
+        key: _array_from_json(value["array"]) if "array" in value else value["value"]
+        for key, value in description.items()
+    }
+
+
+def _coord_system_to_json(coord_system):
+    """Describe a coordinate system by its class and the arguments used to
+    create it, in a form that can be serialised as JSON.
+
+    Args:
+        coord_system (iris.coord_systems.CoordSystem or None):
+            Coordinate system to be described.
+
+    Returns:
+        dict or None:
+            Description of the coordinate system.
+    """
+    if coord_system is None:
+        return None
+    arguments = {}
+    for name in inspect.signature(type(coord_system)).parameters:
+        value = getattr(coord_system, name, None)
+        if isinstance(value, iris.coord_systems.CoordSystem):
+            value = _coord_system_to_json(value)
+        arguments[name] = value
+    return {"type": type(coord_system).__name__, "arguments": arguments}
+
+
+def _coord_system_from_json(description):
+    """Create the coordinate system described by _coord_system_to_json.
+
+    Args:
+        description (dict or None):
+            Description of the coordinate system.
+
+    Returns:
+        iris.coord_systems.CoordSystem or None:
+            The coordinate system.
+    """
+    if description is None:
+        return None
+    arguments = {}
+    for name, value in description["arguments"].items():
+        if isinstance(value, dict):
+            value = _coord_system_from_json(value)
+        elif isinstance(value, list):
+            value = tuple(value)
+        arguments[name] = value
+    coord_system_class = getattr(iris.coord_systems, description["type"])
+    if coord_system_class is iris.coord_systems.GeogCS:
+        # GeogCS does not accept all three ellipsoid parameters, so it is
+        # created from its axes and the saved flattening is then restored.
+        inverse_flattening = arguments.pop("inverse_flattening")
+        coord_system = coord_system_class(**arguments)
+        coord_system.inverse_flattening = inverse_flattening
+        return coord_system
+    return coord_system_class(**arguments)
+
+
+def _metadata_to_json(variable):
+    """Describe the names, units and attributes of a cube or coordinate in
+    a form that can be serialised as JSON.
+
+    Args:
+        variable (iris.cube.Cube or iris.coords.Coord):
+            Cube or coordinate to be described.
+
+    Returns:
+        dict:
+            Description of the names, units and attributes.
+    """
+    return {
+        "standard_name": variable.standard_name,
+        "long_name": variable.long_name,
+        "var_name": variable.var_name,
+        "units": str(variable.units),
+        "calendar": variable.units.calendar,
+        "attributes": _attributes_to_json(variable.attributes),
+    }
+
+
+def _metadata_from_json(description):
+    """Create the keyword arguments for a cube or coordinate from the
+    description given by _metadata_to_json.
+
+    Args:
+        description (dict):
+            Description of the names, units and attributes.
+
+    Returns:
+        dict:
+            Keyword arguments giving the names, units and attributes.
+    """
+    return {
+        "standard_name": description["standard_name"],
+        "long_name": description["long_name"],
+        "var_name": description["var_name"],
+        "units": cf_units.Unit(description["units"], calendar=description["calendar"]),
+        "attributes": _attributes_from_json(description["attributes"]),
+    }
+
+
+def _coord_to_json(coord):
+    """Describe a coordinate, cell measure or ancillary variable in a form
+    that can be serialised as JSON.
+
+    Args:
+        coord (iris.coords.Coord, iris.coords.CellMeasure or
+                iris.coords.AncillaryVariable):
+            Variable to be described.
+
+    Returns:
+        dict:
+            Description of the variable.
+    """
+    description = _metadata_to_json(coord)
+    description["type"] = type(coord).__name__
+    if isinstance(coord, iris.coords.Coord):
+        description["points"] = _array_to_json(coord.points)
+        description["bounds"] = (
+            _array_to_json(coord.bounds) if coord.has_bounds() else None
+        )
+        description["coord_system"] = _coord_system_to_json(coord.coord_system)
+        description["climatological"] = coord.climatological
+        if isinstance(coord, iris.coords.DimCoord):
+            description["circular"] = coord.circular
+    else:
+        description["data"] = _array_to_json(coord.data)
+        if isinstance(coord, iris.coords.CellMeasure):
+            description["measure"] = coord.measure
+    return description
+
+
+def _coord_from_json(description):
+    """Create the coordinate, cell measure or ancillary variable described
+    by _coord_to_json.
+
+    Args:
+        description (dict):
+            Description of the variable.
+
+    Returns:
+        iris.coords.Coord, iris.coords.CellMeasure or
+        iris.coords.AncillaryVariable:
+            The variable.
+    """
+    coord_class = getattr(iris.coords, description["type"])
+    kwargs = _metadata_from_json(description)
+    if "points" in description:
+        bounds = description["bounds"]
+        kwargs.update(
+            bounds=None if bounds is None else _array_from_json(bounds),
+            coord_system=_coord_system_from_json(description["coord_system"]),
+            climatological=description["climatological"],
+        )
+        if "circular" in description:
+            kwargs["circular"] = description["circular"]
+        return coord_class(_array_from_json(description["points"]), **kwargs)
+    if "measure" in description:
+        kwargs["measure"] = description["measure"]
+    return coord_class(_array_from_json(description["data"]), **kwargs)
+
+
+def _cube_metadata(cube):
+    """Describe the metadata of a cube, including its coordinates and cell
+    methods, in a form that can be serialised as JSON. The cube can then be
+    rebuilt by _cube_from_metadata without parsing a netCDF file.
+
+    Args:
+        cube (iris.cube.Cube):
+            Cube whose metadata is to be described.
+
+    Returns:
+        dict:
+            Description of the cube metadata.
+
+    Raises:
+        ValueError: If the cube has derived coordinates.
+    """
+    if cube.aux_factories:
+        raise ValueError(
+            "Cubes with derived coordinates cannot be saved in the "
+            "memory-mappable format"
+        )
+    description = _metadata_to_json(cube)
+    description["cell_methods"] = [
+        {
+            "method": cell_method.method,
+            "coord_names": list(cell_method.coord_names),
+            "intervals": list(cell_method.intervals),
+            "comments": list(cell_method.comments),
+        }
+        for cell_method in cube.cell_methods
+    ]
+    description["dim_coords"] = [
+        [_coord_to_json(coord), cube.coord_dims(coord)[0]] for coord in cube.dim_coords
+    ]
+    description["aux_coords"] = [
+        [_coord_to_json(coord), list(cube.coord_dims(coord))]
+        for coord in cube.aux_coords
+    ]
+    description["cell_measures"] = [
+        [_coord_to_json(measure), list(cube.cell_measure_dims(measure))]
+        for measure in cube.cell_measures()
+    ]
+    description["ancillary_variables"] = [
+        [_coord_to_json(variable), list(cube.ancillary_variable_dims(variable))]
+        for variable in cube.ancillary_variables()
+    ]
+    return description
+
+
+def _cube_from_metadata(description, data):
+    """Create a cube from the metadata described by _cube_metadata.
+
+    Args:
+        description (dict):
+            Description of the cube metadata.
+        data (numpy.ndarray or dask.array.Array):
+            Data of the cube.
+
+    Returns:
+        iris.cube.Cube:
+            Cube with the described metadata and the given data.
+    """
+    variables = {
+        key: [(_coord_from_json(variable), dims) for variable, dims in description[key]]
+        for key in ["dim_coords", "aux_coords", "cell_measures", "ancillary_variables"]
+    }
+    cell_methods = [
+        iris.coords.CellMethod(
+            cell_method["method"],
+            coords=cell_method["coord_names"],
+            intervals=cell_method["intervals"],
+            comments=cell_method["comments"],
+        )
+        for cell_method in description["cell_methods"]
+    ]
+    return iris.cube.Cube(
+        data,
+        cell_methods=cell_methods,
+        dim_coords_and_dims=variables["dim_coords"],
+        aux_coords_and_dims=variables["aux_coords"],
+        cell_measures_and_dims=variables["cell_measures"],
+        ancillary_variables_and_dims=variables["ancillary_variables"],
+        **_metadata_from_json(description),
+    )
+
+
+def save_memmap(cubelist, filepath):
+    """Save cubes in the memory-mappable format. The data of each cube is
+    realised and written as an uncompressed numpy array, with the mask (if
+    any) in a separate array, and the metadata of the cubes is written as
+    JSON in the index file. The index file is written last, so a complete
+    set of files exists whenever the index file does.
+
+    Args:
+        cubelist (iris.cube.Cube or iris.cube.CubeList):
+            Cube or list of cubes to be saved.
+        filepath (str or pathlib.Path):
+            Path of the index file.
+    """
+    if isinstance(cubelist, iris.cube.Cube):
+        cubelist = iris.cube.CubeList([cubelist])
+    filepath = str(filepath)
+    headers = []
+    for index, cube in enumerate(cubelist):
+        payload_path = _payload_path(filepath, index)
+        data = cube.data
+        _atomic_write(payload_path + ".npy", partial(np.save, arr=np.ma.getdata(data)))
+        if np.ma.isMaskedArray(data):
+            mask = np.ma.getmaskarray(data)
+            _atomic_write(payload_path + ".mask.npy", partial(np.save, arr=mask))
+        else:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(payload_path + ".mask.npy")
+        headers.append(_cube_metadata(cube))
+    index = json.dumps({"cubes": headers}).encode("utf-8")
+    _atomic_write(filepath, lambda index_file: index_file.write(index))
+
+
+def load_memmap(filepath):
+    """Load cubes saved in the memory-mappable format. The data of each cube
+    is memory-mapped copy-on-write, so it is only read from disk as it is
+    accessed and the saved arrays are never modified by changes to the
+    returned data.
+
+    Args:
+        filepath (str or pathlib.Path):
+            Path of the index file.
+
+    Returns:
+        iris.cube.CubeList:
+            Cubes with memory-mapped data.
+
+    Raises:
+        FileNotFoundError: if the index file does not exist.
+    """
+    filepath = str(filepath)
+    with open(filepath, "r") as index_file:
+        headers = json.load(index_file)["cubes"]
+    cubes = iris.cube.CubeList()
+    for index, header in enumerate(headers):
+        payload_path = _payload_path(filepath, index)
+        data = np.load(payload_path + ".npy", mmap_mode="c")
+        if os.path.exists(payload_path + ".mask.npy"):
+            mask = np.load(payload_path + ".mask.npy", mmap_mode="c")
+            data = np.ma.masked_array(data, mask=mask)
+        cubes.append(_cube_from_metadata(header, data))
+    return cubes
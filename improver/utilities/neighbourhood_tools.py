@@ -32,6 +32,15 @@
 
 import numpy as np
 
+# Minimum number of rows and columns of points in each tile processed by
+# sliding_percentiles. Larger tiles amortise the cost of setting up the
+# windows at the start of each tile and the overhead of each step.
+MIN_SLIDING_TILE_SIZE = 64
+
+# Limit, in bytes, on the window memberships held for each tile by
+# sliding_percentiles.
+SLIDING_WINDOW_MEMORY = 2 ** 26
+
 
 def rolling_window(input_array, shape, writeable=False):
     """Creates a rolling window neighbourhoods of the given `shape` from the
@@ -203,3 +212,320 @@ def boxsum(data, boxsize, cumsum=True, **pad_options):
         - data[..., i : i + m, :n]
     )
     return result
+
+
+def multi_boxsum(data, boxsizes, **pad_options):
+    """Calculate neighbourhood totals for several neighbourhood sizes from a
+    single summed-area table.
+
+    A summed-area table gives the total within a box of any size from four
+    of its values, as described in :func:`boxsum`. The input array is
+    therefore padded for the largest neighbourhood and accumulated once,
+    and the totals for each size are read from this one table, rather than
+    padding and accumulating the array again for every size.
+
+    Args:
+        data (numpy.ndarray):
+            The input data array.
+        boxsizes (list of int or list of pair of int):
+            The sizes of the neighbourhoods. Each must be an odd number.
+        pad_options (dict):
+            Additional keyword arguments passed to `numpy.pad` function.
+            If given, each returned result will have the same shape as the
+            input array. The results match those of :func:`boxsum` for
+            padding modes such as "constant" and "edge", where the values
+            padded near the edge do not depend on the padding width.
+
+    Returns:
+        list of numpy.ndarray:
+            Arrays containing the calculated neighbourhood totals, one for
+            each of the boxsizes.
+    """
+    boxsizes = [np.broadcast_to(np.atleast_1d(size), (2,)) for size in boxsizes]
+    max_size = np.max(boxsizes, axis=0)
+    if pad_options:
+        data = pad_boxsum(data, max_size, **pad_options)
+    data = data.cumsum(-2).cumsum(-1)
+    results = []
+    for boxsize in boxsizes:
+        if pad_options:
+            # Trim the halo that is only needed by larger neighbourhoods.
+            i, j = (max_size - boxsize) // 2
+            table = data[..., i : data.shape[-2] - i, j : data.shape[-1] - j]
+        else:
+            table = data
+        results.append(boxsum(table, boxsize, cumsum=False))
+    return results
+
+
+def masked_boxsum(data, mask, boxsize, **pad_options):
+    """Calculate masked neighbourhood totals of the data and of the mask
+    together.
+
+    Normalising a masked neighbourhood total requires two summed-area
+    tables: one for the data multiplied by the mask (the numerator) and
+    one for the mask itself (the denominator). Rather than padding and
+    accumulating each of these separately, they are stacked and passed
+    through :func:`boxsum` in a single cumulative pass.
+
+    The data and mask are broadcast against each other, so that many masks
+    can be applied to the same data at once by giving the mask a leading
+    dimension, e.g. data of shape (y, x) and masks of shape (n, y, x)
+    return totals of shape (n, y, x).
+
+    Args:
+        data (numpy.ndarray):
+            The input data array. This must not contain NaNs; invalid points
+            should be set to zero in the data and in the mask before calling
+            this function.
+        mask (numpy.ndarray):
+            The mask of valid input data points, where 1 indicates a valid
+            point and 0 a point that does not contribute to the totals.
+        boxsize (int or pair of int or list):
+            The size of the neighbourhood. Must be an odd number. If a list
+            of sizes is given, the totals for every size are calculated
+            using :func:`multi_boxsum` and lists of totals are returned.
+        pad_options (dict):
+            Additional keyword arguments passed to `numpy.pad` function.
+            If given, the returned results will have the same shape as the
+            broadcast input arrays.
+
+    Returns:
+        (tuple): tuple containing:
+            **data_sum** (numpy.ndarray or list of numpy.ndarray):
+                Neighbourhood totals of the data multiplied by the mask.
+            **mask_sum** (numpy.ndarray or list of numpy.ndarray):
+                Neighbourhood totals of the mask.
+    """
+    data, mask = np.broadcast_arrays(data, mask)
+    # Use 64-bit types for enough precision in accumulations.
+    dtype = np.result_type(data.dtype, np.float64)
+    stacked = np.empty((2,) + data.shape, dtype=dtype)
+    np.multiply(data, mask, out=stacked[0])
+    stacked[1] = mask
+    if isinstance(boxsize, list):
+        totals = multi_boxsum(stacked, boxsize, **pad_options)
+        return [total[0] for total in totals], [total[1].real for total in totals]
+    data_sum, mask_sum = boxsum(stacked, boxsize, **pad_options)
+    return data_sum, mask_sum.real
+
+
+def circlesum(data, ranges, **pad_options):
+    """Exact vectorised approach to calculating unweighted circular
+    neighbourhood totals.
+
+    A circle of radius r grid cells is the union of 2r + 1 horizontal runs
+    of grid cells, one per row offset dy, each extending sqrt(r^2 - dy^2)
+    cells either side of the centre. Each row of the input array is
+    accumulated left to right, so that the total of any run is the
+    difference of two accumulated values. The neighbourhood total is then
+    the sum over the row offsets of these run totals, so the cost scales
+    with the radius rather than with the area of the circle.
+
+    The circle matches the unweighted kernel from
+    :func:`~improver.nbhood.circular_kernel.circular_kernel`, i.e. it
+    includes all grid cells with dx^2 + dy^2 <= r^2.
+
+    Args:
+        data (numpy.ndarray):
+            The input data array. The neighbourhood is calculated over the
+            last two dimensions.
+        ranges (int):
+            Radius of the circle in grid cells.
+        pad_options (dict):
+            Additional keyword arguments passed to `numpy.pad` function.
+            If given, the returned result will have the same shape as the input
+            array.
+
+    Returns:
+        numpy.ndarray:
+            Array containing the calculated neighbourhood total, as float64.
+    """
+    ranges = int(ranges)
+    if pad_options:
+        padding = [(0, 0)] * (data.ndim - 2) + [(ranges, ranges)] * 2
+        data = np.pad(data, padding, **pad_options)
+    # Accumulate along each row, with a leading zero so that the total of the
+    # run [start, stop) is cumulative[stop] - cumulative[start].
+    cumulative = np.zeros(data.shape[:-1] + (data.shape[-1] + 1,), dtype=np.float64)
+    np.cumsum(data, axis=-1, out=cumulative[..., 1:])
+    m, n = data.shape[-2] - 2 * ranges, data.shape[-1] - 2 * ranges
+    result = np.zeros(data.shape[:-2] + (m, n), dtype=np.float64)
+    for offset in range(-ranges, ranges + 1):
+        half_width = int(np.sqrt(ranges ** 2 - offset ** 2))
+        rows = cumulative[..., ranges + offset : ranges + offset + m, :]
+        start = ranges - half_width
+        stop = ranges + half_width + 1
+        result += rows[..., stop : stop + n]
+        result -= rows[..., start : start + n]
+    return result
+
+
+def sliding_percentiles(input_array, kernel_mask, percentiles, **kwargs):
+    """Calculate percentiles over a neighbourhood about each point of a 2D
+    array using windows that are updated as they slide along the rows.
+
+    The padded array is split into tiles, each at least as large as the
+    kernel, which are processed separately by
+    :func:`_sliding_order_statistics`. As the window about each point moves
+    one column to the right, only the cells at the ends of the runs of the
+    kernel are removed from or added to it, so the cost per point grows
+    with the height of the kernel rather than with its area.
+
+    Percentiles are calculated from the order statistics of each window
+    using linear interpolation between the closest ranks, as for
+    `numpy.percentile`.
+
+    Args:
+        input_array (numpy.ndarray):
+            2D array of points for which to calculate percentiles.
+        kernel_mask (numpy.ndarray):
+            2D boolean array with odd dimensions, defining the cells of the
+            neighbourhood about its central cell.
+        percentiles (numpy.ndarray):
+            Percentiles to calculate, between 0 and 100.
+        kwargs:
+            additional keyword arguments passed to `numpy.pad` function.
+
+    Returns:
+        numpy.ndarray:
+            Array of percentiles as float64, with the percentiles as the
+            leading dimension followed by the dimensions of the input array.
+    """
+    kernel_mask = np.asarray(kernel_mask, dtype=bool)
+    pad_extent = [(d // 2, d // 2) for d in kernel_mask.shape]
+    padded = np.pad(input_array, pad_extent, **kwargs)
+    n_rows, n_cols = input_array.shape
+    kernel_rows, kernel_cols = kernel_mask.shape
+    window_size = int(kernel_mask.sum())
+
+    positions = (window_size - 1) * np.asarray(percentiles, dtype=np.float64) / 100
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, window_size - 1)
+    fraction = (positions - lower)[:, np.newaxis, np.newaxis]
+    order_statistics, index = np.unique(
+        np.concatenate([lower, upper]), return_inverse=True
+    )
+    lower_index, upper_index = np.split(index, 2)
+
+    # Limit the number of rows in each tile so that the window memberships
+    # held for the tile stay within SLIDING_WINDOW_MEMORY bytes.
+    tile_cols = max(kernel_cols, MIN_SLIDING_TILE_SIZE)
+    tile_rows = max(kernel_rows, MIN_SLIDING_TILE_SIZE)
+    tile_cells = (tile_rows + kernel_rows - 1) * (tile_cols + kernel_cols - 1)
+    tile_rows = max(1, min(tile_rows, SLIDING_WINDOW_MEMORY // tile_cells))
+
+    result = np.empty((len(positions), n_rows, n_cols), dtype=np.float64)
+    for row in range(0, n_rows, tile_rows):
+        rows = slice(row, min(row + tile_rows, n_rows))
+        for col in range(0, n_cols, tile_cols):
+            cols = slice(col, min(col + tile_cols, n_cols))
+            tile = padded[
+                rows.start : rows.stop + kernel_rows - 1,
+                cols.start : cols.stop + kernel_cols - 1,
+            ]
+            selected = _sliding_order_statistics(tile, kernel_mask, order_statistics)
+            lower_values = selected[lower_index]
+            upper_values = selected[upper_index]
+            result[:, rows, cols] = (
+                lower_values + (upper_values - lower_values) * fraction
+            )
+    return result
+
+
+def _sliding_order_statistics(tile, kernel_mask, order_statistics):
+    """Find order statistics of the window about each point of a padded
+    tile, updating the windows as they slide along the rows.
+
+    Each cell of the tile is replaced by its rank amongst all the cells,
+    with ties broken by position, so that every window is a set of distinct
+    ranks. For each row of points, the ranks in its window are recorded in
+    a membership array, divided into buckets with a count of the members of
+    each. When the window moves one column on, the cells at the start of
+    each run of the kernel leave the window and those beyond the end of
+    each run join it, which updates a few memberships and bucket counts.
+    The k-th smallest value in a window is found from the cumulative bucket
+    counts, followed by the memberships within a single bucket.
+
+    Args:
+        tile (numpy.ndarray):
+            2D array of padded data, extending beyond the points for which
+            order statistics are found by half of the kernel on each side.
+        kernel_mask (numpy.ndarray):
+            2D boolean array with odd dimensions, defining the cells of the
+            neighbourhood about its central cell.
+        order_statistics (numpy.ndarray):
+            Zero-based positions in the sorted window of the values to find.
+
+    Returns:
+        numpy.ndarray:
+            Array of the values at the order statistics, with the order
+            statistics as the leading dimension followed by the dimensions
+            of the unpadded tile.
+    """
+    kernel_rows, kernel_cols = kernel_mask.shape
+    n_rows = tile.shape[0] - kernel_rows + 1
+    n_cols = tile.shape[1] - kernel_cols + 1
+    window_size = int(kernel_mask.sum())
+
+    order = np.argsort(tile, axis=None, kind="stable")
+    values = tile.ravel()[order]
+    ranks = np.empty(tile.size, dtype=np.int64)
+    ranks[order] = np.arange(tile.size)
+    ranks = ranks.reshape(tile.shape)
+
+    # Bucket sizes that balance the cost of accumulating the bucket counts
+    # against the cost of searching within a bucket for each statistic.
+    bucket_size = max(1, int(np.sqrt(tile.size / len(order_statistics))))
+    n_buckets = -(-tile.size // bucket_size)
+    members = np.zeros((n_rows, n_buckets * bucket_size), dtype=np.int8)
+    buckets = members.reshape(n_rows, n_buckets, bucket_size)
+
+    # Kernel cells that leave the window (the start of each run) and enter
+    # the window (beyond the end of each run) as the window moves one
+    # column on, relative to the window about the first point of each row.
+    row_index = np.arange(n_rows)[:, np.newaxis]
+    edges = np.zeros((kernel_rows, 1), dtype=bool)
+    starts = kernel_mask & ~np.hstack([edges, kernel_mask[:, :-1]])
+    ends = kernel_mask & ~np.hstack([kernel_mask[:, 1:], edges])
+    start_rows, start_cols = np.nonzero(starts)
+    end_rows, end_cols = np.nonzero(ends)
+    start_rows = start_rows + row_index
+    end_rows = end_rows + row_index
+
+    kernel_cells = np.nonzero(kernel_mask)
+    members[row_index, ranks[kernel_cells[0] + row_index, kernel_cells[1]]] = 1
+    counts = buckets.sum(axis=2)
+    # Offset the counts of each row so that the cumulative counts of all
+    # rows form a single ascending array.
+    bucket_offsets = row_index * n_buckets
+    count_offsets = row_index * (window_size + 1)
+    targets = order_statistics + count_offsets
+
+    selected = np.empty((len(order_statistics), n_rows, n_cols), dtype=tile.dtype)
+    for column in range(n_cols):
+        if column > 0:
+            outgoing = ranks[start_rows, start_cols + column - 1]
+            incoming = ranks[end_rows, end_cols + column]
+            members[row_index, outgoing] = 0
+            members[row_index, incoming] = 1
+            counts -= np.bincount(
+                (outgoing // bucket_size + bucket_offsets).ravel(),
+                minlength=counts.size,
+            ).reshape(counts.shape)
+            counts += np.bincount(
+                (incoming // bucket_size + bucket_offsets).ravel(),
+                minlength=counts.size,
+            ).reshape(counts.shape)
+        cumulative = np.cumsum(counts, axis=1)
+        bucket = (
+            np.searchsorted((cumulative + count_offsets).ravel(), targets, "right")
+            - bucket_offsets
+        )
+        preceding = np.where(bucket > 0, cumulative[row_index, bucket - 1], 0)
+        within = np.cumsum(buckets[row_index, bucket], axis=2)
+        position = np.argmax(
+            within > (order_statistics - preceding)[..., np.newaxis], axis=2
+        )
+        selected[:, :, column] = values[bucket * bucket_size + position].T
+    return selected
@@ -186,6 +186,35 @@ def _create_cube_with_padded_data(source_cube, data, coord_x, coord_y):
     return new_cube
 
 
+def _spatial_pairs(cube, x_value, y_value, other_value):
+    """
+    Build a per-dimension sequence for the cube, placing the supplied values
+    at the positions of the x and y dimensions and a default value at all
+    other dimensions. Used to construct padding widths and slices that apply
+    only to the spatial dimensions of a multi-dimensional cube.
+
+    Args:
+        cube (iris.cube.Cube):
+            Cube with x and y dimension coordinates.
+        x_value (object):
+            Value to use for the x dimension.
+        y_value (object):
+            Value to use for the y dimension.
+        other_value (object):
+            Value to use for all other dimensions.
+
+    Returns:
+        list:
+            List with one entry per cube dimension.
+    """
+    values = [other_value] * cube.ndim
+    (y_dim,) = cube.coord_dims(cube.coord(axis="y"))
+    (x_dim,) = cube.coord_dims(cube.coord(axis="x"))
+    values[y_dim] = y_value
+    values[x_dim] = x_value
+    return values
+
+
 def pad_cube_with_halo(cube, width_x, width_y, pad_method="constant"):
     """
     Method to pad a halo around the data in an iris cube.  If halo_with_data
@@ -194,9 +223,9 @@ def pad_cube_with_halo(cube, width_x, width_y, pad_method="constant"):
 
     Args:
         cube (iris.cube.Cube):
-            The original cube prior to applying padding. The cube should
-            contain only x and y dimensions, so will generally be a slice
-            of a cube.
+            The original cube prior to applying padding. The cube must
+            contain x and y dimensions; any other dimensions are left
+            unpadded.
         width_x (int):
             The width in x directions of the neighbourhood radius in
             grid cells. This will be the width of padding to be added to
@@ -215,21 +244,22 @@ def pad_cube_with_halo(cube, width_x, width_y, pad_method="constant"):
             Cube containing the new padded cube, with appropriate
             changes to the cube's dimension coordinates.
     """
-    check_for_x_and_y_axes(cube)
+    check_for_x_and_y_axes(cube, require_dim_coords=True)
 
     # Pad a halo around the original data with the extent of the halo
-    # given by width_y and width_x.
+    # given by width_y and width_x. Non-spatial dimensions are not padded.
+    pad_width = _spatial_pairs(cube, (width_x, width_x), (width_y, width_y), (0, 0))
     kwargs = {
-        "stat_length": ((width_y // 2, width_y // 2), (width_x // 2, width_x // 2))
+        "stat_length": _spatial_pairs(
+            cube, (width_x // 2, width_x // 2), (width_y // 2, width_y // 2), (1, 1)
+        )
     }
     if pad_method == "constant":
         kwargs = {"constant_values": (0.0, 0.0)}
     if pad_method == "symmetric":
         kwargs = {}
 
-    padded_data = np.pad(
-        cube.data, ((width_y, width_y), (width_x, width_x)), mode=pad_method, **kwargs
-    )
+    padded_data = np.pad(cube.data, pad_width, mode=pad_method, **kwargs)
 
     coord_x = cube.coord(axis="x")
     padded_x_coord = pad_coord(coord_x, width_x, "add")
@@ -293,9 +323,9 @@ def remove_halo_from_cube(cube, width_x, width_y):
 
     Args:
         cube (iris.cube.Cube):
-            The original cube to be trimmed of edge data. The cube should
-            contain only x and y dimensions, so will generally be a slice
-            of a cube.
+            The original cube to be trimmed of edge data. The cube must
+            contain x and y dimensions; any other dimensions are left
+            untrimmed.
         width_x (int or float):
             The width in x directions of the neighbourhood radius in
             grid cells. This will be the width of padding to be added to
@@ -310,11 +340,17 @@ def remove_halo_from_cube(cube, width_x, width_y):
             Cube containing the new trimmed cube, with appropriate
             changes to the cube's dimension coordinates.
     """
-    check_for_x_and_y_axes(cube)
+    check_for_x_and_y_axes(cube, require_dim_coords=True)
 
     end_y = -width_y if width_y != 0 else None
     end_x = -width_x if width_x != 0 else None
-    trimmed_data = cube.data[width_y:end_y, width_x:end_x]
+    trimmed_data = cube.data[
+        tuple(
+            _spatial_pairs(
+                cube, slice(width_x, end_x), slice(width_y, end_y), slice(None)
+            )
+        )
+    ]
     coord_x = cube.coord(axis="x")
     trimmed_x_coord = pad_coord(coord_x, width_x, "remove")
     coord_y = cube.coord(axis="y")
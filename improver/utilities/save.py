@@ -30,13 +30,26 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Module for saving netcdf cubes with desired attribute types."""
 
+import importlib.util
+import itertools
 import os
 import warnings
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import cf_units
+import dask.array as da
 import iris
+import numpy as np
+from netCDF4 import Dataset
 
 from improver.metadata.check_datatypes import check_mandatory_standards
+from improver.utilities.memmap import is_memmap_file, save_memmap
+
+#: Maximum size of the spatial tiles of the "timeseries" chunk layout.
+TIMESERIES_TILE_SIZE = 64
 
 
 def _order_cell_methods(cube):
@@ -74,7 +87,254 @@ def _check_metadata(cube):
         raise ValueError("{} has unknown units".format(cube.name()))
 
 
-def save_netcdf(cubelist, filename, compression_level=1, least_significant_digit=None):
+def _slice_chunks(shape):
+    """One chunk for each slice over the last two dimensions, suited to
+    reading a whole field at once (eg. 1, 1, 970, 1042)."""
+    if len(shape) < 2:
+        return None
+    return (1,) * (len(shape) - 2) + tuple(shape[-2:])
+
+
+def _spot_chunks(shape):
+    """One chunk for each slice over the last dimension, suited to spot data
+    where the last dimension indexes the sites (eg. 1, 1, 12000)."""
+    if len(shape) < 1:
+        return None
+    return (1,) * (len(shape) - 1) + tuple(shape[-1:])
+
+
+def _timeseries_chunks(shape):
+    """Chunks spanning all leading dimensions over tiles of the last two
+    dimensions, suited to reading the series of values at a point
+    (eg. 24, 12, 64, 64)."""
+    if len(shape) < 2:
+        return None
+    tile = [min(size, TIMESERIES_TILE_SIZE) for size in shape[-2:]]
+    return tuple(shape[:-2]) + tuple(tile)
+
+
+#: Named chunk layouts that can be selected when saving.
+CHUNK_LAYOUTS = {
+    "slice": _slice_chunks,
+    "spot": _spot_chunks,
+    "timeseries": _timeseries_chunks,
+}
+
+
+def _chunksizes(shape, chunks):
+    """
+    Determine the chunk shape of a NetCDF data variable.
+
+    Args:
+        shape (tuple of int):
+            Shape of the data variable.
+        chunks (str or tuple of int or None):
+            Name of a chunk layout in CHUNK_LAYOUTS, or the size of the chunks
+            along each dimension, where -1 selects the full extent of the
+            dimension. If None, the "slice" layout is used.
+
+    Returns:
+        tuple of int or None:
+            Chunk shape, or None if the variable is not chunked.
+
+    Raises:
+        ValueError: if the layout name is not recognised.
+        ValueError: if the chunk shape does not match the number of
+            dimensions or includes sizes that are not positive.
+    """
+    if chunks is None:
+        chunks = "slice"
+    if isinstance(chunks, str):
+        try:
+            layout = CHUNK_LAYOUTS[chunks]
+        except KeyError:
+            msg = "Chunk layout {} not recognised. Expected one of {}".format(
+                chunks, ", ".join(CHUNK_LAYOUTS)
+            )
+            raise ValueError(msg)
+        return layout(shape)
+
+    chunks = tuple(chunks)
+    if len(chunks) != len(shape):
+        msg = "Chunk shape {} does not match the dimensions of data of shape {}"
+        raise ValueError(msg.format(chunks, shape))
+    if any(size == 0 or size < -1 for size in chunks):
+        msg = "Chunk sizes must be positive, or -1 for the full extent: {}"
+        raise ValueError(msg.format(chunks))
+    return tuple(
+        extent if size == -1 else min(size, extent)
+        for size, extent in zip(chunks, shape)
+    )
+
+
+def _quantize(data, least_significant_digit):
+    """
+    Truncate data to a given precision, as netCDF4 does when a variable is
+    created with least_significant_digit.
+
+    Args:
+        data (numpy.ndarray):
+            Data to be quantized.
+        least_significant_digit (int):
+            Power of ten of the precision to be retained.
+
+    Returns:
+        numpy.ndarray:
+            Quantized data.
+    """
+    exponent = -least_significant_digit
+    exponent = int(np.floor(exponent)) if exponent < 0 else int(np.ceil(exponent))
+    bits = np.ceil(np.log2(10.0 ** -exponent))
+    scale = 2.0 ** bits
+    return np.around(scale * data) / scale
+
+
+def _compress_chunk(chunk, compression_level):
+    """
+    Compress a chunk as the HDF5 shuffle and deflate filters used by NetCDF
+    would.
+
+    Args:
+        chunk (numpy.ndarray):
+            Data of a complete chunk.
+        compression_level (int):
+            zlib compression level.
+
+    Returns:
+        bytes:
+            Compressed chunk.
+    """
+    # The shuffle filter groups the bytes of each element by significance
+    shuffled = chunk.view(np.uint8).reshape(-1, chunk.dtype.itemsize).T
+    return zlib.compress(shuffled.tobytes(), compression_level)
+
+
+def _iter_chunks(data, chunksizes, fill_value):
+    """
+    Generate the chunks of an array in the form stored by HDF5, where the
+    chunks at the upper edges of the array are padded to the full chunk
+    shape.
+
+    Args:
+        data (numpy.ndarray):
+            Array to be split into chunks.
+        chunksizes (tuple of int):
+            Chunk shape.
+        fill_value (scalar):
+            Value used to pad chunks at the edges of the array.
+
+    Yields:
+        tuple of (tuple of int, numpy.ndarray):
+            Offset of the chunk within the array and the data of the chunk.
+    """
+    ranges = [range(0, extent, size) for extent, size in zip(data.shape, chunksizes)]
+    for offset in itertools.product(*ranges):
+        index = tuple(
+            slice(start, start + size) for start, size in zip(offset, chunksizes)
+        )
+        chunk = data[index]
+        if chunk.shape != tuple(chunksizes):
+            padded = np.full(chunksizes, fill_value, dtype=data.dtype)
+            padded[tuple(slice(0, size) for size in chunk.shape)] = chunk
+            chunk = padded
+        yield offset, np.ascontiguousarray(chunk)
+
+
+def _compress_chunks(pool, chunks, compression_level, workers):
+    """
+    Compress chunks on a pool of threads, keeping only a few chunks in
+    flight, so that the chunks of an array are not all copied at once.
+
+    Args:
+        pool (concurrent.futures.ThreadPoolExecutor):
+            Pool of threads compressing the chunks.
+        chunks (iterable of tuple of (tuple of int, numpy.ndarray)):
+            Offsets and data of the chunks, as generated by _iter_chunks.
+        compression_level (int):
+            zlib compression level.
+        workers (int):
+            Number of threads in the pool.
+
+    Yields:
+        tuple of (tuple of int, bytes):
+            Offset of each chunk and the compressed chunk, in the order of
+            the input chunks.
+    """
+    pending = deque()
+    for offset, chunk in chunks:
+        pending.append((offset, pool.submit(_compress_chunk, chunk, compression_level)))
+        if len(pending) >= 2 * workers:
+            offset, future = pending.popleft()
+            yield offset, future.result()
+    for offset, future in pending:
+        yield offset, future.result()
+
+
+def _write_compressed_chunks(
+    filename, cubelist, chunksizes, compression_level, least_significant_digit, workers
+):
+    """
+    Write the data of each cube into the compressed data variables of a
+    NetCDF file, compressing the chunks on a pool of threads and writing
+    the compressed chunks directly. zlib releases the GIL, so the chunks
+    are compressed in parallel.
+
+    Args:
+        filename (str):
+            NetCDF file containing a chunked, compressed data variable for
+            each cube, in the order of the cubelist.
+        cubelist (iris.cube.CubeList):
+            Cubes whose data is written.
+        chunksizes (tuple of int):
+            Chunk shape of the data variables.
+        compression_level (int):
+            zlib compression level of the data variables.
+        least_significant_digit (int or None):
+            If specified, the data is quantized to this precision.
+        workers (int):
+            Number of threads compressing chunks.
+
+    Returns:
+        bool:
+            True if the data was written, or False if the data variables of
+            the file could not be matched to the cubes.
+    """
+    import h5py
+
+    with Dataset(filename, mode="r") as dataset:
+        names = [
+            name
+            for name, variable in dataset.variables.items()
+            if variable.filters()["zlib"]
+        ]
+    if len(names) != len(cubelist):
+        return False
+
+    with h5py.File(filename, "r+") as h5file, ThreadPoolExecutor(workers) as pool:
+        for name, cube in zip(names, cubelist):
+            variable = h5file[name]
+            if variable.shape != cube.shape or variable.chunks != chunksizes:
+                return False
+            data = cube.data
+            if least_significant_digit is not None:
+                data = _quantize(data, least_significant_digit)
+            data = np.ma.filled(data, variable.fillvalue).astype(variable.dtype)
+            chunks = _iter_chunks(data, chunksizes, variable.fillvalue)
+            for offset, compressed in _compress_chunks(
+                pool, chunks, compression_level, workers
+            ):
+                variable.id.write_direct_chunk(offset, compressed)
+    return True
+
+
+def save_netcdf(
+    cubelist,
+    filename,
+    compression_level=1,
+    least_significant_digit=None,
+    chunks=None,
+    compression_workers=1,
+):
     """Save the input Cube or CubeList as a NetCDF file and check metadata
     where required for integrity.
 
@@ -82,6 +342,11 @@ def save_netcdf(cubelist, filename, compression_level=1, least_significant_digit
     local_keys to record non-global attributes as data attributes rather than
     global attributes.
 
+    If the filename has the ".mmap" suffix, the cubes are instead saved
+    uncompressed in the memory-mappable format of improver.utilities.memmap,
+    which is intended for ancillaries that are loaded by many processes.
+    The compression options are ignored in this case.
+
     Args:
         cubelist (iris.cube.Cube or iris.cube.CubeList):
             Cube or list of cubes to be saved
@@ -96,8 +361,24 @@ def save_netcdf(cubelist, filename, compression_level=1, least_significant_digit
             http://www.esrl.noaa.gov/psd/data/gridded/conventions/cdc_netcdf_standard.shtml
             for details. When used with `compression level`, this will result in lossy
             compression.
+        chunks (str or tuple of int or None):
+            Chunk layout of the data variables. This is either the name of a
+            layout in CHUNK_LAYOUTS ("slice" for one chunk per slice over the
+            last two dimensions, "spot" for one chunk per slice over the last
+            dimension, or "timeseries" for chunks spanning all leading
+            dimensions over spatial tiles), or the size of the chunks along
+            each dimension, where -1 selects the full extent. If None, the
+            "slice" layout is used.
+        compression_workers (int):
+            Number of threads used to compress the chunks of the data
+            variables. If greater than one, the data is compressed in
+            parallel and the compressed chunks are written directly to the
+            file, which requires h5py. The data is compressed by the NetCDF
+            library on a single thread otherwise.
     Raises:
         warning if cubelist contains cubes of varying dimensions.
+        warning if parallel compression is requested but h5py is not
+            available.
     """
     if isinstance(cubelist, iris.cube.Cube):
         cubelist = iris.cube.CubeList([cubelist])
@@ -108,14 +389,16 @@ def save_netcdf(cubelist, filename, compression_level=1, least_significant_digit
         _order_cell_methods(cube)
         _check_metadata(cube)
 
+    if is_memmap_file(filename):
+        save_memmap(cubelist, filename)
+        return
+
     # If all xy slices are the same shape, use this to determine
-    # the chunksize for the netCDF (eg. 1, 1, 970, 1042)
+    # the chunksize for the netCDF (eg. 1, 1, 970, 1042 by default)
     chunksizes = None
     if len({cube.shape[:2] for cube in cubelist}) == 1:
         cube = cubelist[0]
-        if cube.ndim >= 2:
-            xy_chunksizes = [cube.shape[-2], cube.shape[-1]]
-            chunksizes = tuple([1] * (cube.ndim - 2) + xy_chunksizes)
+        chunksizes = _chunksizes(cube.shape, chunks)
     else:
         msg = "Chunksize not set as cubelist " "contains cubes of varying dimensions"
         warnings.warn(msg)
@@ -143,11 +426,15 @@ def save_netcdf(cubelist, filename, compression_level=1, least_significant_digit
             "Compression level must be an integer value between 0 and 9 (0 to disable compression)"
         )
 
-    # save atomically by writing to a temporary file and then renaming
-    ftmp = str(filename) + ".tmp"
-    iris.fileformats.netcdf.save(
-        cubelist,
-        ftmp,
+    parallel = (
+        compression_workers > 1 and compression_level > 0 and chunksizes is not None
+    )
+    if parallel and importlib.util.find_spec("h5py") is None:
+        warnings.warn("h5py is not available, so compressing serially")
+        parallel = False
+
+    save = partial(
+        iris.fileformats.netcdf.save,
         local_keys=local_keys,
         complevel=compression_level,
         shuffle=True,
@@ -155,4 +442,166 @@ def save_netcdf(cubelist, filename, compression_level=1, least_significant_digit
         chunksizes=chunksizes,
         least_significant_digit=least_significant_digit,
     )
+
+    # save atomically by writing to a temporary file and then renaming
+    ftmp = str(filename) + ".tmp"
+    if parallel:
+        # Write the metadata with cheaply compressed placeholder data, then
+        # replace the chunks of the data variables
+        placeholders = iris.cube.CubeList(
+            cube.copy(data=da.zeros(cube.shape, dtype=cube.dtype, chunks=chunksizes))
+            for cube in cubelist
+        )
+        save(placeholders, ftmp)
+        parallel = _write_compressed_chunks(
+            ftmp,
+            cubelist,
+            chunksizes,
+            compression_level,
+            least_significant_digit,
+            compression_workers,
+        )
+    if not parallel:
+        save(cubelist, ftmp)
+    os.rename(ftmp, filename)
+
+
+def _data_variable(dataset, shape):
+    """
+    Find the data variable of a cube in a NetCDF dataset saved by iris, as
+    the variable of the cube's shape that is not a coordinate, bounds or
+    other variable referenced from another variable.
+
+    Args:
+        dataset (netCDF4.Dataset):
+            Dataset containing a single cube.
+        shape (tuple of int):
+            Shape of the cube.
+
+    Returns:
+        netCDF4.Variable:
+            The data variable.
+
+    Raises:
+        ValueError: if there is not exactly one such variable.
+    """
+    referenced = set(dataset.dimensions)
+    for variable in dataset.variables.values():
+        for attribute in (
+            "coordinates",
+            "bounds",
+            "grid_mapping",
+            "cell_measures",
+            "ancillary_variables",
+        ):
+            value = getattr(variable, attribute, "")
+            # Cell measures are of the form "area: cell_area"
+            referenced.update(item.rstrip(":") for item in value.split())
+    candidates = [
+        variable
+        for name, variable in dataset.variables.items()
+        if name not in referenced and variable.shape == tuple(shape)
+    ]
+    if len(candidates) != 1:
+        raise ValueError("Unable to identify the data variable to be written")
+    return candidates[0]
+
+
+def save_netcdf_incremental(
+    template,
+    slices,
+    filename,
+    coord,
+    compression_level=1,
+    least_significant_digit=None,
+    chunks=None,
+):
+    """Save a cube to a NetCDF file one slice at a time, so that the data
+    of the whole cube never needs to be in memory.
+
+    The file is first written from the metadata of the template cube, with
+    placeholder data. The data of each slice is then written into its
+    place in the data variable, as it is generated, and the file is
+    renamed into place once all slices have been written. A plugin can
+    therefore yield its results (eg. one threshold or realization at a
+    time) rather than stacking them.
+
+    Args:
+        template (iris.cube.Cube):
+            Cube with the metadata and shape of the output, including the
+            full coordinate along which the slices are taken. Its data is
+            not used, so may be lazy.
+        slices (iterable of iris.cube.Cube):
+            Slices of the output, eg. from a generator. Each slice has the
+            coordinate as a scalar coordinate, or as a dimension along which
+            it is split into slices, and otherwise the dimensions of the
+            template in the same order. Every point of the coordinate must be
+            written exactly once.
+        filename (str):
+            Filename to save the cube.
+        coord (str):
+            Name of the coordinate along which the slices are taken.
+        compression_level (int):
+            1-9 to specify compression level, or 0 to not compress.
+        least_significant_digit (int):
+            If specified will truncate the data to a precision given by
+            10**(-least_significant_digit). See save_netcdf.
+        chunks (str or tuple of int or None):
+            Chunk layout of the data variable. See save_netcdf.
+
+    Raises:
+        ValueError: if a slice does not match a point of the coordinate or
+            the shape of the template.
+        ValueError: if not every point of the coordinate is written exactly
+            once.
+    """
+    (dim,) = template.coord_dims(coord)
+    points = template.coord(coord).points
+    slice_shape = template.shape[:dim] + template.shape[dim + 1 :]
+
+    # Split placeholder data along the sliced dimension, so iris does not
+    # hold a whole array of zeros in memory at once
+    placeholder_chunks = list(template.shape)
+    placeholder_chunks[dim] = 1
+    placeholder = template.copy(
+        data=da.zeros(template.shape, dtype=template.dtype, chunks=placeholder_chunks)
+    )
+
+    # save atomically by writing to a temporary file and then renaming
+    ftmp = str(filename) + ".tmp"
+    save_netcdf(
+        placeholder,
+        ftmp,
+        compression_level=compression_level,
+        least_significant_digit=least_significant_digit,
+        chunks=chunks,
+    )
+    try:
+        written = np.zeros(len(points), dtype=bool)
+        with Dataset(ftmp, mode="r+") as dataset:
+            variable = _data_variable(dataset, template.shape)
+            for cube in slices:
+                for cube_slice in cube.slices_over(coord):
+                    (point,) = cube_slice.coord(coord).points
+                    matches = np.flatnonzero(points == point)
+                    if not matches.size:
+                        msg = "Slice at {} = {} is not a point of the template"
+                        raise ValueError(msg.format(coord, point))
+                    index = matches[0]
+                    if cube_slice.shape != slice_shape:
+                        msg = "Slice of shape {} does not match the template shape {}"
+                        raise ValueError(msg.format(cube_slice.shape, template.shape))
+                    if written[index]:
+                        msg = "Slice at {} = {} is written more than once"
+                        raise ValueError(msg.format(coord, point))
+                    key = [slice(None)] * template.ndim
+                    key[dim] = index
+                    variable[tuple(key)] = cube_slice.data
+                    written[index] = True
+        if not written.all():
+            msg = "Slices at {} = {} were not written".format(coord, points[~written])
+            raise ValueError(msg)
+    except BaseException:
+        os.remove(ftmp)
+        raise
     os.rename(ftmp, filename)
@@ -32,7 +32,6 @@
 
 import datetime as dt
 
-import iris
 import numpy as np
 
 from improver import BasePlugin
@@ -311,22 +310,31 @@ class DayNightMask(BasePlugin):
                 on the cube as it is extracted from the first slice.
         """
         daynight_mask = self._create_daynight_mask(cube)
+        return self.process_slices(self._daynight_mask_slice, daynight_mask, "time")
 
-        modified_masks = iris.cube.CubeList()
-        for mask_cube in daynight_mask.slices_over("time"):
-            dtval = mask_cube.coord("time").cell(0).point
-            day_of_year = (dtval - dt.datetime(dtval.year, 1, 1)).days
-            dtval = dtval + dt.timedelta(seconds=dtval.second)
-            utc_hour = (dtval.hour * 60.0 + dtval.minute) / 60.0
-            trg_crs = lat_lon_determine(mask_cube)
-            # Grids that are not Lat Lon
-            if trg_crs is not None:
-                lats, lons = transform_grid_to_lat_lon(mask_cube)
-                solar_el = calc_solar_elevation(lats, lons, day_of_year, utc_hour)
-                mask_cube.data[np.where(solar_el > 0.0)] = self.day
-            else:
-                mask_cube = self._daynight_lat_lon_cube(
-                    mask_cube, day_of_year, utc_hour
-                )
-            modified_masks.append(mask_cube)
-        return modified_masks.merge_cube()
+    def _daynight_mask_slice(self, mask_cube):
+        """
+        Calculate the daynight mask for a single validity time.
+
+        Args:
+            mask_cube (iris.cube.Cube):
+                daynight mask cube with a scalar time coordinate - data
+                initially set to self.night
+
+        Returns:
+            iris.cube.Cube:
+                daynight mask cube - daytime set to self.day
+        """
+        dtval = mask_cube.coord("time").cell(0).point
+        day_of_year = (dtval - dt.datetime(dtval.year, 1, 1)).days
+        dtval = dtval + dt.timedelta(seconds=dtval.second)
+        utc_hour = (dtval.hour * 60.0 + dtval.minute) / 60.0
+        trg_crs = lat_lon_determine(mask_cube)
+        # Grids that are not Lat Lon
+        if trg_crs is not None:
+            lats, lons = transform_grid_to_lat_lon(mask_cube)
+            solar_el = calc_solar_elevation(lats, lons, day_of_year, utc_hour)
+            mask_cube.data[np.where(solar_el > 0.0)] = self.day
+        else:
+            mask_cube = self._daynight_lat_lon_cube(mask_cube, day_of_year, utc_hour)
+        return mask_cube
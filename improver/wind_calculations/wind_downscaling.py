@@ -32,6 +32,7 @@
 
 import copy
 import itertools
+from functools import partial
 
 import iris
 import numpy as np
@@ -929,6 +930,32 @@ class RoughnessCorrection(PostProcessingPlugin):
                 raise ValueError("ancillary grid different from wind grid")
             raise ValueError("xy-orientation: ancillary differ from wind")
 
+    def _correct_time_slice(self, roughness_correction, hld, time_slice):
+        """Apply the roughness and height correction to a single time slice.
+
+        Args:
+            roughness_correction (RoughnessCorrectionUtilities):
+                Utilities set up with the ancillary data for the grid.
+            hld (numpy.ndarray):
+                3D array of the height levels of the wind data.
+            time_slice (iris.cube.Cube):
+                Wind field for a single time, with dimensions ordered
+                y, x, z.
+
+        Returns:
+            iris.cube.Cube:
+                Wind field with the roughness and height correction applied.
+
+        Raises:
+            ValueError: If the wind data contains NaNs or negative values.
+        """
+        if np.isnan(time_slice.data).any() or (time_slice.data < 0.0).any():
+            msg = "{} has invalid wind data"
+            raise ValueError(msg.format(time_slice.coord(self.t_name)))
+        rc_hc = copy.deepcopy(time_slice)
+        rc_hc.data = roughness_correction.do_rc_hc_all(hld, time_slice.data)
+        return rc_hc
+
     def process(self, input_cube):
         """Adjust the 4d wind field - cube - (x, y, z including times).
 
@@ -958,7 +985,6 @@ class RoughnessCorrection(PostProcessingPlugin):
             input_cube.transpose([ywp, xwp, zwp])
         else:
             input_cube.transpose([ywp, xwp, zwp, twp])  # problems with slices
-        rchc_list = iris.cube.CubeList()
         if self.z_0 is None:
             z0_data = None
         else:
@@ -974,14 +1000,11 @@ class RoughnessCorrection(PostProcessingPlugin):
         )
         self.check_wind_ancil(xwp, ywp)
         hld = self.find_heightgrid(input_cube)
-        for time_slice in input_cube.slices_over("time"):
-            if np.isnan(time_slice.data).any() or (time_slice.data < 0.0).any():
-                msg = "{} has invalid wind data"
-                raise ValueError(msg.format(time_slice.coord(self.t_name)))
-            rc_hc = copy.deepcopy(time_slice)
-            rc_hc.data = roughness_correction.do_rc_hc_all(hld, time_slice.data)
-            rchc_list.append(rc_hc)
-        output_cube = rchc_list.merge_cube()
+        output_cube = self.process_slices(
+            partial(self._correct_time_slice, roughness_correction, hld),
+            input_cube,
+            "time",
+        )
         # reorder input_cube and output_cube as original
         if np.isnan(twp):
             input_cube.transpose(np.argsort([ywp, xwp, zwp]))
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Tests for the build-training-store CLI
+"""
+
+import pytest
+
+from improver.utilities.load import load_cube
+
+from . import acceptance as acc
+
+pytestmark = [pytest.mark.acc, acc.skip_if_kgo_missing]
+CLI = acc.cli_name_with_dashes(__file__)
+run_cli = acc.run_cli(CLI)
+run_estimate_emos = acc.run_cli("estimate-emos-coefficients")
+
+# Tolerances matching those of the estimate-emos-coefficients tests
+EST_EMOS_TOL = "1e-4"
+COMPARE_EMOS_TOLERANCE = 1e-3
+
+
+@pytest.mark.slow
+def test_estimate_emos_from_store(tmp_path):
+    """
+    Test building a training store from historic forecasts and truths, and
+    estimating EMOS coefficients from the store, which should match the
+    coefficients estimated from the files
+    """
+    kgo_dir = acc.kgo_root() / "estimate-emos-coefficients/normal"
+    kgo_path = kgo_dir / "kgo.nc"
+    history_path = kgo_dir / "history/*.nc"
+    truth_path = kgo_dir / "truth/*.nc"
+    store_path = tmp_path / "store"
+    output_path = tmp_path / "output.nc"
+    args = [
+        history_path,
+        truth_path,
+        "--truth-attribute",
+        "mosg__model_configuration=uk_det",
+        "--store",
+        str(store_path),
+    ]
+    run_cli(args)
+    assert (store_path / "forecast.data").exists()
+    assert (store_path / "truth.data").exists()
+
+    history_file = sorted(history_path.parent.glob(history_path.name))[0]
+    forecast_period = load_cube(str(history_file)).coord("forecast_period").points[0]
+    args = [
+        "--distribution",
+        "norm",
+        "--training-store",
+        str(store_path),
+        "--forecast-period",
+        str(int(forecast_period) // 3600),
+        "--tolerance",
+        EST_EMOS_TOL,
+        "--output",
+        output_path,
+    ]
+    run_estimate_emos(args)
+    acc.compare(
+        output_path, kgo_path, atol=COMPARE_EMOS_TOLERANCE, rtol=COMPARE_EMOS_TOLERANCE
+    )
+
+
+def test_store_without_forecast_period(tmp_path):
+    """Test estimating EMOS coefficients from a store requires the forecast
+    period"""
+    args = [
+        "--distribution",
+        "norm",
+        "--training-store",
+        str(tmp_path / "store"),
+        "--output",
+        tmp_path / "output.nc",
+    ]
+    with pytest.raises(ValueError, match="forecast period must be provided"):
+        run_estimate_emos(args)
+
+
+def test_files_without_truth_attribute(tmp_path):
+    """Test estimating EMOS coefficients from files requires the truth
+    attribute"""
+    kgo_dir = acc.kgo_root() / "estimate-emos-coefficients/normal"
+    args = [
+        kgo_dir / "history/*.nc",
+        kgo_dir / "truth/*.nc",
+        "--distribution",
+        "norm",
+        "--output",
+        tmp_path / "output.nc",
+    ]
+    with pytest.raises(ValueError, match="truth attribute must be provided"):
+        run_estimate_emos(args)
+
+
+def test_store_with_forecast_cubes(tmp_path):
+    """Test only a land-sea mask may be provided with a training store"""
+    kgo_dir = acc.kgo_root() / "estimate-emos-coefficients/normal"
+    args = [
+        kgo_dir / "truth/*.nc",
+        "--distribution",
+        "norm",
+        "--training-store",
+        str(tmp_path / "store"),
+        "--forecast-period",
+        "12",
+        "--output",
+        tmp_path / "output.nc",
+    ]
+    with pytest.raises(ValueError, match="land_binary_mask|Only a land-sea mask"):
+        run_estimate_emos(args)
@@ -32,8 +32,11 @@
 Tests for the nbhood CLI
 """
 
+import numpy as np
 import pytest
 
+from improver.utilities.load import load_cube
+
 from . import acceptance as acc
 
 pytestmark = [pytest.mark.acc, acc.skip_if_kgo_missing]
@@ -63,6 +66,32 @@ def test_basic_circular(tmp_path):
     acc.compare(output_path, kgo_path)
 
 
+@pytest.mark.parametrize("backend", ("fft", "auto"))
+def test_circular_backend(tmp_path, backend):
+    """Test circular neighbourhooding with the FFT or automatically selected
+    kernel backend matches direct correlation"""
+    kgo_dir = acc.kgo_root() / "nbhood/basic"
+    kgo_path = kgo_dir / "kgo_circular.nc"
+    input_path = kgo_dir / "input_circular.nc"
+    output_path = tmp_path / "output.nc"
+    args = [
+        input_path,
+        "--neighbourhood-output",
+        "probabilities",
+        "--neighbourhood-shape",
+        "circular",
+        "--radii",
+        "20000",
+        "--weighted-mode",
+        "--backend",
+        backend,
+        "--output",
+        output_path,
+    ]
+    run_cli(args)
+    acc.compare(output_path, kgo_path)
+
+
 def test_basic_square(tmp_path):
     """Test basic square neighbourhooding"""
     kgo_dir = acc.kgo_root() / "nbhood/basic"
@@ -85,6 +114,44 @@ def test_basic_square(tmp_path):
     acc.compare(output_path, kgo_path)
 
 
+def test_square_multiple_radii(tmp_path):
+    """Test square neighbourhooding at several radii without lead times"""
+    kgo_dir = acc.kgo_root() / "nbhood/basic"
+    input_path = kgo_dir / "input_square.nc"
+    output_path = tmp_path / "output.nc"
+    args = [
+        input_path,
+        "--neighbourhood-output",
+        "probabilities",
+        "--neighbourhood-shape",
+        "square",
+        "--radii",
+        "20000,40000",
+        "--output",
+        output_path,
+    ]
+    run_cli(args)
+    result = load_cube(str(output_path))
+    assert result.coord("neighbourhood_radius").points.tolist() == [20000, 40000]
+    for radius_cube in result.slices_over("neighbourhood_radius"):
+        radius = radius_cube.coord("neighbourhood_radius").points[0]
+        radius_path = tmp_path / "output_{}.nc".format(int(radius))
+        args = [
+            input_path,
+            "--neighbourhood-output",
+            "probabilities",
+            "--neighbourhood-shape",
+            "square",
+            "--radii",
+            str(radius),
+            "--output",
+            radius_path,
+        ]
+        run_cli(args)
+        expected = load_cube(str(radius_path))
+        np.testing.assert_allclose(radius_cube.data, expected.data, atol=1e-6)
+
+
 def test_masked_square(tmp_path):
     """Test square neighbourhooding with a mask"""
     kgo_dir = acc.kgo_root() / "nbhood/mask"
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Tests for the run-pipeline CLI
+"""
+
+import json
+
+import pytest
+
+from . import acceptance as acc
+
+pytestmark = [pytest.mark.acc, acc.skip_if_kgo_missing]
+CLI = acc.cli_name_with_dashes(__file__)
+run_cli = acc.run_cli(CLI)
+
+
+@pytest.mark.parametrize("concurrency", ("1", "2"))
+def test_shared_input(tmp_path, concurrency):
+    """Test a pipeline of two threshold steps sharing a loaded input, run one
+    at a time and at the same time"""
+    kgo_dir = acc.kgo_root() / "threshold"
+    input_path = kgo_dir / "basic/input.nc"
+    if not acc.checksum_ignore():
+        acc.verify_checksum(input_path)
+    above_path = tmp_path / "above.nc"
+    below_path = tmp_path / "below.nc"
+    pipeline = {
+        "inputs": {"temperature": str(input_path)},
+        "steps": {
+            "above": [
+                "threshold",
+                "@temperature",
+                "--threshold-values",
+                "280",
+                "--output",
+                str(above_path),
+            ],
+            "below": [
+                "threshold",
+                "@temperature",
+                "--threshold-values",
+                "280",
+                "--comparison-operator",
+                "<=",
+                "--output",
+                str(below_path),
+            ],
+        },
+    }
+    pipeline_path = tmp_path / "pipeline.json"
+    with open(pipeline_path, "w") as pipeline_file:
+        json.dump(pipeline, pipeline_file)
+    run_cli([str(pipeline_path), "--concurrency", concurrency])
+    acc.compare(above_path, kgo_dir / "basic/kgo.nc")
+    acc.compare(below_path, kgo_dir / "below_threshold/kgo.nc")
@@ -32,6 +32,7 @@
 
 import unittest
 
+import dask.array as da
 import iris
 import numpy as np
 from iris.tests import IrisTest
@@ -103,6 +104,18 @@ class Test_process(IrisTest):
             thresh_coord.attributes["spp__relative_to_threshold"], "between_thresholds"
         )
 
+    def test_lazy(self):
+        """Test probabilities are calculated lazily in lazy mode"""
+        threshold_ranges = [[280, 281], [281, 282]]
+        expected = OccurrenceBetweenThresholds(threshold_ranges.copy(), "K")(
+            self.temp_cube
+        )
+        self.temp_cube.data = da.from_array(self.temp_cube.data)
+        plugin = OccurrenceBetweenThresholds(threshold_ranges.copy(), "K", lazy=True)
+        result = plugin(self.temp_cube)
+        self.assertTrue(result.has_lazy_data())
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
     def test_below_threshold(self):
         """Test values from a "below threshold" cube"""
         threshold_ranges = [[1000, 5000]]
@@ -222,6 +222,28 @@ def generate_matching_weights_array(weights, shape):
     return weights_array.astype(np.float32)
 
 
+def blend_percentiles_for_point(perc_values, percentiles, weights):
+    """The blending of percentiles at a single grid point, as previously
+    implemented by PercentileBlendingAggregator.blend_percentiles and
+    called for each grid point in turn, for regression testing."""
+    num = perc_values.shape[0]
+    combined_pdf = np.zeros((num, len(percentiles)), dtype=np.float32)
+    for i in range(0, num):
+        for j in range(0, num):
+            if i == j:
+                recalc_values_in_pdf = percentiles
+            else:
+                recalc_values_in_pdf = np.interp(
+                    perc_values[i], perc_values[j], percentiles
+                )
+            combined_pdf[i] += recalc_values_in_pdf * weights[j]
+    combined_perc_thres_data = np.sort(perc_values.flatten())
+    combined_perc_values = np.sort(combined_pdf.flatten())
+    return np.interp(
+        percentiles, combined_perc_values, combined_perc_thres_data
+    ).astype(np.float32)
+
+
 class Test__repr__(IrisTest):
 
     """Test the repr method."""
@@ -328,6 +350,31 @@ class Test_aggregate(IrisTest):
         self.assertArrayAlmostEqual(result, expected_result)
         self.assertEqual(result.shape, expected_result_shape)
 
+    def test_matches_blending_each_point(self):
+        """Test the result is identical to blending each grid point in turn,
+        for percentile values that are sorted, that have repeated values,
+        and that are unsorted."""
+        rng = np.random.RandomState(0)
+        percentiles = np.linspace(0, 100, 9).astype(np.float32)
+        weights = rng.rand(3, 1, 50).astype(np.float32)
+        weights = np.broadcast_to(weights / weights.sum(axis=0), (3, 9, 50))
+        data = 10 * rng.rand(3, 9, 50).astype(np.float32)
+        for perc_data in [np.sort(data, axis=1), np.sort(data.round(), axis=1), data]:
+            expected = np.stack(
+                [
+                    blend_percentiles_for_point(
+                        perc_data[..., i], percentiles, weights[..., i]
+                    )
+                    for i in range(50)
+                ],
+                axis=-1,
+            )
+            result = PercentileBlendingAggregator.aggregate(
+                perc_data, 0, percentiles, weights, 1
+            )
+            self.assertArrayEqual(result, expected)
+            self.assertEqual(result.dtype, np.float32)
+
 
 class Test_blend_percentiles(IrisTest):
     """Test the blend_percentiles method"""
@@ -394,6 +441,24 @@ class Test_blend_percentiles(IrisTest):
         expected_result = np.array([5.0, 6.0, 7.0])
         self.assertArrayAlmostEqual(result, expected_result)
 
+    def test_many_points(self):
+        """Test blending many grid points at once, with a trailing dimension
+        of grid points, gives the result of blending each point in turn."""
+        weights = np.array([0.38872692, 0.33041788, 0.2808552])
+        percentiles = np.array(
+            [0.0, 10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0]
+        )
+        perc_values = np.stack([PERCENTILE_VALUES, PERCENTILE_VALUES[::-1]], axis=-1)
+        result = PercentileBlendingAggregator.blend_percentiles(
+            perc_values, percentiles, weights
+        )
+        self.assertEqual(result.shape, (11, 2))
+        for i in range(2):
+            expected = PercentileBlendingAggregator.blend_percentiles(
+                perc_values[..., i], percentiles, weights
+            )
+            self.assertArrayEqual(result[:, i], expected)
+
 
 if __name__ == "__main__":
     unittest.main()
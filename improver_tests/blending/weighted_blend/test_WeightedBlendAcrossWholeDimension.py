@@ -32,11 +32,16 @@
    weighted_blend.WeightedBlendAcrossWholeDimension plugin."""
 
 
+import time
+import tracemalloc
 import unittest
 from datetime import datetime
+from unittest.mock import patch
 
+import dask.array as da
 import iris
 import numpy as np
+import pytest
 from iris.coords import AuxCoord, DimCoord
 from iris.cube import Cube
 from iris.exceptions import CoordinateNotFoundError
@@ -629,6 +634,22 @@ class Test_weighted_mean(Test_weighted_blend):
         self.assertIsInstance(result, iris.cube.Cube)
         self.assertArrayAlmostEqual(result.data, expected)
 
+    @ManageWarnings(ignored_messages=[COORD_COLLAPSE_WARNING])
+    def test_weights_not_broadcast_to_cube(self):
+        """Test 1D weights are passed to the accumulation with length one
+        spatial dimensions, rather than broadcast to the shape of the cube."""
+
+        coord = "forecast_reference_time"
+        plugin = WeightedBlendAcrossWholeDimension(coord)
+        with patch.object(
+            plugin, "_accumulate_weighted_mean", wraps=plugin._accumulate_weighted_mean,
+        ) as accumulate:
+            result = plugin.weighted_mean(self.cube, self.weights1d)
+        weights_array = accumulate.call_args[0][1]
+
+        self.assertEqual(weights_array.shape, (3, 1, 1))
+        self.assertArrayAlmostEqual(result.data, np.full((2, 2), 1.5))
+
     @ManageWarnings(ignored_messages=[COORD_COLLAPSE_WARNING])
     def test_with_spatially_varying_weights(self):
         """Test function when a data cube and a multi dimensional weights cube
@@ -657,6 +678,35 @@ class Test_weighted_mean(Test_weighted_blend):
         self.assertIsInstance(result, iris.cube.Cube)
         self.assertArrayAlmostEqual(result.data, expected)
 
+    @ManageWarnings(ignored_messages=[COORD_COLLAPSE_WARNING])
+    def test_with_masked_data(self):
+        """Test masked data is given no weight, and points where the data is
+        masked in every slice are masked."""
+        mask = np.zeros(self.cube.shape, dtype=bool)
+        mask[0, 0, 0] = True
+        mask[:, 1, 1] = True
+        self.cube.data = np.ma.masked_array(self.cube.data, mask=mask)
+        plugin = WeightedBlendAcrossWholeDimension("forecast_reference_time")
+        result = plugin.weighted_mean(self.cube, self.weights3d)
+        expected_data = np.array([[2.888889, 2.1], [2.4, 0]])
+        expected_mask = np.array([[False, False], [False, True]])
+        self.assertArrayAlmostEqual(
+            result.data.data[~expected_mask], expected_data[~expected_mask]
+        )
+        self.assertArrayEqual(result.data.mask, expected_mask)
+
+    @ManageWarnings(ignored_messages=[COORD_COLLAPSE_WARNING])
+    def test_with_lazy_data(self):
+        """Test lazy data gives the same result as realised data, and that
+        the input cube data is not realised."""
+        plugin = WeightedBlendAcrossWholeDimension("forecast_reference_time")
+        expected = plugin.weighted_mean(self.cube.copy(), self.weights3d)
+        self.cube.data = da.from_array(self.cube.data, chunks=(1, 2, 2))
+        result = plugin.weighted_mean(self.cube, self.weights3d)
+        self.assertTrue(self.cube.has_lazy_data())
+        self.assertEqual(result.coords(), expected.coords())
+        self.assertArrayEqual(result.data, expected.data)
+
     @ManageWarnings(ignored_messages=[COORD_COLLAPSE_WARNING])
     def test_collapse_dims_with_weights(self):
         """Test function matches when the blend coordinate is first or second."""
@@ -894,5 +944,64 @@ class Test_process(Test_weighted_blend):
             self.assertNotIn(coord_name, [coord.name() for coord in result.coords()])
 
 
+@pytest.mark.slow
+def test_weighted_mean_benchmark(record_property):
+    """Benchmark the streamed weighted mean of 24 realizations on a large
+    grid with 1D weights. The time in seconds and the peak memory allocated
+    in MB are recorded as properties of the test, and the result should
+    match a weighted average of the whole array."""
+    rng = np.random.RandomState(0)
+    data = 280 + rng.normal(size=(24, 1000, 1000)).astype(np.float32)
+    cube = set_up_variable_cube(data)
+    weights = cube[:, 0, 0].copy(data=rng.uniform(size=24).astype(np.float32))
+    weights.data /= weights.data.sum()
+    weights.rename("weights")
+    weights.units = "1"
+    plugin = WeightedBlendAcrossWholeDimension("realization")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = plugin(cube, weights)
+    record_property("seconds", time.perf_counter() - start)
+    record_property("peak_mb", tracemalloc.get_traced_memory()[1] / 1e6)
+    tracemalloc.stop()
+
+    expected = np.average(data, axis=0, weights=weights.data)
+    np.testing.assert_allclose(result.data, expected, rtol=1e-6)
+
+
+@pytest.mark.slow
+def test_percentile_weighted_mean_benchmark(record_property):
+    """Benchmark blending 11 percentiles from 6 forecast reference times on a
+    large grid, which is aggregated over blocks of grid points. The time in
+    seconds is recorded as a property of the test, and the blended
+    percentiles should be in order at every point."""
+    rng = np.random.RandomState(0)
+    data = np.sort(280 + rng.normal(size=(11, 6, 200, 200)), axis=0)
+    cube = set_up_percentile_cube(
+        np.zeros((11, 200, 200), dtype=np.float32),
+        np.linspace(0, 100, 11).astype(np.float32),
+        time=datetime(2015, 11, 19, 6),
+        frt=datetime(2015, 11, 19, 0),
+    )
+    frt_points = [datetime(2015, 11, 19, hour) for hour in range(6)]
+    cube = add_coordinate(
+        cube,
+        frt_points,
+        "forecast_reference_time",
+        is_datetime=True,
+        order=(1, 0, 2, 3),
+    )
+    cube.data = data.astype(np.float32)
+    plugin = WeightedBlendAcrossWholeDimension("forecast_reference_time")
+
+    start = time.perf_counter()
+    result = plugin(cube)
+    record_property("seconds", time.perf_counter() - start)
+
+    assert result.shape == (11, 200, 200)
+    assert np.all(np.diff(result.data, axis=0) >= 0)
+
+
 if __name__ == "__main__":
     unittest.main()
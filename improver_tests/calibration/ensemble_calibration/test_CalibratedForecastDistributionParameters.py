@@ -334,6 +334,31 @@ class Test__calculate_location_parameter_from_realizations(
             decimal=0,
         )
 
+    @ManageWarnings(ignored_messages=["Collapsing a non-contiguous coordinate."])
+    def test_point_by_point(self):
+        """Test that coefficients that vary by point are applied at each
+        point. The statsmodels coefficients are used at every point, with the
+        alpha coefficient offset by a different amount at each point."""
+        offset = np.arange(9, dtype=np.float32).reshape(3, 3)
+        coeffs = np.broadcast_to(
+            np.array(self.expected_realizations_norm_statsmodels)[:, None, None],
+            (6, 3, 3),
+        ).copy()
+        coeffs[0] += offset
+        estimator = EstimateCoefficientsForEnsembleCalibration(
+            "norm", predictor="realizations", point_by_point=True
+        )
+        self.plugin.coefficients_cubelist = estimator.create_coefficients_cubelist(
+            coeffs, self.current_temperature_forecast_cube
+        )
+        location_parameter = (
+            self.plugin._calculate_location_parameter_from_realizations()
+        )
+        self.assertCalibratedVariablesAlmostEqual(
+            location_parameter,
+            self.expected_loc_param_statsmodels_realizations + offset,
+        )
+
 
 class Test__calculate_scale_parameter(
     SetupCoefficientsCubes, EnsembleCalibrationAssertions
@@ -459,6 +484,34 @@ class Test_process(SetupCoefficientsCubes, EnsembleCalibrationAssertions):
         )
         self.assertArrayEqual(calibrated_forecast_var.data.mask, expected_mask)
 
+    @ManageWarnings(ignored_messages=["Collapsing a non-contiguous coordinate."])
+    def test_end_to_end_point_by_point(self):
+        """An example end-to-end calculation with coefficients that vary by
+        point. The same coefficients are used at every point, apart from the
+        alpha coefficient, which is offset by a different amount at each
+        point."""
+        offset = np.arange(9, dtype=np.float32).reshape(3, 3)
+        coeffs = np.broadcast_to(
+            np.array(self.expected_mean_predictor_norm)[:, None, None], (4, 3, 3)
+        ).copy()
+        coeffs[0] += offset
+        estimator = EstimateCoefficientsForEnsembleCalibration(
+            "norm", point_by_point=True
+        )
+        coefficients_cubelist = estimator.create_coefficients_cubelist(
+            coeffs, self.current_temperature_forecast_cube
+        )
+        calibrated_forecast_predictor, calibrated_forecast_var = self.plugin.process(
+            self.current_temperature_forecast_cube, coefficients_cubelist
+        )
+        self.assertCalibratedVariablesAlmostEqual(
+            calibrated_forecast_predictor.data, self.expected_loc_param_mean + offset
+        )
+        self.assertCalibratedVariablesAlmostEqual(
+            calibrated_forecast_var.data, self.expected_scale_param_mean
+        )
+        self.assertEqual(calibrated_forecast_predictor.dtype, np.float32)
+
 
 if __name__ == "__main__":
     unittest.main()
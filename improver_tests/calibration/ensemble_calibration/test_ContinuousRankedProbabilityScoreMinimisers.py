@@ -35,6 +35,7 @@ class.
 
 """
 import unittest
+from unittest.mock import patch
 
 import iris
 import numpy as np
@@ -60,22 +61,59 @@ class Test__repr__(IrisTest):
             "<ContinuousRankedProbabilityScoreMinimisers: "
             "minimisation_dict: {'norm': 'calculate_normal_crps', "
             "'truncnorm': 'calculate_truncated_normal_crps'}; "
-            "tolerance: 0.01; max_iterations: 1000>"
+            "tolerance: 0.01; max_iterations: 1000; "
+            "minimisation_method: Nelder-Mead; point_by_point: False>"
         )
         self.assertEqual(result, msg)
 
     def test_update_kwargs(self):
         """A test to update the available keyword argument."""
-        result = str(Plugin(tolerance=10, max_iterations=10))
+        result = str(
+            Plugin(
+                tolerance=10,
+                max_iterations=10,
+                minimisation_method="L-BFGS-B",
+                point_by_point=True,
+            )
+        )
         msg = (
             "<ContinuousRankedProbabilityScoreMinimisers: "
             "minimisation_dict: {'norm': 'calculate_normal_crps', "
             "'truncnorm': 'calculate_truncated_normal_crps'}; "
-            "tolerance: 10; max_iterations: 10>"
+            "tolerance: 10; max_iterations: 10; "
+            "minimisation_method: L-BFGS-B; point_by_point: True>"
         )
         self.assertEqual(result, msg)
 
 
+class Test__init__(IrisTest):
+
+    """Test the __init__ method."""
+
+    def test_unsupported_minimisation_method(self):
+        """Test that an error is raised if the minimisation method is not
+        supported."""
+        msg = "Minimisation method BFGS is not supported"
+        with self.assertRaisesRegex(ValueError, msg):
+            Plugin(minimisation_method="BFGS")
+
+
+def finite_difference_gradient(crps_function, coefficients, *args):
+    """Calculate the gradient of the CRPS with respect to the coefficients
+    using central differences."""
+    step = 1e-6
+    gradient = []
+    for offset in np.eye(len(coefficients)) * step:
+        gradient.append(
+            (
+                crps_function(coefficients + offset, *args)
+                - crps_function(coefficients - offset, *args)
+            )
+            / (2 * step)
+        )
+    return np.array(gradient)
+
+
 class SetupInputs(IrisTest):
 
     """Set up inputs for testing."""
@@ -213,6 +251,90 @@ class Test_calculate_normal_crps(SetupNormalInputs):
         self.assertAlmostEqual(result, plugin.BAD_VALUE)
 
 
+class Test_calculate_normal_crps_and_gradient(SetupNormalInputs):
+
+    """Test calculating the CRPS and its gradient for a normal distribution."""
+
+    def setUp(self):
+        """Set up coefficients away from the initial guess, so that all
+        components of the gradient are non-zero."""
+        super().setUp()
+        self.coeffs_for_mean = np.array([0.1, 0.9, 0.3, 0.8], dtype=np.float64)
+        self.coeffs_for_realization = np.array(
+            [0.1, 0.5, 0.6, 0.7, 0.3, 0.8], dtype=np.float64
+        )
+
+    def test_mean_predictor(self):
+        """Test that the CRPS matches calculate_normal_crps and the gradient
+        matches a finite difference estimate, with the ensemble mean as the
+        predictor."""
+        plugin = Plugin()
+        args = (
+            self.forecast_predictor_data,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "mean",
+        )
+        result, gradient = plugin.calculate_normal_crps_and_gradient(
+            self.coeffs_for_mean, *args
+        )
+        self.assertAlmostEqual(
+            result, plugin.calculate_normal_crps(self.coeffs_for_mean, *args)
+        )
+        self.assertArrayAlmostEqual(
+            gradient,
+            finite_difference_gradient(
+                plugin.calculate_normal_crps, self.coeffs_for_mean, *args
+            ),
+        )
+
+    def test_realizations_predictor(self):
+        """Test that the CRPS matches calculate_normal_crps and the gradient
+        matches a finite difference estimate, with the ensemble realizations
+        as the predictor."""
+        plugin = Plugin()
+        args = (
+            self.forecast_predictor_data_realizations,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "realizations",
+        )
+        result, gradient = plugin.calculate_normal_crps_and_gradient(
+            self.coeffs_for_realization, *args
+        )
+        self.assertAlmostEqual(
+            result, plugin.calculate_normal_crps(self.coeffs_for_realization, *args)
+        )
+        self.assertArrayAlmostEqual(
+            gradient,
+            finite_difference_gradient(
+                plugin.calculate_normal_crps, self.coeffs_for_realization, *args
+            ),
+        )
+
+    @ManageWarnings(
+        ignored_messages=["invalid value encountered in"],
+        warning_types=[RuntimeWarning],
+    )
+    def test_mean_predictor_bad_value(self):
+        """Test that the BAD_VALUE and a zero gradient are returned, when
+        the appropriate condition is found."""
+        initial_guess = np.array([1e65, 1e65, 1e65, 1e65], dtype=np.float32)
+        plugin = Plugin()
+        result, gradient = plugin.calculate_normal_crps_and_gradient(
+            initial_guess,
+            self.forecast_predictor_data,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "mean",
+        )
+        self.assertAlmostEqual(result, plugin.BAD_VALUE)
+        self.assertArrayEqual(gradient, np.zeros(4))
+
+
 class Test_process_normal_distribution(
     SetupNormalInputs, EnsembleCalibrationAssertions
 ):
@@ -297,6 +419,391 @@ class Test_process_normal_distribution(
             result, self.expected_realizations_coefficients
         )
 
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[UserWarning, RuntimeWarning, RuntimeWarning],
+    )
+    def test_mean_predictor_gradient_method(self):
+        """
+        Test that the L-BFGS-B method, using the analytic gradient, gives
+        coefficients with a CRPS no greater than those from the Nelder-Mead
+        method. The ensemble mean is the predictor.
+        """
+        plugin = Plugin(tolerance=self.tolerance, minimisation_method="L-BFGS-B")
+        result = plugin.process(
+            self.initial_guess_for_mean,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )
+        args = (
+            self.forecast_predictor_data,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "mean",
+        )
+        self.assertEqual(result.dtype, np.float32)
+        self.assertLessEqual(
+            plugin.calculate_normal_crps(result.astype(np.float64), *args),
+            plugin.calculate_normal_crps(
+                np.array(self.expected_mean_coefficients), *args
+            ),
+        )
+
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[UserWarning, RuntimeWarning, RuntimeWarning],
+    )
+    def test_realizations_predictor_gradient_method(self):
+        """
+        Test that the L-BFGS-B method, using the analytic gradient, gives
+        coefficients with a CRPS no greater than those from the Nelder-Mead
+        method. The ensemble realizations are the predictor.
+        """
+        plugin = Plugin(tolerance=self.tolerance, minimisation_method="L-BFGS-B")
+        result = plugin.process(
+            self.initial_guess_for_realization,
+            self.forecast_predictor_realizations,
+            self.truth,
+            self.forecast_variance,
+            "realizations",
+            "norm",
+        )
+        args = (
+            self.forecast_predictor_data_realizations,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "realizations",
+        )
+        self.assertEqual(result.dtype, np.float32)
+        self.assertLessEqual(
+            plugin.calculate_normal_crps(result.astype(np.float64), *args),
+            plugin.calculate_normal_crps(
+                np.array(self.expected_realizations_coefficients), *args
+            ),
+        )
+
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[UserWarning, RuntimeWarning, RuntimeWarning],
+    )
+    def test_mean_predictor_gradient_method(self):
+        """
+        Test that the L-BFGS-B method, using the analytic gradient, gives
+        coefficients with a CRPS no greater than those from the Nelder-Mead
+        method. The ensemble mean is the predictor.
+        """
+        plugin = Plugin(tolerance=self.tolerance, minimisation_method="L-BFGS-B")
+        result = plugin.process(
+            self.initial_guess_for_mean,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "truncnorm",
+        )
+        args = (
+            self.forecast_predictor_data,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "mean",
+        )
+        self.assertEqual(result.dtype, np.float32)
+        self.assertLessEqual(
+            plugin.calculate_truncated_normal_crps(result.astype(np.float64), *args),
+            plugin.calculate_truncated_normal_crps(
+                np.array(self.expected_mean_coefficients), *args
+            ),
+        )
+
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[UserWarning, RuntimeWarning, RuntimeWarning],
+    )
+    def test_realizations_predictor_gradient_method(self):
+        """
+        Test that the L-BFGS-B method, using the analytic gradient, gives
+        coefficients with a CRPS no greater than those from the Nelder-Mead
+        method. The ensemble realizations are the predictor.
+        """
+        plugin = Plugin(tolerance=self.tolerance, minimisation_method="L-BFGS-B")
+        result = plugin.process(
+            self.initial_guess_for_realization,
+            self.forecast_predictor_realizations,
+            self.truth,
+            self.forecast_variance,
+            "realizations",
+            "truncnorm",
+        )
+        args = (
+            self.forecast_predictor_data_realizations,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "realizations",
+        )
+        self.assertEqual(result.dtype, np.float32)
+        self.assertLessEqual(
+            plugin.calculate_truncated_normal_crps(result.astype(np.float64), *args),
+            plugin.calculate_truncated_normal_crps(
+                np.array(self.expected_realizations_coefficients), *args
+            ),
+        )
+
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "Minimisation did not result in convergence",
+            "The final iteration resulted in",
+            "The minimisation did not result in a satisfactory convergence",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[
+            UserWarning,
+            UserWarning,
+            UserWarning,
+            UserWarning,
+            RuntimeWarning,
+            RuntimeWarning,
+        ],
+    )
+    def test_point_by_point_mean_predictor(self):
+        """
+        Test that coefficients are returned for each spatial point, and that
+        these match the coefficients from a minimisation using only the data
+        at that point. The ensemble mean is the predictor.
+        """
+        plugin = Plugin(tolerance=self.tolerance, point_by_point=True)
+        result = plugin.process(
+            self.initial_guess_for_mean,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )
+        self.assertEqual(result.shape, (4, 3, 3))
+        self.assertEqual(result.dtype, np.float32)
+        expected = self.plugin.process(
+            self.initial_guess_for_mean,
+            self.forecast_predictor_mean[:, 1, 2],
+            self.truth[:, 1, 2],
+            self.forecast_variance[:, 1, 2],
+            "mean",
+            "norm",
+        )
+        self.assertArrayEqual(result[:, 1, 2], expected)
+
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "Minimisation did not result in convergence",
+            "The final iteration resulted in",
+            "The minimisation did not result in a satisfactory convergence",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[
+            UserWarning,
+            UserWarning,
+            UserWarning,
+            UserWarning,
+            RuntimeWarning,
+            RuntimeWarning,
+        ],
+    )
+    def test_point_by_point_realizations_predictor(self):
+        """
+        Test that coefficients are returned for each spatial point, and that
+        these match the coefficients from a minimisation using only the data
+        at that point. The ensemble realizations are the predictor.
+        """
+        plugin = Plugin(tolerance=self.tolerance, point_by_point=True)
+        result = plugin.process(
+            self.initial_guess_for_realization,
+            self.forecast_predictor_realizations,
+            self.truth,
+            self.forecast_variance,
+            "realizations",
+            "norm",
+        )
+        self.assertEqual(result.shape, (6, 3, 3))
+        expected = self.plugin.process(
+            self.initial_guess_for_realization,
+            self.forecast_predictor_realizations[..., 2, 0],
+            self.truth[:, 2, 0],
+            self.forecast_variance[:, 2, 0],
+            "realizations",
+            "norm",
+        )
+        self.assertArrayEqual(result[:, 2, 0], expected)
+
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "The minimisation did not result in a satisfactory convergence",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[UserWarning, UserWarning, RuntimeWarning, RuntimeWarning],
+    )
+    def test_point_by_point_workers(self):
+        """
+        Test that the same coefficients are returned when the minimisations
+        for separate points are distributed over multiple workers.
+        """
+        plugin = Plugin(tolerance=self.tolerance, point_by_point=True)
+        expected = plugin.process(
+            self.initial_guess_for_mean,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )
+        plugin._workers = 2
+        result = plugin.process(
+            self.initial_guess_for_mean,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )
+        self.assertArrayEqual(result, expected)
+
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "The minimisation did not result in a satisfactory convergence",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[UserWarning, UserWarning, RuntimeWarning, RuntimeWarning],
+    )
+    def test_point_by_point_blocks(self):
+        """
+        Test that the points are passed to the workers in blocks, rather
+        than as a separate task for each point.
+        """
+        plugin = Plugin(tolerance=self.tolerance, point_by_point=True)
+        n_tasks = []
+
+        def parallel_map(function, iterable, executor):
+            """Apply the function serially, recording the number of tasks."""
+            items = list(iterable)
+            n_tasks.append(len(items))
+            return [function(item) for item in items]
+
+        with patch.object(plugin, "parallel_map", side_effect=parallel_map):
+            result = plugin.process(
+                self.initial_guess_for_mean,
+                self.forecast_predictor_mean,
+                self.truth,
+                self.forecast_variance,
+                "mean",
+                "norm",
+            )
+        self.assertEqual(n_tasks, [3])
+        self.assertEqual(result.shape, (4, 3, 3))
+
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "The minimisation did not result in a satisfactory convergence",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[UserWarning, UserWarning, RuntimeWarning, RuntimeWarning],
+    )
+    def test_point_by_point_initial_guess_for_each_point(self):
+        """
+        Test that, if a separate initial guess is provided for each point,
+        the minimisation at each point starts from the initial guess for
+        that point.
+        """
+        other_initial_guess = np.array([1, 0.9, 0.1, 0.5], dtype=np.float64)
+        initial_guess = np.broadcast_to(
+            self.initial_guess_for_mean[:, np.newaxis, np.newaxis], (4, 3, 3)
+        ).copy()
+        initial_guess[:, 2, 0] = other_initial_guess
+        plugin = Plugin(tolerance=self.tolerance, point_by_point=True)
+        expected = plugin.process(
+            self.initial_guess_for_mean,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )
+        expected_at_point = plugin.process(
+            other_initial_guess,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )[:, 2, 0]
+        expected[:, 2, 0] = expected_at_point
+        result = plugin.process(
+            initial_guess,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )
+        self.assertArrayEqual(result, expected)
+
+    @ManageWarnings(
+        record=True, ignored_messages=["Collapsing a non-contiguous coordinate."]
+    )
+    def test_point_by_point_catch_warnings(self, warning_list=None):
+        """
+        Test that a single warning reporting the number of points at which
+        the minimisation did not converge is raised, rather than a warning
+        for each point.
+        """
+        plugin = Plugin(tolerance=self.tolerance, max_iterations=5, point_by_point=True)
+        plugin.process(
+            self.initial_guess_for_mean,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )
+        warning_msg = (
+            "The minimisation did not result in a satisfactory convergence "
+            "at 9 of 9 points."
+        )
+        user_warnings = [
+            str(item.message) for item in warning_list if item.category == UserWarning
+        ]
+        self.assertEqual(user_warnings, [warning_msg])
+
     @ManageWarnings(ignored_messages=["Collapsing a non-contiguous coordinate."])
     def test_mean_predictor_keyerror(self):
         """
@@ -385,6 +892,57 @@ class Test_process_normal_distribution(
             result, self.expected_realizations_coefficients
         )
 
+    @ManageWarnings(
+        ignored_messages=[
+            "Collapsing a non-contiguous coordinate.",
+            "divide by zero encountered in",
+            "invalid value encountered in",
+        ],
+        warning_types=[UserWarning, RuntimeWarning, RuntimeWarning],
+    )
+    def test_gradient_method_initial_guess_unchanged(self):
+        """
+        Test that the L-BFGS-B method does not modify an initial guess with
+        zero gamma and delta coefficients, whether given as an array or as a
+        list. The ensemble mean is the predictor.
+        """
+        plugin = Plugin(tolerance=self.tolerance, minimisation_method="L-BFGS-B")
+        for initial_guess in (np.array([0.0, 1.0, 0.0, 0.0]), [0.0, 1.0, 0.0, 0.0]):
+            expected = np.array(initial_guess)
+            result = plugin.process(
+                initial_guess,
+                self.forecast_predictor_mean,
+                self.truth,
+                self.forecast_variance,
+                "mean",
+                "norm",
+            )
+            self.assertArrayEqual(initial_guess, expected)
+            self.assertEqual(result.dtype, np.float32)
+
+    @ManageWarnings(
+        record=True, ignored_messages=["Collapsing a non-contiguous coordinate."]
+    )
+    def test_gradient_method_bad_initial_guess(self, warning_list=None):
+        """
+        Test that a warning is generated if the CRPS cannot be calculated for
+        the initial guess, as the L-BFGS-B minimisation stops at once. The
+        ensemble mean is the predictor.
+        """
+        initial_guess = np.array([1e65, 1e65, 1e65, 1e65], dtype=np.float32)
+        plugin = Plugin(tolerance=self.tolerance, minimisation_method="L-BFGS-B")
+        result = plugin.process(
+            initial_guess,
+            self.forecast_predictor_mean,
+            self.truth,
+            self.forecast_variance,
+            "mean",
+            "norm",
+        )
+        warning_msg = "The CRPS could not be calculated for the initial guess"
+        self.assertTrue(any(warning_msg in str(item) for item in warning_list))
+        self.assertArrayEqual(result, initial_guess)
+
     @ManageWarnings(
         record=True, ignored_messages=["Collapsing a non-contiguous coordinate."]
     )
@@ -561,6 +1119,94 @@ class Test_calculate_truncated_normal_crps(SetupTruncatedNormalInputs):
         self.assertAlmostEqual(result, plugin.BAD_VALUE)
 
 
+class Test_calculate_truncated_normal_crps_and_gradient(SetupTruncatedNormalInputs):
+
+    """Test calculating the CRPS and its gradient for a truncated normal
+    distribution."""
+
+    def setUp(self):
+        """Set up coefficients away from the initial guess, so that all
+        components of the gradient are non-zero."""
+        super().setUp()
+        self.coeffs_for_mean = np.array([0.1, 0.9, 0.3, 0.8], dtype=np.float64)
+        self.coeffs_for_realization = np.array(
+            [0.1, 0.5, 0.6, 0.7, 0.3, 0.8], dtype=np.float64
+        )
+
+    def test_mean_predictor(self):
+        """Test that the CRPS matches calculate_truncated_normal_crps and the
+        gradient matches a finite difference estimate, with the ensemble mean
+        as the predictor."""
+        plugin = Plugin()
+        args = (
+            self.forecast_predictor_data,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "mean",
+        )
+        result, gradient = plugin.calculate_truncated_normal_crps_and_gradient(
+            self.coeffs_for_mean, *args
+        )
+        self.assertAlmostEqual(
+            result, plugin.calculate_truncated_normal_crps(self.coeffs_for_mean, *args)
+        )
+        self.assertArrayAlmostEqual(
+            gradient,
+            finite_difference_gradient(
+                plugin.calculate_truncated_normal_crps, self.coeffs_for_mean, *args
+            ),
+        )
+
+    def test_realizations_predictor(self):
+        """Test that the CRPS matches calculate_truncated_normal_crps and the
+        gradient matches a finite difference estimate, with the ensemble
+        realizations as the predictor."""
+        plugin = Plugin()
+        args = (
+            self.forecast_predictor_data_realizations,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "realizations",
+        )
+        result, gradient = plugin.calculate_truncated_normal_crps_and_gradient(
+            self.coeffs_for_realization, *args
+        )
+        self.assertAlmostEqual(
+            result,
+            plugin.calculate_truncated_normal_crps(self.coeffs_for_realization, *args),
+        )
+        self.assertArrayAlmostEqual(
+            gradient,
+            finite_difference_gradient(
+                plugin.calculate_truncated_normal_crps,
+                self.coeffs_for_realization,
+                *args,
+            ),
+        )
+
+    @ManageWarnings(
+        ignored_messages=["invalid value encountered in"],
+        warning_types=[RuntimeWarning],
+    )
+    def test_mean_predictor_bad_value(self):
+        """Test that the BAD_VALUE and a zero gradient are returned, when
+        the appropriate condition is found."""
+        initial_guess = np.array([1e65, 1e65, 1e65, 1e65], dtype=np.float32)
+        plugin = Plugin()
+        result, gradient = plugin.calculate_truncated_normal_crps_and_gradient(
+            initial_guess,
+            self.forecast_predictor_data,
+            self.truth_data,
+            self.forecast_variance_data,
+            self.sqrt_pi,
+            "mean",
+        )
+        self.assertAlmostEqual(result, plugin.BAD_VALUE)
+        self.assertArrayEqual(gradient, np.zeros(4))
+
+
 class Test_process_truncated_normal_distribution(
     SetupTruncatedNormalInputs, EnsembleCalibrationAssertions
 ):
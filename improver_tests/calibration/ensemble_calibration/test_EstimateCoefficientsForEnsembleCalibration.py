@@ -73,6 +73,7 @@ IGNORED_MESSAGES = [
     "can't resolve package from",  # Originating from statsmodels
     "Minimisation did not result in convergence",  # From calibration code
     "The final iteration resulted in",  # From calibration code
+    "The minimisation did not result in a satisfactory",  # From calibration code
     "Invalid value encountered in",  # From calculating percentage change in
     # calibration code
 ]
@@ -83,6 +84,7 @@ WARNING_TYPES = [
     ImportWarning,
     UserWarning,
     UserWarning,
+    UserWarning,
     RuntimeWarning,
 ]
 
@@ -234,7 +236,9 @@ class Test__repr__(IrisTest):
             "ContinuousRankedProbabilityScoreMinimisers'>; "
             "coeff_names: ['alpha', 'beta', 'gamma', 'delta']; "
             "tolerance: 0.01; "
-            "max_iterations: 1000>"
+            "max_iterations: 1000; "
+            "minimisation_method: Nelder-Mead; "
+            "point_by_point: False>"
         )
         self.assertEqual(result, msg)
 
@@ -248,6 +252,8 @@ class Test__repr__(IrisTest):
                 predictor="realizations",
                 tolerance=10,
                 max_iterations=10,
+                minimisation_method="L-BFGS-B",
+                point_by_point=True,
             )
         )
         msg = (
@@ -259,7 +265,9 @@ class Test__repr__(IrisTest):
             "ContinuousRankedProbabilityScoreMinimisers'>; "
             "coeff_names: ['alpha', 'beta', 'gamma', 'delta']; "
             "tolerance: 10; "
-            "max_iterations: 10>"
+            "max_iterations: 10; "
+            "minimisation_method: L-BFGS-B; "
+            "point_by_point: True>"
         )
         self.assertEqual(result, msg)
 
@@ -706,6 +714,130 @@ class Test_compute_initial_guess(IrisTest):
         )
 
 
+class Test_initial_guess_from_coefficients(SetupCubes):
+
+    """Test the initial_guess_from_coefficients method."""
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def setUp(self):
+        """Set up previous coefficients for the mean and realizations
+        predictors, and previous coefficients that vary by point."""
+        super().setUp()
+        self.distribution = "norm"
+        self.historic_forecasts = self.historic_temperature_forecast_cube
+        self.mean_coefficients = np.array([1, 0.9, 0.1, 0.5], dtype=np.float32)
+        self.mean_coefficients_cubelist = Plugin(
+            self.distribution
+        ).create_coefficients_cubelist(self.mean_coefficients, self.historic_forecasts)
+        self.realizations_coefficients = np.array(
+            [1, 0.3, 0.3, 0.3, 0.1, 0.5], dtype=np.float32
+        )
+        self.realizations_coefficients_cubelist = Plugin(
+            self.distribution, predictor="realizations"
+        ).create_coefficients_cubelist(
+            self.realizations_coefficients, self.historic_forecasts
+        )
+        self.point_coefficients = np.broadcast_to(
+            self.mean_coefficients[:, np.newaxis, np.newaxis], (4, 3, 3)
+        ).copy()
+        self.point_coefficients[0, 1, 2] = 2
+        self.point_coefficients_cubelist = Plugin(
+            self.distribution, point_by_point=True
+        ).create_coefficients_cubelist(self.point_coefficients, self.historic_forecasts)
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_mean_predictor(self):
+        """Test that the previous coefficients are returned in the order
+        [alpha, beta, gamma, delta] for the mean predictor."""
+        plugin = Plugin(self.distribution)
+        result = plugin.initial_guess_from_coefficients(
+            self.mean_coefficients_cubelist[::-1], self.historic_forecasts
+        )
+        self.assertEqual(result.dtype, np.float32)
+        self.assertArrayAlmostEqual(result, self.mean_coefficients)
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_realizations_predictor(self):
+        """Test that the beta coefficients for each realization are returned
+        in order for the realizations predictor."""
+        plugin = Plugin(self.distribution, predictor="realizations")
+        result = plugin.initial_guess_from_coefficients(
+            self.realizations_coefficients_cubelist,
+            self.historic_forecasts,
+            no_of_realizations=3,
+        )
+        self.assertArrayAlmostEqual(result, self.realizations_coefficients)
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_point_by_point(self):
+        """Test that previous coefficients that vary by point are returned
+        with the spatial dimensions following the coefficients."""
+        plugin = Plugin(self.distribution, point_by_point=True)
+        result = plugin.initial_guess_from_coefficients(
+            self.point_coefficients_cubelist, self.historic_forecasts
+        )
+        self.assertArrayAlmostEqual(result, self.point_coefficients)
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_point_by_point_from_domain_coefficients(self):
+        """Test that coefficients for the whole domain can be used as the
+        initial guess when estimating coefficients point by point."""
+        plugin = Plugin(self.distribution, point_by_point=True)
+        result = plugin.initial_guess_from_coefficients(
+            self.mean_coefficients_cubelist, self.historic_forecasts
+        )
+        self.assertArrayAlmostEqual(result, self.mean_coefficients)
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_mismatching_diagnostic(self):
+        """Test that an exception is raised if the previous coefficients
+        were estimated for a different diagnostic."""
+        for cube in self.mean_coefficients_cubelist:
+            cube.attributes["diagnostic_standard_name"] = "wind_speed"
+        plugin = Plugin(self.distribution)
+        msg = "The previous coefficients were estimated for the wind_speed"
+        with self.assertRaisesRegex(ValueError, msg):
+            plugin.initial_guess_from_coefficients(
+                self.mean_coefficients_cubelist, self.historic_forecasts
+            )
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_mismatching_distribution(self):
+        """Test that an exception is raised if the previous coefficients
+        were estimated for a different distribution."""
+        plugin = Plugin("truncnorm")
+        msg = "and the norm distribution"
+        with self.assertRaisesRegex(ValueError, msg):
+            plugin.initial_guess_from_coefficients(
+                self.mean_coefficients_cubelist, self.historic_forecasts
+            )
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_mismatching_predictor(self):
+        """Test that an exception is raised if coefficients estimated using
+        the mean predictor are provided for the realizations predictor."""
+        plugin = Plugin(self.distribution, predictor="realizations")
+        msg = "The shape of the previous beta coefficients"
+        with self.assertRaisesRegex(ValueError, msg):
+            plugin.initial_guess_from_coefficients(
+                self.mean_coefficients_cubelist,
+                self.historic_forecasts,
+                no_of_realizations=3,
+            )
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_point_coefficients_without_point_by_point(self):
+        """Test that an exception is raised if coefficients that vary by
+        point are provided, when one set of coefficients is being estimated
+        for the whole domain."""
+        plugin = Plugin(self.distribution)
+        msg = "Previous coefficients of shape \\(3, 3\\) that vary by point"
+        with self.assertRaisesRegex(ValueError, msg):
+            plugin.initial_guess_from_coefficients(
+                self.point_coefficients_cubelist, self.historic_forecasts
+            )
+
+
 class Test_mask_cube(SetupCubes):
     """Test the mask_cube method"""
 
@@ -1095,6 +1227,107 @@ class Test_process(
             [cube.name() for cube in result], self.expected_coeff_names
         )
 
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_point_by_point(self):
+        """Ensure that, when estimating coefficients point by point, the
+        coefficient cubes have the spatial dimensions of the truth, with
+        finite coefficients at every point."""
+        plugin = Plugin(self.distribution, point_by_point=True)
+        result = plugin.process(
+            self.historic_temperature_forecast_cube, self.temperature_truth_cube
+        )
+        self.assertArrayEqual(
+            [cube.name() for cube in result], self.expected_coeff_names
+        )
+        for cube in result:
+            self.assertEqual(cube.shape, (3, 3))
+            self.assertEqual(
+                cube.coord(axis="y"), self.temperature_truth_cube.coord(axis="y")
+            )
+            self.assertEqual(
+                cube.coord(axis="x"), self.temperature_truth_cube.coord(axis="x")
+            )
+            self.assertTrue(np.all(np.isfinite(cube.data)))
+            self.assertEqual(cube.coord("forecast_period").shape, (1,))
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_point_by_point_realizations(self):
+        """Ensure that, when estimating coefficients point by point with the
+        realizations as the predictor, the beta coefficient cube has a
+        leading realization dimension followed by the spatial dimensions."""
+        plugin = Plugin(
+            self.distribution, predictor="realizations", point_by_point=True
+        )
+        result = plugin.process(
+            self.historic_temperature_forecast_cube, self.temperature_truth_cube
+        )
+        beta = result.extract_cube("emos_coefficient_beta")
+        self.assertEqual(beta.shape, (3, 3, 3))
+        self.assertEqual(
+            [coord.name() for coord in beta.dim_coords],
+            ["realization", "latitude", "longitude"],
+        )
+        self.assertEqual(result.extract_cube("emos_coefficient_alpha").shape, (3, 3))
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_point_by_point_landsea_mask(self):
+        """Ensure that, when estimating coefficients point by point with a
+        land-sea mask, the coefficients are NaN at sea points, where there is
+        no training data, and finite at land points."""
+        plugin = Plugin(self.distribution, point_by_point=True)
+        result = plugin.process(
+            self.historic_temperature_forecast_cube_halo,
+            self.temperature_truth_cube_halo,
+            landsea_mask=self.landsea_cube,
+        )
+        land = self.landsea_cube.data.astype(bool)
+        for cube in result:
+            self.assertEqual(cube.shape, (5, 5))
+            self.assertTrue(np.all(np.isfinite(cube.data[land])))
+            self.assertTrue(np.all(np.isnan(cube.data[~land])))
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_previous_coefficients(self):
+        """Ensure that, when the minimisation is started from previously
+        estimated coefficients that have already converged for the same
+        training dataset, these coefficients are returned."""
+        plugin = Plugin(
+            self.distribution, tolerance=1e-5, minimisation_method="L-BFGS-B"
+        )
+        expected = plugin.process(
+            self.historic_temperature_forecast_cube, self.temperature_truth_cube
+        )
+        result = plugin.process(
+            self.historic_temperature_forecast_cube,
+            self.temperature_truth_cube,
+            previous_coefficients=expected,
+        )
+        self.assertEMOSCoefficientsAlmostEqual(
+            np.array([cube.data for cube in result]),
+            np.array([cube.data for cube in expected]),
+        )
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_previous_coefficients_point_by_point(self):
+        """Ensure that, when estimating coefficients point by point from
+        previous coefficients that vary by point, points without previous
+        coefficients are started from the initial guess computed using the
+        training dataset, so that coefficients are found at every point."""
+        plugin = Plugin(self.distribution, point_by_point=True)
+        previous = plugin.process(
+            self.historic_temperature_forecast_cube, self.temperature_truth_cube
+        )
+        for cube in previous:
+            cube.data[0, 0] = np.nan
+        result = plugin.process(
+            self.historic_temperature_forecast_cube,
+            self.temperature_truth_cube,
+            previous_coefficients=previous,
+        )
+        for cube in result:
+            self.assertEqual(cube.shape, (3, 3))
+            self.assertTrue(np.all(np.isfinite(cube.data)))
+
     @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
     def test_truth_unit_conversion(self):
         """Ensure the expected optimised coefficients are generated,
@@ -387,6 +387,47 @@ class Test__populate_reliability_bins(Test_Setup):
         self.assertSequenceEqual(result.shape, self.expected_table_shape)
         assert_array_equal(result, self.expected_table)
 
+    def test_masked_data(self):
+        """Test that points at which either the forecast or the truth is
+        masked do not contribute to the reliability table."""
+
+        forecast_slice = next(self.forecast_1.slices_over("air_temperature"))
+        truth_slice = next(self.truth_1.slices_over("air_temperature"))
+        forecast = np.ma.masked_array(forecast_slice.data)
+        forecast[0, 1] = np.ma.masked
+        truth = np.ma.masked_array(truth_slice.data)
+        truth[2, 2] = np.ma.masked
+        expected = self.expected_table.copy()
+        expected[..., 0, 1] = 0
+        expected[..., 2, 2] = 0
+        result = Plugin(
+            single_value_lower_limit=True, single_value_upper_limit=True
+        )._populate_reliability_bins(forecast, truth)
+
+        self.assertNotIsInstance(result, np.ma.MaskedArray)
+        assert_array_equal(result, expected)
+
+    def test_values_outside_bins(self):
+        """Test that forecast values that are outside of the range of the
+        probability bins, or are NaN, do not contribute to the reliability
+        table."""
+
+        forecast_slice = next(self.forecast_1.slices_over("air_temperature"))
+        truth_slice = next(self.truth_1.slices_over("air_temperature"))
+        forecast = forecast_slice.data.copy()
+        forecast[0, 0] = -0.5
+        forecast[1, 1] = np.nan
+        forecast[2, 2] = 1.5
+        expected = self.expected_table.copy()
+        expected[..., 0, 0] = 0
+        expected[..., 1, 1] = 0
+        expected[..., 2, 2] = 0
+        result = Plugin(
+            single_value_lower_limit=True, single_value_upper_limit=True
+        )._populate_reliability_bins(forecast, truth_slice.data)
+
+        assert_array_equal(result, expected)
+
 
 class Test_process(Test_Setup):
 
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the TrainingDataStore class."""
+
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+import numpy as np
+from iris.tests import IrisTest
+
+from improver.calibration.training_store import TrainingDataStore
+from improver.calibration.utilities import filter_non_matching_cubes
+from improver.utilities.warnings_handler import ManageWarnings
+
+from ..ensemble_calibration.helper_functions import SetupCubes
+
+IGNORED_MESSAGES = ["Collapsing a non-contiguous coordinate"]
+WARNING_TYPES = [UserWarning]
+
+# Forecast period of the historic forecasts in seconds
+FORECAST_PERIOD = 4 * 3600
+
+
+class SetupStore(SetupCubes):
+
+    """Set up historic forecasts, truths and a directory for a store."""
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def setUp(self):
+        """Set up historic forecasts and truths for five days, and a path
+        for the training store."""
+        super().setUp()
+        self.directory = mkdtemp()
+        self.path = os.path.join(self.directory, "store")
+        self.forecasts = self.historic_temperature_forecast_cube
+        self.truths = self.temperature_truth_cube
+
+    def tearDown(self):
+        """Remove temporary directories created for testing."""
+        shutil.rmtree(self.directory)
+
+
+class Test_append(SetupStore):
+
+    """Test appending to the training store."""
+
+    def test_basic(self):
+        """Test that each forecast reference time and each truth is stored
+        as a separate record, and that the store can be reopened."""
+        TrainingDataStore(self.path).append(self.forecasts, self.truths)
+        store = TrainingDataStore(self.path)
+        self.assertEqual(len(store.forecasts), 5)
+        self.assertEqual(len(store.truths), 5)
+        self.assertEqual(
+            repr(store),
+            "<TrainingDataStore: {}, forecasts: 5, truths: 5>".format(self.path),
+        )
+
+    def test_append_single_time(self):
+        """Test appending cubes with a single time, without a time
+        dimension."""
+        store = TrainingDataStore(self.path)
+        for index in range(5):
+            store.append(self.forecasts[index], self.truths[index])
+        self.assertEqual(len(store.forecasts), 5)
+        self.assertEqual(len(store.truths), 5)
+
+    def test_mismatching_cube(self):
+        """Test that an exception is raised if a cube does not match the
+        records in the store, and that the store is unchanged."""
+        store = TrainingDataStore(self.path)
+        store.append(self.forecasts)
+        msg = "Only the values of the time coordinates may differ"
+        with self.assertRaisesRegex(ValueError, msg):
+            store.append(self.forecasts[:, :2])
+        self.assertEqual(len(TrainingDataStore(self.path).forecasts), 5)
+
+    def test_non_float_data(self):
+        """Test that an exception is raised if the data is not floating
+        point."""
+        self.truths.data = self.truths.data.astype(np.int32)
+        msg = "Only floating point data can be stored"
+        with self.assertRaisesRegex(ValueError, msg):
+            TrainingDataStore(self.path).append(truths=self.truths)
+
+
+class Test_load(SetupStore):
+
+    """Test loading from the training store."""
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_basic(self):
+        """Test that the loaded historic forecasts and truths match those
+        filtered from the original cubes."""
+        TrainingDataStore(self.path).append(self.forecasts, self.truths)
+        expected_forecasts, expected_truths = filter_non_matching_cubes(
+            self.forecasts, self.truths
+        )
+        forecasts, truths = TrainingDataStore(self.path).load(FORECAST_PERIOD)
+        self.assertEqual(forecasts, expected_forecasts)
+        self.assertEqual(truths, expected_truths)
+
+    @ManageWarnings(ignored_messages=IGNORED_MESSAGES, warning_types=WARNING_TYPES)
+    def test_non_matching_times(self):
+        """Test that only forecasts with a matching truth, and truths with a
+        matching forecast, are loaded, in order of validity time."""
+        store = TrainingDataStore(self.path)
+        store.append(self.forecasts[1:][::-1], self.truths[:4])
+        forecasts, truths = store.load(FORECAST_PERIOD)
+        self.assertEqual(forecasts, self.forecasts[1:4])
+        self.assertEqual(truths, self.truths[1:4])
+
+    def test_cycletime_and_training_length(self):
+        """Test that only the requested number of days of forecasts before
+        the cycletime are loaded."""
+        store = TrainingDataStore(self.path)
+        store.append(self.forecasts, self.truths)
+        forecasts, truths = store.load(
+            FORECAST_PERIOD, cycletime="20171114T0000Z", training_length=2
+        )
+        self.assertEqual(forecasts, self.forecasts[2:4])
+        self.assertEqual(truths, self.truths[2:4])
+
+    def test_cycletime_different_time_of_day(self):
+        """Test that forecasts with a forecast reference time at a different
+        time of day to the cycletime are not loaded."""
+        store = TrainingDataStore(self.path)
+        store.append(self.forecasts, self.truths)
+        msg = "No historic forecasts with a forecast period of 14400 seconds"
+        with self.assertRaisesRegex(ValueError, msg):
+            store.load(FORECAST_PERIOD, cycletime="20171114T1200Z")
+
+    def test_single_time(self):
+        """Test that a single matching time is loaded without a time
+        dimension."""
+        store = TrainingDataStore(self.path)
+        store.append(self.forecasts, self.truths)
+        forecasts, truths = store.load(
+            FORECAST_PERIOD, cycletime="20171111T0000Z", training_length=1
+        )
+        self.assertEqual(forecasts, self.forecasts[0])
+        self.assertEqual(truths, self.truths[0])
+
+    def test_masked_data(self):
+        """Test that masked data is loaded as masked data."""
+        self.truths.data = np.ma.masked_greater(self.truths.data, 277)
+        store = TrainingDataStore(self.path)
+        store.append(self.forecasts, self.truths)
+        _, truths = store.load(FORECAST_PERIOD)
+        self.assertIsInstance(truths.data, np.ma.MaskedArray)
+        self.assertArrayEqual(truths.data.mask, self.truths.data.mask)
+        self.assertArrayAlmostEqual(truths.data, self.truths.data)
+
+    def test_latest_record_used(self):
+        """Test that, if a truth is appended again, the truth appended most
+        recently is loaded."""
+        store = TrainingDataStore(self.path)
+        store.append(self.forecasts, self.truths)
+        replacement = self.truths[2].copy(data=self.truths[2].data + 1)
+        store.append(truths=replacement)
+        _, truths = store.load(FORECAST_PERIOD)
+        self.assertArrayAlmostEqual(truths[2].data, replacement.data)
+        self.assertArrayAlmostEqual(truths[3].data, self.truths[3].data)
+
+    def test_incomplete_append_discarded(self):
+        """Test that data left in the data file by an append that failed
+        before updating the index is discarded by the next append."""
+        store = TrainingDataStore(self.path)
+        store.append(truths=self.truths[:2])
+        with open(store.truths.data_path, "ab") as data_file:
+            data_file.write(b"incomplete")
+        store.append(self.forecasts, self.truths[2:])
+        _, truths = store.load(FORECAST_PERIOD)
+        self.assertArrayAlmostEqual(truths.data, self.truths.data)
+
+    def test_no_matches(self):
+        """Test that an exception is raised if there are no historic
+        forecasts with a matching truth for the forecast period."""
+        store = TrainingDataStore(self.path)
+        store.append(self.forecasts, self.truths)
+        msg = "No historic forecasts with a forecast period of 7200 seconds"
+        with self.assertRaisesRegex(ValueError, msg):
+            store.load(2 * 3600)
+
+    def test_empty_store(self):
+        """Test that an exception is raised if the store is empty."""
+        msg = "No historic forecasts"
+        with self.assertRaisesRegex(ValueError, msg):
+            TrainingDataStore(self.path).load(FORECAST_PERIOD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,21 +30,28 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Unit tests for cli.__init__"""
 
+import multiprocessing
 import unittest
 from unittest.mock import patch
 
 import numpy as np
+import pytest
 from iris.cube import CubeList
 from iris.exceptions import ConstraintMismatchError
 
 import improver
 from improver.cli import (
+    LazyCommand,
     clizefy,
     create_constrained_inputcubelist_converter,
     docutilize,
+    execute_pipeline,
+    generate_help_index,
     inputcube,
     inputcubelist,
     inputjson,
+    load_help_index,
+    main,
     maybe_coerce_with,
     run_main,
     unbracket,
@@ -175,7 +182,7 @@ class Test_with_output(unittest.TestCase):
         # pylint disable is needed as it can't see the wrappers output kwarg.
         # pylint: disable=E1123
         result = wrapped_with_output.cli("argv[0]", "2", "--output=foo")
-        m.assert_called_with(4, "foo", 1, None)
+        m.assert_called_with(4, "foo", 1, None, chunks=None, compression_workers=1)
         self.assertEqual(result, None)
 
     @patch("improver.utilities.save.save_netcdf")
@@ -186,7 +193,7 @@ class Test_with_output(unittest.TestCase):
         result = wrapped_with_output.cli(
             "argv[0]", "2", "--output=foo", "--compression-level=9"
         )
-        m.assert_called_with(4, "foo", 9, None)
+        m.assert_called_with(4, "foo", 9, None, chunks=None, compression_workers=1)
         self.assertEqual(result, None)
 
     @patch("improver.utilities.save.save_netcdf")
@@ -197,7 +204,7 @@ class Test_with_output(unittest.TestCase):
         result = wrapped_with_output.cli(
             "argv[0]", "2", "--output=foo", "--compression-level=0"
         )
-        m.assert_called_with(4, "foo", 0, None)
+        m.assert_called_with(4, "foo", 0, None, chunks=None, compression_workers=1)
         self.assertEqual(result, None)
 
     @patch("improver.utilities.save.save_netcdf")
@@ -212,9 +219,30 @@ class Test_with_output(unittest.TestCase):
             "--compression-level=0",
             "--least-significant-digit=2",
         )
-        m.assert_called_with(4, "foo", 0, 2)
+        m.assert_called_with(4, "foo", 0, 2, chunks=None, compression_workers=1)
         self.assertEqual(result, None)
 
+    @patch("improver.utilities.save.save_netcdf")
+    def test_with_output_chunks(self, m):
+        """Tests that save_netcdf is called with a named chunk layout or a
+        chunk shape, and the number of compression workers"""
+        # pylint disable is needed as it can't see the wrappers output kwarg.
+        # pylint: disable=E1123
+        wrapped_with_output.cli(
+            "argv[0]",
+            "2",
+            "--output=foo",
+            "--chunks=timeseries",
+            "--compression-workers=4",
+        )
+        m.assert_called_with(
+            4, "foo", 1, None, chunks="timeseries", compression_workers=4
+        )
+        wrapped_with_output.cli("argv[0]", "2", "--output=foo", "--chunks=1,-1,64")
+        m.assert_called_with(
+            4, "foo", 1, None, chunks=(1, -1, 64), compression_workers=1
+        )
+
 
 def setup_for_mock():
     """Function that returns a CubeList of wind_speed and wind_from_direction
@@ -340,6 +368,33 @@ class Test_clizefy(unittest.TestCase):
         m.assert_called_with(func.__doc__)
 
 
+class Test_LazyCommand(unittest.TestCase):
+    """Test the LazyCommand class."""
+
+    def test_indexed_help(self):
+        """Test the help summary is taken from the index entry."""
+        entry = {"description": "Do something.", "usages": ["cube"]}
+        command = LazyCommand("not_a_module", entry)
+        self.assertIs(command.cli, command)
+        self.assertEqual(command.helper.description, "Do something.")
+        self.assertEqual(list(command.helper.usages()), ["cube"])
+
+    def test_unindexed_help(self):
+        """Test the help summary is taken from the module if there is no
+        index entry."""
+        command = LazyCommand("combine")
+        self.assertEqual(command.helper.description, "Combine input cubes.")
+
+    @patch("improver.cli.combine.process")
+    def test_call(self, m):
+        """Test calling the command runs the process function of the module."""
+        m.return_value = "result"
+        m.cli = m
+        result = LazyCommand("combine")("improver combine", "input.nc")
+        m.assert_called_once_with("improver combine", "input.nc")
+        self.assertEqual(result, "result")
+
+
 class Test_unbracket(unittest.TestCase):
     """Test the unbracket function"""
 
@@ -363,6 +418,130 @@ class Test_unbracket(unittest.TestCase):
             unbracket(["foo", "]", "bar"])
 
 
+def sum_dispatcher(prog_name, command, *args):
+    """A dummy dispatcher that sums its arguments, for testing pipelines.
+    Arguments passed in memory are unwrapped from their string wrapper."""
+    values = [getattr(arg, "original_object", arg) for arg in args]
+    if command == "wait":
+        values[0].wait(timeout=60)
+        return 0
+    return sum(int(value) for value in values)
+
+
+class Test_execute_pipeline(unittest.TestCase):
+    """Test the execute_pipeline function."""
+
+    def test_basic(self):
+        """Test results are passed between steps in dependency order,
+        regardless of the order in which the steps are given."""
+        steps = {
+            "total": ["sum", "@first", "@second"],
+            "first": ["sum", "1", "2"],
+            "second": ["sum", "@first", "10"],
+        }
+        result = execute_pipeline(sum_dispatcher, "improver", steps)
+        self.assertEqual(result, {"total": 16, "first": 3, "second": 13})
+
+    def test_nested_and_inputs(self):
+        """Test references within nested commands and to inputs."""
+        steps = {"total": ["sum", ["sum", "@value", "1"], "@value"]}
+        result = execute_pipeline(
+            sum_dispatcher, "improver", steps, inputs={"value": 5}
+        )
+        self.assertEqual(result, {"total": 11})
+
+    def test_sequential(self):
+        """Test steps are run one at a time in dependency order."""
+        calls = []
+
+        def recording_dispatcher(prog_name, command, *args):
+            """Record the command, then sum the arguments."""
+            calls.append(command)
+            return sum_dispatcher(prog_name, "sum", *args)
+
+        steps = {
+            "third": ["c", "@second"],
+            "first": ["a", "1"],
+            "second": ["b", "@first"],
+        }
+        result = execute_pipeline(recording_dispatcher, "improver", steps)
+        self.assertEqual(calls, ["a", "b", "c"])
+        self.assertEqual(result, {"third": 1, "first": 1, "second": 1})
+
+    def test_concurrent(self):
+        """Test independent steps run at the same time in worker processes.
+        The first two steps wait for a barrier that is only passed once both
+        are running, and the results are then passed to a third step."""
+        context = multiprocessing.get_context("spawn")
+        with context.Manager() as manager:
+            barrier = manager.Barrier(2)
+            steps = {
+                "first": ["wait", "@barrier1"],
+                "second": ["wait", "@barrier2"],
+                "total": ["sum", "@first", "@second", "1"],
+            }
+            result = execute_pipeline(
+                sum_dispatcher,
+                "improver",
+                steps,
+                inputs={"barrier1": barrier, "barrier2": barrier},
+                concurrency=2,
+            )
+        self.assertEqual(result, {"first": 0, "second": 0, "total": 1})
+
+    def test_shared_results_copied(self):
+        """Test a result used by several steps is copied for each of them,
+        so that a step modifying its input cannot affect another step."""
+
+        def append_dispatcher(prog_name, command, *args):
+            """Append to the list given as the first argument."""
+            values = [getattr(arg, "original_object", arg) for arg in args]
+            if command == "append":
+                values[0].append(values[1])
+            return values[0]
+
+        steps = {
+            "first": ["append", "@items", "1"],
+            "second": ["append", "@items", "2"],
+        }
+        result = execute_pipeline(
+            append_dispatcher, "improver", steps, inputs={"items": []}
+        )
+        self.assertEqual(result, {"first": ["1"], "second": ["2"]})
+
+    def test_unknown_reference(self):
+        """Test an error is raised for a reference to an unknown step."""
+        msg = "Step total refers to unknown steps"
+        with self.assertRaisesRegex(ValueError, msg):
+            execute_pipeline(sum_dispatcher, "improver", {"total": ["sum", "@x"]})
+
+    def test_circular_reference(self):
+        """Test an error is raised for circular references."""
+        steps = {"first": ["sum", "@second"], "second": ["sum", "@first"]}
+        msg = "Circular references between steps"
+        with self.assertRaisesRegex(ValueError, msg):
+            execute_pipeline(sum_dispatcher, "improver", steps)
+
+
+class Test_main(unittest.TestCase):
+    """Test the main function."""
+
+    @patch("improver.cli.execute_command")
+    def test_workers(self, m):
+        """Test the workers option is set on plugins while the command
+        runs and restored afterwards."""
+        m.side_effect = lambda *args, **kwargs: improver.BasePlugin._workers
+        result = main("improver", "command", workers=4)
+        self.assertEqual(result, 4)
+        self.assertEqual(improver.BasePlugin._workers, 1)
+
+    def test_invalid_workers(self):
+        """Test an error is raised if fewer than one worker is requested."""
+        msg = "The number of workers must be at least 1."
+        with self.assertRaisesRegex(ValueError, msg):
+            main("improver", "command", workers=0)
+
+
 def test_import_cli():
     """Test if `import improver.cli` pulls in heavy stuff like numpy.
 
@@ -382,6 +561,91 @@ def test_import_cli():
     subprocess.run([sys.executable, "-c", script], check=True)  # nosec
 
 
+def test_import_cli_heavy_modules():
+    """Test that `import improver.cli` and looking up a command in the help
+    index import none of numpy, scipy or iris.
+
+    Run in a subprocess to ensure a "fresh" Python interpreter.
+    """
+    import subprocess  # nosec
+    import sys
+
+    script = (
+        "import improver.cli, sys; "
+        'improver.cli.SUBCOMMANDS_TABLE["threshold"].helper; '
+        'print(" ".join(m for m in ("numpy", "scipy", "iris") if m in sys.modules))'
+    )
+    result = subprocess.run(  # nosec
+        [sys.executable, "-c", script],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_startup_modules():
+    """Test that running a single command only imports that command module,
+    without heavy imports such as numpy or iris.
+
+    Run in a subprocess to ensure a "fresh" Python interpreter.
+    """
+    import subprocess  # nosec
+    import sys
+
+    script = (
+        "import improver.cli, sys; "
+        'improver.cli.SUBCOMMANDS_TABLE["threshold"].load(); '
+        'print(" ".join(m for m in sys.modules if m.startswith("improver.cli."))); '
+        'print("numpy" in sys.modules or "iris" in sys.modules)'
+    )
+    result = subprocess.run(  # nosec
+        [sys.executable, "-c", script],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    modules, heavy_imports = result.stdout.splitlines()
+    assert modules == "improver.cli.threshold"
+    assert heavy_imports == "False"
+
+
+# Generous budget in seconds for importing improver.cli and resolving one
+# command, so that only a heavy import regression exceeds it.
+STARTUP_TIME_BUDGET = 5.0
+
+
+@pytest.mark.slow
+def test_startup_time():
+    """Test that importing improver.cli and resolving a single command
+    completes within a generous time budget.
+
+    Run in a subprocess to ensure a "fresh" Python interpreter.
+    """
+    import subprocess  # nosec
+    import sys
+
+    script = (
+        "import time; start = time.perf_counter(); "
+        "import improver.cli; "
+        'improver.cli.SUBCOMMANDS_TABLE["threshold"].load(); '
+        "print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(  # nosec
+        [sys.executable, "-c", script],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert float(result.stdout) < STARTUP_TIME_BUDGET
+
+
+def test_help_index_up_to_date():
+    """Test that the help index matches the command modules. If this fails,
+    regenerate the index using improver.cli.write_help_index()."""
+    assert load_help_index() == generate_help_index()
+
+
 def test_help_no_stderr():
     """Test if help writes to sys.stderr."""
     import contextlib
@@ -59,6 +59,20 @@ class Test__init__(IrisTest):
         with self.assertRaisesRegex(ValueError, msg):
             CircularNeighbourhood(sum_or_fraction=sum_or_fraction)
 
+    def test_backend(self):
+        """Test that a ValueError is raised if an invalid option is passed
+        in for backend."""
+        msg = "The kernel backend nonsense is invalid"
+        with self.assertRaisesRegex(ValueError, msg):
+            CircularNeighbourhood(backend="nonsense")
+
+    def test_summed_area_weighted(self):
+        """Test that a ValueError is raised if the summed_area backend is
+        requested for a weighted kernel."""
+        msg = "summed_area kernel backend can only be used"
+        with self.assertRaisesRegex(ValueError, msg):
+            CircularNeighbourhood(weighted_mode=True, backend="summed_area")
+
 
 class Test__repr__(IrisTest):
 
@@ -68,7 +82,8 @@ class Test__repr__(IrisTest):
         """Test that the __repr__ returns the expected string."""
         result = str(CircularNeighbourhood())
         msg = (
-            "<CircularNeighbourhood: weighted_mode: True, " "sum_or_fraction: fraction>"
+            "<CircularNeighbourhood: weighted_mode: True, "
+            "sum_or_fraction: fraction, backend: correlate>"
         )
         self.assertEqual(str(result), msg)
 
@@ -330,6 +345,100 @@ class Test_apply_circular_kernel(IrisTest):
         self.assertArrayAlmostEqual(result.data, expected)
 
 
+class Test_apply_circular_kernel_backends(IrisTest):
+
+    """Test the alternative backends for applying the circular kernel match
+    direct correlation."""
+
+    def setUp(self):
+        """Set up a cube with random data over several realizations and
+        times, with the spatial dimensions not trailing."""
+        self.cube = set_up_cube(
+            num_time_points=2, num_grid_points=20, num_realization_points=2
+        )
+        self.cube.data = (
+            np.random.RandomState(0).random_sample(self.cube.shape).astype(np.float32)
+        )
+        self.cube.transpose([2, 0, 3, 1])
+        self.ranges = 6
+
+    def _compare_backends(self, backend, weighted_mode, sum_or_fraction):
+        """Compare the result of the backend with direct correlation."""
+        expected = CircularNeighbourhood(
+            weighted_mode=weighted_mode,
+            sum_or_fraction=sum_or_fraction,
+            backend="correlate",
+        ).apply_circular_kernel(self.cube.copy(), self.ranges)
+        result = CircularNeighbourhood(
+            weighted_mode=weighted_mode,
+            sum_or_fraction=sum_or_fraction,
+            backend=backend,
+        ).apply_circular_kernel(self.cube.copy(), self.ranges)
+        self.assertEqual(result.dtype, np.float32)
+        self.assertArrayAlmostEqual(result.data, expected.data, decimal=4)
+
+    def test_fft_weighted(self):
+        """Test the fft backend with a weighted kernel."""
+        self._compare_backends("fft", True, "fraction")
+
+    def test_fft_unweighted_sum(self):
+        """Test the fft backend with an unweighted kernel returning sums."""
+        self._compare_backends("fft", False, "sum")
+
+    def test_summed_area_fraction(self):
+        """Test the summed_area backend returning fractions."""
+        self._compare_backends("summed_area", False, "fraction")
+
+    def test_summed_area_sum(self):
+        """Test the summed_area backend returning sums."""
+        self._compare_backends("summed_area", False, "sum")
+
+    def test_summed_area_single_point(self):
+        """Test the summed_area backend gives the expected result for a
+        single non-zero grid cell."""
+        cube = set_up_cube()
+        expected = np.ones_like(cube.data)
+        for index, slice_ in enumerate(SINGLE_POINT_RANGE_2_CENTROID_FLAT):
+            expected[0][0][5 + index][5:10] = slice_
+        result = CircularNeighbourhood(
+            weighted_mode=False, backend="summed_area"
+        ).apply_circular_kernel(cube, 2)
+        self.assertArrayAlmostEqual(result.data, expected)
+
+    def test_fft_probability_range(self):
+        """Test the fft backend leaves no round-off where the exact result
+        is zero or one, so that probabilities remain within [0, 1]."""
+        cube = set_up_cube(num_grid_points=40)
+        cube.data[..., :20] = 0.0
+        cube.data[..., 20:] = 1.0
+        result = CircularNeighbourhood(
+            weighted_mode=True, backend="fft"
+        ).apply_circular_kernel(cube, 8)
+        self.assertTrue(np.all(result.data[..., :12] == 0.0))
+        self.assertTrue(np.all(result.data[..., 28:] == 1.0))
+        self.assertTrue(np.all((result.data >= 0.0) & (result.data <= 1.0)))
+
+    def test_default(self):
+        """Test that direct correlation is used by default, whatever the
+        kernel size."""
+        plugin = CircularNeighbourhood()
+        self.assertEqual(plugin._select_backend(self.cube.data, 10), "correlate")
+
+    def test_auto(self):
+        """Test the backend selected automatically for different kernel
+        sizes and weightings."""
+        data = self.cube.data
+        weighted = CircularNeighbourhood(weighted_mode=True, backend="auto")
+        unweighted = CircularNeighbourhood(weighted_mode=False, backend="auto")
+        self.assertEqual(weighted._select_backend(data, 2), "correlate")
+        self.assertEqual(unweighted._select_backend(data, 2), "correlate")
+        self.assertEqual(weighted._select_backend(data, 10), "fft")
+        self.assertEqual(unweighted._select_backend(data, 10), "summed_area")
+        self.assertEqual(
+            unweighted._select_backend(data.astype(np.int32), 10), "correlate"
+        )
+
+
 class Test_run(IrisTest):
 
     """Test the run method on the CircularNeighbourhood class."""
@@ -43,7 +43,9 @@ from iris.tests import IrisTest
 from improver.constants import DEFAULT_PERCENTILES
 from improver.nbhood.circular_kernel import (
     GeneratePercentilesFromACircularNeighbourhood,
+    circular_kernel,
 )
+from improver.utilities.neighbourhood_tools import pad_and_roll
 
 from ..nbhood.test_BaseNeighbourhoodProcessing import set_up_cube, set_up_cube_lat_long
 
@@ -331,6 +333,26 @@ class Test_pad_and_unpad_cube(IrisTest):
         ).pad_and_unpad_cube(slice_2d, kernel)
         self.assertArrayAlmostEqual(result.data, expected)
 
+    def test_matches_windowed_percentiles(self):
+        """Test that the percentiles calculated using sliding windows for a
+        kernel larger than MAX_SORTED_WINDOW_SIZE match those calculated by
+        sorting every neighbourhood window, for random data including
+        repeated values."""
+        cube = set_up_cube(num_grid_points=30)[0, 0, :, :]
+        data = np.random.RandomState(0).random_sample((30, 30)).astype(np.float32)
+        data[5:10, :] = np.round(data[5:10, :], 1)
+        cube.data = data
+        kernel = circular_kernel(np.array([8, 8]), 8, weighted_mode=False)
+        plugin = GeneratePercentilesFromACircularNeighbourhood()
+        nb_slices = pad_and_roll(
+            data, kernel.shape, mode="mean", stat_length=max(kernel.shape) // 2
+        )
+        expected = np.percentile(
+            nb_slices[..., kernel > 0], plugin.percentiles, axis=-1
+        )
+        result = plugin.pad_and_unpad_cube(cube, kernel)
+        self.assertArrayAlmostEqual(result.data, expected)
+
 
 class Test_run(IrisTest):
 
@@ -35,7 +35,7 @@ import unittest
 import numpy as np
 from iris.tests import IrisTest
 
-from improver.nbhood.circular_kernel import circular_kernel
+from improver.nbhood.circular_kernel import cached_circular_kernel, circular_kernel
 
 
 class Test_circular_kernel(IrisTest):
@@ -184,5 +184,35 @@ class Test_circular_kernel(IrisTest):
         self.assertArrayEqual(result, expected)
 
 
+class Test_cached_circular_kernel(IrisTest):
+
+    """Test the cached creation of circular kernels."""
+
+    def setUp(self):
+        """Clear the cache so that each test starts from no cached kernels."""
+        cached_circular_kernel.cache_clear()
+
+    def test_matches_circular_kernel(self):
+        """Test the cached kernel and area match those from circular_kernel,
+        for weighted and unweighted kernels."""
+        for weighted_mode in [True, False]:
+            expected = circular_kernel((3, 3), 3, weighted_mode)
+            kernel, kernel_area = cached_circular_kernel(3, weighted_mode)
+            self.assertArrayAlmostEqual(kernel, expected)
+            self.assertAlmostEqual(kernel_area, np.sum(expected))
+
+    def test_cache_reused(self):
+        """Test that a repeated request returns the same read-only kernel
+        and is counted as a cache hit."""
+        kernel, _ = cached_circular_kernel(2, False)
+        repeat, _ = cached_circular_kernel(2, False)
+        cached_circular_kernel(2, True)
+        self.assertIs(kernel, repeat)
+        self.assertFalse(kernel.flags.writeable)
+        info = cached_circular_kernel.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -32,6 +32,7 @@
 
 
 import unittest
+from unittest.mock import patch
 
 import iris
 import numpy as np
@@ -408,7 +409,7 @@ class Test__repr__(IrisTest):
         msg = (
             "<BaseNeighbourhoodProcessing: neighbourhood_method: "
             "<CircularNeighbourhood: weighted_mode: True, "
-            "sum_or_fraction: fraction>; "
+            "sum_or_fraction: fraction, backend: correlate>; "
             "radii: 10000.0; lead_times: None>"
         )
         self.assertEqual(result, msg)
@@ -804,6 +805,38 @@ class Test_process(IrisTest):
         result = NBHood(neighbourhood_method, radius)(cube, mask_cube)
         self.assertArrayAlmostEqual(result.data, expected)
 
+    def test_multiple_radii_square(self):
+        """Test that a list of radii without lead times gives a cube for each
+        radius, matching separate runs at each radius, when the square
+        neighbourhood calculates every radius from one summed-area table."""
+        cube = set_up_cube(
+            zero_point_indices=((0, 0, 7, 7), (1, 0, 5, 9)), num_realization_points=2,
+        )
+        radii = [2000, 4000, 6000]
+        neighbourhood_method = SquareNeighbourhood()
+        with patch.object(
+            SquareNeighbourhood, "run", wraps=neighbourhood_method.run
+        ) as mock_run:
+            result = NBHood(neighbourhood_method, radii)(cube)
+        mock_run.assert_not_called()
+        self.assertIsInstance(result, iris.cube.CubeList)
+        self.assertEqual(len(result), len(radii))
+        for radius, radius_result in zip(radii, result):
+            expected = NBHood(SquareNeighbourhood(), radius)(cube)
+            self.assertArrayAlmostEqual(radius_result.data, expected.data)
+            self.assertEqual(radius_result.metadata, expected.metadata)
+            self.assertEqual(radius_result.coords(), expected.coords())
+
+    def test_multiple_radii_circular(self):
+        """Test that a list of radii without lead times gives a cube for each
+        radius when the method is run separately at each radius."""
+        radii = [2000, 5600]
+        result = NBHood(CircularNeighbourhood(), radii)(self.cube)
+        self.assertEqual(len(result), len(radii))
+        for radius, radius_result in zip(radii, result):
+            expected = NBHood(CircularNeighbourhood(), radius)(self.cube)
+            self.assertArrayAlmostEqual(radius_result.data, expected.data)
+
 
 if __name__ == "__main__":
     unittest.main()
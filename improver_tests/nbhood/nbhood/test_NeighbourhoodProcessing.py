@@ -32,11 +32,13 @@
 
 
 import unittest
+from unittest.mock import patch
 
 import numpy as np
 from iris.cube import Cube
 from iris.tests import IrisTest
 
+from improver.nbhood import circular_kernel
 from improver.nbhood.nbhood import NeighbourhoodProcessing as NBHood
 
 from .test_BaseNeighbourhoodProcessing import set_up_cube
@@ -53,10 +55,17 @@ class Test__init__(IrisTest):
         radii = 10000
         result = NBHood(neighbourhood_method, radii)
         msg = (
-            "<CircularNeighbourhood: weighted_mode: True, " "sum_or_fraction: fraction>"
+            "<CircularNeighbourhood: weighted_mode: True, "
+            "sum_or_fraction: fraction, backend: correlate>"
         )
         self.assertEqual(str(result.neighbourhood_method), msg)
 
+    def test_backend(self):
+        """Test that the kernel backend is passed to a circular
+        neighbourhood."""
+        result = NBHood("circular", 10000, backend="fft")
+        self.assertEqual(result.neighbourhood_method.backend, "fft")
+
     def test_neighbourhood_method_does_not_exist(self):
         """Test that desired error message is raised, if the neighbourhood
         method does not exist."""
@@ -77,7 +86,7 @@ class Test__repr__(IrisTest):
         msg = (
             "<BaseNeighbourhoodProcessing: neighbourhood_method: "
             "<CircularNeighbourhood: weighted_mode: True, "
-            "sum_or_fraction: fraction>; "
+            "sum_or_fraction: fraction, backend: correlate>; "
             "radii: 10000.0; lead_times: None>"
         )
         self.assertEqual(result, msg)
@@ -156,6 +165,29 @@ class Test_process(IrisTest):
         self.assertIsInstance(result, Cube)
         self.assertArrayAlmostEqual(result.data, expected)
 
+    def test_backends(self):
+        """Test that each kernel backend is used when requested and matches
+        direct correlation."""
+        cube = set_up_cube(
+            zero_point_indices=((0, 0, 7, 7), (0, 0, 10, 5)), num_grid_points=16
+        )
+        radius = 12000
+        expected = NBHood("circular", radius, weighted_mode=False)(cube)
+        for backend, function in [
+            ("fft", "fftconvolve"),
+            ("summed_area", "circlesum"),
+            ("auto", "circlesum"),
+        ]:
+            with patch(
+                "improver.nbhood.circular_kernel.{}".format(function),
+                wraps=getattr(circular_kernel, function),
+            ) as mock_backend:
+                result = NBHood(
+                    "circular", radius, weighted_mode=False, backend=backend
+                )(cube)
+            mock_backend.assert_called_once()
+            self.assertArrayAlmostEqual(result.data, expected.data)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -51,6 +51,33 @@ def _mean_points(points):
     return np.array((points[:-1] + points[1:]) / 2, dtype=np.float32)
 
 
+def _reference_recursion(grid, smoothing_coefficients_x, smoothing_coefficients_y):
+    """Apply one iteration of the recursive filter to a 2D (y, x) array one
+    gridpoint at a time, to compare against the vectorised implementation."""
+    grid = grid.copy()
+    for i in range(1, grid.shape[1]):
+        coeff = smoothing_coefficients_x[:, i - 1]
+        grid[:, i] = (1.0 - coeff) * grid[:, i] + coeff * grid[:, i - 1]
+    for i in range(grid.shape[1] - 2, -1, -1):
+        coeff = smoothing_coefficients_x[:, i]
+        grid[:, i] = (1.0 - coeff) * grid[:, i] + coeff * grid[:, i + 1]
+    for i in range(1, grid.shape[0]):
+        coeff = smoothing_coefficients_y[i - 1, :]
+        grid[i, :] = (1.0 - coeff) * grid[i, :] + coeff * grid[i - 1, :]
+    for i in range(grid.shape[0] - 2, -1, -1):
+        coeff = smoothing_coefficients_y[i, :]
+        grid[i, :] = (1.0 - coeff) * grid[i, :] + coeff * grid[i + 1, :]
+    return grid
+
+
+def _pad_slices(cube, width):
+    """Pad each x-y slice of a multi-dimensional cube and merge the slices."""
+    return iris.cube.CubeList(
+        pad_cube_with_halo(cube_slice, width, width)
+        for cube_slice in cube.slices([cube.coord(axis="y"), cube.coord(axis="x")])
+    ).merge_cube()
+
+
 class Test__repr__(IrisTest):
 
     """Test the repr method."""
@@ -508,6 +535,60 @@ class Test__run_recursion(Test_RecursiveFilter):
         )
         self.assertArrayAlmostEqual(unpadded_result, expected_result)
 
+    def test_batched_matches_reference(self):
+        """Test that a cube with several realizations, filtered as a single
+        batched array, matches the result of filtering each realization
+        separately one gridpoint at a time."""
+        edge_width = 1
+        data = np.random.RandomState(0).random_sample((3, 5, 5)).astype(np.float32)
+        cube = set_up_variable_cube(data, name="precipitation_amount", units="1")
+        plugin = RecursiveFilter(edge_width=edge_width)
+        smoothing_coefficients_x = plugin._set_smoothing_coefficients(
+            self.smoothing_coefficients_cube_x
+        )
+        smoothing_coefficients_y = plugin._set_smoothing_coefficients(
+            self.smoothing_coefficients_cube_y_half
+        )
+        padded_cube = _pad_slices(cube, 2 * edge_width)
+        expected = np.array(
+            [
+                _reference_recursion(
+                    grid, smoothing_coefficients_x.data, smoothing_coefficients_y.data
+                )
+                for grid in padded_cube.data
+            ]
+        )
+        result = plugin._run_recursion(
+            padded_cube, smoothing_coefficients_x, smoothing_coefficients_y, 1
+        )
+        self.assertArrayAlmostEqual(result.data, expected)
+
+    def test_batched_transposed_spatial_dimensions(self):
+        """Test that a batched cube with (x, y) spatial ordering is filtered
+        along the correct axes."""
+        edge_width = 1
+        data = np.random.RandomState(1).random_sample((2, 5, 5)).astype(np.float32)
+        cube = set_up_variable_cube(data, name="precipitation_amount", units="1")
+        plugin = RecursiveFilter(edge_width=edge_width)
+        smoothing_coefficients_x = plugin._set_smoothing_coefficients(
+            self.smoothing_coefficients_cube_x
+        )
+        smoothing_coefficients_y = plugin._set_smoothing_coefficients(
+            self.smoothing_coefficients_cube_y_half
+        )
+        padded_cube = _pad_slices(cube, 2 * edge_width)
+        expected = plugin._run_recursion(
+            padded_cube.copy(), smoothing_coefficients_x, smoothing_coefficients_y, 1
+        )
+        enforce_coordinate_ordering(
+            padded_cube, ["longitude", "realization", "latitude"]
+        )
+        result = plugin._run_recursion(
+            padded_cube, smoothing_coefficients_x, smoothing_coefficients_y, 1
+        )
+        enforce_coordinate_ordering(result, ["realization", "latitude", "longitude"])
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
 
 class Test_process(Test_RecursiveFilter):
 
@@ -568,6 +649,41 @@ class Test_process(Test_RecursiveFilter):
         expected = 0.13277836
         self.assertAlmostEqual(result.data[0][2][2], expected)
 
+    def test_multiple_realizations_match_single_slices(self):
+        """Test that filtering a cube with several realizations and a mask
+        in one call gives the same result as filtering each realization
+        separately."""
+        data = np.random.RandomState(0).random_sample((3, 5, 5)).astype(np.float32)
+        data[1, 3, 2] = np.nan
+        cube = set_up_variable_cube(data, name="precipitation_amount", units="1")
+        mask_cube = next(cube.slices(["latitude", "longitude"])).copy(
+            np.ones((5, 5), dtype=np.float32)
+        )
+        mask_cube.data[0, 0] = 0
+        plugin = RecursiveFilter(iterations=2, edge_width=1, re_mask=True)
+        expected = [
+            plugin(
+                cube_slice,
+                smoothing_coefficients_x=self.smoothing_coefficients_cube_x,
+                smoothing_coefficients_y=self.smoothing_coefficients_cube_y_half,
+                mask_cube=mask_cube,
+            )
+            for cube_slice in cube.slices(["latitude", "longitude"])
+        ]
+        result = plugin(
+            cube,
+            smoothing_coefficients_x=self.smoothing_coefficients_cube_x,
+            smoothing_coefficients_y=self.smoothing_coefficients_cube_y_half,
+            mask_cube=mask_cube,
+        )
+        self.assertEqual(result.shape, (3, 5, 5))
+        for result_slice, expected_slice in zip(result.data, expected):
+            self.assertArrayAlmostEqual(result_slice, expected_slice.data)
+            self.assertArrayEqual(result_slice.mask, expected_slice.data.mask)
+        self.assertTrue(np.isnan(result.data.data[1, 3, 2]))
+        self.assertEqual(mask_cube.data[0, 0], 0)
+        self.assertEqual(mask_cube.data.sum(), 24)
+
     def test_coordinate_reordering_with_different_smoothing_coefficients(self):
         """Test that x and y smoothing_coefficients still apply to the right
         coordinate when the input cube spatial dimensions are (x, y) not
@@ -72,6 +72,69 @@ class Test__repr__(IrisTest):
         self.assertEqual(result, msg)
 
 
+class Test__calculate_neighbourhood(IrisTest):
+
+    """Test the _calculate_neighbourhood method."""
+
+    def setUp(self):
+        """Set up data with an invalid point and a stack of masks."""
+        self.data = np.linspace(0, 1, 30, dtype=np.float32).reshape(5, 6)
+        self.data[1, 4] = np.nan
+        masks = np.zeros((3, 5, 6), dtype=np.float32)
+        masks[0, :2] = 1
+        masks[1, 2:] = 1
+        masks[2] = 1
+        self.masks = masks
+
+    def test_stacked_masks(self):
+        """Test that processing a stack of masks at once gives the same
+        result as processing each mask in turn."""
+        result = SquareNeighbourhood._calculate_neighbourhood(
+            self.data, self.masks, 3, False, True
+        )
+        self.assertEqual(result.shape, self.masks.shape)
+        for mask, band_result in zip(self.masks, result):
+            expected = SquareNeighbourhood._calculate_neighbourhood(
+                self.data, mask, 3, False, True
+            )
+            self.assertArrayAlmostEqual(band_result.data, expected.data)
+            self.assertArrayEqual(band_result.mask, expected.mask)
+
+    def test_stacked_masks_sum(self):
+        """Test that the neighbourhood sums for a stack of masks match those
+        from processing each mask in turn."""
+        result = SquareNeighbourhood._calculate_neighbourhood(
+            self.data, self.masks, 3, True, False
+        )
+        for mask, band_result in zip(self.masks, result):
+            expected = SquareNeighbourhood._calculate_neighbourhood(
+                self.data, mask, 3, True, False
+            )
+            self.assertArrayAlmostEqual(band_result, expected)
+
+    def test_multiple_sizes(self):
+        """Test that a list of neighbourhood sizes gives the same results as
+        processing each size in turn."""
+        result = SquareNeighbourhood._calculate_neighbourhood(
+            self.data, self.masks, [1, 3, 5], False, True
+        )
+        self.assertEqual(len(result), 3)
+        for nb_size, size_result in zip([1, 3, 5], result):
+            expected = SquareNeighbourhood._calculate_neighbourhood(
+                self.data, self.masks, nb_size, False, True
+            )
+            self.assertArrayAlmostEqual(size_result.data, expected.data)
+            self.assertArrayEqual(size_result.mask, expected.mask)
+
+    def test_input_mask_unchanged(self):
+        """Test that an integer mask is not modified in place."""
+        data = np.ones((5, 6), dtype=np.float32)
+        data[2, 2] = np.nan
+        mask = np.ones((5, 6), dtype=np.int64)
+        SquareNeighbourhood._calculate_neighbourhood(data, mask, 3, False, False)
+        self.assertTrue(np.all(mask == 1))
+
+
 class Test_run(IrisTest):
 
     """Test the run method on the SquareNeighbourhood class."""
@@ -606,6 +669,71 @@ class Test_run(IrisTest):
         self.assertTupleEqual(result.cell_methods, cube.cell_methods)
         self.assertDictEqual(result.attributes, cube.attributes)
 
+    def test_stacked_mask_cube(self):
+        """Test that a mask cube with a leading dimension gives a result with
+        this as an additional dimension, matching the results for each mask
+        in turn."""
+        cube = set_up_cube(
+            zero_point_indices=((0, 0, 2, 2), (0, 1, 3, 1)),
+            num_time_points=2,
+            num_grid_points=5,
+        )
+        masks = np.ones((2, 5, 5), dtype=np.float32)
+        masks[0, :, 3:] = 0
+        masks[1, :, :3] = 0
+        mask_slices = iris.cube.CubeList()
+        for index, mask in enumerate(masks):
+            mask_slice = cube[0, 0].copy(data=mask)
+            mask_slice.add_aux_coord(DimCoord(index, long_name="topographic_zone"))
+            mask_slices.append(mask_slice)
+        mask_cube = mask_slices.merge_cube()
+        plugin = SquareNeighbourhood(re_mask=False)
+        result = plugin.run(cube, self.RADIUS, mask_cube=mask_cube)
+        self.assertEqual(len(result.coord_dims("topographic_zone")), 1)
+        for mask_slice, band_result in zip(
+            mask_slices, result.slices_over("topographic_zone")
+        ):
+            expected = plugin.run(cube, self.RADIUS, mask_cube=mask_slice)
+            self.assertArrayAlmostEqual(band_result.data, expected.data)
+
+
+class Test_run_multiple_radii(IrisTest):
+
+    """Test the run_multiple_radii method on the SquareNeighbourhood class."""
+
+    def setUp(self):
+        """Set up a cube with two time points and a mask."""
+        self.cube = set_up_cube(
+            zero_point_indices=((0, 0, 2, 2), (0, 1, 3, 1)),
+            num_time_points=2,
+            num_grid_points=7,
+        )
+        self.mask_cube = self.cube[0, 0].copy(data=np.ones((7, 7), dtype=np.float32))
+        self.mask_cube.data[:, 5:] = 0
+        self.radii = [2000, 4000, 6000]
+
+    def test_matches_run(self):
+        """Test that the result for each radius matches the run method."""
+        plugin = SquareNeighbourhood()
+        result = plugin.run_multiple_radii(self.cube, self.radii)
+        self.assertEqual(len(result), len(self.radii))
+        for radius, cube in zip(self.radii, result):
+            expected = plugin.run(self.cube, radius)
+            self.assertArrayAlmostEqual(cube.data, expected.data)
+            self.assertEqual(cube.metadata, expected.metadata)
+            self.assertEqual(cube.coords(), expected.coords())
+
+    def test_matches_run_with_mask(self):
+        """Test that the result for each radius matches the run method when
+        a mask is supplied and the sum is requested."""
+        plugin = SquareNeighbourhood(sum_or_fraction="sum", re_mask=False)
+        result = plugin.run_multiple_radii(
+            self.cube, self.radii, mask_cube=self.mask_cube
+        )
+        for radius, cube in zip(self.radii, result):
+            expected = plugin.run(self.cube, radius, mask_cube=self.mask_cube)
+            self.assertArrayAlmostEqual(cube.data, expected.data)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -32,7 +32,12 @@
 
 import unittest
 
-from improver.nbhood import radius_by_lead_time
+from improver.nbhood import kernel_cache_info, radius_by_lead_time
+from improver.nbhood.circular_kernel import cached_circular_kernel
+from improver.nbhood.nbhood import NeighbourhoodProcessing
+from improver.nbhood.square_kernel import unmasked_area_sum
+
+from .nbhood.test_BaseNeighbourhoodProcessing import set_up_cube
 
 
 class Test_radius_by_lead_time(unittest.TestCase):
@@ -89,5 +94,36 @@ class Test_radius_by_lead_time(unittest.TestCase):
             radius_by_lead_time(radii, lead_times)
 
 
+class Test_kernel_cache_info(unittest.TestCase):
+
+    """Test the reporting of the neighbourhood kernel caches."""
+
+    def setUp(self):
+        """Clear the caches and set up a cube with several time slices."""
+        cached_circular_kernel.cache_clear()
+        unmasked_area_sum.cache_clear()
+        self.cube = set_up_cube(num_time_points=3)
+
+    def test_circular(self):
+        """Test the circular kernel is created once and then reused for the
+        remaining time slices and for a repeated call."""
+        plugin = NeighbourhoodProcessing("circular", 4000.0)
+        for cube_slice in self.cube.slices_over("time"):
+            plugin(cube_slice)
+        plugin(self.cube)
+        result = kernel_cache_info()["circular_kernel"]
+        self.assertEqual(result.misses, 1)
+        self.assertEqual(result.hits, 3)
+
+    def test_square(self):
+        """Test the unmasked area sums are calculated once for all time
+        slices."""
+        plugin = NeighbourhoodProcessing("square", 4000.0)
+        plugin(self.cube)
+        result = kernel_cache_info()["unmasked_area_sum"]
+        self.assertEqual(result.misses, 1)
+        self.assertEqual(result.hits, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -376,6 +376,33 @@ class Test_process(unittest.TestCase):
         self.assertEqual(result.coords(), self.multi_threshold_cube.coords())
         self.assertEqual(result.metadata, self.multi_threshold_cube.metadata)
 
+    def test_lead_times(self):
+        """Test process when the radii are defined at lead times. The radius
+        interpolated to the forecast period of the cube is 2000m, so the
+        result matches test_basic_no_collapse."""
+        fp_hours = self.cube.coord("forecast_period").points[0] / 3600
+        plugin = ApplyNeighbourhoodProcessingWithAMask(
+            "topographic_zone", [0, 4000], lead_times=[fp_hours - 1, fp_hours + 1],
+        )
+        result = plugin(self.cube, self.mask_cube)
+        assert_allclose(result.data, self.expected_uncollapsed_result, equal_nan=True)
+
+    def test_lead_times_mismatch(self):
+        """Test an error is raised if the numbers of radii and lead times
+        differ."""
+        plugin = ApplyNeighbourhoodProcessingWithAMask(
+            "topographic_zone", [2000, 4000], lead_times=[1, 2, 3]
+        )
+        with self.assertRaisesRegex(ValueError, "mismatch in the number of radii"):
+            plugin(self.cube, self.mask_cube)
+
+    def test_nan_input(self):
+        """Test an error is raised if the input cube contains NaNs."""
+        self.cube.data[0, 0, 0] = np.nan
+        plugin = ApplyNeighbourhoodProcessingWithAMask("topographic_zone", 2000)
+        with self.assertRaisesRegex(ValueError, "NaN detected"):
+            plugin(self.cube, self.mask_cube)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the improver.BasePlugin abstract base class"""
+
+import multiprocessing
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from improver import BasePlugin
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+
+
+class DummyPlugin(BasePlugin):
+    """Dummy class inheriting from the abstract base class"""
+
+    def process(self, cube):
+        """Local process method doubles each realization slice"""
+        return self.process_slices(self.double, cube, "realization")
+
+    @staticmethod
+    def double(cube):
+        """Double the data in a cube"""
+        return cube.copy(data=cube.data * 2)
+
+
+def square(value):
+    """Square a value, at module level so that it is picklable"""
+    return value ** 2
+
+
+class Test_parallel_map(unittest.TestCase):
+    """Tests for the parallel_map method"""
+
+    def setUp(self):
+        """Set up a plugin"""
+        self.plugin = DummyPlugin()
+
+    def test_serial(self):
+        """Test items are processed in order with a single worker"""
+        result = self.plugin.parallel_map(square, range(5))
+        self.assertEqual(result, [0, 1, 4, 9, 16])
+
+    def test_threads(self):
+        """Test items are returned in order from a thread pool"""
+        self.plugin._workers = 3
+        result = self.plugin.parallel_map(square, range(5))
+        self.assertEqual(result, [0, 1, 4, 9, 16])
+
+    def test_processes(self):
+        """Test items are returned in order from a process pool"""
+        self.plugin._workers = 2
+        result = self.plugin.parallel_map(square, range(5), executor="process")
+        self.assertEqual(result, [0, 1, 4, 9, 16])
+
+    def test_processes_spawned(self):
+        """Test the process pool spawns its processes rather than forking"""
+        self.plugin._workers = 2
+        get_context = multiprocessing.get_context
+        with patch("multiprocessing.get_context", wraps=get_context) as mock_context:
+            result = self.plugin.parallel_map(square, range(5), executor="process")
+        mock_context.assert_called_once_with("spawn")
+        self.assertEqual(result, [0, 1, 4, 9, 16])
+
+    def test_exception_raised(self):
+        """Test an exception raised by the function is raised by the pool"""
+        self.plugin._workers = 2
+        with self.assertRaises(TypeError):
+            self.plugin.parallel_map(square, [1, "a"])
+
+    def test_invalid_executor(self):
+        """Test an error is raised for an unrecognised executor"""
+        msg = "Executor nonsense is not recognised"
+        with self.assertRaisesRegex(ValueError, msg):
+            self.plugin.parallel_map(square, range(5), executor="nonsense")
+
+
+class Test_process_slices(unittest.TestCase):
+    """Tests for the process_slices method"""
+
+    def setUp(self):
+        """Set up a plugin and a cube with realizations"""
+        self.plugin = DummyPlugin()
+        data = np.arange(36, dtype=np.float32).reshape(4, 3, 3)
+        self.cube = set_up_variable_cube(data, realizations=[0, 1, 2, 3])
+
+    def test_serial(self):
+        """Test the slices are processed and merged back into a cube"""
+        result = self.plugin(self.cube)
+        assert_array_equal(result.data, self.cube.data * 2)
+        self.assertEqual(result.coords(), self.cube.coords())
+
+    def test_parallel(self):
+        """Test the result from several workers matches the serial result"""
+        self.plugin._workers = 4
+        result = self.plugin(self.cube)
+        assert_array_equal(result.data, self.cube.data * 2)
+        self.assertEqual(result.coords(), self.cube.coords())
+
+
+if __name__ == "__main__":
+    unittest.main()
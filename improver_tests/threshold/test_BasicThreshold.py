@@ -31,14 +31,20 @@
 """Unit tests for the threshold.BasicThreshold plugin."""
 
 
+import time
 import unittest
+from unittest.mock import patch
 
+import dask.array as da
 import numpy as np
+import pytest
 from iris.coords import DimCoord
-from iris.cube import Cube
+from iris.cube import Cube, CubeList
 from iris.tests import IrisTest
 
+from improver.blending.calculate_weights_and_blend import WeightAndBlend
 from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.threshold import THRESHOLD_BLOCK_SIZE, _threshold_kernel
 from improver.threshold import BasicThreshold as Threshold
 
 
@@ -608,6 +614,250 @@ class Test_process(IrisTest):
         self.assertTrue("new_name" in result.name())
 
 
+class Test_process_lazy(IrisTest):
+
+    """Test the thresholding plugin in lazy mode."""
+
+    def setUp(self):
+        """Create a cube with lazy, masked data of several realizations."""
+        data = np.linspace(270, 290, 3 * 4 * 5, dtype=np.float32).reshape(3, 4, 5)
+        mask = np.zeros(data.shape, dtype=bool)
+        mask[:, 0, 0] = True
+        self.cube = set_up_variable_cube(np.ma.masked_array(data, mask=mask))
+        self.cube.data = da.from_array(self.cube.data, chunks=(1, 4, 5))
+        self.thresholds = [275.0, 280.0, 285.0]
+
+    def test_matches_eager(self):
+        """Test the output is lazy until realised and then matches the
+        output of eager thresholding, including masked points."""
+        plugin_kwargs = {"fuzzy_bounds": [(273, 277), (278, 282), (283, 287)]}
+        expected = Threshold(self.thresholds, **plugin_kwargs)(self.cube.copy())
+        result = Threshold(self.thresholds, lazy=True, **plugin_kwargs)(self.cube)
+        self.assertTrue(self.cube.has_lazy_data())
+        self.assertTrue(result.has_lazy_data())
+        self.assertEqual(result.metadata, expected.metadata)
+        self.assertEqual(result.coords(), expected.coords())
+        self.assertArrayAlmostEqual(result.data, expected.data)
+        self.assertArrayEqual(result.data.mask, expected.data.mask)
+
+    def test_below_sharp_threshold(self):
+        """Test sharp thresholds for probabilities below threshold."""
+        expected = Threshold(self.thresholds, comparison_operator="<")(self.cube.copy())
+        result = Threshold(self.thresholds, comparison_operator="<", lazy=True)(
+            self.cube
+        )
+        self.assertTrue(result.has_lazy_data())
+        self.assertArrayEqual(result.data, expected.data)
+        self.assertEqual(result.dtype, np.float32)
+
+    def test_nan_raised_on_realisation(self):
+        """Test the check for NaN values is deferred until the output data
+        is realised."""
+        data = self.cube.data.copy()
+        data[1, 2, 2] = np.nan
+        self.cube.data = da.from_array(data, chunks=(1, 4, 5))
+        result = Threshold(self.thresholds, lazy=True)(self.cube)
+        msg = "NaN detected"
+        with self.assertRaisesRegex(ValueError, msg):
+            result.data
+
+
+class Test_process_multiple_thresholds(IrisTest):
+
+    """Test thresholding at many thresholds at once matches thresholding at
+    each threshold in turn."""
+
+    def setUp(self):
+        """Create a cube with masked data of several realizations."""
+        data = np.linspace(270, 290, 3 * 4 * 5, dtype=np.float32).reshape(3, 4, 5)
+        mask = np.zeros(data.shape, dtype=bool)
+        mask[:, 0, 0] = True
+        self.cube = set_up_variable_cube(np.ma.masked_array(data, mask=mask))
+        self.thresholds = [285.0, 275.0, 280.0, 290.0]
+        self.fuzzy_bounds = [(283.0, 287.0), (275.0, 275.0), (278.0, 281.0), (290, 290)]
+
+    def single_thresholds(self, **kwargs):
+        """Threshold at each threshold in turn and concatenate the results."""
+        cubes = CubeList()
+        for threshold, bounds in zip(self.thresholds, self.fuzzy_bounds):
+            plugin = Threshold(threshold, fuzzy_bounds=[bounds], **kwargs)
+            cubes.append(plugin(self.cube.copy()))
+        return cubes.concatenate_cube()
+
+    def test_mixed_sharp_and_fuzzy(self):
+        """Test unordered thresholds, with a mixture of sharp and fuzzy
+        bounds, for probabilities above and below threshold."""
+        for comparison_operator in [">", "<="]:
+            expected = self.single_thresholds(comparison_operator=comparison_operator)
+            plugin = Threshold(
+                self.thresholds,
+                fuzzy_bounds=self.fuzzy_bounds,
+                comparison_operator=comparison_operator,
+            )
+            result = plugin(self.cube)
+            self.assertEqual(result, expected)
+            self.assertArrayEqual(result.data.data, expected.data.data)
+            self.assertArrayEqual(result.data.mask, expected.data.mask)
+            self.assertEqual(result.dtype, np.float32)
+
+    def test_input_unchanged(self):
+        """Test the input cube is not modified."""
+        expected = self.cube.copy()
+        Threshold(self.thresholds, fuzzy_bounds=self.fuzzy_bounds)(self.cube)
+        self.assertEqual(self.cube, expected)
+
+    def test_many_thresholds(self):
+        """Test thresholding at 50 thresholds with a fuzzy factor matches
+        thresholding at each threshold in turn."""
+        rng = np.random.RandomState(0)
+        data = 280 + 10 * rng.normal(size=(3, 20, 20)).astype(np.float32)
+        cube = set_up_variable_cube(data)
+        thresholds = list(np.linspace(260, 300, 50))
+        expected = CubeList(
+            Threshold(threshold, fuzzy_factor=0.8)(cube) for threshold in thresholds
+        ).concatenate_cube()
+        result = Threshold(thresholds, fuzzy_factor=0.8)(cube)
+        self.assertEqual(result, expected)
+
+    def test_single_pass(self):
+        """Test the data is traversed once for all thresholds, in blocks that
+        each cover every threshold."""
+        data = np.linspace(270, 290, 3 * 100 * 100, dtype=np.float32)
+        cube = set_up_variable_cube(data.reshape(3, 100, 100))
+        thresholds = list(np.linspace(260, 300, 50))
+        with patch(
+            "improver.threshold._threshold_kernel", wraps=_threshold_kernel,
+        ) as kernel:
+            Threshold(thresholds, fuzzy_factor=0.8)(cube)
+        block_sizes = [call[0][0].size for call in kernel.call_args_list]
+        self.assertEqual(len(block_sizes), -(-data.size // THRESHOLD_BLOCK_SIZE))
+        self.assertEqual(sum(block_sizes), data.size)
+        for call in kernel.call_args_list:
+            self.assertEqual(len(call[0][1]), len(thresholds))
+
+
+@pytest.mark.slow
+def test_many_thresholds_benchmark(record_property):
+    """Benchmark thresholding a large grid at 50 thresholds at once and at
+    each threshold in turn. Timings in seconds are recorded as properties of
+    the test, and the results should be identical."""
+    rng = np.random.RandomState(0)
+    data = 280 + 10 * rng.normal(size=(12, 500, 500)).astype(np.float32)
+    cube = set_up_variable_cube(data)
+    thresholds = list(np.linspace(260, 300, 50))
+
+    start = time.perf_counter()
+    expected = CubeList(
+        Threshold(threshold, fuzzy_factor=0.8)(cube) for threshold in thresholds
+    ).concatenate_cube()
+    record_property("single_threshold_seconds", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    result = Threshold(thresholds, fuzzy_factor=0.8)(cube)
+    record_property("multiple_threshold_seconds", time.perf_counter() - start)
+
+    assert result == expected
+
+
+class Test_process_collapse_coord(IrisTest):
+
+    """Test thresholding fused with collapsing a coordinate."""
+
+    def setUp(self):
+        """Create a cube of several realizations, with values equal to the
+        thresholds at some points."""
+        data = np.linspace(270, 290, 5 * 4 * 5, dtype=np.float32).reshape(5, 4, 5)
+        data[:, 0, 0] = [275, 280, 280, 285, 280]
+        self.cube = set_up_variable_cube(data)
+        self.thresholds = [280.0, 275.0, 285.0]
+
+    def collapsed_thresholds(self, **kwargs):
+        """Threshold each realization and take the mean across
+        realizations."""
+        blend = WeightAndBlend("realization", "linear", y0val=1.0, ynval=1.0)
+        plugin = Threshold(self.thresholds, each_threshold_func=blend, **kwargs)
+        return plugin(self.cube.copy())
+
+    def test_sharp_thresholds(self):
+        """Test the fractions of realizations satisfying sharp thresholds
+        match the mean of the thresholded realizations, for each comparison
+        operator."""
+        for comparison_operator in [">", ">=", "<", "<="]:
+            expected = self.collapsed_thresholds(
+                comparison_operator=comparison_operator
+            )
+            result = Threshold(
+                self.thresholds,
+                comparison_operator=comparison_operator,
+                collapse_coord="realization",
+            )(self.cube)
+            self.assertEqual(result.coords(), expected.coords())
+            self.assertEqual(result.name(), expected.name())
+            self.assertArrayAlmostEqual(result.data, expected.data)
+            self.assertEqual(result.dtype, np.float32)
+
+    def test_fuzzy_thresholds(self):
+        """Test fuzzy and sharp bounds together."""
+        fuzzy_bounds = [(278.0, 281.0), (275.0, 275.0), (283.0, 287.0)]
+        expected = self.collapsed_thresholds(fuzzy_bounds=fuzzy_bounds)
+        result = Threshold(
+            self.thresholds, fuzzy_bounds=fuzzy_bounds, collapse_coord="realization"
+        )(self.cube)
+        self.assertEqual(result.coords(), expected.coords())
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
+    def test_masked_data(self):
+        """Test masked realizations are excluded from the fractions, and
+        points where all realizations are masked are masked."""
+        mask = np.zeros(self.cube.shape, dtype=bool)
+        mask[1:3, 0, 0] = True
+        mask[:, 0, 1] = True
+        self.cube.data = np.ma.masked_array(self.cube.data, mask=mask)
+        result = Threshold(self.thresholds, collapse_coord="realization")(self.cube)
+        self.assertArrayAlmostEqual(result.data[:, 0, 0], [2 / 3, 1 / 3, 0])
+        self.assertArrayEqual(result.data.mask[:, 0, 1], [True, True, True])
+        self.assertFalse(result.data.mask[:, 1:].any())
+
+    def test_lazy_data(self):
+        """Test lazy input data is realised and collapsed."""
+        expected = Threshold(self.thresholds, collapse_coord="realization")(
+            self.cube.copy()
+        )
+        self.cube.data = da.from_array(self.cube.data)
+        result = Threshold(self.thresholds, collapse_coord="realization", lazy=True)(
+            self.cube
+        )
+        self.assertArrayEqual(result.data, expected.data)
+
+    def test_each_threshold_func(self):
+        """Test each_threshold_func is applied to the collapsed cube."""
+        result = Threshold(
+            self.thresholds,
+            collapse_coord="realization",
+            each_threshold_func=lambda cube: cube.rename("new_name") or cube,
+        )(self.cube)
+        self.assertIn("new_name", result.name())
+
+    def test_scalar_coord_error(self):
+        """Test an error is raised if the coordinate to collapse is not a
+        dimension coordinate."""
+        msg = "Cannot collapse forecast_period"
+        with self.assertRaisesRegex(ValueError, msg):
+            Threshold(self.thresholds, collapse_coord="forecast_period")(self.cube)
+
+    def test_many_thresholds(self):
+        """Test the fused mode matches thresholding followed by collapsing
+        realizations, at 50 thresholds."""
+        rng = np.random.RandomState(0)
+        data = 280 + 10 * rng.normal(size=(6, 20, 20)).astype(np.float32)
+        cube = set_up_variable_cube(data)
+        thresholds = list(np.linspace(260, 300, 50))
+        blend = WeightAndBlend("realization", "linear", y0val=1.0, ynval=1.0)
+        expected = Threshold(thresholds, each_threshold_func=blend)(cube)
+        result = Threshold(thresholds, collapse_coord="realization")(cube)
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
+
 class Test__init__(IrisTest):
 
     """Test error-raising behaviours unique to the init method and the private
@@ -30,10 +30,13 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Unit tests for loading functionality."""
 
+import multiprocessing
 import os
+import shutil
 import unittest
 from datetime import datetime
 from tempfile import mkdtemp
+from unittest.mock import patch
 
 import iris
 import numpy as np
@@ -46,7 +49,7 @@ from improver.synthetic_data.set_up_test_cubes import (
     set_up_probability_cube,
     set_up_variable_cube,
 )
-from improver.utilities.load import load_cube, load_cubelist
+from improver.utilities.load import LOAD_CACHE_DIR_ENV, load_cube, load_cubelist
 from improver.utilities.save import save_netcdf
 
 
@@ -438,6 +441,136 @@ class Test_load_cubelist(IrisTest):
         result = load_cubelist([self.filepath, self.filepath])
         self.assertArrayEqual([True, True], [_.has_lazy_data() for _ in result])
 
+    def test_concurrent_load_order(self):
+        """Test that loading files concurrently returns the cubes in the same
+        order as the filepaths."""
+        filepaths = []
+        for value in range(6):
+            filepath = os.path.join(self.directory, "temp_{}.nc".format(value))
+            save_netcdf(self.cube.copy(data=self.cube.data * value), filepath)
+            filepaths.append(filepath)
+        result = load_cubelist(filepaths, no_lazy_load=True, workers=3)
+        for filepath in filepaths:
+            os.remove(filepath)
+        self.assertEqual(len(result), 6)
+        for value, cube in enumerate(result):
+            self.assertArrayAlmostEqual(cube.data, self.cube.data * value)
+
+    def test_concurrent_load_spawned_processes(self):
+        """Test that files are loaded by a pool of freshly spawned processes
+        when more than one worker is requested."""
+        get_context = multiprocessing.get_context
+        with patch(
+            "improver.utilities.load.multiprocessing.get_context", wraps=get_context
+        ) as mock_context:
+            result = load_cubelist([self.filepath, self.filepath], workers=2)
+        mock_context.assert_called_once_with("spawn")
+        self.assertEqual(len(result), 2)
+        self.assertArrayAlmostEqual(result[1].data, self.cube.data)
+
+    def test_concurrent_load_unpicklable_constraint(self):
+        """Test that files are loaded serially if the constraints cannot be
+        sent to worker processes."""
+        constraint = iris.Constraint(cube_func=lambda cube: cube.ndim == 3)
+        result = load_cubelist([self.filepath, self.filepath], constraint, workers=2)
+        self.assertEqual(len(result), 2)
+
+    def test_load_time_logged(self):
+        """Test that the time taken to load each file is logged."""
+        with self.assertLogs("improver.utilities.load", level="INFO") as logs:
+            load_cubelist([self.filepath, self.filepath], workers=1)
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("Loaded {} in".format(self.filepath), logs.output[0])
+
+
+class Test_load_cache(IrisTest):
+
+    """Test loading cubes via the load cache."""
+
+    def setUp(self):
+        """Set up a file to load and a cache directory."""
+        self.directory = mkdtemp()
+        self.cache_dir = os.path.join(self.directory, "cache")
+        self.filepath = os.path.join(self.directory, "temp.nc")
+        data = np.arange(27, dtype=np.float32).reshape(3, 3, 3)
+        self.cube = set_up_variable_cube(data, spatial_grid="equalarea")
+        save_netcdf(self.cube, self.filepath)
+        self.expected = load_cube(self.filepath)
+
+    def tearDown(self):
+        """Remove temporary directories created for testing."""
+        shutil.rmtree(self.directory)
+
+    def test_cache_hit(self):
+        """Test that the cache is populated on first load and that the cube
+        loaded from the cache matches the cube loaded from the file, with
+        memory-mapped data."""
+        first = load_cube(self.filepath, cache_dir=self.cache_dir)
+        self.assertTrue(os.listdir(self.cache_dir))
+        with self.assertLogs("improver.utilities.load", level="INFO") as logs:
+            result = load_cube(self.filepath, cache_dir=self.cache_dir)
+        self.assertFalse(any("Cached" in line for line in logs.output))
+        self.assertEqual(first, self.expected)
+        self.assertEqual(result, self.expected)
+        self.assertIsInstance(result.data.base, np.memmap)
+
+    def test_cache_hit_without_netcdf(self):
+        """Test that a cache hit builds the cube from the cached metadata,
+        without loading the file or parsing any netCDF metadata."""
+        load_cube(self.filepath, cache_dir=self.cache_dir)
+        with patch("iris.load", side_effect=AssertionError), patch(
+            "iris.load_raw", side_effect=AssertionError
+        ), patch("iris.fileformats.netcdf.load_cubes", side_effect=AssertionError):
+            result = load_cube(self.filepath, cache_dir=self.cache_dir)
+        self.assertEqual(result, self.expected)
+
+    def test_environment_variable(self):
+        """Test that the cache directory can be set by environment variable."""
+        os.environ[LOAD_CACHE_DIR_ENV] = self.cache_dir
+        try:
+            load_cube(self.filepath)
+        finally:
+            del os.environ[LOAD_CACHE_DIR_ENV]
+        self.assertTrue(os.listdir(self.cache_dir))
+
+    def test_modified_file(self):
+        """Test that a modified file is loaded afresh rather than from the
+        cache."""
+        load_cube(self.filepath, cache_dir=self.cache_dir)
+        cube = self.cube.copy(data=np.zeros_like(self.cube.data))
+        save_netcdf(cube, self.filepath)
+        stat = os.stat(self.filepath)
+        os.utime(self.filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        result = load_cube(self.filepath, cache_dir=self.cache_dir)
+        self.assertArrayEqual(result.data, np.zeros_like(self.cube.data))
+
+    def test_cached_data_not_modified(self):
+        """Test that modifying the loaded data does not modify the cache."""
+        load_cube(self.filepath, cache_dir=self.cache_dir)
+        result = load_cube(self.filepath, cache_dir=self.cache_dir)
+        result.data[:] = -1
+        result = load_cube(self.filepath, cache_dir=self.cache_dir)
+        self.assertArrayEqual(result.data, self.expected.data)
+
+    def test_masked_data(self):
+        """Test that the mask of masked data is cached."""
+        mask = np.zeros(self.cube.shape, dtype=bool)
+        mask[:, 0, 0] = True
+        cube = self.cube.copy(data=np.ma.masked_array(self.cube.data, mask=mask))
+        save_netcdf(cube, self.filepath)
+        load_cube(self.filepath, cache_dir=self.cache_dir)
+        result = load_cube(self.filepath, cache_dir=self.cache_dir)
+        self.assertArrayEqual(result.data.mask, mask)
+        self.assertArrayEqual(result.data, cube.data)
+
+    def test_constraint_by_name(self):
+        """Test that loads with different name constraints are cached
+        separately."""
+        load_cube(self.filepath, cache_dir=self.cache_dir)
+        msg = "No cubes found"
+        with self.assertRaisesRegex(ValueError, msg):
+            load_cube(self.filepath, "wind_speed", cache_dir=self.cache_dir)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the memory-mappable cube format."""
+
+import json
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+from unittest.mock import patch
+
+import iris
+import numpy as np
+from iris.tests import IrisTest
+
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.utilities.memmap import is_memmap_file, load_memmap, save_memmap
+
+
+class Test_is_memmap_file(IrisTest):
+
+    """Test identification of memory-mappable files."""
+
+    def test_memmap(self):
+        """Test a path with the memory-mappable suffix."""
+        self.assertTrue(is_memmap_file("orography.mmap"))
+
+    def test_netcdf(self):
+        """Test a NetCDF path."""
+        self.assertFalse(is_memmap_file("orography.nc"))
+
+
+class Test_save_memmap_load_memmap(IrisTest):
+
+    """Test saving and loading cubes in the memory-mappable format."""
+
+    def setUp(self):
+        """Set up cubes to save and a path to save them to."""
+        self.directory = mkdtemp()
+        self.filepath = os.path.join(self.directory, "temp.mmap")
+        data = np.arange(27, dtype=np.float32).reshape(3, 3, 3)
+        self.cube = set_up_variable_cube(data)
+
+    def tearDown(self):
+        """Remove temporary directories created for testing."""
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        """Test that a saved cube is loaded unchanged, with memory-mapped
+        data."""
+        save_memmap(self.cube, self.filepath)
+        result = load_memmap(self.filepath)
+        self.assertIsInstance(result, iris.cube.CubeList)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0], self.cube)
+        self.assertIsInstance(result[0].data.base, np.memmap)
+
+    def test_cubelist(self):
+        """Test that several cubes are saved and loaded in order."""
+        cube = set_up_variable_cube(
+            np.ones((3, 2, 3), dtype=np.float32), name="wind_speed", units="m s-1"
+        )
+        save_memmap(iris.cube.CubeList([self.cube, cube]), self.filepath)
+        result = load_memmap(self.filepath)
+        self.assertEqual(result[0], self.cube)
+        self.assertEqual(result[1], cube)
+
+    def test_metadata_format(self):
+        """Test that the metadata of each cube is described in the JSON index
+        file, with no other metadata files."""
+        save_memmap(self.cube, self.filepath)
+        with open(self.filepath) as index_file:
+            index = json.load(index_file)
+        self.assertEqual(len(index["cubes"]), 1)
+        self.assertEqual(index["cubes"][0]["standard_name"], self.cube.name())
+        self.assertEqual(
+            sorted(os.listdir(self.directory)), ["temp.mmap", "temp.mmap.0.npy"]
+        )
+
+    def test_round_trip_metadata(self):
+        """Test that coordinate systems, bounds, cell methods, variable names
+        and attributes of numpy types are restored exactly."""
+        cube = set_up_variable_cube(
+            self.cube.data,
+            spatial_grid="equalarea",
+            attributes={"mosg__grid_version": np.float32(1.5), "title": "Test"},
+        )
+        cube.var_name = "air_temp"
+        cube.coord(axis="x").var_name = "projection_x_coordinate"
+        cube.add_cell_method(
+            iris.coords.CellMethod("maximum", coords="time", intervals="1 hour")
+        )
+        time = cube.coord("time")
+        time.bounds = [time.points[0] - 3600, time.points[0]]
+        cube.add_aux_coord(
+            iris.coords.AuxCoord(
+                np.ones(cube.shape[1:], dtype=np.float32),
+                long_name="surface_altitude",
+                units="m",
+            ),
+            (1, 2),
+        )
+        save_memmap(cube, self.filepath)
+        (result,) = load_memmap(self.filepath)
+        self.assertEqual(result, cube)
+        self.assertEqual(result.var_name, "air_temp")
+        self.assertEqual(result.attributes, cube.attributes)
+        self.assertEqual(
+            type(result.attributes["mosg__grid_version"]), np.float32,
+        )
+        for coord in cube.coords():
+            result_coord = result.coord(coord.name())
+            self.assertEqual(result_coord.var_name, coord.var_name)
+            self.assertEqual(result_coord.dtype, coord.dtype)
+            self.assertEqual(result.coord_dims(result_coord), cube.coord_dims(coord))
+
+    def test_load_without_netcdf(self):
+        """Test that cubes are loaded without parsing any netCDF metadata."""
+        save_memmap(self.cube, self.filepath)
+        with patch("iris.load", side_effect=AssertionError), patch(
+            "iris.load_cube", side_effect=AssertionError
+        ), patch("iris.load_raw", side_effect=AssertionError), patch(
+            "iris.fileformats.netcdf.load_cubes", side_effect=AssertionError
+        ):
+            result = load_memmap(self.filepath)
+        self.assertEqual(result[0], self.cube)
+
+    def test_masked_data(self):
+        """Test that the mask of masked data is saved and loaded."""
+        mask = np.zeros(self.cube.shape, dtype=bool)
+        mask[:, 0, 0] = True
+        self.cube.data = np.ma.masked_array(self.cube.data, mask=mask)
+        save_memmap(self.cube, self.filepath)
+        result = load_memmap(self.filepath)
+        self.assertArrayEqual(result[0].data.mask, mask)
+        self.assertArrayEqual(result[0].data, self.cube.data)
+
+    def test_saved_data_not_modified(self):
+        """Test that modifying the loaded data does not modify the file."""
+        save_memmap(self.cube, self.filepath)
+        result = load_memmap(self.filepath)
+        result[0].data[:] = -1
+        result = load_memmap(self.filepath)
+        self.assertArrayEqual(result[0].data, self.cube.data)
+
+    def test_missing_file(self):
+        """Test an error is raised if the index file does not exist."""
+        with self.assertRaises(FileNotFoundError):
+            load_memmap(self.filepath)
+
+
+if __name__ == "__main__":
+    unittest.main()
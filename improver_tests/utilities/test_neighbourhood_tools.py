@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017-2020 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the neighbourhood_tools module."""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+from iris.tests import IrisTest
+
+from improver.utilities.neighbourhood_tools import pad_and_roll, sliding_percentiles
+
+
+class Test_sliding_percentiles(IrisTest):
+
+    """Test the sliding_percentiles function."""
+
+    def setUp(self):
+        """Set up random data, including repeated values, and a kernel."""
+        self.data = np.random.RandomState(0).random_sample((23, 17))
+        self.data[5:10, :] = np.round(self.data[5:10, :], 1)
+        self.kernel = np.array(
+            [
+                [0, 0, 1, 0, 0],
+                [0, 1, 1, 1, 0],
+                [1, 1, 1, 1, 1],
+                [0, 1, 1, 1, 0],
+                [0, 0, 1, 0, 0],
+            ],
+            dtype=bool,
+        )
+        self.percentiles = np.array([0, 10, 25, 50, 90, 100])
+
+    def _windowed_percentiles(self, data):
+        """Calculate percentiles by sorting every neighbourhood window."""
+        windows = pad_and_roll(data, self.kernel.shape, mode="edge")
+        return np.percentile(windows[..., self.kernel], self.percentiles, axis=-1)
+
+    def test_basic(self):
+        """Test the percentiles match those from sorting every window."""
+        result = sliding_percentiles(
+            self.data, self.kernel, self.percentiles, mode="edge"
+        )
+        self.assertEqual(result.shape, (6, 23, 17))
+        self.assertArrayAlmostEqual(result, self._windowed_percentiles(self.data))
+
+    @mock.patch("improver.utilities.neighbourhood_tools.MIN_SLIDING_TILE_SIZE", 4)
+    def test_tiles(self):
+        """Test the percentiles are unchanged when the array is processed in
+        several tiles, including partial tiles at the edges."""
+        result = sliding_percentiles(
+            self.data, self.kernel, self.percentiles, mode="edge"
+        )
+        self.assertArrayAlmostEqual(result, self._windowed_percentiles(self.data))
+
+    def test_integer_data(self):
+        """Test that percentiles interpolated between integer values are
+        returned as floats rather than truncated."""
+        data = np.arange(4 * 5).reshape(4, 5)
+        result = sliding_percentiles(data, self.kernel, self.percentiles, mode="edge")
+        self.assertEqual(result.dtype, np.float64)
+        self.assertArrayAlmostEqual(result, self._windowed_percentiles(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
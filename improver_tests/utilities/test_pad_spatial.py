@@ -38,6 +38,7 @@ from iris.coords import DimCoord
 from iris.tests import IrisTest
 
 from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.utilities.cube_manipulation import enforce_coordinate_ordering
 from improver.utilities.pad_spatial import (
     _create_cube_with_padded_data,
     create_cube_with_halo,
@@ -464,6 +465,23 @@ class Test_pad_cube_with_halo(IrisTest):
         )
         self.assertArrayAlmostEqual(padded_cube.data, expected_data)
 
+    def test_multiple_realizations(self):
+        """Test that only the spatial dimensions of a multi-dimensional cube
+        are padded, and that each slice matches padding that slice alone."""
+        data = np.stack([self.cube.data, 2 * self.cube.data])
+        cube = set_up_variable_cube(data, spatial_grid="equalarea")
+        enforce_coordinate_ordering(
+            cube, ["projection_x_coordinate", "realization", "projection_y_coordinate"]
+        )
+        padded_cube = pad_cube_with_halo(cube, 2, 4, pad_method="maximum")
+        self.assertEqual(padded_cube.shape, (9, 2, 13))
+        self.assertEqual(padded_cube.coord_dims("realization"), (1,))
+        for index, cube_slice in enumerate(
+            cube.slices(["projection_y_coordinate", "projection_x_coordinate"])
+        ):
+            expected = pad_cube_with_halo(cube_slice, 2, 4, pad_method="maximum")
+            self.assertArrayAlmostEqual(padded_cube.data[:, index, :].T, expected.data)
+
 
 class Test_remove_cube_halo(IrisTest):
     """Tests for the  remove_cube_halo function"""
@@ -570,6 +588,17 @@ class Test_remove_halo_from_cube(IrisTest):
         self.assertIsInstance(padded_cube, iris.cube.Cube)
         self.assertArrayAlmostEqual(padded_cube.data, expected)
 
+    def test_multiple_realizations(self):
+        """Test that only the spatial dimensions of a multi-dimensional cube
+        are trimmed."""
+        data = np.stack([self.large_cube.data, 2 * self.large_cube.data])
+        cube = set_up_variable_cube(data, spatial_grid="equalarea")
+        enforce_coordinate_ordering(cube, ["realization"], anchor_start=False)
+        trimmed_cube = remove_halo_from_cube(cube, 2, 4)
+        self.assertEqual(trimmed_cube.shape, (2, 6, 2))
+        self.assertEqual(trimmed_cube.coord_dims("realization"), (2,))
+        self.assertArrayAlmostEqual(trimmed_cube.data, cube.data[4:-4, 2:-2, :])
+
 
 if __name__ == "__main__":
     unittest.main()
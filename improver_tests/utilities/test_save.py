@@ -31,7 +31,9 @@
 """Unit tests for saving functionality."""
 
 import os
+import time
 import unittest
+import zlib
 from tempfile import mkdtemp
 
 import iris
@@ -43,7 +45,13 @@ from netCDF4 import Dataset
 
 from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
 from improver.utilities.load import load_cube
-from improver.utilities.save import _order_cell_methods, save_netcdf
+from improver.utilities.save import (
+    _chunksizes,
+    _compress_chunks,
+    _order_cell_methods,
+    save_netcdf,
+    save_netcdf_incremental,
+)
 
 
 def set_up_test_cube():
@@ -235,6 +243,21 @@ class Test_save_netcdf(IrisTest):
             save_netcdf(no_units_cube, self.filepath)
 
 
+def test_memmap_format(tmp_path):
+    """ Test a file with the memory-mappable suffix is saved in that format
+    and loaded with memory-mapped data """
+    cube = set_up_test_cube()
+    filepath = tmp_path / "temp.mmap"
+    save_netcdf(cube, filepath)
+    with pytest.raises(OSError):
+        Dataset(filepath, mode="r")
+    result = load_cube(str(filepath))
+    assert isinstance(result.data.base, np.memmap)
+    np.testing.assert_array_equal(result.data, cube.data)
+    assert result.coord("realization") == cube.coord("realization")
+    assert result.attributes == cube.attributes
+
+
 @pytest.fixture(name="bitshaving_cube")
 def bitshaving_cube_fixture():
     """ Sets up a cube with a recurring decimal for bitshaving testing """
@@ -274,6 +297,189 @@ def test_least_significant_digit(bitshaving_cube, tmp_path, lsd, compress):
     assert np.max(abs_diff) < 10 ** (-1.0 * lsd)
 
 
+@pytest.mark.parametrize(
+    "chunks, expected",
+    (
+        (None, (1, 1, 970, 1042)),
+        ("slice", (1, 1, 970, 1042)),
+        ("spot", (1, 1, 1, 1042)),
+        ("timeseries", (12, 24, 64, 64)),
+        ((1, -1, 100, 2000), (1, 24, 100, 1042)),
+    ),
+)
+def test_chunksizes(chunks, expected):
+    """ Test chunk shapes for named layouts and explicit sizes """
+    assert _chunksizes((12, 24, 970, 1042), chunks) == expected
+
+
+@pytest.mark.parametrize(
+    "chunks, msg",
+    (
+        ("columns", "Chunk layout columns not recognised"),
+        ((1, 10, 10), "does not match the dimensions"),
+        ((1, 0, 10, 10), "Chunk sizes must be positive"),
+    ),
+)
+def test_chunksizes_invalid(chunks, msg):
+    """ Test errors for unrecognised layouts and invalid chunk shapes """
+    with pytest.raises(ValueError, match=msg):
+        _chunksizes((12, 24, 970, 1042), chunks)
+
+
+@pytest.fixture(name="multi_threshold_cube")
+def multi_threshold_cube_fixture():
+    """ Sets up a cube with several slices, masked points and a shape that
+    does not divide into whole chunks """
+    data = np.linspace(250, 300, 5 * 30 * 40, dtype=np.float32).reshape(5, 30, 40)
+    data = np.ma.masked_greater(data, 299)
+    return set_up_variable_cube(data)
+
+
+@pytest.mark.parametrize("chunks", ("slice", "timeseries", (2, 7, 9)))
+@pytest.mark.parametrize("lsd", (None, 2))
+def test_parallel_compression(multi_threshold_cube, tmp_path, chunks, lsd):
+    """ Test parallel compression writes the same data, chunking and filters
+    as serial compression """
+    pytest.importorskip("h5py")
+    serial_path = tmp_path / "serial.nc"
+    parallel_path = tmp_path / "parallel.nc"
+    kwargs = {"compression_level": 3, "least_significant_digit": lsd, "chunks": chunks}
+    save_netcdf(multi_threshold_cube, serial_path, **kwargs)
+    save_netcdf(multi_threshold_cube, parallel_path, compression_workers=4, **kwargs)
+
+    with Dataset(serial_path) as serial, Dataset(parallel_path) as parallel:
+        # pylint: disable=unsubscriptable-object
+        expected = serial.variables["air_temperature"]
+        result = parallel.variables["air_temperature"]
+        assert result.chunking() == expected.chunking()
+        assert result.filters() == expected.filters()
+        np.testing.assert_array_equal(result[:].mask, expected[:].mask)
+        np.testing.assert_array_equal(result[:], expected[:])
+    assert load_cube(str(parallel_path)) == load_cube(str(serial_path))
+
+
+def test_compress_chunks_streamed():
+    """ Test chunks are compressed in order while only a few of them are
+    taken from the input at a time """
+    from concurrent.futures import ThreadPoolExecutor
+
+    taken = []
+
+    def chunks():
+        """ Generate chunks, recording how many have been taken """
+        for index in range(20):
+            taken.append(index)
+            yield (index,), np.full(4, index, dtype=np.float32)
+
+    with ThreadPoolExecutor(2) as pool:
+        for offset, compressed in _compress_chunks(pool, chunks(), 1, 2):
+            assert len(taken) <= offset[0] + 4
+            shuffled = np.frombuffer(zlib.decompress(compressed), dtype=np.uint8)
+            data = shuffled.reshape(4, 4).T.copy().view(np.float32)
+            np.testing.assert_array_equal(data.ravel(), offset[0])
+    assert len(taken) == 20
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("compression_level", range(10))
+def test_compression_throughput(tmp_path, record_property, compression_level):
+    """ Benchmark the write throughput of serial and parallel compression at
+    each compression level. Throughputs in MB/s are recorded as properties
+    of the test, which only checks that writes complete at a loose minimum
+    throughput """
+    pytest.importorskip("h5py")
+    rng = np.random.RandomState(0)
+    data = 273.15 + rng.normal(size=(10, 1000, 1000)).astype(np.float32)
+    cube = set_up_variable_cube(data, spatial_grid="equalarea")
+    megabytes = data.nbytes / 1e6
+
+    for workers in (1, 4):
+        filepath = tmp_path / "temp_{}.nc".format(workers)
+        start = time.perf_counter()
+        save_netcdf(
+            cube,
+            filepath,
+            compression_level=compression_level,
+            compression_workers=workers,
+        )
+        throughput = megabytes / (time.perf_counter() - start)
+        record_property("mb_per_s_workers_{}".format(workers), throughput)
+        assert throughput > 0.1
+
+
+class Test_save_netcdf_incremental(IrisTest):
+    """ Test saving a cube one slice at a time. """
+
+    def setUp(self):
+        """ Set up a cube to write and a template with lazy data """
+        self.directory = mkdtemp()
+        self.filepath = os.path.join(self.directory, "temp.nc")
+        data = np.arange(36, dtype=np.float32).reshape(4, 3, 3) + 273.15
+        mask = np.zeros(data.shape, dtype=bool)
+        mask[1, 0, 0] = True
+        self.cube = set_up_variable_cube(np.ma.masked_array(data, mask=mask))
+        self.template = self.cube.copy(data=self.cube.lazy_data() * 0)
+
+    def tearDown(self):
+        """ Remove temporary directories created for testing. """
+        for filename in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, filename))
+        os.rmdir(self.directory)
+
+    def test_generator(self):
+        """ Test the saved file matches the cube saved in one go, when the
+        slices are generated one at a time in any order """
+        expected_path = os.path.join(self.directory, "expected.nc")
+        save_netcdf(self.cube, expected_path)
+        slices = (self.cube[index] for index in (2, 0, 3, 1))
+        save_netcdf_incremental(self.template, slices, self.filepath, "realization")
+        self.assertFalse(os.path.exists(self.filepath + ".tmp"))
+        result = load_cube(self.filepath)
+        self.assertEqual(result, load_cube(expected_path))
+        self.assertArrayEqual(result.data.mask, self.cube.data.mask)
+
+    def test_blocks(self):
+        """ Test slices can include several points of the coordinate """
+        slices = [self.cube[:2], self.cube[2:]]
+        save_netcdf_incremental(self.template, slices, self.filepath, "realization")
+        self.assertArrayEqual(load_cube(self.filepath).data, self.cube.data)
+
+    def test_missing_slice(self):
+        """ Test an error is raised and no file written if a point of the
+        coordinate is not written """
+        slices = (self.cube[index] for index in (0, 1, 2))
+        msg = "were not written"
+        with self.assertRaisesRegex(ValueError, msg):
+            save_netcdf_incremental(self.template, slices, self.filepath, "realization")
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_repeated_slice(self):
+        """ Test an error is raised if a point is written twice """
+        slices = (self.cube[index] for index in (0, 1, 1, 2, 3))
+        msg = "is written more than once"
+        with self.assertRaisesRegex(ValueError, msg):
+            save_netcdf_incremental(self.template, slices, self.filepath, "realization")
+
+    def test_unknown_point(self):
+        """ Test an error is raised if a slice is not a point of the
+        template """
+        cube_slice = self.cube[0]
+        cube_slice.coord("realization").points = [10]
+        msg = "is not a point of the template"
+        with self.assertRaisesRegex(ValueError, msg):
+            save_netcdf_incremental(
+                self.template, [cube_slice], self.filepath, "realization"
+            )
+
+    def test_mismatched_shape(self):
+        """ Test an error is raised if a slice does not match the template """
+        msg = "does not match the template shape"
+        with self.assertRaisesRegex(ValueError, msg):
+            save_netcdf_incremental(
+                self.template, [self.cube[0, :2]], self.filepath, "realization"
+            )
+
+
 class Test__order_cell_methods(IrisTest):
     """ Test function that sorts cube cell_methods before saving. """
 